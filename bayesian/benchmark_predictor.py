@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Latency benchmark for the Bayesian Team Predictor backends.
+
+Compares the Counter loops against the NumPy count-matrix backend on a synthetic
+model (--synthetic), or times load and queries on the saved model file.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from typing import List, Tuple
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+
+from bayesian.team_predictor import BayesianTeamPredictor, PokemonConfig, TeamData
+
+STAT_NAMES = ['HP', 'Atk', 'Def', 'SpA', 'SpD', 'Spe']
+EV_SPREADS = [(252, 252, 0, 0, 4, 0), (0, 252, 4, 0, 0, 252), (252, 0, 252, 0, 4, 0), (4, 0, 0, 252, 0, 252)]
+
+
+def make_synthetic_teams(n_teams: int = 5000, n_species: int = 120, seed: int = 0) -> List[TeamData]:
+    """Randomly generated teams with Zipf-like species usage."""
+    rng = random.Random(seed)
+    species_pool = [f"Species{i}" for i in range(n_species)]
+    species_weights = [1.0 / (i + 1) for i in range(n_species)]  # Zipf-like usage
+    move_pool = [f"Move {i}" for i in range(60)]
+    items = ["Leftovers", "Choice Scarf", "Heavy-Duty Boots", "Life Orb", "Choice Band"]
+    natures = ["Jolly", "Adamant", "Timid", "Modest", "Bold", "Careful"]
+
+    teams = []
+    for _ in range(n_teams):
+        species = set()
+        while len(species) < 6:
+            species.add(rng.choices(species_pool, weights=species_weights)[0])
+        pokemon = []
+        for name in sorted(species):
+            # Each species draws from its own slice of the move pool so configs repeat
+            offset = int(name[len("Species"):]) % 50
+            moves = rng.sample(move_pool[offset:offset + 10], 4)
+            pokemon.append(PokemonConfig(
+                species=name,
+                item=rng.choice(items),
+                ability=f"Ability {offset % 3}",
+                moves=moves,
+                nature=rng.choice(natures),
+                evs=dict(zip(STAT_NAMES, rng.choice(EV_SPREADS))),
+                ivs={stat: 31 for stat in STAT_NAMES},
+                tera_type=rng.choice(["Fairy", "Steel", "Ground"]),
+            ))
+        teams.append(TeamData(pokemon=pokemon))
+    return teams
+
+
+def make_synthetic_predictor(n_teams: int = 5000, n_species: int = 120, seed: int = 0) -> BayesianTeamPredictor:
+    """Train a predictor on randomly generated teams (no dataset download)."""
+    predictor = BayesianTeamPredictor(cache_file=f"synthetic_{seed}_team_predictor.pkl", battle_format="synthetic")
+    for team_data in make_synthetic_teams(n_teams, n_species, seed):
+        predictor._update_counts(team_data)
+        predictor.total_teams += 1
+    predictor.is_trained = True
+    return predictor
+
+
+def time_queries(predictor: BayesianTeamPredictor, queries, repeat: int) -> float:
+    """Average milliseconds per (teammates + components) query."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for revealed, species, moves in queries:
+            predictor.predict_unrevealed_pokemon(revealed)
+            predictor.predict_component_probabilities(species, revealed, moves)
+    return (time.perf_counter() - start) * 1000 / (repeat * len(queries))
+
+
+def time_team_queries(predictor: BayesianTeamPredictor, teams, repeat: int) -> Tuple[float, float]:
+    """Average milliseconds per team: six predict_component_probabilities calls vs one predict_team call."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for team, revealed in teams:
+            for species in team:
+                predictor.predict_component_probabilities(species, [s for s in team if s != species], revealed.get(species))
+    separate_ms = (time.perf_counter() - start) * 1000 / (repeat * len(teams))
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for team, revealed in teams:
+            predictor.predict_team(team, revealed)
+    batched_ms = (time.perf_counter() - start) * 1000 / (repeat * len(teams))
+    return separate_ms, batched_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--battle_format", type=str, default="gen9ou")
+    parser.add_argument("--synthetic", type=int, default=0, help="Benchmark a synthetic model with this many teams")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        predictor = make_synthetic_predictor(args.synthetic)
+    else:
+        predictor = BayesianTeamPredictor(cache_file=f"{args.battle_format}_team_predictor_full.pkl",
+                                          battle_format=args.battle_format)
+        start = time.perf_counter()
+        predictor.load_and_train(force_retrain=False)
+        print(f"Model load time: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    common_species = [species for species, _ in predictor.species_counts.most_common(30)]
+    start = time.perf_counter()
+    predictor.use_count_matrix = True
+    known_moves = {}
+    for species in common_species:
+        table = predictor.count_matrix.config_table(species)
+        known_moves[species] = (table.move_names if table else []) or [""]
+    compile_ms = (time.perf_counter() - start) * 1000
+
+    rng = random.Random(0)
+    queries = []
+    teams = []
+    for _ in range(args.queries):
+        revealed = rng.sample(common_species, 3)
+        species = rng.choice([s for s in common_species if s not in revealed])
+        queries.append((revealed, species, rng.sample(known_moves[species], min(2, len(known_moves[species])))))
+    # A few opponent teams queried repeatedly, as over the turns of concurrent battles
+    for _ in range(8):
+        team = rng.sample(common_species, 6)
+        teams.append((team, {s: rng.sample(known_moves[s], min(rng.randint(0, 2), len(known_moves[s]))) for s in team}))
+
+    matrix_ms = time_queries(predictor, queries, args.repeat)
+    preview_ms = time_team_queries(predictor, [(team, {}) for team, _ in teams], args.repeat)
+    midgame_ms = time_team_queries(predictor, teams, args.repeat)
+
+    print(f"Model: {predictor.total_teams:,} teams, {len(predictor.species_counts):,} species")
+    print(f"Count-matrix compile time: {compile_ms:.1f} ms")
+    for label, (separate_ms, batched_ms) in [("team preview", preview_ms), ("moves revealed", midgame_ms)]:
+        print(f"Team of six ({label}): {separate_ms:.3f} ms separate calls, "
+              f"{batched_ms:.3f} ms predict_team ({separate_ms / batched_ms:.1f}x)")
+    if not predictor._has_counts:
+        # Loaded from the model file: there are no Counters to compare against
+        print(f"Count-matrix backend: {matrix_ms:.3f} ms/query")
+        return
+    predictor.use_count_matrix = False
+    counter_ms = time_queries(predictor, queries, args.repeat)
+    print(f"Counter backend:      {counter_ms:.3f} ms/query")
+    print(f"Count-matrix backend: {matrix_ms:.3f} ms/query ({counter_ms / matrix_ms:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
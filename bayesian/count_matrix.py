@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+NumPy count-matrix backend for the Bayesian Team Predictor.
+
+Compiles the Counter tables of a trained BayesianTeamPredictor into
+integer-indexed arrays so predictions are vectorised instead of looping over
+every species / config string per query. The same arrays are what the compact
+model file stores (see bayesian/model_file.py), so a loaded model predicts
+straight from memory-mapped pages.
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from bayesian.model_file import load_model_file, save_model_file
+
+# Probability used by the predictor for unseen teammate combinations
+UNSEEN_TEAMMATE_PROB = 0.001
+
+
+STAT_NAMES = ['HP', 'Atk', 'Def', 'SpA', 'SpD', 'Spe']
+
+# Single-valued config components stored as string-ID columns (-1 = missing)
+CONFIG_COLUMNS = ['items', 'natures', 'abilities', 'tera_types', 'ev_spreads']
+
+
+def popcount(words: np.ndarray) -> np.ndarray:
+    """Number of set bits per uint64 element."""
+    if hasattr(np, 'bitwise_count'):  # NumPy >= 2.0
+        return np.bitwise_count(words)
+    bits = np.unpackbits(words.view(np.uint8), axis=-1)
+    return bits.reshape(words.shape + (64,)).sum(axis=-1)
+
+
+def _local_ids(column: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Split string IDs into a first-appearance vocabulary and indices into it (-1 kept)."""
+    present = column >= 0
+    ids, first = np.unique(column[present], return_index=True)
+    order = np.argsort(first, kind='stable')
+    rank = np.empty(len(ids), dtype=np.int32)
+    rank[order] = np.arange(len(ids), dtype=np.int32)
+    local = np.full(column.shape, -1, dtype=np.int32)
+    local[present] = rank[np.searchsorted(ids, column[present])]
+    return ids[order].astype(np.int32), local
+
+
+def _global_ids(vocab: np.ndarray, local: np.ndarray) -> np.ndarray:
+    """Inverse of _local_ids."""
+    if len(vocab) == 0:
+        return np.full(local.shape, -1, dtype=np.int32)
+    return np.where(local >= 0, vocab[np.maximum(local, 0)], -1).astype(np.int32)
+
+
+class StringTable:
+    """Interned strings shared by every config table; an ID is an index into `strings`."""
+
+    def __init__(self, strings: Optional[List[str]] = None):
+        self.strings: List[str] = list(strings or [])
+        self._ids: Dict[str, int] = {value: idx for idx, value in enumerate(self.strings)}
+
+    def intern(self, value: str) -> int:
+        string_id = self._ids.get(value)
+        if string_id is None:
+            string_id = len(self.strings)
+            self._ids[value] = string_id
+            self.strings.append(value)
+        return string_id
+
+    def get(self, value: str, default: int = -1) -> int:
+        return self._ids.get(value, default)
+
+
+class ConfigTable:
+    """
+    Columnar, pre-parsed configs of a single species, one row per config key.
+
+    Each component column holds an index into the species vocabulary of that
+    component (-1 = missing); vocabularies keep first-appearance order so ties
+    rank like the Counter loop, and map to interned string IDs.
+    """
+
+    COMPONENTS = ['moves', 'items', 'natures', 'abilities', 'ev_spreads']
+
+    def __init__(self, strings: StringTable, counts: np.ndarray, columns: Dict[str, np.ndarray],
+                 moves: np.ndarray, evs: np.ndarray, parse_errors: np.ndarray):
+        """Build from string-ID columns: `columns` per CONFIG_COLUMNS, `moves` (n, 4), `evs` (n, 6)."""
+        self.strings = strings
+        self.config_keys: Optional[List[str]] = None  # only known when compiled from Counters
+        self.counts = np.asarray(counts, dtype=np.float64)
+        self.total = int(np.asarray(counts).sum())
+        self.evs = evs
+        # Rows whose key failed to parse only keep the fields that did parse
+        self.parse_errors = parse_errors
+
+        # species vocabulary (local index) -> interned string ID
+        self.vocab = {}
+        self._vocab_names: Dict[str, List[str]] = {}
+        self.vocab['moves'], self.move_slots = _local_ids(moves)
+        for component in CONFIG_COLUMNS:
+            self.vocab[component], local = _local_ids(columns[component])
+            setattr(self, component, local)
+
+        # Move bitsets: bit m of row r is set if the config has species-local move m
+        n_words = max(1, (len(self.vocab['moves']) + 63) // 64)
+        self.move_bits = np.zeros((len(self.counts), n_words), dtype=np.uint64)
+        rows, slots = np.nonzero(self.move_slots >= 0)
+        local_moves = self.move_slots[rows, slots]
+        np.bitwise_or.at(self.move_bits, (rows, local_moves // 64),
+                         np.left_shift(np.uint64(1), (local_moves % 64).astype(np.uint64)))
+
+        self._move_local = {name: idx for idx, name in enumerate(self.move_names)}
+
+    @classmethod
+    def from_config_keys(cls, predictor, configs: Dict[str, int], strings: StringTable) -> 'ConfigTable':
+        """Parse every config key of a species once."""
+        n_configs = len(configs)
+        counts = np.fromiter(configs.values(), dtype=np.int64, count=n_configs)
+        columns = {component: np.full(n_configs, -1, dtype=np.int32) for component in CONFIG_COLUMNS}
+        moves = np.full((n_configs, 4), -1, dtype=np.int32)
+        evs = np.zeros((n_configs, len(STAT_NAMES)), dtype=np.int16)
+        parse_errors = np.zeros(n_configs, dtype=bool)
+
+        for row, config_key in enumerate(configs):
+            parsed = predictor._parse_config_key(config_key)
+            parse_errors[row] = not parsed or parsed.get('parse_error', False)
+            config_moves = [move for move in parsed.get('moves', []) if move][:4]
+            moves[row, :len(config_moves)] = [strings.intern(move) for move in config_moves]
+            for component, field in [('items', 'item'), ('natures', 'nature'), ('abilities', 'ability'), ('tera_types', 'tera_type')]:
+                if parsed.get(field) is not None:
+                    columns[component][row] = strings.intern(parsed[field])
+            if parsed.get('ev_spread'):
+                evs[row] = [parsed['ev_spread'][stat] for stat in STAT_NAMES]
+                columns['ev_spreads'][row] = strings.intern(predictor._summarize_ev_spread(parsed['ev_spread']))
+
+        table = cls(strings, counts, columns, moves, evs, parse_errors)
+        table.config_keys = list(configs)
+        return table
+
+    @property
+    def move_names(self) -> List[str]:
+        """Every move seen on this species, in first-appearance order."""
+        return self.vocab_names('moves')
+
+    def vocab_names(self, component: str) -> List[str]:
+        """Readable vocabulary of a component (cached)."""
+        names = self._vocab_names.get(component)
+        if names is None:
+            names = [self.strings.strings[string_id] for string_id in self.vocab[component]]
+            self._vocab_names[component] = names
+        return names
+
+    def global_columns(self) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """Component columns and move slots as interned string IDs (the model file layout)."""
+        columns = {component: _global_ids(self.vocab[component], getattr(self, component)) for component in CONFIG_COLUMNS}
+        return columns, _global_ids(self.vocab['moves'], self.move_slots)
+
+    def revealed_mask(self, revealed_moves: List[str]) -> np.ndarray:
+        """Bitset of the revealed moves this species has been seen with."""
+        mask = np.zeros(self.move_bits.shape[1], dtype=np.uint64)
+        for move in set(revealed_moves):
+            idx = self._move_local.get(move)
+            if idx is not None:
+                mask[idx // 64] |= np.uint64(1) << np.uint64(idx % 64)
+        return mask
+
+    def adjusted_probs(self, revealed_moves: List[str]) -> np.ndarray:
+        """P(config | species) with the (1 + matches)^2 revealed-move bonus."""
+        base_probs = self.counts / self.total
+        if not revealed_moves:
+            return base_probs
+        matches = popcount(self.move_bits & self.revealed_mask(revealed_moves)).sum(axis=1)
+        return base_probs * (1 + matches) ** 2
+
+    def component_sums(self, adjusted: np.ndarray) -> Dict[str, List[Tuple[str, float]]]:
+        """Unnormalised probability mass per non-empty component value, in vocabulary order."""
+        sums = {}
+        for component, column in [('moves', self.move_slots), ('items', self.items), ('natures', self.natures),
+                                  ('abilities', self.abilities), ('ev_spreads', self.ev_spreads)]:
+            weights = np.broadcast_to(adjusted[:, None], column.shape) if column.ndim == 2 else adjusted
+            present = column >= 0
+            totals = np.bincount(column[present], weights=weights[present], minlength=len(self.vocab[component]))
+            sums[component] = [(name, totals[idx]) for idx, name in enumerate(self.vocab_names(component)) if name]
+        return sums
+
+    def config(self, row: int) -> Dict:
+        """Readable config for a row, as _parse_config_key would return it."""
+        def value(column: np.ndarray, component: str) -> Optional[str]:
+            idx = column[row]
+            return self.strings.strings[self.vocab[component][idx]] if idx >= 0 else None
+
+        config = {
+            'item': value(self.items, 'items'),
+            'ability': value(self.abilities, 'abilities'),
+            'nature': value(self.natures, 'natures'),
+            'ev_spread': dict(zip(STAT_NAMES, (int(ev) for ev in self.evs[row]))),
+            'moves': [self.strings.strings[self.vocab['moves'][idx]] for idx in self.move_slots[row] if idx >= 0],
+            'tera_type': value(self.tera_types, 'tera_types'),
+        }
+        if self.parse_errors[row]:
+            config['ev_spread'] = {}
+            config['parse_error'] = True
+        return config
+
+    def config_key(self, row: int) -> Optional[str]:
+        """Counter key of a row as _pokemon_to_config_key builds it, None for unparseable rows."""
+        if self.parse_errors[row]:
+            return None
+        config = self.config(row)
+        ev_spread = tuple(config['ev_spread'][stat] for stat in STAT_NAMES)
+        return (f"{config['item']}|{config['ability']}|{config['nature']}|{ev_spread}|"
+                f"{tuple(config['moves'])}|{config['tera_type']}")
+
+
+class TeamTable:
+    """
+    Config tables of several species stacked into one set of rows, so a whole
+    team is scored in a single vectorised pass. Each species keeps its own
+    vocabularies, offset into one shared index space per component.
+    Species with revealed moves are rescored on their own table.
+    """
+
+    def __init__(self, tables: List[ConfigTable]):
+        self.tables = tables
+        segments = np.repeat(np.arange(len(tables)), [len(table.counts) for table in tables])
+        self.base_probs = np.concatenate([table.counts / table.total for table in tables])
+
+        self.columns = {}
+        self.vocab_offsets = {}
+        for component in ConfigTable.COMPONENTS:
+            offsets = np.concatenate([[0], np.cumsum([len(table.vocab[component]) for table in tables])]).astype(np.int64)
+            local = np.concatenate([table.move_slots if component == 'moves' else getattr(table, component)
+                                    for table in tables])
+            shift = offsets[:-1][segments]
+            self.columns[component] = np.where(local >= 0, local + (shift[:, None] if local.ndim == 2 else shift), -1)
+            self.vocab_offsets[component] = offsets
+
+        # Sums with nothing revealed (e.g. at team preview) only depend on the counts: compute them once
+        self._base_sums = self._sums(self.base_probs)
+
+    def component_sums(self, revealed_moves: List[List[str]]) -> List[Dict[str, List[Tuple[str, float]]]]:
+        """ConfigTable.component_sums of every species, given each species' revealed moves."""
+        # Only species with revealed moves need rescoring; the rest reuse the team-wide pass
+        return [table.component_sums(table.adjusted_probs(moves)) if moves else base_sums
+                for table, moves, base_sums in zip(self.tables, revealed_moves, self._base_sums)]
+
+    def _sums(self, adjusted: np.ndarray) -> List[Dict[str, List[Tuple[str, float]]]]:
+        sums = [{} for _ in self.tables]
+        for component, column in self.columns.items():
+            weights = np.broadcast_to(adjusted[:, None], column.shape) if column.ndim == 2 else adjusted
+            present = column >= 0
+            offsets = self.vocab_offsets[component]
+            totals = np.bincount(column[present], weights=weights[present], minlength=int(offsets[-1]))
+            for idx, table in enumerate(self.tables):
+                species_totals = totals[offsets[idx]:offsets[idx + 1]]
+                sums[idx][component] = [(name, species_totals[i]) for i, name in enumerate(table.vocab_names(component)) if name]
+        return sums
+
+
+class CountMatrixModel:
+    """Integer-indexed NumPy view of a trained BayesianTeamPredictor."""
+
+    def __init__(self, species_names: List[str], species_counts: np.ndarray, teammates: np.ndarray,
+                 log_teammate_given: np.ndarray, total_teams: int, strings: StringTable,
+                 build_config_table: Callable[[str], Optional[ConfigTable]]):
+        self.species_names = species_names
+        self.species_index = {species: idx for idx, species in enumerate(species_names)}
+        self.total_teams = total_teams
+
+        # P(species) numerator
+        self.species_marginal = np.asarray(species_counts, dtype=np.float64)
+        # teammates[a, b] = number of teams where b appears alongside a
+        self.teammates = teammates
+        # log P(teammate | revealed) per revealed species, unseen pairs fall back to UNSEEN_TEAMMATE_PROB
+        self.log_teammate_given = log_teammate_given
+        self.log_marginal = np.log(self.species_marginal / total_teams) if total_teams else self.species_marginal
+
+        self.strings = strings
+        self._config_tables: Dict[str, Optional[ConfigTable]] = {}
+        self._team_tables: Dict[Tuple[str, ...], TeamTable] = {}
+        self._build_config_table = build_config_table
+
+    @classmethod
+    def from_predictor(cls, predictor) -> 'CountMatrixModel':
+        """Compile the Counters of a trained predictor; config tables are compiled on first use."""
+        species_names = list(predictor.species_counts)
+        species_index = {species: idx for idx, species in enumerate(species_names)}
+        species_counts = np.array([predictor.species_counts[s] for s in species_names], dtype=np.int64)
+
+        teammates = np.zeros((len(species_names), len(species_names)), dtype=np.int64)
+        for species, species_teammates in predictor.teammate_counts.items():
+            row = species_index.get(species)
+            if row is None:
+                continue
+            for teammate, count in species_teammates.items():
+                col = species_index.get(teammate)
+                if col is not None:
+                    teammates[row, col] = count
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            conditional = teammates / species_counts[:, None].astype(np.float64)
+        log_teammate_given = np.log(np.where(teammates > 0, conditional, UNSEEN_TEAMMATE_PROB))
+
+        # Configs not restored from a loaded model file yet are read from it (see _restore_counts)
+        source = predictor._config_source
+        strings = source.strings if source is not None else StringTable()
+
+        def build_config_table(species: str) -> Optional[ConfigTable]:
+            with predictor._lock:
+                if source is not None:
+                    return source.config_table(species)
+                if species not in predictor.config_given_species:
+                    return None
+                return ConfigTable.from_config_keys(predictor, predictor.config_given_species[species], strings)
+
+        return cls(species_names, species_counts, teammates, log_teammate_given,
+                   predictor.total_teams, strings, build_config_table)
+
+    @classmethod
+    def load(cls, path: str) -> Tuple['CountMatrixModel', Dict]:
+        """Memory-map a model file written by save(); returns the model and its metadata."""
+        arrays, strings, meta = load_model_file(path)
+        strings = StringTable(strings)
+        species_names = [strings.strings[string_id] for string_id in arrays['species']]
+        species_index = {species: idx for idx, species in enumerate(species_names)}
+        offsets = arrays['config_offsets']
+
+        def build_config_table(species: str) -> Optional[ConfigTable]:
+            idx = species_index.get(species)
+            if idx is None or offsets[idx] == offsets[idx + 1]:
+                return None
+            rows = slice(int(offsets[idx]), int(offsets[idx + 1]))
+            columns = {component: arrays[f'config_{component}'][rows] for component in CONFIG_COLUMNS}
+            return ConfigTable(strings, arrays['config_counts'][rows], columns, arrays['config_moves'][rows],
+                               arrays['config_evs'][rows], arrays['config_parse_errors'][rows])
+
+        model = cls(species_names, arrays['species_counts'], arrays['teammates'], arrays['log_teammate_given'],
+                    meta['total_teams'], strings, build_config_table)
+        return model, meta
+
+    def save(self, path: str, meta: Optional[Dict] = None):
+        """Compile every species' config table and write the model file."""
+        species_ids = np.array([self.strings.intern(species) for species in self.species_names], dtype=np.int32)
+        all_tables = [self.config_table(species) for species in self.species_names]
+        tables = [table for table in all_tables if table is not None]
+        sizes = [len(table.counts) if table is not None else 0 for table in all_tables]
+
+        def stack(values: List[np.ndarray], dtype, row_shape=()) -> np.ndarray:
+            if not values:
+                return np.zeros((0,) + row_shape, dtype=dtype)
+            return np.concatenate(values).astype(dtype)
+
+        global_columns = [table.global_columns() for table in tables]
+        arrays = {
+            'species': species_ids,
+            'species_counts': self.species_marginal.astype(np.int64),
+            'teammates': np.asarray(self.teammates, dtype=np.int32),
+            'log_teammate_given': np.asarray(self.log_teammate_given, dtype=np.float64),
+            'config_offsets': np.concatenate([[0], np.cumsum(sizes, dtype=np.int64)]).astype(np.int64),
+            'config_counts': stack([table.counts for table in tables], np.int64),
+            'config_moves': stack([moves for _, moves in global_columns], np.int32, (4,)),
+            'config_evs': stack([table.evs for table in tables], np.int16, (len(STAT_NAMES),)),
+            'config_parse_errors': stack([table.parse_errors for table in tables], bool),
+        }
+        for component in CONFIG_COLUMNS:
+            arrays[f'config_{component}'] = stack([columns[component] for columns, _ in global_columns], np.int32)
+
+        save_model_file(path, arrays, self.strings.strings, dict(meta or {}, total_teams=self.total_teams))
+
+    def config_table(self, species: str) -> Optional[ConfigTable]:
+        """Compile (once) and return the config table for a species, None if it has no configs."""
+        if species not in self._config_tables:
+            self._config_tables[species] = self._build_config_table(species)
+        return self._config_tables[species]
+
+    def has_configs(self, species: str) -> bool:
+        return self.config_table(species) is not None
+
+    def team_table(self, species_list: List[str]) -> TeamTable:
+        """Stacked config tables of a team (species must have configs); the last few teams are kept."""
+        key = tuple(species_list)
+        table = self._team_tables.get(key)
+        if table is None:
+            if len(self._team_tables) >= 16:
+                self._team_tables.pop(next(iter(self._team_tables)))
+            table = TeamTable([self.config_table(species) for species in species_list])
+            self._team_tables[key] = table
+        return table
+
+    def predict_unrevealed_pokemon(self, revealed_species: List[str], max_predictions: int = 5) -> List[Tuple[str, float]]:
+        """Vectorised P(species | revealed teammates) as a sum of log-probabilities."""
+        log_probs = self.log_marginal.copy()
+        unknown = 0
+        for revealed in revealed_species:
+            row = self.species_index.get(revealed)
+            if row is None or self.species_marginal[row] <= 0:
+                unknown += 1
+            else:
+                log_probs += self.log_teammate_given[row]
+        log_probs += unknown * np.log(UNSEEN_TEAMMATE_PROB)
+
+        excluded = np.zeros(len(log_probs), dtype=bool)
+        for revealed in revealed_species:
+            row = self.species_index.get(revealed)
+            if row is not None:
+                excluded[row] = True
+
+        candidates = np.flatnonzero(~excluded)
+        order = candidates[np.argsort(-log_probs[candidates], kind='stable')][:max_predictions]
+        return [(self.species_names[idx], float(np.exp(log_probs[idx]))) for idx in order]
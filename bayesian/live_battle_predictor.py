@@ -297,6 +297,12 @@ class LiveBattlePredictor(AbyssalPlayer):
             return
             
         try:
+            # Detailed probability breakdown for the whole team in one batched query
+            team_probabilities = self.predictor.predict_team(
+                opponent_pokemon_normalized,
+                {self.normalize_pokemon_name(species): list(revealed_moves[species]) for species in opponent_pokemon_raw}
+            )
+            
             for i, species_raw in enumerate(opponent_pokemon_raw, 1):
                 species_norm = self.normalize_pokemon_name(species_raw)
                 observed_moves = list(revealed_moves[species_raw])
@@ -306,20 +312,15 @@ class LiveBattlePredictor(AbyssalPlayer):
                 if len(observed_moves) >= 4 and known_item and known_item != "unknown":
                     continue
                 
+                probabilities = team_probabilities[species_norm]
+                
                 # Enhanced prediction display
-                move_predictions = [(move, prob) for move, prob in probabilities.get('moves', {}).items() if prob > 0.1]
-                if move_predictions:
+                move_predictions = [(move, prob) for move, prob in probabilities.get('moves', []) if prob > 0.1]
+                if VISUAL_EFFECTS and move_predictions:
                     print(visual.prediction_display(species_raw, move_predictions[:5]))
                 else:
                     print(f"\n   {i}. [TARGET] {species_raw}:")
                 
-                # Get detailed probability breakdown for all components
-                probabilities = self.predictor.predict_component_probabilities(
-                    species_norm, 
-                    teammates=opponent_pokemon_normalized,
-                    observed_moves=observed_moves
-                )
-                
                 if 'error' in probabilities:
                     print(f"      [ERROR] No prediction data available")
                     continue
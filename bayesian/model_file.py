@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Compact on-disk format for the Bayesian Team Predictor.
+
+A model file is a single binary blob that can be memory-mapped read-only, so
+every process on a host that loads the same model shares its pages:
+
+    MAGIC | uint64 header length | JSON header | padding | arrays...
+
+The JSON header records dtype, shape and offset of each array plus free-form
+metadata. Strings are interned into one UTF-8 blob with an int64 offsets array;
+every other table refers to strings by index. Array offsets are 64-byte aligned.
+"""
+
+import json
+import os
+import struct
+import tempfile
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+MAGIC = b'PKCHMDL1'
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def save_model_file(path: str, arrays: Dict[str, np.ndarray], strings: List[str], meta: Dict):
+    """Write arrays and the string table to `path` atomically (temp file + rename)."""
+    encoded = [value.encode('utf-8') for value in strings]
+    arrays = dict(arrays)
+    arrays['string_offsets'] = np.concatenate([[0], np.cumsum([len(value) for value in encoded])]).astype(np.int64)
+    arrays['string_data'] = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+
+    # Offsets are relative to the end of the (padded) header
+    layout = {}
+    offset = 0
+    for name in sorted(arrays):
+        array = np.ascontiguousarray(arrays[name])
+        layout[name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+        offset = _align(offset + array.nbytes)
+    header = json.dumps({'version': FORMAT_VERSION, 'meta': meta, 'arrays': layout}, sort_keys=True).encode('utf-8')
+    data_start = _align(len(MAGIC) + 8 + len(header))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.model-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(MAGIC + struct.pack('<Q', len(header)) + header)
+            for name in sorted(arrays):
+                f.seek(data_start + layout[name]['offset'])
+                f.write(np.ascontiguousarray(arrays[name]).tobytes())
+            f.truncate(data_start + offset)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_model_file(path: str) -> Tuple[Dict[str, np.ndarray], List[str], Dict]:
+    """Memory-map a model file; returned arrays are read-only views of the mapped pages."""
+    buffer = np.memmap(path, dtype=np.uint8, mode='r')
+    if bytes(buffer[:len(MAGIC)]) != MAGIC:
+        raise ValueError(f"{path} is not a predictor model file")
+    (header_len,) = struct.unpack('<Q', bytes(buffer[len(MAGIC):len(MAGIC) + 8]))
+    header_start = len(MAGIC) + 8
+    header = json.loads(bytes(buffer[header_start:header_start + header_len]).decode('utf-8'))
+    if header['version'] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported model file version {header['version']} in {path}")
+    data_start = _align(header_start + header_len)
+
+    arrays = {}
+    for name, spec in header['arrays'].items():
+        dtype = np.dtype(spec['dtype'])
+        count = int(np.prod(spec['shape'], dtype=np.int64))
+        start = data_start + spec['offset']
+        arrays[name] = buffer[start:start + count * dtype.itemsize].view(dtype).reshape(spec['shape'])
+
+    offsets = arrays.pop('string_offsets')
+    blob = bytes(arrays.pop('string_data'))
+    strings = [blob[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(len(offsets) - 1)]
+    return arrays, strings, header['meta']
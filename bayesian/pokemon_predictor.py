@@ -7,14 +7,74 @@ during battles or team analysis.
 """
 
 import os
-from typing import List, Dict, Tuple, Optional
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, List, Dict, Tuple, Optional
 from bayesian.team_predictor import BayesianTeamPredictor
+from poke_env.data import to_id_str
+
+
+class PredictionCache:
+    """LRU cache of prediction results with hit-rate statistics.
+
+    Safe to share between decision threads and the event loop: lookups, inserts,
+    evictions and clears hold a lock, while results are computed outside it.
+    """
+    
+    def __init__(self, max_size: int = 4096):
+        self._cache: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._max_size = max_size
+        self._hits = 0
+        self._misses = 0
+        # Bumped by clear(), so that results computed before it are not stored after it
+        self._generation = 0
+        self._lock = threading.Lock()
+    
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached result for `key`, computing and storing it on a miss."""
+        with self._lock:
+            if key in self._cache:
+                self._hits += 1
+                self._cache.move_to_end(key)
+                return self._cache[key]
+            self._misses += 1
+            generation = self._generation
+        
+        result = compute()
+        if self._max_size > 0:
+            with self._lock:
+                if generation == self._generation:
+                    self._cache[key] = result
+                    if len(self._cache) > self._max_size:
+                        self._cache.popitem(last=False)
+        return result
+    
+    def clear(self):
+        """Drop all cached results (e.g. after the model changes) and reset statistics."""
+        with self._lock:
+            self._cache.clear()
+            self._hits = 0
+            self._misses = 0
+            self._generation += 1
+    
+    def get_stats(self) -> Dict[str, float]:
+        """Get cache statistics: hits, misses, hit_rate, size and max_size."""
+        with self._lock:
+            hits, misses, size = self._hits, self._misses, len(self._cache)
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / total if total > 0 else 0.0,
+            'size': size,
+            'max_size': self._max_size,
+        }
 
 
 class PokemonPredictor:
     """Production interface for Pokemon team predictions."""
     
-    def __init__(self, cache_dir: str = None, battle_format: str = "gen9ou"):
+    def __init__(self, cache_dir: str = None, battle_format: str = "gen9ou", cache_size: int = 4096):
         """
         Initialize the predictor and load the trained model.
         
@@ -22,6 +82,7 @@ class PokemonPredictor:
             cache_dir: Directory containing the trained model cache.
                       Defaults to METAMON_CACHE_DIR environment variable.
             battle_format: Battle format for format-specific predictions.
+            cache_size: Number of prediction results kept in the LRU cache (0 disables it).
         """
         if cache_dir:
             os.environ['METAMON_CACHE_DIR'] = cache_dir
@@ -33,6 +94,10 @@ class PokemonPredictor:
             cache_file = f"{battle_format}_team_predictor_full.pkl"
             
         self.predictor = BayesianTeamPredictor(cache_file=cache_file, battle_format=battle_format)
+        # Results depend only on (species, teammates, revealed moves), which change a few times per battle
+        # while the same query is repeated at every search node. Cached results are shared: treat them as read-only.
+        self.cache = PredictionCache(cache_size)
+        self._species_ids: Dict[str, str] = {}
         self._load_model()
     
     def _load_model(self):
@@ -56,7 +121,9 @@ class PokemonPredictor:
         Returns:
             List of (species, probability) tuples, sorted by probability descending
         """
-        return self.predictor.predict_unrevealed_pokemon(revealed_pokemon, max_predictions)
+        key = ('teammates', frozenset(revealed_pokemon), max_predictions)
+        return self.cache.get_or_compute(
+            key, lambda: self.predictor.predict_unrevealed_pokemon(revealed_pokemon, max_predictions))
     
     def predict_moveset(self, species: str, teammates: List[str] = None, 
                        observed_moves: List[str] = None) -> Dict:
@@ -71,7 +138,9 @@ class PokemonPredictor:
         Returns:
             Dictionary containing predicted configuration with confidence score
         """
-        return self.predictor.predict_pokemon_config(species, teammates, observed_moves)
+        key = ('moveset', species, frozenset(teammates or ()), frozenset(observed_moves or ()))
+        return self.cache.get_or_compute(
+            key, lambda: self.predictor.predict_pokemon_config(species, teammates, observed_moves))
     
     def predict_component_probabilities(self, species: str, teammates: List[str] = None, 
                                       observed_moves: List[str] = None) -> Dict:
@@ -86,7 +155,66 @@ class PokemonPredictor:
         Returns:
             Dictionary containing probability distributions for each component
         """
-        return self.predictor.predict_component_probabilities(species, teammates, observed_moves)
+        key = ('components', species, frozenset(teammates or ()), frozenset(observed_moves or ()))
+        return self.cache.get_or_compute(
+            key, lambda: self.predictor.predict_component_probabilities(species, teammates, observed_moves))
+    
+    def predict_team(self, species_list: List[str], observed_moves: Dict[str, List[str]] = None) -> Dict[str, Dict]:
+        """
+        Predict component probabilities for every Pokemon of a known team in one pass.
+        
+        Args:
+            species_list: The opponent's team (e.g. all six at team preview)
+            observed_moves: Moves already observed, per species
+            
+        Returns:
+            Dictionary mapping each species to its component probabilities
+            (as returned by predict_component_probabilities)
+        """
+        observed_moves = observed_moves or {}
+        key = ('team', tuple(species_list),
+               frozenset((species, frozenset(moves)) for species, moves in observed_moves.items() if moves))
+        return self.cache.get_or_compute(key, lambda: self.predictor.predict_team(species_list, observed_moves))
+    
+    def cache_stats(self) -> Dict[str, float]:
+        """Hit-rate statistics of the prediction cache."""
+        return self.cache.get_stats()
+    
+    def update_from_battle(self, battle, min_team_size: int = 6) -> bool:
+        """
+        Fold the opponent team of a finished battle into the model.
+        
+        Natures and EVs are never revealed in battle, so only the team composition
+        (P(species) and teammate counts) is learned; sets need complete teams, see
+        BayesianTeamPredictor.update_from_teams.
+        
+        Args:
+            battle: A finished battle
+            min_team_size: Skip battles where fewer opponent Pokemon were revealed,
+                           so partially seen teams do not skew the teammate counts
+            
+        Returns:
+            Whether the team was added
+        """
+        species = [self._model_species_name(mon) for mon in battle.opponent_team.values() if mon and mon.species]
+        if len(species) < min_team_size:
+            return False
+        self.predictor.update_from_species([species])
+        self.cache.clear()
+        return True
+    
+    def save_snapshot(self):
+        """Write the updated model to its model file."""
+        self.predictor.save_snapshot()
+    
+    def _model_species_name(self, mon) -> str:
+        """Name the model uses for a battle Pokemon (training data uses display names)."""
+        if len(self._species_ids) != len(self.predictor.species_counts):
+            self._species_ids = {to_id_str(name): name for name in self.predictor.species_counts}
+        name = self._species_ids.get(mon.species)
+        if name is None:
+            name = mon._data.pokedex.get(mon.species, {}).get('name', mon.species)
+        return name
     
     def get_usage_stats(self, top_n: int = 20) -> List[Tuple[str, int, float]]:
         """
@@ -1,19 +1,29 @@
 # Format-aware singleton module for PokemonPredictor
 # Maintains separate instances for different battle formats
 
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
 _predictor_instances = {}
+# Held while a model loads, so a battle asking for the predictor during the
+# background warm-up waits for that load instead of starting a second one
+_predictor_lock = threading.Lock()
+# Online updates run one at a time on this thread: loading and updating a model
+# can take seconds, which players must not spend on their event loop
+_update_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="team-predictor-update")
 
 def get_pokemon_predictor(battle_format: str = "gen9ou"):
     """Get the PokemonPredictor instance for the specified format."""
     global _predictor_instances
-    if battle_format not in _predictor_instances:
-        from bayesian.pokemon_predictor import PokemonPredictor
-        
-        # Create format-specific predictor with appropriate cache file
-        if "vgc" in battle_format.lower():
-            cache_file = f"{battle_format}_team_predictor_full.pkl"
-        else:
-            cache_file = f"{battle_format}_team_predictor_full.pkl"
-            
-        _predictor_instances[battle_format] = PokemonPredictor(battle_format=battle_format)
-    return _predictor_instances[battle_format]
\ No newline at end of file
+    if battle_format in _predictor_instances:
+        return _predictor_instances[battle_format]
+    with _predictor_lock:
+        if battle_format not in _predictor_instances:
+            from bayesian.pokemon_predictor import PokemonPredictor
+
+            _predictor_instances[battle_format] = PokemonPredictor(battle_format=battle_format)
+    return _predictor_instances[battle_format]
+
+def update_from_battle_in_background(battle_format: str, battle) -> Future:
+    """Queue folding a finished battle into the format's predictor (see PokemonPredictor.update_from_battle)."""
+    return _update_executor.submit(lambda: get_pokemon_predictor(battle_format).update_from_battle(battle))
@@ -8,12 +8,19 @@ based on observed information using Naive Bayes approach trained on ~1M teams.
 
 import os
 import re
+import time
 import pickle
-from typing import Dict, List, Tuple, Optional
+import threading
+import multiprocessing
+from typing import Dict, Iterable, List, Tuple, Optional
 from collections import defaultdict, Counter
 from dataclasses import dataclass
 from tqdm import tqdm
 
+import numpy as np
+
+from bayesian.count_matrix import CountMatrixModel
+from bayesian.teammate_table import TeammateConfigTable, raw_entries
 from poke_env.player.team_util import get_metamon_teams
 
 
@@ -158,9 +165,19 @@ class TeamParser:
 class BayesianTeamPredictor:
     """Naive Bayes predictor for Pokemon team configurations."""
     
-    def __init__(self, cache_file: str = "gen9ou_team_predictor_full.pkl", battle_format: str = "gen9ou"):
+    def __init__(self, cache_file: str = "gen9ou_team_predictor_full.pkl", battle_format: str = "gen9ou",
+                 use_count_matrix: bool = True, snapshot_every: int = 0):
         self.cache_file = cache_file
         self.battle_format = battle_format
+        # Predict from compiled NumPy count matrices instead of looping over the Counters
+        self.use_count_matrix = use_count_matrix
+        self._count_matrix = None
+        # Online updates: write a model file snapshot every `snapshot_every` folded teams (0 = only on request)
+        self.snapshot_every = snapshot_every
+        self._teams_since_snapshot = 0
+        self._snapshot_thread = None
+        # Guards the Counters against online updates while they are compiled or copied
+        self._lock = threading.RLock()
         self.parser = TeamParser()
         
         # Set up cache directory
@@ -169,6 +186,8 @@ class BayesianTeamPredictor:
         
         # Full path for cache file
         self.cache_path = os.path.join(self.cache_dir, cache_file)
+        # Compact memory-mapped model file (see bayesian/model_file.py); supersedes the pickle cache
+        self.model_path = os.path.splitext(self.cache_path)[0] + '.model'
         
         # Probability tables
         self.species_counts = Counter()  # P(species)
@@ -180,46 +199,118 @@ class BayesianTeamPredictor:
         
         self.total_teams = 0
         self.is_trained = False
+        # False when only the model file was loaded: the Counters above are then empty
+        self._has_counts = True
+        # Model files and pickle caches do not store config_given_teammates
+        self._has_teammate_configs = True
+        # Loaded model whose configs are not in config_given_species yet (see _restore_counts)
+        self._config_source = None
     
-    def load_and_train(self, force_retrain: bool = False):
-        """Load cached model or train from scratch."""
+    def load_and_train(self, force_retrain: bool = False, workers: Optional[int] = None):
+        """Load cached model or train from scratch (on `workers` processes, default: all CPUs)."""
+        if not force_retrain and os.path.exists(self.model_path):
+            print(f"Loading model from {self.model_path}...")
+            self._load_model_file()
+            self.is_trained = True
+            return
+        
         if not force_retrain and os.path.exists(self.cache_path):
-            print(f"Loading cached model from {self.cache_path}...")
+            # Convert a legacy pickle cache once, then serve from the model file
+            print(f"Converting cached model {self.cache_path} to {self.model_path}...")
             self._load_cache()
+            self._save_model_file()
+            self._load_model_file()
             self.is_trained = True
             return
         
         print("Training new model from full team dataset...")
         print("This may take several minutes for ~1M teams...")
-        self._train_from_data()
-        self._save_cache()
+        self._train_from_data(workers=workers)
+        self._save_model_file()
+        self._has_counts = True
+        self._has_teammate_configs = True
         self.is_trained = True
     
-    def _train_from_data(self):
+    def _train_from_data(self, workers: Optional[int] = None):
         """Train the model on team data."""
         # Get team data
         team_set = get_metamon_teams(self.battle_format, "modern_replays")
         team_files = team_set.team_files
         
-        print(f"Training on {len(team_files)} teams...")
+        self._train_on_files(team_files, workers=workers)
+    
+    def _train_on_files(self, team_files: List[str], workers: Optional[int] = None, shard_size: int = 2000):
+        """
+        Count team files, map-reduce style when workers > 1.
         
-        for file_path in tqdm(team_files, desc="Processing teams"):
-            try:
-                team_data = self.parser.parse_team_file(file_path)
-                self._update_counts(team_data)
-                self.total_teams += 1
-                
-                # Progress reporting for large datasets
-                if self.total_teams % 10000 == 0:
-                    print(f"Processed {self.total_teams} teams...")
-                    
-            except Exception as e:
-                print(f"Error processing {file_path}: {e}")
-                continue
+        Shards are contiguous runs of files and are merged in file order, so the
+        counts (including dict insertion order, hence the cache bytes) match the
+        serial trainer.
+        """
+        workers = workers or os.cpu_count() or 1
+        n_shards = (len(team_files) + shard_size - 1) // shard_size
         
-        print(f"Trained on {self.total_teams} teams")
+        print(f"Training on {len(team_files)} teams...")
+        start_time = time.perf_counter()
+        
+        if workers <= 1 or n_shards <= 1:
+            for file_path in tqdm(team_files, desc="Processing teams"):
+                self._count_team_file(file_path)
+        else:
+            shards = [team_files[i:i + shard_size] for i in range(0, len(team_files), shard_size)]
+            print(f"Counting {len(shards)} shards on {workers} worker processes...")
+            with multiprocessing.Pool(processes=min(workers, len(shards))) as pool:
+                progress = tqdm(total=len(team_files), desc="Processing teams", unit="team")
+                for shard_counts in pool.imap(_count_team_shard, [(self.battle_format, shard) for shard in shards]):
+                    self._merge_counts(shard_counts)
+                    progress.update(shard_counts['files'])
+                    progress.set_postfix(teams_per_s=f"{self.total_teams / (time.perf_counter() - start_time):.0f}")
+                progress.close()
+        
+        elapsed = time.perf_counter() - start_time
+        print(f"Trained on {self.total_teams} teams in {elapsed:.1f}s "
+              f"({self.total_teams / max(elapsed, 1e-9):.0f} teams/s)")
         print(f"Found {len(self.species_counts)} unique species")
     
+    def _count_team_file(self, file_path: str):
+        """Parse one team file and add it to the counts."""
+        try:
+            team_data = self.parser.parse_team_file(file_path)
+            self._update_counts(team_data)
+            self.total_teams += 1
+            
+            # Progress reporting for large datasets
+            if self.total_teams % 10000 == 0:
+                print(f"Processed {self.total_teams} teams...")
+                
+        except Exception as e:
+            print(f"Error processing {file_path}: {e}")
+    
+    def _count_tables(self) -> Dict:
+        """Plain-dict (picklable) copy of the count tables, keeping insertion order."""
+        return {
+            'species_counts': dict(self.species_counts),
+            'teammate_counts': {k: dict(v) for k, v in self.teammate_counts.items()},
+            'config_given_species': {k: dict(v) for k, v in self.config_given_species.items()},
+            'config_given_teammates': {k: {k2: dict(v2) for k2, v2 in v.items()}
+                                       for k, v in self.config_given_teammates.items()},
+            'move_given_species': {k: dict(v) for k, v in self.move_given_species.items()},
+            'move_pairs': {k: dict(v) for k, v in self.move_pairs.items()},
+            'total_teams': self.total_teams,
+        }
+    
+    def _merge_counts(self, counts: Dict):
+        """Add the count tables of a later shard (see _count_tables)."""
+        self.species_counts.update(counts['species_counts'])
+        for table in ['teammate_counts', 'config_given_species', 'move_given_species', 'move_pairs']:
+            target = getattr(self, table)
+            for key, counter in counts[table].items():
+                target[key].update(counter)
+        for teammate_key, species_configs in counts['config_given_teammates'].items():
+            for species, counter in species_configs.items():
+                self.config_given_teammates[teammate_key][species].update(counter)
+        self.total_teams += counts['total_teams']
+    
     def _update_counts(self, team_data: TeamData):
         """Update probability counts from a single team."""
         species_list = team_data.get_species_list()
@@ -257,6 +348,117 @@ class BayesianTeamPredictor:
                         if other_move and other_move != move:
                             self.move_pairs[(species, move)][other_move] += 1
     
+    def update_from_teams(self, teams: Iterable[TeamData]) -> int:
+        """
+        Fold complete teams (full sets, e.g. from team sheets or replays) into the counts.
+        Returns the number of teams added.
+        """
+        with self._lock:
+            self._restore_counts()
+            n_teams = 0
+            for team_data in teams:
+                self._update_counts(team_data)
+                self.total_teams += 1
+                n_teams += 1
+            self._updated(n_teams)
+        return n_teams
+    
+    def update_from_species(self, teams: Iterable[List[str]]) -> int:
+        """
+        Fold team compositions whose sets are unknown (e.g. opponents of finished battles).
+        Only P(species) and the teammate counts change. Returns the number of teams added.
+        """
+        with self._lock:
+            self._restore_counts(configs=False)
+            n_teams = 0
+            for species_list in teams:
+                for i, species in enumerate(species_list):
+                    self.species_counts[species] += 1
+                    for j, teammate in enumerate(species_list):
+                        if j != i:
+                            self.teammate_counts[species][teammate] += 1
+                self.total_teams += 1
+                n_teams += 1
+            self._updated(n_teams)
+        return n_teams
+    
+    def _updated(self, n_teams: int):
+        """Invalidate the compiled model after an online update and snapshot if due."""
+        if not n_teams:
+            return
+        self._count_matrix = None
+        self.is_trained = True
+        self._teams_since_snapshot += n_teams
+        if self.snapshot_every and self._teams_since_snapshot >= self.snapshot_every:
+            if self._snapshot_thread is None or not self._snapshot_thread.is_alive():
+                self._snapshot_thread = threading.Thread(target=self.save_snapshot, daemon=True)
+                self._snapshot_thread.start()
+    
+    def save_snapshot(self):
+        """Atomically write the current counts to the model file (safe to call while updates continue)."""
+        with self._lock:
+            self._restore_counts(configs=False)
+            self._teams_since_snapshot = 0
+            # Configs unchanged since the model file was loaded: its config tables are written as is
+            model = self.count_matrix if self._config_source is not None else None
+            counts = self._count_tables() if model is None else None
+        if model is not None:
+            model.save(self.model_path, meta={'battle_format': self.battle_format})
+            return
+        # Compile from a private copy so updates are not blocked while the file is written
+        snapshot = BayesianTeamPredictor(cache_file=self.cache_file, battle_format=self.battle_format)
+        snapshot._merge_counts(counts)
+        snapshot.model_path = self.model_path
+        snapshot._save_model_file()
+    
+    def _restore_counts(self, configs: bool = True):
+        """
+        Rebuild the Counters from a loaded model file so they can be updated.
+        
+        Species-only updates pass configs=False: the config Counters, the bulk of the model,
+        are then only rebuilt when first needed, and compiled models keep reading the configs
+        from the loaded model meanwhile.
+        """
+        if not self._has_counts:
+            model = self.count_matrix
+            self.species_counts = Counter()
+            self.teammate_counts = defaultdict(Counter)
+            self.config_given_species = defaultdict(Counter)
+            for species, count in zip(model.species_names, model.species_marginal.astype(int).tolist()):
+                self.species_counts[species] = count
+            for row, col in zip(*np.nonzero(model.teammates)):
+                self.teammate_counts[model.species_names[row]][model.species_names[col]] = int(model.teammates[row, col])
+            self._config_source = model
+            self._has_counts = True
+        if configs and self._config_source is not None:
+            self._restore_config_counts()
+    
+    def _restore_config_counts(self):
+        """Rebuild config_given_species from the loaded model it was left in."""
+        model, self._config_source = self._config_source, None
+        for species in model.species_names:
+            table = model.config_table(species)
+            if table is None:
+                continue
+            for row, count in enumerate(table.counts.astype(int).tolist()):
+                config_key = table.config_key(row)
+                if config_key is not None:
+                    self.config_given_species[species][config_key] = count
+    
+    def compact_teammate_table(self, min_support: int = 1, pairwise: bool = True) -> TeammateConfigTable:
+        """
+        Compact config_given_teammates into an integer-keyed TeammateConfigTable, conditioned on
+        single teammates (pairwise) or the whole team, dropping counts below `min_support`.
+        
+        Report-only (see teammate_table_report.py): predictions do not read the table, and the
+        raw counts are kept. Needs the training counts, which model files do not store.
+        """
+        with self._lock:
+            if not self._has_teammate_configs:
+                raise RuntimeError("Teammate config counts are not stored in model files; compact a freshly trained predictor")
+            return TeammateConfigTable.from_counts(raw_entries(self.config_given_teammates), list(self.species_counts),
+                                                   min_support=min_support, pairwise=pairwise)
+    
     def _pokemon_to_config_key(self, pokemon: PokemonConfig) -> str:
         """Convert Pokemon config to a key for counting."""
         # Debug and ensure EVs is a dictionary
@@ -269,6 +471,27 @@ class BayesianTeamPredictor:
         
         return f"{pokemon.item}|{pokemon.ability}|{pokemon.nature}|{ev_spread}|{moves_tuple}|{pokemon.tera_type}"
     
+    @property
+    def count_matrix(self) -> CountMatrixModel:
+        """NumPy count matrices compiled from the trained Counters (built on first use)."""
+        with self._lock:
+            if self._count_matrix is None:
+                self._count_matrix = CountMatrixModel.from_predictor(self)
+            return self._count_matrix
+    
+    def _has_configs(self, species: str) -> bool:
+        if self.use_count_matrix:
+            return self.count_matrix.has_configs(species)
+        self._require_counts()
+        return species in self.config_given_species
+    
+    def _require_counts(self):
+        if not self._has_counts:
+            raise RuntimeError("Counter backend needs the training counts; a model file only supports use_count_matrix=True")
+        if self._config_source is not None:
+            with self._lock:
+                self._restore_counts()
+    
     def predict_unrevealed_pokemon(self, revealed_species: List[str], max_predictions: int = 5) -> List[Tuple[str, float]]:
         """Predict most likely unrevealed team members."""
         if not self.is_trained:
@@ -277,6 +500,10 @@ class BayesianTeamPredictor:
         if self.total_teams == 0:
             return []  # No training data
         
+        if self.use_count_matrix:
+            return self.count_matrix.predict_unrevealed_pokemon(revealed_species, max_predictions)
+        self._require_counts()
+        
         # Calculate P(species | revealed_teammates)
         species_probs = {}
         
@@ -314,9 +541,19 @@ class BayesianTeamPredictor:
         revealed_moves = revealed_moves or []
         
         # Get most common configs for this species
-        if species not in self.config_given_species:
+        if not self._has_configs(species):
             return {"error": f"No data for species {species}"}
         
+        if self.use_count_matrix:
+            table = self.count_matrix.config_table(species)
+            adjusted_probs = table.adjusted_probs(revealed_moves)
+            best_row = int(np.argmax(adjusted_probs))
+            parsed_config = table.config(best_row)
+            parsed_config['probability'] = float(adjusted_probs[best_row])
+            parsed_config['species'] = species
+            return parsed_config
+        self._require_counts()
+        
         configs = self.config_given_species[species]
         total_configs = sum(configs.values())
         
@@ -352,9 +589,90 @@ class BayesianTeamPredictor:
         
         revealed_moves = revealed_moves or []
         
-        if species not in self.config_given_species:
+        if not self._has_configs(species):
             return {"error": f"No data for species {species}"}
         
+        if self.use_count_matrix:
+            table = self.count_matrix.config_table(species)
+            component_sums = table.component_sums(table.adjusted_probs(revealed_moves))
+            move_probs, item_probs, nature_probs, ability_probs, ev_spread_probs = (
+                {value: float(prob) for value, prob in component_sums[component]}
+                for component in ['moves', 'items', 'natures', 'abilities', 'ev_spreads']
+            )
+        else:
+            self._require_counts()
+            move_probs, item_probs, nature_probs, ability_probs, ev_spread_probs = self._component_sums(species, revealed_moves)
+        
+        return self._component_result(species, revealed_moves, move_probs, item_probs, nature_probs,
+                                      ability_probs, ev_spread_probs)
+    
+    def predict_team(self, species_list: List[str], revealed: Dict[str, List[str]] = None) -> Dict[str, Dict]:
+        """
+        Component probabilities for a whole known team (e.g. at team preview) in one pass.
+        
+        Args:
+            species_list: The team's species
+            revealed: Revealed moves per species
+            
+        Returns:
+            Dictionary mapping each species to what predict_component_probabilities returns for it
+        """
+        if not self.is_trained:
+            raise RuntimeError("Model not trained. Call load_and_train() first.")
+        
+        revealed = revealed or {}
+        batched = [species for species in dict.fromkeys(species_list) if self.use_count_matrix and self._has_configs(species)]
+        results = {}
+        if batched:
+            team_table = self.count_matrix.team_table(batched)
+            all_sums = team_table.component_sums([revealed.get(species) or [] for species in batched])
+            for species, component_sums in zip(batched, all_sums):
+                results[species] = self._component_result(species, revealed.get(species) or [], *(
+                    {value: float(prob) for value, prob in component_sums[component]}
+                    for component in ['moves', 'items', 'natures', 'abilities', 'ev_spreads']
+                ))
+        for species in species_list:
+            if species not in results:
+                teammates = [other for other in species_list if other != species]
+                results[species] = self.predict_component_probabilities(species, teammates, revealed.get(species))
+        return results
+    
+    def _component_result(self, species: str, revealed_moves: List[str], move_probs: Dict, item_probs: Dict,
+                          nature_probs: Dict, ability_probs: Dict, ev_spread_probs: Dict) -> Dict:
+        """Normalise and rank the component sums of a species."""
+        # Handle confirmed moves specially - they should have 100% probability
+        def normalize_and_sort_with_confirmed(prob_dict, confirmed_items=None):
+            confirmed_items = confirmed_items or []
+            total = sum(prob_dict.values()) if prob_dict else 1
+            
+            # Set confirmed items to 100% and normalize others
+            normalized = {}
+            for item, prob in prob_dict.items():
+                if item in confirmed_items:
+                    normalized[item] = 1.0  # 100% for confirmed items
+                else:
+                    normalized[item] = prob / total
+            
+            return sorted(normalized.items(), key=lambda x: x[1], reverse=True)
+        
+        # Regular normalize and sort for non-move components
+        def normalize_and_sort(prob_dict):
+            total = sum(prob_dict.values()) if prob_dict else 1
+            normalized = {k: v/total for k, v in prob_dict.items()}
+            return sorted(normalized.items(), key=lambda x: x[1], reverse=True)
+        
+        return {
+            'species': species,
+            'moves': normalize_and_sort_with_confirmed(move_probs, revealed_moves),
+            'items': normalize_and_sort(item_probs),
+            'natures': normalize_and_sort(nature_probs),
+            'abilities': normalize_and_sort(ability_probs),
+            'ev_spreads': normalize_and_sort(ev_spread_probs),
+            'revealed_moves': revealed_moves
+        }
+    
+    def _component_sums(self, species: str, revealed_moves: List[str]) -> Tuple[Dict, Dict, Dict, Dict, Dict]:
+        """Unnormalised component probabilities by looping over the config Counter."""
         configs = self.config_given_species[species]
         total_configs = sum(configs.values())
         
@@ -404,36 +722,7 @@ class BayesianTeamPredictor:
                     if ev_key:
                         ev_spread_probs[ev_key] = ev_spread_probs.get(ev_key, 0) + adjusted_prob
         
-        # Handle confirmed moves specially - they should have 100% probability
-        def normalize_and_sort_with_confirmed(prob_dict, confirmed_items=None):
-            confirmed_items = confirmed_items or []
-            total = sum(prob_dict.values()) if prob_dict else 1
-            
-            # Set confirmed items to 100% and normalize others
-            normalized = {}
-            for item, prob in prob_dict.items():
-                if item in confirmed_items:
-                    normalized[item] = 1.0  # 100% for confirmed items
-                else:
-                    normalized[item] = prob / total
-            
-            return sorted(normalized.items(), key=lambda x: x[1], reverse=True)
-        
-        # Regular normalize and sort for non-move components
-        def normalize_and_sort(prob_dict):
-            total = sum(prob_dict.values()) if prob_dict else 1
-            normalized = {k: v/total for k, v in prob_dict.items()}
-            return sorted(normalized.items(), key=lambda x: x[1], reverse=True)
-        
-        return {
-            'species': species,
-            'moves': normalize_and_sort_with_confirmed(move_probs, revealed_moves),
-            'items': normalize_and_sort(item_probs),
-            'natures': normalize_and_sort(nature_probs),
-            'abilities': normalize_and_sort(ability_probs),
-            'ev_spreads': normalize_and_sort(ev_spread_probs),
-            'revealed_moves': revealed_moves
-        }
+        return move_probs, item_probs, nature_probs, ability_probs, ev_spread_probs
     
     def _summarize_ev_spread(self, ev_spread: Dict[str, int]) -> str:
         """Create a summary string for EV spread showing main investments."""
@@ -495,25 +784,27 @@ class BayesianTeamPredictor:
             except:
                 return {'raw_config': config_key, 'parse_error': True}
     
-    def _save_cache(self):
-        """Save trained model to cache."""
-        cache_data = {
-            'species_counts': dict(self.species_counts),
-            'teammate_counts': {k: dict(v) for k, v in self.teammate_counts.items()},
-            'config_given_species': {k: dict(v) for k, v in self.config_given_species.items()},
-            'config_given_teammates': {str(k): {k2: dict(v2) for k2, v2 in v.items()} 
-                                     for k, v in self.config_given_teammates.items()},
-            'move_given_species': {k: dict(v) for k, v in self.move_given_species.items()},
-            'move_pairs': {str(k): dict(v) for k, v in self.move_pairs.items()},
-            'total_teams': self.total_teams
-        }
-        
-        with open(self.cache_path, 'wb') as f:
-            pickle.dump(cache_data, f)
-        print(f"Model cached to {self.cache_path}")
+    def _save_model_file(self):
+        """Write the trained model to the compact model file."""
+        self._count_matrix = None
+        self.count_matrix.save(self.model_path, meta={'battle_format': self.battle_format})
+        print(f"Model saved to {self.model_path}")
+    
+    def _load_model_file(self):
+        """Memory-map the model file; predictions then run on the count-matrix backend."""
+        self._count_matrix, meta = CountMatrixModel.load(self.model_path)
+        self.species_counts = Counter(dict(zip(self._count_matrix.species_names,
+                                               self._count_matrix.species_marginal.astype(int).tolist())))
+        self.teammate_counts = defaultdict(Counter)
+        self.config_given_species = defaultdict(Counter)
+        self.total_teams = meta['total_teams']
+        self._has_counts = False
+        self._has_teammate_configs = False
+        self._config_source = None
+        print(f"Loaded model trained on {self.total_teams} teams")
     
     def _load_cache(self):
-        """Load trained model from cache."""
+        """Load trained model from a legacy pickle cache."""
         with open(self.cache_path, 'rb') as f:
             cache_data = pickle.load(f)
         
@@ -528,9 +819,24 @@ class BayesianTeamPredictor:
         
         # Restore other attributes...
         self.total_teams = cache_data['total_teams']
+        self._has_counts = True
+        self._has_teammate_configs = False
+        self._config_source = None
+        self._count_matrix = None
         print(f"Loaded model trained on {self.total_teams} teams")
 
 
+def _count_team_shard(args: Tuple[str, List[str]]) -> Dict:
+    """Pool worker: count one shard of team files into plain dicts."""
+    battle_format, team_files = args
+    predictor = BayesianTeamPredictor(cache_file=f"{battle_format}_shard.pkl", battle_format=battle_format)
+    for file_path in team_files:
+        predictor._count_team_file(file_path)
+    counts = predictor._count_tables()
+    counts['files'] = len(team_files)
+    return counts
+
+
 def main():
     """Test the team predictor."""
     predictor = BayesianTeamPredictor()
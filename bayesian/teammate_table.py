@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Compacted teammate-conditional config counts for the Bayesian Team Predictor.
+
+The raw `config_given_teammates` table is keyed by the sorted tuple of all five
+teammates, so nearly every training team adds keys that are never matched
+exactly again. TeammateConfigTable stores the same counts as sorted
+integer-keyed arrays, optionally conditioned on single teammates instead of
+the whole team (pairwise) and pruned to a minimum support.
+"""
+
+import sys
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+TEAMMATES = 5
+
+
+class TeammateConfigTable:
+    """
+    P(config | species, teammates) counts as parallel arrays sorted by key.
+
+    Pairwise keys encode (species, teammate) as species_id * n_species +
+    teammate_id; team keys encode the species and its sorted teammate IDs + 1,
+    zero-padded to five, in base n_species + 1. Configs are indices into
+    `config_keys`.
+    """
+
+    def __init__(self, species_names: List[str], config_keys: List[str], keys: np.ndarray,
+                 configs: np.ndarray, counts: np.ndarray, pairwise: bool):
+        self.species_names = species_names
+        self.species_index = {species: idx for idx, species in enumerate(species_names)}
+        self.config_keys = config_keys
+        self.config_index = {config_key: idx for idx, config_key in enumerate(config_keys)}
+        self.keys = keys
+        self.configs = configs
+        self.counts = counts
+        self.pairwise = pairwise
+
+    @classmethod
+    def from_counts(cls, entries: Iterable[Tuple[str, Tuple[str, ...], str, int]], species_names: Sequence[str],
+                    min_support: int = 1, pairwise: bool = True) -> 'TeammateConfigTable':
+        """Compact (species, teammates, config key, count) entries, dropping counts below `min_support`."""
+        table = cls(list(species_names), [], np.empty(0, np.int64), np.empty(0, np.int32),
+                    np.empty(0, np.int32), pairwise)
+        n_species = len(table.species_names)
+        if not pairwise and (n_species + 1) ** (TEAMMATES + 1) >= 2 ** 63:
+            raise ValueError(f"Too many species ({n_species}) for integer team keys; use pairwise=True")
+
+        totals = Counter()
+        for species, teammates, config_key, count in entries:
+            config_id = table.config_index.get(config_key)
+            if config_id is None:
+                config_id = table.config_index[config_key] = len(table.config_keys)
+                table.config_keys.append(config_key)
+            for key in table.encode(species, teammates):
+                totals[key, config_id] += count
+
+        kept = [(key, config_id, count) for (key, config_id), count in totals.items() if count >= min_support]
+        kept.sort()
+        if kept:
+            keys, configs, counts = zip(*kept)
+            table.keys = np.array(keys, dtype=np.int64)
+            table.configs = np.array(configs, dtype=np.int32)
+            table.counts = np.array(counts, dtype=np.int32)
+        return table
+
+    def encode(self, species: str, teammates: Iterable[str]) -> List[int]:
+        """Keys to look up for a species and its teammates; team tables skip unknown species and teams over six."""
+        n_species = len(self.species_names)
+        species_id = self.species_index.get(species)
+        teammate_ids = [self.species_index.get(teammate) for teammate in teammates]
+        if species_id is None:
+            return []
+        if self.pairwise:
+            return [species_id * n_species + teammate_id for teammate_id in teammate_ids if teammate_id is not None]
+        if None in teammate_ids or len(teammate_ids) > TEAMMATES:
+            return []
+        key = species_id
+        for digit in [0] * (TEAMMATES - len(teammate_ids)) + sorted(teammate_id + 1 for teammate_id in teammate_ids):
+            key = key * (n_species + 1) + digit
+        return [key]
+
+    def decode(self, key: int) -> Tuple[str, Tuple[str, ...]]:
+        """Species and teammates (sorted by name, like the raw table keys) of a key."""
+        n_species = len(self.species_names)
+        if self.pairwise:
+            return self.species_names[key // n_species], (self.species_names[key % n_species],)
+        teammates = []
+        for _ in range(TEAMMATES):
+            key, digit = divmod(key, n_species + 1)
+            if digit:
+                teammates.append(self.species_names[digit - 1])
+        return self.species_names[key], tuple(sorted(teammates))
+
+    def entries(self) -> Iterator[Tuple[str, Tuple[str, ...], str, int]]:
+        """The stored counts as (species, teammates, config key, count)."""
+        for key, config_id, count in zip(self.keys.tolist(), self.configs.tolist(), self.counts.tolist()):
+            species, teammates = self.decode(key)
+            yield species, teammates, self.config_keys[config_id], count
+
+    def config_counts(self, key: int) -> Dict[str, int]:
+        """Config key -> count stored under one key."""
+        start, end = np.searchsorted(self.keys, [key, key + 1])
+        return {self.config_keys[config_id]: int(count)
+                for config_id, count in zip(self.configs[start:end], self.counts[start:end])}
+
+    def predict_config(self, species: str, teammates: List[str], species_configs: Dict[str, int],
+                       alpha: float = 1.0) -> str:
+        """
+        Most likely config key of a species given its teammates.
+
+        Pairwise tables combine the teammates naive-Bayes style, with
+        P(teammate | config) smoothed by `alpha`; team tables use the exact
+        team counts when the team was seen. Both fall back to `species_configs`
+        (P(config | species) counts), whose order breaks ties.
+        """
+        keys = self.encode(species, teammates)
+        if not self.pairwise:
+            team_counts = self.config_counts(keys[0]) if keys else {}
+            scores = team_counts or species_configs
+            return max(scores, key=scores.get)
+
+        config_keys = list(species_configs)
+        base = np.array([species_configs[config_key] for config_key in config_keys], dtype=np.float64)
+        scores = np.log(base)
+        for key in keys:
+            pair_counts = self.config_counts(key)
+            together = np.array([pair_counts.get(config_key, 0) for config_key in config_keys], dtype=np.float64)
+            scores += np.log((together + alpha) / (base + alpha * len(self.species_names)))
+        return config_keys[int(np.argmax(scores))]
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the arrays and the config vocabulary (the key strings are shared with config_given_species)."""
+        return (self.keys.nbytes + self.configs.nbytes + self.counts.nbytes
+                + sys.getsizeof(self.config_keys) + sys.getsizeof(self.config_index))
+
+
+def raw_entries(config_given_teammates: Dict) -> Iterator[Tuple[str, Tuple[str, ...], str, int]]:
+    """(species, teammates, config key, count) entries of a raw config_given_teammates table."""
+    for teammates, species_configs in config_given_teammates.items():
+        for species, configs in species_configs.items():
+            for config_key, count in configs.items():
+                yield species, teammates, config_key, count
+
+
+def deep_sizeof(obj, seen=None) -> int:
+    """Approximate memory of nested dicts / sequences of strings and ints, counting shared objects once."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(key, seen) + deep_sizeof(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    return size
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Memory / accuracy report for compacting the teammate-conditional config table.
+
+Trains on all but a held-out sample of the team dataset (the local
+bayesian_dataset for gen9vgc2025regi), then compares the raw 5-way table with
+compacted tables: memory, and top-1 config / item accuracy of predicting each
+held-out Pokemon's set from its species and teammates.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Callable, Dict, List
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+
+from bayesian.benchmark_predictor import make_synthetic_teams
+from bayesian.team_predictor import BayesianTeamPredictor, TeamData, TeamParser
+from bayesian.teammate_table import TeammateConfigTable, deep_sizeof, raw_entries
+from poke_env.player.team_util import get_metamon_teams
+
+
+def load_split(args) -> (List[TeamData], List[TeamData]):
+    """Train and held-out teams."""
+    rng = random.Random(args.seed)
+    if args.synthetic:
+        teams = make_synthetic_teams(args.synthetic, seed=args.seed)
+    else:
+        parser = TeamParser()
+        teams = []
+        for file_path in get_metamon_teams(args.battle_format, "modern_replays").team_files:
+            try:
+                teams.append(parser.parse_team_file(file_path))
+            except Exception as e:
+                print(f"Error processing {file_path}: {e}")
+    rng.shuffle(teams)
+    n_holdout = max(1, int(len(teams) * args.holdout))
+    return teams[n_holdout:], teams[:n_holdout]
+
+
+def accuracy(predictor: BayesianTeamPredictor, teams: List[TeamData],
+             predict: Callable[[str, List[str], Dict[str, int]], str]) -> Dict[str, float]:
+    """Top-1 accuracy of the predicted config key and of its item over every held-out Pokemon."""
+    hits = {'config': 0, 'item': 0}
+    total = 0
+    for team_data in teams:
+        species_list = team_data.get_species_list()
+        for i, pokemon in enumerate(team_data.pokemon):
+            species_configs = predictor.config_given_species.get(pokemon.species)
+            if not species_configs:
+                continue
+            teammates = [s for j, s in enumerate(species_list) if j != i]
+            predicted = predict(pokemon.species, teammates, species_configs)
+            actual = predictor._pokemon_to_config_key(pokemon)
+            hits['config'] += predicted == actual
+            hits['item'] += predicted.split('|')[0] == actual.split('|')[0]
+            total += 1
+    return {name: count / max(total, 1) for name, count in hits.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--battle_format", type=str, default="gen9vgc2025regi")
+    parser.add_argument("--synthetic", type=int, default=0, help="Use this many synthetic teams instead of the dataset")
+    parser.add_argument("--holdout", type=float, default=0.1, help="Fraction of teams held out for evaluation")
+    parser.add_argument("--min_support", type=int, nargs="+", default=[1, 2, 5])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    train, holdout = load_split(args)
+    predictor = BayesianTeamPredictor(cache_file=f"{args.battle_format}_teammate_report.pkl",
+                                      battle_format=args.battle_format)
+    for team_data in train:
+        predictor._update_counts(team_data)
+        predictor.total_teams += 1
+    predictor.is_trained = True
+    print(f"Trained on {len(train):,} teams, evaluating on {len(holdout):,} held-out teams")
+
+    raw = predictor.config_given_teammates
+    species_names = list(predictor.species_counts)
+    # Config key strings are shared with config_given_species, so they are not counted against the raw table
+    raw_bytes = deep_sizeof(raw, seen={id(key) for configs in predictor.config_given_species.values() for key in configs})
+    n_raw = sum(len(configs) for species_configs in raw.values() for configs in species_configs.values())
+
+    rows = [("species only (no teammates)", None, 0, 0,
+             accuracy(predictor, holdout, lambda species, teammates, configs: max(configs, key=configs.get)))]
+    rows.append(("raw 5-way dict", None, raw_bytes, n_raw,
+                 accuracy(predictor, holdout, TeammateConfigTable.from_counts(raw_entries(raw), species_names,
+                                                                              pairwise=False).predict_config)))
+    for pairwise in [False, True]:
+        for min_support in args.min_support:
+            start = time.perf_counter()
+            table = TeammateConfigTable.from_counts(raw_entries(raw), species_names,
+                                                    min_support=min_support, pairwise=pairwise)
+            build_ms = (time.perf_counter() - start) * 1000
+            label = f"{'pairwise' if pairwise else '5-way'} min_support={min_support}"
+            rows.append((label, build_ms, table.nbytes, len(table.keys),
+                         accuracy(predictor, holdout, table.predict_config)))
+
+    print(f"{'table':<30} {'entries':>10} {'memory':>10} {'build':>9} {'config acc':>11} {'item acc':>9}")
+    for label, build_ms, nbytes, entries, acc in rows:
+        memory = f"{nbytes / 2 ** 20:.2f} MB" if nbytes else "-"
+        build = f"{build_ms:.0f} ms" if build_ms is not None else "-"
+        print(f"{label:<30} {entries:>10,} {memory:>10} {build:>9} {acc['config']:>11.3f} {acc['item']:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
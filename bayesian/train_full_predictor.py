@@ -42,7 +42,7 @@ def main():
         print(f"Training time: {duration:.1f} seconds ({duration/60:.1f} minutes)")
         print(f"Total teams processed: {predictor.total_teams:,}")
         print(f"Unique species found: {len(predictor.species_counts):,}")
-        print(f"Model cached at: {predictor.cache_path}")
+        print(f"Model saved at: {predictor.model_path}")
         
         # Show some statistics
         print(f"\nTop 10 most common Pokemon:")
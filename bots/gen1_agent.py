@@ -89,6 +89,7 @@ class Gen1Agent(Player):
         save_replays: bool = False,
         account_configuration=None,
         server_configuration=None,
+        start_listening: bool = True,
         **kwargs  # Accept and ignore any extra parameters
     ):
         super().__init__(
@@ -97,6 +98,7 @@ class Gen1Agent(Player):
             save_replays=save_replays,
             account_configuration=account_configuration,
             server_configuration=server_configuration,
+            start_listening=start_listening,
         )
 
         self.gen_data = GenData.from_format(battle_format)
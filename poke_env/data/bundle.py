@@ -0,0 +1,186 @@
+"""This module defines the binary bundles GenData loads static data from.
+
+A bundle holds the parsed and post-processed static data of a generation. Small
+tables are pickled together; large, sparsely used tables such as the learnset are
+stored entry by entry behind an index and decoded on access from a memory map.
+Buffers of the tables, such as numpy arrays, are stored out of band and read
+directly from the memory map, so processes loading a bundle share their pages.
+A checksum of the source JSON files is stored in the header: when the sources
+change, the bundle is rebuilt on the next load.
+
+Bundles are built on first use. To build them ahead of time, e.g. in a docker
+image, run ``python scripts/data/build_bundles.py``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+from collections.abc import Mapping
+from logging import getLogger
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+# Bump when the bundle layout or the post-processing of the sources changes
+BUNDLE_VERSION = 2
+
+MAGIC = b"PEGD"
+_HEADER = struct.Struct("<4sH16sQQ")
+# Alignment of out of band buffers
+_ALIGNMENT = 64
+
+_logger = getLogger(__name__)
+
+
+class BundleMapping(Mapping):
+    """Read-only mapping whose values are decoded from a bundle on first access."""
+
+    __slots__ = ("_buffer", "_index", "_values")
+
+    def __init__(self, buffer: Any, index: Dict[str, Sequence[int]]):
+        self._buffer = buffer
+        self._index = index
+        self._values: Dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._values.get(key)
+        if value is None:
+            offset, length = self._index[key]
+            value = self._values[key] = pickle.loads(self._buffer[offset : offset + length])
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __reduce__(self):
+        # Memory maps cannot be pickled
+        return dict, (dict(self.items()),)
+
+
+def _align(offset: int) -> int:
+    return offset + -offset % _ALIGNMENT
+
+
+def source_digest(paths: Sequence[str]) -> bytes:
+    """Checksum of the bundle version and the contents of the source files."""
+    digest = hashlib.blake2b(str(BUNDLE_VERSION).encode(), digest_size=16)
+    for path in paths:
+        with open(path, "rb") as f:
+            digest.update(os.path.basename(path).encode())
+            digest.update(f.read())
+    return digest.digest()
+
+
+def write_bundle(path: str, data: Dict[str, Any], digest: bytes, lazy: Sequence[str] = ()):
+    """Writes a bundle, atomically so that concurrent readers never see a partial file.
+
+    Sections named in ``lazy`` must be mappings; they are stored entry by entry.
+    """
+    tables = {name: value for name, value in data.items() if name not in lazy}
+    entries = []
+    indexes: Dict[str, Dict[str, Sequence[int]]] = {name: {} for name in lazy}
+    offset = 0
+    for name in lazy:
+        for key, value in data[name].items():
+            entry = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            indexes[name][key] = (offset, len(entry))
+            entries.append(entry)
+            offset += len(entry)
+
+    buffers: List[pickle.PickleBuffer] = []
+    tables_pickle = pickle.dumps(tables, protocol=5, buffer_callback=buffers.append)
+
+    # Buffers follow the lazy entries, each aligned for numpy
+    entries_size = offset
+    spans = []
+    offset = 0
+    for buffer in buffers:
+        offset = _align(offset)
+        spans.append((offset, buffer.raw().nbytes))
+        offset += buffer.raw().nbytes
+    meta_pickle = pickle.dumps((indexes, entries_size, spans), protocol=pickle.HIGHEST_PROTOCOL)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, BUNDLE_VERSION, digest, len(meta_pickle), len(tables_pickle)))
+        f.write(meta_pickle)
+        f.write(tables_pickle)
+        f.writelines(entries)
+        buffers_start = _align(f.tell())
+        for buffer, (offset, _) in zip(buffers, spans):
+            f.write(bytes(buffers_start + offset - f.tell()))
+            f.write(buffer.raw())
+    os.replace(tmp_path, path)
+
+
+def read_bundle(path: str, digest: bytes) -> Optional[Dict[str, Any]]:
+    """Reads a bundle, or returns None if it is missing or was built from other sources."""
+    try:
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    if len(buffer) < _HEADER.size:
+        return None
+    magic, version, bundle_digest, meta_size, tables_size = _HEADER.unpack_from(buffer)
+    if magic != MAGIC or version != BUNDLE_VERSION or bundle_digest != digest:
+        return None
+
+    tables_start = _HEADER.size + meta_size
+    start = tables_start + tables_size
+    indexes, entries_size, spans = pickle.loads(buffer[_HEADER.size : tables_start])
+    buffers_start = _align(start + entries_size)
+    view = memoryview(buffer)
+    tables = pickle.loads(
+        buffer[tables_start:start],
+        buffers=[view[buffers_start + offset : buffers_start + offset + length] for offset, length in spans],
+    )
+    for name, index in indexes.items():
+        tables[name] = BundleMapping(
+            buffer, {key: (start + offset, length) for key, (offset, length) in index.items()}
+        )
+    return tables
+
+
+def load_bundle(
+    path: str,
+    sources: Sequence[str],
+    build: Callable[[], Dict[str, Any]],
+    lazy: Sequence[str] = (),
+) -> Dict[str, Any]:
+    """Loads a bundle, building it from its sources first if it is missing or stale.
+
+    :param path: Path of the bundle.
+    :type path: str
+    :param sources: Paths of the files the bundle is built from.
+    :type sources: Sequence[str]
+    :param build: Parses the sources into the bundle's sections.
+    :type build: Callable[[], Dict[str, Any]]
+    :param lazy: Sections stored entry by entry and decoded on access.
+    :type lazy: Sequence[str]
+    :return: The sections of the bundle.
+    :rtype: Dict[str, Any]
+    """
+    digest = source_digest(sources)
+    data = read_bundle(path, digest)
+    if data is not None:
+        return data
+
+    data = build()
+    try:
+        write_bundle(path, data, digest, lazy)
+    except OSError as e:
+        # e.g. read-only installs: the sources are parsed on every start instead
+        _logger.warning("Could not write static data bundle %s: %s", path, e)
+    return data
+
@@ -1,12 +1,40 @@
 from __future__ import annotations
 
 import os
-from functools import lru_cache
-from typing import Any, Dict, Optional, Union
+import threading
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, TypeVar, Union
 
 import orjson
 
+from poke_env.data.bundle import load_bundle
 from poke_env.data.normalize import to_id_str
+from poke_env.data.usage_sets import UsageSets
+
+T = TypeVar("T")
+
+
+def _load_once(load: Callable[..., T]) -> Callable[..., T]:
+    """Caches a loader like ``lru_cache(None)``, but loads each key once when threads,
+    e.g. the warm-up thread and a player's constructor, ask for it at the same time."""
+    values: Dict[Any, T] = {}
+    locks: Dict[Any, threading.Lock] = {}
+    locks_lock = threading.Lock()
+
+    @wraps(load)
+    def cached(*args: Any) -> T:
+        try:
+            return values[args]
+        except KeyError:
+            pass
+        with locks_lock:
+            lock = locks.setdefault(args, threading.Lock())
+        with lock:
+            if args not in values:
+                values[args] = load(*args)
+        return values[args]
+
+    return cached
 
 
 class GenData:
@@ -21,15 +49,50 @@ class GenData:
             raise ValueError(f"GenData for gen {gen} already initialized.")
 
         self.gen = gen
-        self.moves = self.load_moves(gen)
-        self.natures = self.load_natures()
-        self.pokedex = self.load_pokedex(gen)
-        self.type_chart = self.load_type_chart(gen)
-        self.learnset = self.load_learnset()
+        data = load_bundle(
+            self.bundle_path(gen),
+            self.source_paths(gen),
+            lambda: self.load_sources(gen),
+            lazy=("learnset",),
+        )
+        self.moves = data["moves"]
+        self.natures = data["natures"]
+        self.pokedex = data["pokedex"]
+        self.type_chart = data["type_chart"]
+        self.learnset = data["learnset"]
 
     def __deepcopy__(self, memodict: Optional[Dict[int, Any]] = None) -> GenData:
         return self
 
+    def load_sources(self, gen: int) -> Dict[str, Any]:
+        """Parses the static data of a generation from its JSON sources."""
+        return {
+            "moves": self.load_moves(gen),
+            "natures": self.load_natures(),
+            "pokedex": self.load_pokedex(gen),
+            "type_chart": self.load_type_chart(gen),
+            "learnset": self.load_learnset(),
+        }
+
+    def source_paths(self, gen: int) -> List[str]:
+        """Paths of the JSON files the static data of a generation is parsed from."""
+        return [
+            os.path.join(self._static_files_root, path)
+            for path in (
+                os.path.join("moves", f"gen{gen}moves.json"),
+                "natures.json",
+                os.path.join("pokedex", f"gen{gen}pokedex.json"),
+                os.path.join("typechart", f"gen{gen}typechart.json"),
+                "learnset.json",
+            )
+        ]
+
+    @staticmethod
+    def bundle_path(gen: int) -> str:
+        """Path of the prebuilt bundle of a generation's static data."""
+        root = os.path.join(os.path.dirname(os.path.realpath(__file__)), "static")
+        return os.path.join(root, "bundles", f"gen{gen}.bundle")
+
     def load_moves(self, gen: int) -> Dict[str, Any]:
         with open(
             os.path.join(self._static_files_root, "moves", f"gen{gen}moves.json")
@@ -114,7 +177,7 @@ class GenData:
         return os.path.join(os.path.dirname(os.path.realpath(__file__)), "static")
 
     @classmethod
-    @lru_cache(None)
+    @_load_once
     def from_gen(cls, gen: int) -> GenData:
         gen_data = GenData(gen)
         cls._gen_data_per_gen[gen] = gen_data
@@ -122,7 +185,41 @@ class GenData:
         return gen_data
 
     @classmethod
-    @lru_cache(None)
+    @_load_once
     def from_format(cls, format: str) -> GenData:
         gen = int(format[3])  # Update when Gen 10 comes
         return cls.from_gen(gen)
+
+    @classmethod
+    def sets_for_format(cls, format: Optional[str]) -> Dict[str, Any]:
+        """Usage sets of a format, loaded once and shared by every Pokemon."""
+        return cls._load_sets(cls._sets_path(format))
+
+    @classmethod
+    def usage_sets_for_format(cls, format: Optional[str]) -> UsageSets:
+        """Store sampling the usage sets of a format, loaded once per process."""
+        return cls._load_usage_sets(cls._sets_path(format))
+
+    @staticmethod
+    def _sets_path(format: Optional[str]) -> str:
+        if format and "vgc" in format.lower():
+            return os.path.join("gen9", "vgc", "sets_1760.json")
+        return os.path.join("gen9", "ou", "sets_1500.json")
+
+    @staticmethod
+    @_load_once
+    def _load_sets(path: str) -> Dict[str, Any]:
+        root = os.path.join(os.path.dirname(os.path.realpath(__file__)), "static")
+        with open(os.path.join(root, path)) as f:
+            return orjson.loads(f.read())
+
+    @classmethod
+    @_load_once
+    def _load_usage_sets(cls, path: str) -> UsageSets:
+        root = os.path.join(os.path.dirname(os.path.realpath(__file__)), "static")
+        bundle_name = os.path.splitext(path)[0].replace(os.sep, "_") + ".bundle"
+        return UsageSets.load(
+            cls._load_sets(path),
+            os.path.join(root, path),
+            os.path.join(root, "bundles", bundle_name),
+        )
@@ -0,0 +1,156 @@
+"""This module defines the compiled store used to sample usage sets.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from poke_env.data.bundle import load_bundle
+
+# Consecutive rejected draws after which sampling without replacement scans the
+# remaining entries instead
+_MAX_REJECTIONS = 16
+
+
+class UsageSets:
+    """Samples the entries of usage sets in proportion to their percentages.
+
+    Usage sets map species to categories (``"items"``, ``"moves"``, ``"spreads"``,
+    ...), each a list of entries with a ``"percentage"``. The store compiles every
+    category into an alias table, so that an entry is drawn in constant time, and
+    refers to entries by their index in their category. Tables are flat, read-only
+    numpy arrays loaded from a bundle, shared by the processes loading it.
+
+    Draws use numpy's global random state, like ``np.random.choice``.
+
+    :param sets: Usage sets, as loaded from a ``sets_*.json`` file.
+    :type sets: Dict[str, Any]
+    :param tables: Tables compiled from the usage sets by ``compile``.
+    :type tables: Dict[str, Any]
+    """
+
+    __slots__ = ("sets", "_index", "_probabilities", "_alias_probabilities", "_aliases")
+
+    def __init__(self, sets: Dict[str, Any], tables: Dict[str, Any]):
+        self.sets = sets
+        self._index: Dict[str, Dict[str, Tuple[int, int]]] = tables["index"]
+        self._probabilities: np.ndarray = tables["probabilities"]
+        self._alias_probabilities: np.ndarray = tables["alias_probabilities"]
+        self._aliases: np.ndarray = tables["aliases"]
+
+    def __contains__(self, species: object) -> bool:
+        return species in self._index
+
+    @classmethod
+    def load(cls, sets: Dict[str, Any], source: str, bundle_path: str) -> UsageSets:
+        """Loads the store of usage sets, compiling it if its bundle is missing or stale.
+
+        :param sets: Usage sets, as loaded from ``source``.
+        :type sets: Dict[str, Any]
+        :param source: Path of the usage sets file.
+        :type source: str
+        :param bundle_path: Path of the bundle holding the compiled tables.
+        :type bundle_path: str
+        """
+        return cls(sets, load_bundle(bundle_path, [source], lambda: cls.compile(sets)))
+
+    @staticmethod
+    def compile(sets: Dict[str, Any]) -> Dict[str, Any]:
+        """Compiles the alias tables of every category of usage sets."""
+        index: Dict[str, Dict[str, Tuple[int, int]]] = {}
+        probabilities: List[float] = []
+        alias_probabilities: List[float] = []
+        aliases: List[int] = []
+
+        for species, categories in sets.items():
+            index[species] = {}
+            for category, entries in categories.items():
+                if not isinstance(entries, list):
+                    continue
+                weights = [float(entry["percentage"]) for entry in entries]
+                total = sum(weights)
+                if total <= 0:
+                    weights = [1.0] * len(entries)
+                    total = float(len(entries))
+
+                index[species][category] = (len(probabilities), len(entries))
+                probabilities.extend(weight / total for weight in weights)
+                table_probabilities, table_aliases = _alias_table(weights, total)
+                alias_probabilities.extend(table_probabilities)
+                aliases.extend(table_aliases)
+
+        return {
+            "index": index,
+            "probabilities": np.array(probabilities, dtype=np.float64),
+            "alias_probabilities": np.array(alias_probabilities, dtype=np.float64),
+            "aliases": np.array(aliases, dtype=np.int32),
+        }
+
+    def sample(self, species: str, category: str, size: int = 1) -> List[int]:
+        """Draws distinct entries of a category, like ``np.random.choice`` without
+        replacement.
+
+        :param species: Species of the usage set.
+        :type species: str
+        :param category: Category to draw from, e.g. ``"moves"``.
+        :type category: str
+        :param size: Number of entries to draw, capped to the number of entries.
+        :type size: int
+        :return: Indices of the drawn entries in their category.
+        :rtype: List[int]
+        """
+        start, count = self._index[species][category]
+        size = min(size, count)
+        drawn: List[int] = []
+        rejections = 0
+        while len(drawn) < size:
+            entry = self._draw(start, count)
+            if entry not in drawn:
+                drawn.append(entry)
+                rejections = 0
+            elif rejections < _MAX_REJECTIONS:
+                rejections += 1
+            else:
+                drawn.append(self._draw_remaining(start, count, drawn))
+        return drawn
+
+    def choice(self, species: str, category: str, size: int = 1) -> List[Dict[str, Any]]:
+        """Draws distinct entries of a category, see ``sample``.
+
+        :return: The drawn entries.
+        :rtype: List[Dict[str, Any]]
+        """
+        entries = self.sets[species][category]
+        return [entries[entry] for entry in self.sample(species, category, size)]
+
+    def _draw(self, start: int, count: int) -> int:
+        draw = np.random.random() * count
+        column = int(draw)
+        if draw - column < self._alias_probabilities[start + column]:
+            return column
+        return int(self._aliases[start + column])
+
+    def _draw_remaining(self, start: int, count: int, drawn: Sequence[int]) -> int:
+        remaining = [entry for entry in range(count) if entry not in drawn]
+        cumulative = np.cumsum(self._probabilities[start + np.array(remaining)])
+        position = np.searchsorted(cumulative, np.random.random() * cumulative[-1], side="right")
+        return remaining[min(int(position), len(remaining) - 1)]
+
+
+def _alias_table(weights: Sequence[float], total: float) -> Tuple[List[float], List[int]]:
+    """Builds the alias table of a distribution with Vose's method."""
+    count = len(weights)
+    scaled = [weight * count / total for weight in weights]
+    probabilities = [1.0] * count
+    aliases = list(range(count))
+    small = [entry for entry, weight in enumerate(scaled) if weight < 1]
+    large = [entry for entry, weight in enumerate(scaled) if weight >= 1]
+    while small and large:
+        less, more = small.pop(), large.pop()
+        probabilities[less] = scaled[less]
+        aliases[less] = more
+        scaled[more] += scaled[less] - 1
+        (small if scaled[more] < 1 else large).append(more)
+    return probabilities, aliases
@@ -19,7 +19,7 @@ from poke_env.environment.battle import Battle
 from poke_env.environment.double_battle import DoubleBattle
 from poke_env.environment.effect import Effect
 from poke_env.environment.field import Field
-from poke_env.environment.move import SPECIAL_MOVES, EmptyMove, Move
+from poke_env.environment.move import SPECIAL_MOVES, EmptyMove, FrozenMove, Move
 from poke_env.environment.move_category import MoveCategory
 from poke_env.environment.pokemon import Pokemon
 from poke_env.environment.pokemon_gender import PokemonGender
@@ -36,6 +36,7 @@ __all__ = [
     "Effect",
     "EmptyMove",
     "Field",
+    "FrozenMove",
     "Move",
     "MoveCategory",
     "Pokemon",
@@ -1,9 +1,10 @@
+import copy
 import os
 import asyncio
 
 from abc import ABC, abstractmethod
 from logging import Logger
-from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 
 from poke_env.data import GenData, to_id_str
 from poke_env.data.replay_template import REPLAY_TEMPLATE
@@ -17,8 +18,22 @@ from difflib import get_close_matches
 def sanitize_string(s: str) -> str:
     return ''.join(char for char in s if char.isalnum()).lower()
 
+
+_TARGET_PREFIXES = {"p1: ", "p2: ", "p1a:", "p1b:", "p2a:", "p2b:"}
+
+
+def _handles(*events: str):
+    """Registers an AbstractBattle method as the parse_message handler of `events`."""
+    def register(method):
+        method._handled_events = events
+        return method
+    return register
+
+
 class AbstractBattle(ABC):
     _pokemon_predictor = None  # Class-level singleton for PokemonPredictor
+    # Protocol event -> handler, collected once per subclass from the @_handles methods
+    _message_handlers: Dict[str, Callable[["AbstractBattle", List[str]], Any]] = {}
     
     MESSAGES_TO_IGNORE = {
         "-anim",
@@ -102,6 +117,7 @@ class AbstractBattle(ABC):
         "_player_role",
         "_player_username",
         "_players",
+        "_pokemon_index",
         "_rating",
         "_reconnected",
         "_replay_data",
@@ -179,6 +195,45 @@ class AbstractBattle(ABC):
         # Pokemon attributes
         self._team: Dict[str, Pokemon] = {}
         self._opponent_team: Dict[str, Pokemon] = {}
+        # Raw protocol identifier -> Pokemon resolved by get_pokemon
+        self._pokemon_index: Dict[str, Pokemon] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        handlers = {}
+        for klass in reversed(cls.__mro__):
+            for name, attribute in vars(klass).items():
+                for event in getattr(attribute, "_handled_events", ()):
+                    # Looked up on cls so that subclass overrides are dispatched to
+                    handlers[event] = getattr(cls, name)
+        cls._message_handlers = handlers
+
+    def __deepcopy__(self, memodict: Optional[Dict[int, Any]] = None) -> "AbstractBattle":
+        # Search (LocalSim, minimax) copies battles once per node: only the
+        # per-battle state is copied, Pokemon and Move share their static data.
+        memodict = {} if memodict is None else memodict
+        copied = object.__new__(self.__class__)
+        memodict[id(self)] = copied
+        state = {slot: getattr(self, slot) for slot in AbstractBattle.__slots__ if hasattr(self, slot)}
+        state.update(getattr(self, "__dict__", {}))
+        for name, value in state.items():
+            if name == "_data" or name == "logger":
+                pass
+            elif name == "_replay_data":
+                # Logged messages are never modified, only appended
+                value = list(value)
+            else:
+                value = copy.deepcopy(value, memodict)
+            object.__setattr__(copied, name, value)
+        return copied
+
+    def clone(self) -> "AbstractBattle":
+        """Returns an independent copy of the battle state, sharing the static game data.
+
+        :return: The copied battle.
+        :rtype: AbstractBattle
+        """
+        return copy.deepcopy(self)
 
     @classmethod
     def get_pokemon_predictor(cls):
@@ -217,6 +272,13 @@ class AbstractBattle(ABC):
         :raises ValueError: If the team has too many pokemons, as determined by the
             teamsize component of battle initialisation.
         """
+        unforced = not force_self_team and not force_opp_team
+        if unforced:
+            indexed = self._pokemon_index.get(identifier)
+            if indexed is not None:
+                return indexed
+        raw_identifier = identifier
+
         # this is a monster but it works for the random pokemon name changes
         player_role = identifier[:2]
         cutoff = 1
@@ -225,28 +287,14 @@ class AbstractBattle(ABC):
         dash_mons = {'ho-oh', 'chi-yu', 'porygon-z', 'ting-lu', 'kommo-o'}
         if '-' in identifier and len(dash_mons.intersection({identifier[4:].lower()})) == 0:
             identifier = identifier.split('-')[0]
-        if not force_self_team and not force_opp_team:
-            if identifier in self._team.keys():
-                return self._team[identifier]
-            elif identifier in self._opponent_team.keys():
-                return self._opponent_team[identifier]
-            else:
-                for mon in self._team.keys():
-                    if sanitize_string(identifier) in sanitize_string(mon) or sanitize_string(mon) in sanitize_string(identifier):
-                        return self._team[mon]
-                for mon in self._opponent_team.keys():
-                    if sanitize_string(identifier) in sanitize_string(mon) or sanitize_string(mon) in sanitize_string(identifier):
-                        return self._opponent_team[mon]
-            closest = get_close_matches(identifier, list(self._team.keys()), n=1, cutoff=cutoff)
-            if len(closest) > 0:
-                identifier = closest[0]
-                return self._team[identifier]
-            closest = get_close_matches(identifier, list(self._opponent_team.keys()), n=1, cutoff=cutoff)
-            if len(closest) > 0:
-                identifier = closest[0]
-                return self._opponent_team[identifier]
+        if unforced:
+            mon = self._find_pokemon(identifier)
+            if mon is not None:
+                self._pokemon_index[raw_identifier] = mon
+                return mon
         elif force_self_team:
             if identifier in self._team:
+                self._pokemon_index[raw_identifier] = self._team[identifier]
                 return self._team[identifier]
             for mon in self._team.keys():
                 if sanitize_string(identifier) in sanitize_string(mon) or sanitize_string(mon) in sanitize_string(identifier):
@@ -257,6 +305,7 @@ class AbstractBattle(ABC):
                 return self._team[identifier]
         elif force_opp_team:
             if identifier in self._opponent_team:
+                self._pokemon_index[raw_identifier] = self._opponent_team[identifier]
                 return self._opponent_team[identifier]
             for mon in self._opponent_team.keys():
                 if sanitize_string(identifier) in sanitize_string(mon) or sanitize_string(mon) in sanitize_string(identifier):
@@ -291,8 +340,33 @@ class AbstractBattle(ABC):
         else:
             species = identifier[4:]
             team[identifier] = Pokemon(species=species, gen=self._data.gen, battle_format=self._format)
+        # A new team member can change what fuzzy identifiers resolve to. Exact
+        # matches are indexed for forced lookups too: team keys are role-prefixed,
+        # so an unforced lookup of the same identifier finds the same Pokemon.
+        self._pokemon_index.clear()
+        self._pokemon_index[raw_identifier] = team[identifier]
         return team[identifier]
 
+    def _find_pokemon(self, identifier: str) -> Optional[Pokemon]:
+        """Pokemon of either team matching a normalised identifier, exactly or by name."""
+        if identifier in self._team:
+            return self._team[identifier]
+        elif identifier in self._opponent_team:
+            return self._opponent_team[identifier]
+        for mon in self._team.keys():
+            if sanitize_string(identifier) in sanitize_string(mon) or sanitize_string(mon) in sanitize_string(identifier):
+                return self._team[mon]
+        for mon in self._opponent_team.keys():
+            if sanitize_string(identifier) in sanitize_string(mon) or sanitize_string(mon) in sanitize_string(identifier):
+                return self._opponent_team[mon]
+        closest = get_close_matches(identifier, list(self._team.keys()), n=1, cutoff=1)
+        if len(closest) > 0:
+            return self._team[closest[0]]
+        closest = get_close_matches(identifier, list(self._opponent_team.keys()), n=1, cutoff=1)
+        if len(closest) > 0:
+            return self._opponent_team[closest[0]]
+        return None
+
     @abstractmethod
     def clear_all_boosts(self):
         pass
@@ -440,414 +514,545 @@ class AbstractBattle(ABC):
         self._finished = True
 
     def parse_message(self, split_message: List[str]):
-        # print("[PARSE MSG ABS BATTLE]", split_message)
         if self._save_replays:
             self._replay_data.append(split_message)
 
-        if split_message[1] in self.MESSAGES_TO_IGNORE:
+        event = split_message[1]
+        if event in self.MESSAGES_TO_IGNORE:
             return
-        elif split_message[1] in ["drag", "switch"] and not "volt" in split_message[1] and not "voltswitch" in split_message:
-            pokemon, details, hp_status = split_message[2:5]
-            self.switch(pokemon, details, hp_status)
-        elif split_message[1] == "-damage":
-            pokemon, hp_status = split_message[2:4]
-            self.get_pokemon(pokemon).damage(hp_status)
+        handler = self._message_handlers.get(event)
+        if handler is None:
+            raise NotImplementedError(split_message)
+        handler(self, split_message)
+
+    @_handles("drag", "switch")
+    def _parse_switch(self, split_message: List[str]):
+        if "voltswitch" in split_message:
+            raise NotImplementedError(split_message)
+        pokemon, details, hp_status = split_message[2:5]
+        self.switch(pokemon, details, hp_status)
+
+    @_handles("-damage")
+    def _parse_damage(self, split_message: List[str]):
+        pokemon, hp_status = split_message[2:4]
+        self.get_pokemon(pokemon).damage(hp_status)
+        # Only "[from] ..." suffixes reveal an item or ability
+        if len(split_message) > 4:
             self._check_damage_message_for_item(split_message)
             self._check_damage_message_for_ability(split_message)
-        elif split_message[1] == "move":
-            failed = False
-            override_move = None
-            reveal_other_move = False
-
-            for move_failed_suffix in ["[miss]", "[still]", "[notarget]"]:
-                if split_message[-1] == move_failed_suffix:
-                    split_message = split_message[:-1]
-                    failed = True
 
-            if split_message[-1] == "[notarget]":
-                split_message = split_message[:-1]
+    @_handles("move")
+    def _parse_move(self, split_message: List[str]):
+        # Fast path for the plain "|move|<user>|<move>|<target>" form, which needs none of
+        # the suffix clean-up below
+        if (
+            len(split_message) == 5
+            and len(split_message[4]) > 4
+            and split_message[4][:4] in _TARGET_PREFIXES
+        ):
+            pokemon, move = split_message[2:4]
+            if move.upper().strip() == "MINIMIZE":
+                self.get_pokemon(pokemon).start_effect("MINIMIZE")
+            self.get_pokemon(pokemon).moved(move, failed=False, use=False)
+            return
 
-            if split_message[-1].startswith("[spread]"):
-                split_message = split_message[:-1]
+        failed = False
+        override_move = None
+        reveal_other_move = False
 
-            if split_message[-1] in {"[from]lockedmove", "[from]Pursuit", "[zeffect]"}:
+        for move_failed_suffix in ["[miss]", "[still]", "[notarget]"]:
+            if split_message[-1] == move_failed_suffix:
                 split_message = split_message[:-1]
+                failed = True
+
+        if split_message[-1] == "[notarget]":
+            split_message = split_message[:-1]
+
+        if split_message[-1].startswith("[spread]"):
+            split_message = split_message[:-1]
+
+        if split_message[-1] in {"[from]lockedmove", "[from]Pursuit", "[zeffect]"}:
+            split_message = split_message[:-1]
+
+        if split_message[-1].startswith("[anim]"):
+            split_message = split_message[:-1]
+
+        if split_message[-1].startswith("[from]move: "):
+            override_move = split_message.pop()[12:]
+
+            if override_move == "Sleep Talk":
+                # Sleep talk was used, but also reveals another move
+                reveal_other_move = True
+            elif override_move in {"Copycat", "Metronome", "Nature Power"}:
+                pass
+            elif self.logger is not None:
+                self.logger.warning(
+                    "Unmanaged [from]move message received - move %s in cleaned up "
+                    "message %s in battle %s turn %d",
+                    override_move,
+                    split_message,
+                    self.battle_tag,
+                    self.turn,
+                )
 
-            if split_message[-1].startswith("[anim]"):
-                split_message = split_message[:-1]
+        if split_message[-1] == "null":
+            split_message = split_message[:-1]
 
-            if split_message[-1].startswith("[from]move: "):
-                override_move = split_message.pop()[12:]
-
-                if override_move == "Sleep Talk":
-                    # Sleep talk was used, but also reveals another move
-                    reveal_other_move = True
-                elif override_move in {"Copycat", "Metronome", "Nature Power"}:
-                    pass
-                elif self.logger is not None:
-                    self.logger.warning(
-                        "Unmanaged [from]move message received - move %s in cleaned up "
-                        "message %s in battle %s turn %d",
-                        override_move,
-                        split_message,
-                        self.battle_tag,
-                        self.turn,
-                    )
-
-            if split_message[-1] == "null":
-                split_message = split_message[:-1]
+        if split_message[-1].startswith("[from]ability: "):
+            revealed_ability = split_message.pop()[15:]
+            pokemon = split_message[2]
+            self.get_pokemon(pokemon).ability = revealed_ability
 
-            if split_message[-1].startswith("[from]ability: "):
-                revealed_ability = split_message.pop()[15:]
-                pokemon = split_message[2]
-                self.get_pokemon(pokemon).ability = revealed_ability
-
-                if revealed_ability == "Magic Bounce":
-                    return
-                elif revealed_ability == "Dancer":
-                    return
-                elif self.logger is not None:
-                    self.logger.warning(
-                        "Unmanaged [from]ability: message received - ability %s in "
-                        "cleaned up message %s in battle %s turn %d",
-                        revealed_ability,
-                        split_message,
-                        self.battle_tag,
-                        self.turn,
-                    )
-            if split_message[-1] == "[from]Magic Coat":
+            if revealed_ability == "Magic Bounce":
                 return
+            elif revealed_ability == "Dancer":
+                return
+            elif self.logger is not None:
+                self.logger.warning(
+                    "Unmanaged [from]ability: message received - ability %s in "
+                    "cleaned up message %s in battle %s turn %d",
+                    revealed_ability,
+                    split_message,
+                    self.battle_tag,
+                    self.turn,
+                )
+        if split_message[-1] == "[from]Magic Coat":
+            return
 
-            while split_message[-1] == "[still]":
-                split_message = split_message[:-1]
-
-            if split_message[-1] == "":
-                split_message = split_message[:-1]
-
-            if len(split_message) == 4:
-                pokemon, move = split_message[2:4]
-            elif len(split_message) == 5:
-                pokemon, move, presumed_target = split_message[2:5]
-
-                if len(presumed_target) > 4 and presumed_target[:4] in {
-                    "p1: ",
-                    "p2: ",
-                    "p1a:",
-                    "p1b:",
-                    "p2a:",
-                    "p2b:",
-                }:
-                    pass
-                elif self.logger is not None:
-                    self.logger.warning(
-                        "Unmanaged move message format received - cleaned up message %s"
-                        " in battle %s turn %d",
-                        split_message,
-                        self.battle_tag,
-                        self.turn,
-                    )
-            elif len(split_message) == 6 and split_message[5].startswith("[from]"):
-                # Handle moves with [from] tags like lockedmove, Magic Bounce, etc.
-                pokemon, move, presumed_target = split_message[2:5]
-            else:
-                pokemon, move, presumed_target = split_message[2:5]
-                if self.logger is not None:
-                    self.logger.warning(
-                        "Unmanaged move message format received - cleaned up message %s in "
-                        "battle %s turn %d",
-                        split_message,
-                        self.battle_tag,
-                        self.turn,
-                    )
-
-            # Check if a silent-effect move has occurred (Minimize) and add the effect
+        while split_message[-1] == "[still]":
+            split_message = split_message[:-1]
+
+        if split_message[-1] == "":
+            split_message = split_message[:-1]
+
+        if len(split_message) == 4:
+            pokemon, move = split_message[2:4]
+        elif len(split_message) == 5:
+            pokemon, move, presumed_target = split_message[2:5]
+
+            if len(presumed_target) > 4 and presumed_target[:4] in _TARGET_PREFIXES:
+                pass
+            elif self.logger is not None:
+                self.logger.warning(
+                    "Unmanaged move message format received - cleaned up message %s"
+                    " in battle %s turn %d",
+                    split_message,
+                    self.battle_tag,
+                    self.turn,
+                )
+        elif len(split_message) == 6 and split_message[5].startswith("[from]"):
+            # Handle moves with [from] tags like lockedmove, Magic Bounce, etc.
+            pokemon, move, presumed_target = split_message[2:5]
+        else:
+            pokemon, move, presumed_target = split_message[2:5]
+            if self.logger is not None:
+                self.logger.warning(
+                    "Unmanaged move message format received - cleaned up message %s in "
+                    "battle %s turn %d",
+                    split_message,
+                    self.battle_tag,
+                    self.turn,
+                )
 
-            if move.upper().strip() == "MINIMIZE":
-                temp_pokemon = self.get_pokemon(pokemon)
-                temp_pokemon.start_effect("MINIMIZE")
-
-            if override_move:
-                # Moves that can trigger this branch results in two `move` messages being sent.
-                # We're setting use=False in the one (with the override) in order to prevent two pps from being used
-                # incorrectly.
-                self.get_pokemon(pokemon).moved(override_move, failed=failed, use=False)
-            if override_move is None or reveal_other_move:
-                self.get_pokemon(pokemon).moved(move, failed=failed, use=False)
-        elif split_message[1] == "cant":
-            pokemon, _ = split_message[2:4]
-            self.get_pokemon(pokemon).cant_move()
-        elif split_message[1] == "turn":
-            self.end_turn(int(split_message[2]))
-        elif split_message[1] == "-heal":
-            pokemon, hp_status = split_message[2:4]
-            self.get_pokemon(pokemon).heal(hp_status)
+        # Check if a silent-effect move has occurred (Minimize) and add the effect
+
+        if move.upper().strip() == "MINIMIZE":
+            temp_pokemon = self.get_pokemon(pokemon)
+            temp_pokemon.start_effect("MINIMIZE")
+
+        if override_move:
+            # Moves that can trigger this branch results in two `move` messages being sent.
+            # We're setting use=False in the one (with the override) in order to prevent two pps from being used
+            # incorrectly.
+            self.get_pokemon(pokemon).moved(override_move, failed=failed, use=False)
+        if override_move is None or reveal_other_move:
+            self.get_pokemon(pokemon).moved(move, failed=failed, use=False)
+
+    @_handles("cant")
+    def _parse_cant(self, split_message: List[str]):
+        pokemon, _ = split_message[2:4]
+        self.get_pokemon(pokemon).cant_move()
+
+    @_handles("turn")
+    def _parse_turn(self, split_message: List[str]):
+        self.end_turn(int(split_message[2]))
+
+    @_handles("-heal")
+    def _parse_heal(self, split_message: List[str]):
+        pokemon, hp_status = split_message[2:4]
+        self.get_pokemon(pokemon).heal(hp_status)
+        if len(split_message) > 4:
             self._check_heal_message_for_ability(split_message)
             self._check_heal_message_for_item(split_message)
-        elif split_message[1] == "-boost":
-            pokemon, stat, amount = split_message[2:5]
-            self.get_pokemon(pokemon).boost(stat, int(amount))
-        elif split_message[1] == "-weather":
-            weather = split_message[2]
-            if weather == "none":
-                self._weather = {}
-                return
+
+    @_handles("-boost")
+    def _parse_boost(self, split_message: List[str]):
+        pokemon, stat, amount = split_message[2:5]
+        self.get_pokemon(pokemon).boost(stat, int(amount))
+
+    @_handles("-weather")
+    def _parse_weather(self, split_message: List[str]):
+        weather = split_message[2]
+        if weather == "none":
+            self._weather = {}
+            return
+        else:
+            self._weather = {Weather.from_showdown_message(weather): self.turn}
+
+    @_handles("faint")
+    def _parse_faint(self, split_message: List[str]):
+        pokemon = split_message[2]
+        self.get_pokemon(pokemon).faint()
+
+    @_handles("-unboost")
+    def _parse_unboost(self, split_message: List[str]):
+        pokemon, stat, amount = split_message[2:5]
+        self.get_pokemon(pokemon).boost(stat, -int(amount))
+
+    @_handles("-ability")
+    def _parse_ability(self, split_message: List[str]):
+        pokemon, ability = split_message[2:4]
+        self.get_pokemon(pokemon).ability = ability
+
+    @_handles("-start")
+    def _parse_start_effect(self, split_message: List[str]):
+        pokemon, effect = split_message[2:4]
+        pokemon = self.get_pokemon(pokemon)
+        pokemon.start_effect(effect)
+
+        if pokemon.is_dynamaxed:
+            if pokemon in set(self.team.values()) and self._dynamax_turn is None:
+                self._dynamax_turn = self.turn
+            # self._can_dynamax value is set via _parse_request()
+            elif (
+                pokemon in set(self.opponent_team.values())
+                and self._opponent_dynamax_turn is None
+            ):
+                self._opponent_dynamax_turn = self.turn
+                self.opponent_can_dynamax = False
+
+    @_handles("-activate")
+    def _parse_activate(self, split_message: List[str]):
+        target, effect = split_message[2:4]
+        if target:
+            self.get_pokemon(target).start_effect(effect)
+
+    @_handles("-status")
+    def _parse_status(self, split_message: List[str]):
+        pokemon, status = split_message[2:4]
+        self.get_pokemon(pokemon).status = status
+
+    @_handles("rule")
+    def _parse_rule(self, split_message: List[str]):
+        self.rules.append(split_message[2])
+
+    @_handles("-clearallboost")
+    def _parse_clearallboost(self, split_message: List[str]):
+        self.clear_all_boosts()
+
+    @_handles("-clearboost")
+    def _parse_clearboost(self, split_message: List[str]):
+        pokemon = split_message[2]
+        self.get_pokemon(pokemon).clear_boosts()
+
+    @_handles("-clearnegativeboost")
+    def _parse_clearnegativeboost(self, split_message: List[str]):
+        pokemon = split_message[2]
+        self.get_pokemon(pokemon).clear_negative_boosts()
+
+    @_handles("-clearpositiveboost")
+    def _parse_clearpositiveboost(self, split_message: List[str]):
+        pokemon = split_message[2]
+        self.get_pokemon(pokemon).clear_positive_boosts()
+
+    @_handles("-copyboost")
+    def _parse_copyboost(self, split_message: List[str]):
+        source, target = split_message[2:4]
+        self.get_pokemon(target).copy_boosts(self.get_pokemon(source))
+
+    @_handles("-curestatus")
+    def _parse_curestatus(self, split_message: List[str]):
+        pokemon, status = split_message[2:4]
+        self.get_pokemon(pokemon).cure_status(status)
+
+    @_handles("-cureteam")
+    def _parse_cureteam(self, split_message: List[str]):
+        pokemon = split_message[2]
+        team = (
+            self.team if pokemon[:2] == self._player_role else self._opponent_team
+        )
+        for mon in team.values():
+            mon.cure_status()
+
+    @_handles("-end")
+    def _parse_end(self, split_message: List[str]):
+        pokemon, effect = split_message[2:4]
+        self.get_pokemon(pokemon).end_effect(effect)
+
+    @_handles("-endability")
+    def _parse_endability(self, split_message: List[str]):
+        pokemon = split_message[2]
+        self.get_pokemon(pokemon).ability = None
+
+    @_handles("-enditem")
+    def _parse_enditem(self, split_message: List[str]):
+        pokemon, item = split_message[2:4]
+        self.get_pokemon(pokemon).end_item(item)
+
+    @_handles("-fieldend")
+    def _parse_fieldend(self, split_message: List[str]):
+        condition = split_message[2]
+        self._field_end(condition)
+
+    @_handles("-fieldstart")
+    def _parse_fieldstart(self, split_message: List[str]):
+        condition = split_message[2]
+        self.field_start(condition)
+
+    @_handles("-formechange", "detailschange")
+    def _parse_formechange(self, split_message: List[str]):
+        pokemon, species = split_message[2:4]
+        self.get_pokemon(pokemon).forme_change(species)
+
+    @_handles("-invertboost")
+    def _parse_invertboost(self, split_message: List[str]):
+        pokemon = split_message[2]
+        self.get_pokemon(pokemon).invert_boosts()
+
+    @_handles("-item")
+    def _parse_item(self, split_message: List[str]):
+        pokemon, item = split_message[2:4]
+        self.get_pokemon(pokemon).item = to_id_str(item)
+
+    @_handles("-mega")
+    def _parse_mega(self, split_message: List[str]):
+        if self.player_role is not None and not split_message[2].startswith(
+            self.player_role
+        ):
+            self._opponent_can_mega_evolve = False
+        pokemon, megastone = split_message[2:4]
+        self.get_pokemon(pokemon).mega_evolve(megastone)
+
+    @_handles("-mustrecharge")
+    def _parse_mustrecharge(self, split_message: List[str]):
+        pokemon = split_message[2]
+        self.get_pokemon(pokemon).must_recharge = True
+
+    @_handles("-prepare")
+    def _parse_prepare(self, split_message: List[str]):
+        try:
+            attacker, move, defender = split_message[2:5]
+            # Check if defender is a valid pokemon identifier (starts with p1 or p2)
+            if defender.startswith(('p1', 'p2')):
+                defender = self.get_pokemon(defender)
+                if to_id_str(move) == "skydrop":
+                    defender.start_effect("Sky Drop")
             else:
-                self._weather = {Weather.from_showdown_message(weather): self.turn}
-        elif split_message[1] == "faint":
-            pokemon = split_message[2]
-            self.get_pokemon(pokemon).faint()
-        elif split_message[1] == "-unboost":
-            pokemon, stat, amount = split_message[2:5]
-            self.get_pokemon(pokemon).boost(stat, -int(amount))
-        elif split_message[1] == "-ability":
-            pokemon, ability = split_message[2:4]
-            self.get_pokemon(pokemon).ability = ability
-        elif split_message[1] == "-start":
-            pokemon, effect = split_message[2:4]
-            pokemon = self.get_pokemon(pokemon)
-            pokemon.start_effect(effect)
-
-            if pokemon.is_dynamaxed:
-                if pokemon in set(self.team.values()) and self._dynamax_turn is None:
-                    self._dynamax_turn = self.turn
-                # self._can_dynamax value is set via _parse_request()
-                elif (
-                    pokemon in set(self.opponent_team.values())
-                    and self._opponent_dynamax_turn is None
-                ):
-                    self._opponent_dynamax_turn = self.turn
-                    self.opponent_can_dynamax = False
-        elif split_message[1] == "-activate":
-            target, effect = split_message[2:4]
-            if target:
-                self.get_pokemon(target).start_effect(effect)
-        elif split_message[1] == "-status":
-            pokemon, status = split_message[2:4]
-            self.get_pokemon(pokemon).status = status
-        elif split_message[1] == "rule":
-            self.rules.append(split_message[2])
-
-        elif split_message[1] == "-clearallboost":
-            self.clear_all_boosts()
-        elif split_message[1] == "-clearboost":
-            pokemon = split_message[2]
-            self.get_pokemon(pokemon).clear_boosts()
-        elif split_message[1] == "-clearnegativeboost":
-            pokemon = split_message[2]
-            self.get_pokemon(pokemon).clear_negative_boosts()
-        elif split_message[1] == "-clearpositiveboost":
-            pokemon = split_message[2]
-            self.get_pokemon(pokemon).clear_positive_boosts()
-        elif split_message[1] == "-copyboost":
-            source, target = split_message[2:4]
-            self.get_pokemon(target).copy_boosts(self.get_pokemon(source))
-        elif split_message[1] == "-curestatus":
-            pokemon, status = split_message[2:4]
-            self.get_pokemon(pokemon).cure_status(status)
-        elif split_message[1] == "-cureteam":
-            pokemon = split_message[2]
-            team = (
-                self.team if pokemon[:2] == self._player_role else self._opponent_team
+                # Defender is a special flag like [premajor], not a pokemon
+                defender = None
+        except (ValueError, IndexError):
+            attacker, move = split_message[2:4]
+            defender = None
+        self.get_pokemon(attacker).prepare(move, defender)
+
+    @_handles("-primal")
+    def _parse_primal(self, split_message: List[str]):
+        pokemon = split_message[2]
+        self.get_pokemon(pokemon).primal()
+
+    @_handles("-setboost")
+    def _parse_setboost(self, split_message: List[str]):
+        pokemon, stat, amount = split_message[2:5]
+        self.get_pokemon(pokemon).set_boost(stat, int(amount))
+
+    @_handles("-sethp")
+    def _parse_sethp(self, split_message: List[str]):
+        pokemon, hp_status = split_message[2:4]
+        self.get_pokemon(pokemon).set_hp(hp_status)
+
+    @_handles("-sideend")
+    def _parse_sideend(self, split_message: List[str]):
+        side, condition = split_message[2:4]
+        self.side_end(side, condition)
+
+    @_handles("-sidestart")
+    def _parse_sidestart(self, split_message: List[str]):
+        side, condition = split_message[2:4]
+        self._side_start(side, condition)
+
+    @_handles("-swapboost")
+    def _parse_swapboost(self, split_message: List[str]):
+        source, target, stats = split_message[2:5]
+        source = self.get_pokemon(source)
+        target = self.get_pokemon(target)
+        for stat in stats.split(", "):
+            source.boosts[stat], target.boosts[stat] = (
+                target.boosts[stat],
+                source.boosts[stat],
             )
-            for mon in team.values():
-                mon.cure_status()
-        elif split_message[1] == "-end":
-            pokemon, effect = split_message[2:4]
-            self.get_pokemon(pokemon).end_effect(effect)
-        elif split_message[1] == "-endability":
-            pokemon = split_message[2]
-            self.get_pokemon(pokemon).ability = None
-        elif split_message[1] == "-enditem":
-            pokemon, item = split_message[2:4]
-            self.get_pokemon(pokemon).end_item(item)
-        elif split_message[1] == "-fieldend":
-            condition = split_message[2]
-            self._field_end(condition)
-        elif split_message[1] == "-fieldstart":
-            condition = split_message[2]
-            self.field_start(condition)
-        elif split_message[1] in ["-formechange", "detailschange"]:
-            pokemon, species = split_message[2:4]
-            self.get_pokemon(pokemon).forme_change(species)
-        elif split_message[1] == "-invertboost":
-            pokemon = split_message[2]
-            self.get_pokemon(pokemon).invert_boosts()
-        elif split_message[1] == "-item":
-            pokemon, item = split_message[2:4]
-            self.get_pokemon(pokemon).item = to_id_str(item)
-        elif split_message[1] == "-mega":
-            if self.player_role is not None and not split_message[2].startswith(
-                self.player_role
-            ):
-                self._opponent_can_mega_evolve = False
-            pokemon, megastone = split_message[2:4]
-            self.get_pokemon(pokemon).mega_evolve(megastone)
-        elif split_message[1] == "-mustrecharge":
-            pokemon = split_message[2]
-            self.get_pokemon(pokemon).must_recharge = True
-        elif split_message[1] == "-prepare":
-            try:
-                attacker, move, defender = split_message[2:5]
-                # Check if defender is a valid pokemon identifier (starts with p1 or p2)
-                if defender.startswith(('p1', 'p2')):
-                    defender = self.get_pokemon(defender)
-                    if to_id_str(move) == "skydrop":
-                        defender.start_effect("Sky Drop")
+
+    @_handles("-transform")
+    def _parse_transform(self, split_message: List[str]):
+        pokemon, into = split_message[2:4]
+        self.get_pokemon(pokemon).transform(self.get_pokemon(into))
+
+    @_handles("-zpower")
+    def _parse_zpower(self, split_message: List[str]):
+        if self._player_role is not None and not split_message[2].startswith(
+            self._player_role
+        ):
+            self._opponent_can_z_move = False
+
+        pokemon = split_message[2]
+        self.get_pokemon(pokemon).used_z_move()
+
+    @_handles("clearpoke")
+    def _parse_clearpoke(self, split_message: List[str]):
+        # print("Battle.")
+        self.in_team_preview = True
+        for mon in self.team.values():
+            mon.clear_active()
+
+    @_handles("gen")
+    def _parse_gen(self, split_message: List[str]):
+        self._format = split_message[2]
+
+    @_handles("inactive")
+    def _parse_inactive(self, split_message: List[str]):
+        if "disconnected" in split_message[2]:
+            self._anybody_inactive = True
+        elif "reconnected" in split_message[2]:
+            self._anybody_inactive = False
+            self._reconnected = True
+        elif "Time left:" in split_message[2]:
+            # Parse time from message like: "Time left: 150 sec this turn | 300 sec total"
+            import re
+            match = re.search(r'(\d+) sec total', split_message[2])
+            if match:
+                self._time_left = int(match.group(1))
+
+    @_handles("player")
+    def _parse_player(self, split_message: List[str]):
+        if len(split_message) == 6:
+            player, username, avatar, rating = split_message[2:6]
+        else:
+            if not self._anybody_inactive:
+                if self._reconnected:
+                    self._reconnected = False
                 else:
-                    # Defender is a special flag like [premajor], not a pokemon
-                    defender = None
-            except (ValueError, IndexError):
-                attacker, move = split_message[2:4]
-                defender = None
-            self.get_pokemon(attacker).prepare(move, defender)
-        elif split_message[1] == "-primal":
-            pokemon = split_message[2]
-            self.get_pokemon(pokemon).primal()
-        elif split_message[1] == "-setboost":
-            pokemon, stat, amount = split_message[2:5]
-            self.get_pokemon(pokemon).set_boost(stat, int(amount))
-        elif split_message[1] == "-sethp":
-            pokemon, hp_status = split_message[2:4]
-            self.get_pokemon(pokemon).set_hp(hp_status)
-        elif split_message[1] == "-sideend":
-            side, condition = split_message[2:4]
-            self.side_end(side, condition)
-        elif split_message[1] == "-sidestart":
-            side, condition = split_message[2:4]
-            self._side_start(side, condition)
-        elif split_message[1] == "-swapboost":
-            source, target, stats = split_message[2:5]
-            source = self.get_pokemon(source)
-            target = self.get_pokemon(target)
-            for stat in stats.split(", "):
-                source.boosts[stat], target.boosts[stat] = (
-                    target.boosts[stat],
-                    source.boosts[stat],
-                )
-        elif split_message[1] == "-transform":
-            pokemon, into = split_message[2:4]
-            self.get_pokemon(pokemon).transform(self.get_pokemon(into))
-        elif split_message[1] == "-zpower":
-            if self._player_role is not None and not split_message[2].startswith(
-                self._player_role
-            ):
-                self._opponent_can_z_move = False
+                    raise RuntimeError(f"Invalid player message: {split_message}")
+            return
+        if username == self._player_username:
+            self._player_role = player
+        return self._players.append(
+            {
+                "username": username,
+                "player": player,
+                "avatar": avatar,
+                "rating": rating,
+            }
+        )
 
-            pokemon = split_message[2]
-            self.get_pokemon(pokemon).used_z_move()
-        elif split_message[1] == "clearpoke":
-            # print("Battle.")
-            self.in_team_preview = True
-            for mon in self.team.values():
-                mon.clear_active()
-        elif split_message[1] == "gen":
-            self._format = split_message[2]
-        elif split_message[1] == "inactive":
-            if "disconnected" in split_message[2]:
-                self._anybody_inactive = True
-            elif "reconnected" in split_message[2]:
-                self._anybody_inactive = False
-                self._reconnected = True
-            elif "Time left:" in split_message[2]:
-                # Parse time from message like: "Time left: 150 sec this turn | 300 sec total"
-                import re
-                match = re.search(r'(\d+) sec total', split_message[2])
-                if match:
-                    self._time_left = int(match.group(1))
-        elif split_message[1] == "player":
-            if len(split_message) == 6:
-                player, username, avatar, rating = split_message[2:6]
-            else:
-                if not self._anybody_inactive:
-                    if self._reconnected:
-                        self._reconnected = False
-                    else:
-                        raise RuntimeError(f"Invalid player message: {split_message}")
-                return
-            if username == self._player_username:
-                self._player_role = player
-            return self._players.append(
-                {
-                    "username": username,
-                    "player": player,
-                    "avatar": avatar,
-                    "rating": rating,
-                }
-            )
-        elif split_message[1] == "poke":
-            #pass    #TODO make this not register teampreview pokemon while playing VGC b/c it messes with showteam
-            player, details = split_message[2:4]
-            self._register_teampreview_pokemon(player, details)
-        elif split_message[1] == "premove":
-            pokemon, details = split_message[2:4]
-            mon = self.get_pokemon(pokemon, force_self_team=True)
-            mon._add_move(details)
-        elif split_message[1] == "raw":
-            # Check if this is a rating message (contains "'s rating: ")
-            if "'s rating: " in split_message[2]:
-                username, rating_info = split_message[2].split("'s rating: ")
-                rating = int(rating_info[:4])
-                if username == self.player_username:
-                    self._rating = rating
-                elif username == self.opponent_username:
-                    self._opponent_rating = rating
-                elif self.logger is not None:
-                    self.logger.warning(
-                        "Rating information regarding an unrecognized username received. "
-                    "Received '%s', while only known players are '%s' and '%s'",
-                    username,
-                    self.player_username,
-                    self.opponent_username,
-                    )
-            else:
-                # Handle non-rating raw messages (like throttle notices)
-                if self.logger is not None:
-                    self.logger.debug("Raw message received: %s", split_message[2])
-        elif split_message[1] == "replace":
-            pokemon = split_message[2]
-            details = split_message[3]
-            self.end_illusion(pokemon, details)
-        elif split_message[1] == "start":
-            self.in_team_preview = False
-        elif split_message[1] == "swap":
-            pokemon, position = split_message[2:4]
-            self._swap(pokemon, position)  # type: ignore
-        elif split_message[1] == "teamsize":
-            player, number = split_message[2:4]
-            number = int(number)
-            self._team_size[player] = number
-        elif split_message[1] in {"message", "-message"} and self.logger is not None:
-            self.logger.info("Received message: %s", split_message[2])
-        elif split_message[1] == "-immune":
-            if len(split_message) == 4:
-                mon, cause = split_message[2:]
-
-                if cause.startswith("[from] ability:"):
-                    ability = cause.replace("[from] ability:", "")
-                    self.get_pokemon(mon).ability = to_id_str(ability)
-        elif split_message[1] == "-swapsideconditions":
-            self._side_conditions, self._opponent_side_conditions = (
-                self._opponent_side_conditions,
-                self._side_conditions,
-            )
-        elif split_message[1] == "title":
-            player_1, player_2 = split_message[2].split(" vs. ")
-            self.players = player_1, player_2
-        elif split_message[1] == "-terastallize":
-            pokemon, type_ = split_message[2:]
-            pokemon = self.get_pokemon(pokemon)
-            pokemon.terastallize(type_)
-
-            if pokemon.terastallized:
-                if pokemon in set(self.opponent_team.values()):
-                    self._opponent_can_terrastallize = False
-        elif split_message[1] == "sentchoice":
-            # Handle sentchoice messages (player action confirmations)
-            if self.logger is not None:
-                self.logger.debug("Player sent choice: %s", " ".join(split_message[2:]))
-            # This is just a confirmation message, no action needed
+    @_handles("poke")
+    def _parse_poke(self, split_message: List[str]):
+        #pass    #TODO make this not register teampreview pokemon while playing VGC b/c it messes with showteam
+        player, details = split_message[2:4]
+        self._register_teampreview_pokemon(player, details)
+
+    @_handles("premove")
+    def _parse_premove(self, split_message: List[str]):
+        pokemon, details = split_message[2:4]
+        mon = self.get_pokemon(pokemon, force_self_team=True)
+        mon._add_move(details)
+
+    @_handles("raw")
+    def _parse_raw(self, split_message: List[str]):
+        # Check if this is a rating message (contains "'s rating: ")
+        if "'s rating: " in split_message[2]:
+            username, rating_info = split_message[2].split("'s rating: ")
+            rating = int(rating_info[:4])
+            if username == self.player_username:
+                self._rating = rating
+            elif username == self.opponent_username:
+                self._opponent_rating = rating
+            elif self.logger is not None:
+                self.logger.warning(
+                    "Rating information regarding an unrecognized username received. "
+                "Received '%s', while only known players are '%s' and '%s'",
+                username,
+                self.player_username,
+                self.opponent_username,
+                )
         else:
+            # Handle non-rating raw messages (like throttle notices)
+            if self.logger is not None:
+                self.logger.debug("Raw message received: %s", split_message[2])
+
+    @_handles("replace")
+    def _parse_replace(self, split_message: List[str]):
+        pokemon = split_message[2]
+        details = split_message[3]
+        self.end_illusion(pokemon, details)
+
+    @_handles("start")
+    def _parse_start(self, split_message: List[str]):
+        self.in_team_preview = False
+
+    @_handles("swap")
+    def _parse_swap(self, split_message: List[str]):
+        pokemon, position = split_message[2:4]
+        self._swap(pokemon, position)  # type: ignore
+
+    @_handles("teamsize")
+    def _parse_teamsize(self, split_message: List[str]):
+        player, number = split_message[2:4]
+        number = int(number)
+        self._team_size[player] = number
+
+    @_handles("message", "-message")
+    def _parse_message_event(self, split_message: List[str]):
+        if self.logger is None:
             raise NotImplementedError(split_message)
+        self.logger.info("Received message: %s", split_message[2])
+
+    @_handles("-immune")
+    def _parse_immune(self, split_message: List[str]):
+        if len(split_message) == 4:
+            mon, cause = split_message[2:]
+
+            if cause.startswith("[from] ability:"):
+                ability = cause.replace("[from] ability:", "")
+                self.get_pokemon(mon).ability = to_id_str(ability)
+
+    @_handles("-swapsideconditions")
+    def _parse_swapsideconditions(self, split_message: List[str]):
+        self._side_conditions, self._opponent_side_conditions = (
+            self._opponent_side_conditions,
+            self._side_conditions,
+        )
+
+    @_handles("title")
+    def _parse_title(self, split_message: List[str]):
+        player_1, player_2 = split_message[2].split(" vs. ")
+        self.players = player_1, player_2
+
+    @_handles("-terastallize")
+    def _parse_terastallize(self, split_message: List[str]):
+        pokemon, type_ = split_message[2:]
+        pokemon = self.get_pokemon(pokemon)
+        pokemon.terastallize(type_)
+
+        if pokemon.terastallized:
+            if pokemon in set(self.opponent_team.values()):
+                self._opponent_can_terrastallize = False
+
+    @_handles("sentchoice")
+    def _parse_sentchoice(self, split_message: List[str]):
+        # Handle sentchoice messages (player action confirmations)
+        if self.logger is not None:
+            self.logger.debug("Player sent choice: %s", " ".join(split_message[2:]))
+        # This is just a confirmation message, no action needed
+
     @abstractmethod
     def parse_request(self, request: Dict[str, Any]):
         pass
@@ -1197,6 +1402,7 @@ class AbstractBattle(ABC):
     @team.setter
     def team(self, value: Dict[str, Pokemon]):
         self._team = value
+        self._pokemon_index.clear()
 
     @property
     def team_size(self) -> int:
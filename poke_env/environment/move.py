@@ -129,6 +129,28 @@ class Move:
     def __repr__(self) -> str:
         return f"{self._id} (Move object)"
 
+    def __deepcopy__(self, memodict: Optional[Dict[int, Any]] = None) -> "Move":
+        # Every slot but the pp is an immutable value or the shared gen moves
+        # table; the dynamaxed view is a cache and is rebuilt on demand.
+        copied = object.__new__(self.__class__)
+        if memodict is not None:
+            memodict[id(self)] = copied
+        for slot in Move.__slots__:
+            if hasattr(self, slot):
+                object.__setattr__(copied, slot, getattr(self, slot))
+        object.__setattr__(copied, "_dynamaxed_move", None)
+        if hasattr(self, "__dict__"):
+            copied.__dict__.update(copy.deepcopy(self.__dict__, memodict))
+        return copied
+
+    def clone(self) -> "Move":
+        """Returns an independent copy of the move sharing the static move data.
+
+        :return: The copied move.
+        :rtype: Move
+        """
+        return copy.deepcopy(self)
+
     def use(self):
         self._current_pp -= 1
 
@@ -793,6 +815,128 @@ class Move:
         return 200
 
 
+class FrozenMove(Move):
+    """Read-only, interned view of a move.
+
+    Prompt building and damage estimation create the same moves over and over for
+    every matchup and tera scenario. ``FrozenMove.from_id`` returns a single shared
+    instance per ``(move_id, gen)`` whose most used properties are resolved once.
+    Use a regular ``Move`` whenever per-battle state (pp, request target) matters.
+    """
+
+    __slots__ = (
+        "_frozen_base_power",
+        "_frozen_category",
+        "_frozen_heal",
+        "_frozen_priority",
+        "_frozen_status",
+        "_frozen_type",
+    )
+
+    _UNRESOLVED = object()
+
+    def __init__(self, move_id: str, gen: int):
+        object.__setattr__(self, "_dynamaxed_move", None)
+        super().__init__(move_id, gen)
+        # Order matters: pre-split categories are derived from the move type.
+        for slot, prop in (
+            ("_frozen_type", Move.type),
+            ("_frozen_base_power", Move.base_power),
+            ("_frozen_category", Move.category),
+            ("_frozen_heal", Move.heal),
+            ("_frozen_priority", Move.priority),
+            ("_frozen_status", Move.status),
+        ):
+            try:
+                value = prop.fget(self)
+            except (KeyError, TypeError, ValueError):
+                # Malformed entries keep raising lazily, like a regular Move
+                value = self._UNRESOLVED
+            object.__setattr__(self, slot, value)
+
+    def __setattr__(self, name: str, value: Any):
+        if hasattr(self, "_frozen_status"):
+            raise AttributeError(f"{self!r} is read-only")
+        object.__setattr__(self, name, value)
+
+    def __repr__(self) -> str:
+        return f"{self._id} (FrozenMove object)"
+
+    def __copy__(self) -> "FrozenMove":
+        return self
+
+    def __deepcopy__(self, memodict: Optional[Dict[int, Any]] = None) -> "FrozenMove":
+        return self
+
+    def __reduce__(self):
+        return FrozenMove.from_id, (self._id, self._gen)
+
+    @classmethod
+    @lru_cache(None)
+    def from_id(cls, move_id: str, gen: int) -> "FrozenMove":
+        """Returns the shared read-only view of a move.
+
+        :param move_id: The move id.
+        :type move_id: str
+        :param gen: The generation the move data is taken from.
+        :type gen: int
+        :return: The interned move.
+        :rtype: FrozenMove
+        """
+        return cls(move_id, gen)
+
+    def use(self):
+        raise AttributeError(f"{self!r} is read-only")
+
+    @property
+    def base_power(self) -> int:
+        value = self._frozen_base_power
+        if value is self._UNRESOLVED:
+            return Move.base_power.fget(self)
+        return value
+
+    @property
+    def category(self) -> MoveCategory:
+        value = self._frozen_category
+        if value is self._UNRESOLVED:
+            return Move.category.fget(self)
+        return value
+
+    @property
+    def dynamaxed(self):
+        if self._dynamaxed_move is None:
+            object.__setattr__(self, "_dynamaxed_move", DynamaxMove(self))
+        return self._dynamaxed_move
+
+    @property
+    def heal(self) -> float:
+        value = self._frozen_heal
+        if value is self._UNRESOLVED:
+            return Move.heal.fget(self)
+        return value
+
+    @property
+    def priority(self) -> int:
+        value = self._frozen_priority
+        if value is self._UNRESOLVED:
+            return Move.priority.fget(self)
+        return value
+
+    @property
+    def status(self) -> Optional[Status]:
+        value = self._frozen_status
+        if value is self._UNRESOLVED:
+            return Move.status.fget(self)
+        return value
+
+    @property
+    def type(self) -> PokemonType:
+        value = self._frozen_type
+        if value is self._UNRESOLVED:
+            return Move.type.fget(self)
+        return value
+
+
 class EmptyMove(Move):
     def __init__(self, move_id: str):
         self._id = move_id
@@ -839,6 +983,9 @@ class DynamaxMove(Move):
     def __init__(self, parent: Move):
         self._parent: Move = parent
 
+    def __deepcopy__(self, memodict: Optional[Dict[int, Any]] = None) -> "DynamaxMove":
+        return DynamaxMove(copy.deepcopy(self._parent, memodict))
+
     def __getattr__(self, name: str):
         if name[:2] == "__":
             raise AttributeError(name)
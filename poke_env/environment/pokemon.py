@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-import json
+import copy
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 import numpy as np
@@ -55,6 +55,11 @@ class Pokemon:
         "_battle_format",
     )
 
+    # Static data tables, never mutated per battle: copies share them
+    _SHARED_ON_COPY = frozenset(
+        ("_base_stats", "_data", "_possible_abilities", "_sets")
+    )
+
     def __init__(
         self,
         gen: int,
@@ -115,16 +120,8 @@ class Pokemon:
         self._status: Optional[Status] = None
         self._status_counter: int = 0
 
-        # Load appropriate sets file based on battle format
-        # Handle None battle_format gracefully
-        if battle_format and "vgc" in battle_format.lower():
-            sets_file = 'poke_env/data/static/gen9/vgc/sets_1760.json'
-        else:
-            sets_file = 'poke_env/data/static/gen9/ou/sets_1500.json'
-        
-        with open(sets_file, 'r') as f:
-            sets = json.load(f)
-        self._sets = sets
+        # Sets of the battle format, shared read-only between all Pokemon
+        self._sets = GenData.sets_for_format(battle_format)
         
         
         if request_pokemon:
@@ -136,6 +133,30 @@ class Pokemon:
             
         
         
+    def __deepcopy__(self, memodict: Optional[Dict[int, Any]] = None) -> Pokemon:
+        memodict = {} if memodict is None else memodict
+        copied = object.__new__(self.__class__)
+        memodict[id(self)] = copied
+        for slot in self.__slots__:
+            if not hasattr(self, slot):
+                continue
+            value = getattr(self, slot)
+            if slot in self._SHARED_ON_COPY:
+                setattr(copied, slot, value)
+            elif slot == "_boosts" or slot == "_effects":
+                setattr(copied, slot, dict(value))
+            else:
+                setattr(copied, slot, copy.deepcopy(value, memodict))
+        return copied
+
+    def clone(self) -> Pokemon:
+        """Returns an independent copy of the pokemon sharing the static pokedex and sets data.
+
+        :return: The copied pokemon.
+        :rtype: Pokemon
+        """
+        return copy.deepcopy(self)
+
     def __repr__(self) -> str:
         return self.__str__()
 
@@ -871,24 +892,9 @@ class Pokemon:
             tera = set['name']
         
         else:
-            # statistically weighted choice (copy paste lol)
-            def get_weighted_choice(category, id, size=1):
-                category_dict = sets[self.species.lower()][category]
-                p = np.array([float(category_dict[i]['percentage'])/100. for i in range(len(category_dict))])
-                p = p / p.sum()
-                if size > len(category_dict):
-                    size = len(category_dict)
-                item = np.random.choice(category_dict, p=p, size=size, replace=False)
-                if category == 'moves':
-                    out = [item[i][id] if item[i][id] != 'Nothing' else '' for i in range(len(item))]
-                else:
-                    item = item[0]
-                    out = item[id]
-                if id == 'stats':
-                    return out, item['nature']
-                return out
-            
-            tera = get_weighted_choice('tera', 'name')
+            # statistically weighted choice
+            usage_sets = GenData.usage_sets_for_format(self._battle_format)
+            tera = usage_sets.choice(self.species.lower(), 'tera')[0]['name']
             
         return tera
         
@@ -950,12 +956,8 @@ class Pokemon:
                     # Fallback to a default Pokemon
                     normalized_species = list(sets.keys())[0]
                     
-                category_dict = sets[normalized_species][category]
-                p = np.array([float(category_dict[i]['percentage'])/100. for i in range(len(category_dict))])
-                p = p / p.sum()
-                if size > len(category_dict):
-                    size = len(category_dict)
-                item = np.random.choice(category_dict, p=p, size=size, replace=False)
+                usage_sets = GenData.usage_sets_for_format(self._battle_format)
+                item = usage_sets.choice(normalized_species, category, size=size)
                 if category == 'moves':
                     out = [item[i][id] if item[i][id] != 'Nothing' else '' for i in range(len(item))]
                 else:
@@ -0,0 +1,526 @@
+"""This module defines an in-process arena playing players against each other
+without a showdown server.
+"""
+
+import asyncio
+import math
+import multiprocessing
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from logging import getLogger
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import orjson
+
+from poke_env.concurrency import POKE_LOOP
+from poke_env.data import GenData, to_id_str
+from poke_env.environment.battle import Battle
+from poke_env.environment.move import FrozenMove, Move
+from poke_env.environment.move_category import MoveCategory
+from poke_env.environment.pokemon import Pokemon
+from poke_env.environment.status import Status
+from poke_env.player.local_simulation import LocalSim
+from poke_env.player.player import Player
+from poke_env.stats import compute_raw_stats
+from poke_env.teambuilder.teambuilder import Teambuilder
+from poke_env.teambuilder.teambuilder_pokemon import TeambuilderPokemon
+
+TEAMS_ROOT = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "static", "teams")
+
+# Chance of a Pokemon not moving because of its status
+CANT_MOVE_CHANCE = {Status.PAR: 0.25, Status.FRZ: 0.8, Status.SLP: 2 / 3}
+# Fraction of max HP lost at the end of every turn because of a status
+RESIDUAL_DAMAGE = {Status.BRN: 1 / 16, Status.PSN: 1 / 8, Status.TOX: 1 / 8}
+
+
+@dataclass
+class GameResult:
+    """Outcome of an arena game."""
+    winner: Optional[str]
+    turns: int
+    seed: int
+    players: Tuple[str, str]
+
+    @property
+    def tie(self) -> bool:
+        return self.winner is None
+
+
+@dataclass
+class ArenaResults:
+    """Outcomes of a series of arena games."""
+    games: List[GameResult] = field(default_factory=list)
+
+    @property
+    def n_games(self) -> int:
+        return len(self.games)
+
+    def wins(self, username: str) -> int:
+        return sum(game.winner == username for game in self.games)
+
+    @property
+    def ties(self) -> int:
+        return sum(game.tie for game in self.games)
+
+    def win_rate(self, username: str) -> float:
+        return self.wins(username) / self.n_games if self.games else 0.0
+
+
+class _ArenaPokemon(Pokemon):
+    """A Pokemon of the arena's ground truth, with the exact stats of its set."""
+
+    __slots__ = ("exact_stats", "name", "details", "moveset", "tera_type")
+
+    def calculate_stats(self, ivs=(31,) * 6, evs=(85,) * 6, battle_format="random"):
+        return self.exact_stats
+
+
+def _arena_pokemon(set_: TeambuilderPokemon, data: GenData, battle_format: str) -> _ArenaPokemon:
+    species = to_id_str(set_.species or set_.nickname)
+    entry = data.pokedex[species]
+    mon = _ArenaPokemon(gen=data.gen, species=species, battle_format=battle_format)
+    mon._level = set_.level or 100
+    # Nicknames are not kept: identifiers use the base species name
+    mon.name = data.pokedex.get(to_id_str(entry.get("baseSpecies", species)), entry)["name"]
+    mon.details = f"{entry['name']}, L{mon._level}"
+
+    nature = to_id_str(set_.nature) if set_.nature else "serious"
+    stats = compute_raw_stats(species, set_.evs, set_.ivs, mon._level, nature, data)
+    mon.exact_stats = dict(zip(["hp", "atk", "def", "spa", "spd", "spe"], stats))
+    mon._max_hp = mon._current_hp = mon.exact_stats["hp"]
+
+    if set_.ability:
+        mon._ability = to_id_str(set_.ability)
+    elif data.gen >= 3:
+        mon._ability = to_id_str(entry["abilities"]["0"])
+    mon._item = to_id_str(set_.item) if set_.item else ""
+    mon.moveset = [to_id_str(move) for move in set_.moves]
+    mon._moves = {move_id: FrozenMove.from_id(move_id, data.gen) for move_id in mon.moveset}
+    mon.tera_type = set_.tera_type or entry["types"][0]
+    return mon
+
+
+def _heal(move: Move) -> float:
+    # Gen 1 Recover and Soft-Boiled heal half of the user's HP from a null heal entry
+    if "heal" in move.entry and move.entry["heal"] is None:
+        return 0.5
+    return move.heal
+
+
+def load_format_teams(battle_format: str) -> List[str]:
+    """Showdown-format teams shipped for a format, in poke_env/data/static/teams."""
+    directory = os.path.join(TEAMS_ROOT, battle_format)
+    if not os.path.isdir(directory):
+        raise ValueError(f"No teams available for {battle_format}, pass them explicitly.")
+    teams = []
+    for name in sorted(os.listdir(directory)):
+        with open(os.path.join(directory, name)) as f:
+            teams.append(f.read())
+    return teams
+
+
+class _ArenaSide:
+    def __init__(self, role: str, player: Player, team: List[_ArenaPokemon]):
+        self.role = role
+        self.player = player
+        # Showdown order: the active Pokemon is always first
+        self.mons = team
+        self.choice: Optional[str] = None
+        self.foe: "_ArenaSide"
+
+    @property
+    def active(self) -> _ArenaPokemon:
+        return self.mons[0]
+
+    @property
+    def defeated(self) -> bool:
+        return all(mon.fainted for mon in self.mons)
+
+    def ident(self, mon: Optional[_ArenaPokemon] = None) -> str:
+        return f"{self.role}a: {(mon or self.active).name}"
+
+
+class ArenaGame:
+    """A game between two players, simulated locally.
+
+    The arena plays the part of the showdown server: it sends each player the
+    battle frames and requests of its side through PSClient._handle_message,
+    reads their choices from the messages they send back, and resolves turns
+    with LocalSim's damage calculation. Switches, moves with their accuracy,
+    damage rolls, healing, drain, recoil, boosts, major statuses and faints are
+    simulated; field effects, volatile statuses and items beyond damage
+    modifiers are not.
+    """
+
+    def __init__(self, player_1: Player, player_2: Player, team_1: str, team_2: str,
+                 battle_format: str, seed: int, battle_tag: str, max_turns: int = 200):
+        self.data = GenData.from_format(battle_format)
+        self.format = battle_format
+        self.rng = random.Random(seed)
+        self.seed = seed
+        self.battle_tag = battle_tag
+        self.max_turns = max_turns
+        self.team_preview = self.data.gen >= 5 and "random" not in battle_format
+        self.sides = [
+            _ArenaSide("p1", player_1, self._build_team(team_1)),
+            _ArenaSide("p2", player_2, self._build_team(team_2)),
+        ]
+        self.sides[0].foe, self.sides[1].foe = self.sides[1], self.sides[0]
+        self.turn = 0
+        self.rqid = 0
+        # Per side lines of the frame being built: HP is exact for its owner only
+        self._lines: Tuple[List[str], List[str]] = ([], [])
+        self.sim = LocalSim(Battle(battle_tag, player_1.username, getLogger("arena"), gen=self.data.gen),
+                            {}, {}, {}, {}, {}, {}, self.data, True, format=battle_format)
+
+    def _build_team(self, team: str) -> List[_ArenaPokemon]:
+        return [_arena_pokemon(set_, self.data, self.format) for set_ in Teambuilder.parse_showdown_team(team)]
+
+    # Protocol output
+
+    def _emit(self, line: str):
+        for lines in self._lines:
+            lines.append(line)
+
+    def _emit_hp(self, prefix: str, side: _ArenaSide, mon: _ArenaPokemon, suffix: str = ""):
+        for viewer, lines in zip(self.sides, self._lines):
+            lines.append(prefix + self._condition(mon, exact=viewer is side) + suffix)
+
+    @staticmethod
+    def _condition(mon: _ArenaPokemon, exact: bool) -> str:
+        if mon.fainted:
+            return "0 fnt"
+        if exact:
+            hp = f"{mon.current_hp}/{mon.max_hp}"
+        else:
+            hp = f"{math.ceil(mon.current_hp / mon.max_hp * 100)}/100"
+        if mon.status is not None:
+            hp += " " + mon.status.name.lower()
+        return hp
+
+    async def _flush(self):
+        for side, lines in zip(self.sides, self._lines):
+            if lines:
+                await side.player.ps_client._handle_message("\n".join([">" + self.battle_tag] + lines))
+        self._lines = ([], [])
+
+    async def _request(self, side: _ArenaSide, kind: str = "move"):
+        self.rqid += 1
+        pokemon = [{
+            "ident": f"{side.role}: {mon.name}",
+            "details": mon.details,
+            "condition": self._condition(mon, exact=True),
+            "active": index == 0 and kind != "teampreview",
+            "stats": {stat: mon.exact_stats[stat] for stat in ["atk", "def", "spa", "spd", "spe"]},
+            "moves": mon.moveset,
+            "baseAbility": mon.ability or "",
+            "item": mon.item or "",
+            "pokeball": "pokeball",
+            "ability": mon.ability or "",
+            "teraType": mon.tera_type,
+            "terastallized": "",
+        } for index, mon in enumerate(side.mons)]
+        request = {"side": {"name": side.player.username, "id": side.role, "pokemon": pokemon}, "rqid": self.rqid}
+        if kind == "teampreview":
+            request["teamPreview"] = True
+            request["maxTeamSize"] = len(side.mons)
+        elif kind == "wait":
+            request["wait"] = True
+        elif kind == "switch":
+            request["forceSwitch"] = [True]
+        else:
+            request["active"] = [{"moves": [{
+                "move": move.entry["name"], "id": move.id, "pp": move.max_pp, "maxpp": move.max_pp,
+                "target": move.target, "disabled": False,
+            } for move in side.active.moves.values()]}]
+        side.choice = None
+        await side.player.ps_client._handle_message(
+            f">{self.battle_tag}\n|request|{orjson.dumps(request).decode()}"
+        )
+
+    # Choices
+
+    def _capture(self, side: _ArenaSide):
+        async def send_message(message: str, room: str = "", message_2: Optional[str] = None):
+            if room == self.battle_tag:
+                side.choice = message
+        return send_message
+
+    def _default_switch(self, side: _ArenaSide) -> int:
+        return next(index for index, mon in enumerate(side.mons) if index and not mon.fainted)
+
+    def _switch_choice(self, side: _ArenaSide) -> int:
+        """Bench index a side switches to, from its choice or by default."""
+        words = (side.choice or "").split()
+        if len(words) >= 3 and words[1] == "switch":
+            target = words[2]
+            for index, mon in enumerate(side.mons):
+                if index and not mon.fainted and (target in (mon.species, to_id_str(mon.name)) or target == str(index + 1)):
+                    return index
+        return self._default_switch(side)
+
+    def _turn_choice(self, side: _ArenaSide) -> Tuple[str, object]:
+        """('switch', bench index) or ('move', move) of a side, from its choice or by default."""
+        words = (side.choice or "").split()
+        if len(words) >= 3 and words[1] == "switch" and any(not mon.fainted for mon in side.mons[1:]):
+            return "switch", self._switch_choice(side)
+        moves = list(side.active.moves.values())
+        if len(words) >= 3 and words[1] == "move":
+            target = words[2]
+            for index, move in enumerate(moves):
+                if target == move.id or target == str(index + 1):
+                    return "move", move
+        return "move", moves[0]
+
+    # Simulation
+
+    def _switch(self, side: _ArenaSide, index: int):
+        side.active.clear_boosts()
+        side.mons[0], side.mons[index] = side.mons[index], side.mons[0]
+        mon = side.active
+        self._emit_hp(f"|switch|{side.ident()}|{mon.details}|", side, mon)
+
+    def _set_hp(self, side: _ArenaSide, mon: _ArenaPokemon, hp: int, event: str, suffix: str = ""):
+        hp = max(0, min(mon.max_hp, hp))
+        if hp == mon.current_hp:
+            return
+        mon._current_hp = hp
+        if hp == 0:
+            mon._status = Status.FNT
+        self._emit_hp(f"|{event}|{side.ident(mon)}|", side, mon, suffix)
+
+    def _boost(self, side: _ArenaSide, boosts: Dict[str, int]):
+        mon = side.active
+        for stat, amount in boosts.items():
+            before = mon.boosts[stat]
+            mon.boost(stat, amount)
+            if mon.boosts[stat] != before:
+                event = "-boost" if amount > 0 else "-unboost"
+                self._emit(f"|{event}|{side.ident()}|{stat}|{abs(mon.boosts[stat] - before)}")
+
+    def _speed(self, side: _ArenaSide) -> float:
+        mon = side.active
+        speed = mon.exact_stats["spe"] * self.sim.boost_multiplier("spe", mon.boosts["spe"])
+        return speed / 2 if mon.status == Status.PAR else speed
+
+    def _use_move(self, side: _ArenaSide, move: Move, foe_move: Optional[Move]):
+        user, foe = side.active, side.foe
+        cant_chance = CANT_MOVE_CHANCE.get(user.status)
+        if cant_chance is not None:
+            if self.rng.random() < cant_chance:
+                self._emit(f"|cant|{side.ident()}|{user.status.name.lower()}")
+                return
+            if user.status in (Status.FRZ, Status.SLP):
+                self._emit(f"|-curestatus|{side.ident()}|{user.status.name.lower()}|[msg]")
+                user._status = None
+
+        self._emit(f"|move|{side.ident()}|{move.entry['name']}|{foe.ident()}")
+        target = foe.active
+        targets_foe = move.target not in ("self", "allySide", "allyTeam", "adjacentAllyOrSelf")
+        if targets_foe and target.fainted:
+            return
+        if targets_foe and self.rng.random() > move.accuracy:
+            self._emit(f"|-miss|{side.ident()}|{foe.ident()}")
+            return
+
+        if move.category != MoveCategory.STATUS:
+            if target.damage_multiplier(move) == 0:
+                self._emit(f"|-immune|{foe.ident()}")
+                return
+            damage = self.sim.calc_base_dmg(user, target, move, team={mon.species: mon for mon in side.mons})
+            damage = self.sim.modify_damage(damage, user, target, move, foe_move, use_expected=False)
+            damage = max(1, int(damage * self.rng.uniform(0.85, 1.0)))
+            dealt = min(damage, target.current_hp)
+            self._set_hp(foe, target, target.current_hp - damage, "-damage")
+            if move.drain:
+                self._set_hp(side, user, user.current_hp + max(1, int(dealt * move.drain)), "-heal", "|[from] drain")
+            if move.recoil:
+                self._set_hp(side, user, user.current_hp - max(1, int(dealt * move.recoil)), "-damage", "|[from] Recoil")
+        heal = _heal(move)
+        if heal:
+            self._set_hp(side, user, user.current_hp + int(user.max_hp * heal), "-heal")
+        if move.status is not None and not target.fainted and target.status is None:
+            target._status = move.status
+            self._emit(f"|-status|{foe.ident()}|{move.status.name.lower()}")
+        if move.boosts:
+            self._boost(side if move.target == "self" else foe, move.boosts)
+        if move.self_boost and not user.fainted:
+            self._boost(side, move.self_boost)
+
+    def _resolve_turn(self):
+        actions = {side.role: self._turn_choice(side) for side in self.sides}
+        for side in self.sides:
+            kind, value = actions[side.role]
+            if kind == "switch":
+                self._switch(side, value)
+
+        movers = [side for side in self.sides if actions[side.role][0] == "move"]
+        movers.sort(key=lambda side: (actions[side.role][1].priority, self._speed(side), self.rng.random()),
+                    reverse=True)
+        for side in movers:
+            if side.active.fainted:
+                continue
+            foe_action = actions[side.foe.role]
+            foe_move = foe_action[1] if foe_action[0] == "move" else None
+            self._use_move(side, actions[side.role][1], foe_move)
+            for fainted_side in self.sides:
+                if fainted_side.active.fainted:
+                    self._emit(f"|faint|{fainted_side.ident()}")
+            if any(side.active.fainted for side in self.sides):
+                break
+
+        for side in self.sides:
+            mon = side.active
+            residual = RESIDUAL_DAMAGE.get(mon.status)
+            if residual is not None and not mon.fainted:
+                status = mon.status.name.lower()
+                self._set_hp(side, mon, mon.current_hp - max(1, int(mon.max_hp * residual)), "-damage",
+                             f"|[from] {status}")
+                if mon.fainted:
+                    self._emit(f"|faint|{side.ident()}")
+
+    async def _replace_fainted(self):
+        """Asks the sides whose active Pokemon fainted to switch, as the server does after a turn."""
+        switching = [side for side in self.sides if side.active.fainted and not side.defeated]
+        if not switching:
+            return
+        for side in self.sides:
+            await self._request(side, "switch" if side in switching else "wait")
+        for side in switching:
+            self._switch(side, self._switch_choice(side))
+
+    async def play(self) -> GameResult:
+        for side in self.sides:
+            side.player.ps_client.send_message = self._capture(side)
+
+        self._emit("|init|battle")
+        self._emit(f"|title|{self.sides[0].player.username} vs. {self.sides[1].player.username}")
+        for side in self.sides:
+            self._emit(f"|player|{side.role}|{side.player.username}|1|")
+        for side in self.sides:
+            self._emit(f"|teamsize|{side.role}|{len(side.mons)}")
+        self._emit("|gametype|singles")
+        self._emit(f"|gen|{self.data.gen}")
+        if self.team_preview:
+            self._emit("|clearpoke")
+            for side in self.sides:
+                for mon in side.mons:
+                    self._emit(f"|poke|{side.role}|{mon.details}|")
+            await self._flush()
+            for side in self.sides:
+                await self._request(side, "teampreview")
+            self._emit("|teampreview")
+            await self._flush()
+            for side in self.sides:
+                words = (side.choice or "").split()
+                if len(words) == 2 and words[0] == "/team":
+                    order = [int(c) - 1 for c in words[1] if c.isdigit() and 0 < int(c) <= len(side.mons)]
+                    order = list(dict.fromkeys(order))
+                    order += [index for index in range(len(side.mons)) if index not in order]
+                    side.mons = [side.mons[index] for index in order]
+
+        self._emit("|")
+        self._emit("|start")
+        for side in self.sides:
+            self._emit_hp(f"|switch|{side.ident()}|{side.active.details}|", side, side.active)
+
+        winner = None
+        while True:
+            self.turn += 1
+            if self.turn > self.max_turns:
+                self._emit("|tie")
+                await self._flush()
+                break
+            self._emit(f"|turn|{self.turn}")
+            await self._flush()
+            for side in self.sides:
+                await self._request(side)
+            self._emit("|")
+            self._resolve_turn()
+            defeated = [side for side in self.sides if side.defeated]
+            if defeated:
+                if len(defeated) == 2:
+                    self._emit("|tie")
+                else:
+                    winner = defeated[0].foe.player.username
+                    self._emit(f"|win|{winner}")
+                await self._flush()
+                break
+            self._emit("|upkeep")
+            await self._flush()
+            await self._replace_fainted()
+            self._emit("|")
+
+        return GameResult(winner=winner, turns=min(self.turn, self.max_turns), seed=self.seed,
+                          players=(self.sides[0].player.username, self.sides[1].player.username))
+
+
+class Arena:
+    """Plays games between two players locally, without a showdown server.
+
+    Players are created by picklable factories (classes or functools.partial of
+    them) called with the battle format and start_listening=False, so that games
+    can be spread over worker processes, each with its own pair of players.
+
+    :param player_1: Factory of the first player.
+    :param player_2: Factory of the second player.
+    :param battle_format: Singles battle format.
+    :param teams: Showdown-format teams the players' teams are drawn from. Defaults
+        to the teams shipped for the format.
+    :param max_turns: Turn after which a game is declared a tie.
+    :param seed: Seed of the first game; game i uses seed + i.
+    """
+
+    def __init__(self, player_1: Callable[..., Player], player_2: Callable[..., Player],
+                 battle_format: str = "gen9ou", teams: Optional[Sequence[str]] = None,
+                 max_turns: int = 200, seed: int = 0):
+        if "vgc" in battle_format or "doubles" in battle_format:
+            raise ValueError("The arena only plays singles formats.")
+        self.player_factories = (player_1, player_2)
+        self.battle_format = battle_format
+        self.teams = list(teams) if teams is not None else load_format_teams(battle_format)
+        self.max_turns = max_turns
+        self.seed = seed
+
+    def create_players(self) -> Tuple[Player, Player]:
+        return tuple(factory(battle_format=self.battle_format, start_listening=False)
+                     for factory in self.player_factories)
+
+    def play_game(self, players: Tuple[Player, Player], seed: int) -> GameResult:
+        """Plays one game between already created players.
+
+        Players draw from the global random module: it is seeded for the game, so
+        that games are reproducible, and restored afterwards.
+        """
+        rng = random.Random(seed)
+        game = ArenaGame(players[0], players[1], rng.choice(self.teams), rng.choice(self.teams),
+                         self.battle_format, seed, f"battle-{self.battle_format}-{seed}", self.max_turns)
+        state = random.getstate()
+        random.seed(seed)
+        try:
+            return asyncio.run_coroutine_threadsafe(game.play(), POKE_LOOP).result()
+        finally:
+            random.setstate(state)
+
+    def play_games(self, seeds: Sequence[int]) -> List[GameResult]:
+        players = self.create_players()
+        results = []
+        for seed in seeds:
+            results.append(self.play_game(players, seed))
+            for player in players:
+                player.reset_battles()
+        return results
+
+    def play(self, n_games: int, processes: int = 1) -> ArenaResults:
+        """Plays n_games games, spread over `processes` worker processes."""
+        seeds = list(range(self.seed, self.seed + n_games))
+        if processes <= 1:
+            return ArenaResults(self.play_games(seeds))
+        chunks = [seeds[index::processes] for index in range(processes) if seeds[index::processes]]
+        # Forked workers would inherit POKE_LOOP without the thread running it
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=len(chunks), mp_context=context) as executor:
+            games = [game for chunk in executor.map(self.play_games, chunks) for game in chunk]
+        return ArenaResults(sorted(games, key=lambda game: game.seed))
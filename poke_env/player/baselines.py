@@ -10,7 +10,7 @@ import numpy as np
 from poke_env.environment.abstract_battle import AbstractBattle
 from poke_env.environment.battle import Battle
 from poke_env.environment.double_battle import DoubleBattle
-from poke_env.environment.move import Move
+from poke_env.environment.move import FrozenMove, Move
 from poke_env.environment.move_category import MoveCategory
 from poke_env.environment.pokemon import Pokemon
 from poke_env.environment.side_condition import SideCondition
@@ -29,8 +29,6 @@ from pokechamp.data_cache import (
     get_cached_pokedex
 )
 
-move_effect = get_cached_move_effect()
-
 def calculate_move_type_damage_multipier(type_1, type_2, type_chart, constraint_type_list):
     TYPE_list = 'BUG,DARK,DRAGON,ELECTRIC,FAIRY,FIGHTING,FIRE,FLYING,GHOST,GRASS,GROUND,ICE,NORMAL,POISON,PSYCHIC,ROCK,STEEL,WATER'.split(",")
 
@@ -231,12 +229,14 @@ class OneStepPlayer(Player):
                  save_replays=None,
                  account_configuration=None,
                  server_configuration=None,
-                 K=2):
+                 K=2,
+                 start_listening=True):
         super().__init__(battle_format=battle_format,
                          team=team,
                          save_replays=save_replays,
                          account_configuration=account_configuration,
-                         server_configuration=server_configuration)
+                         server_configuration=server_configuration,
+                         start_listening=start_listening)
         
         self.gen = GenData.from_format(battle_format)
         # Use cached data instead of loading files repeatedly
@@ -259,7 +259,7 @@ class OneStepPlayer(Player):
         if battle.active_pokemon.species == mon.species and not is_opp:
             moves = [move.id for move in battle.available_moves]
         for move_id in moves:
-            move = Move(move_id, gen=sim.gen.gen)
+            move = FrozenMove.from_id(move_id, sim.gen.gen)
             t = np.inf
             if move.category == MoveCategory.STATUS:
                 # apply stat boosting effects to see if it will KO in fewer turns
@@ -0,0 +1,192 @@
+"""This module defines a background writer streaming battle logs to disk.
+"""
+
+import atexit
+import gzip
+import os
+import queue
+import threading
+from logging import getLogger
+from typing import IO, Any, Dict, Iterable, Optional, Tuple
+
+import orjson
+
+from poke_env.data.replay_template import REPLAY_TEMPLATE
+
+PROTOCOL_SUFFIX = ".log.gz"
+DECISIONS_SUFFIX = ".decisions.jsonl.gz"
+
+_WRITE, _CLOSE, _FLUSH, _STOP = range(4)
+
+
+class BattleLogWriter:
+    """Streams battle protocol lines and decision records to per-battle gzip files.
+
+    Writes are queued from the event loop (or decision threads) and performed by a
+    single background thread, so disk I/O never blocks the loop and no battle log
+    is kept in memory. Queued writes are bounded: when the disk cannot keep up,
+    writes are dropped and counted in ``dropped`` rather than blocking the caller.
+    Closing a battle neither counts towards the bound nor is dropped, so that its
+    files are always closed, after the writes queued before it. Pending writes are
+    completed and open files closed when the interpreter exits, or on ``close``.
+
+    For every battle, ``{username} - {battle_tag}.log.gz`` holds the protocol lines
+    and ``{username} - {battle_tag}.decisions.jsonl.gz`` the decision records, one
+    JSON object per line. When a battle is closed, its replay is also rendered to
+    ``{username} - {battle_tag}.html`` from the streamed log if ``html`` is set.
+
+    :param folder: Folder the files are written to. Created if needed.
+    :type folder: str
+    :param max_pending: Maximum number of queued writes. Defaults to 10000.
+    :type max_pending: int
+    :param html: Whether to render HTML replays of closed battles. Defaults to True.
+    :type html: bool
+    """
+
+    def __init__(self, folder: str, max_pending: int = 10000, html: bool = True):
+        self.folder = folder
+        self.max_pending = max_pending
+        self.html = html
+        self.dropped = 0
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+        self._queue: Optional["queue.Queue[Tuple[Any, ...]]"] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._logger = getLogger(__name__)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Process pools pickle players: the copy starts its own thread if it writes
+        return {"folder": self.folder, "max_pending": self.max_pending, "html": self.html}
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__init__(**state)
+
+    def path(self, username: str, battle_tag: str, suffix: str) -> str:
+        return os.path.join(self.folder, f"{username} - {battle_tag}{suffix}")
+
+    def write_lines(self, username: str, battle_tag: str, lines: Iterable[str]):
+        """Queues protocol lines of a battle."""
+        text = "\n".join(lines)
+        if text:
+            self._put((_WRITE, self.path(username, battle_tag, PROTOCOL_SUFFIX), text + "\n"))
+
+    def write_decision(self, username: str, battle_tag: str, record: Dict[str, Any]):
+        """Queues a decision record of a battle, e.g. the prompts and outputs of an LLM."""
+        self._put((_WRITE, self.path(username, battle_tag, DECISIONS_SUFFIX),
+                   orjson.dumps(record, default=str).decode() + "\n"))
+
+    def close_battle(self, username: str, battle_tag: str, opponent_username: Optional[str] = None):
+        """Queues the closing of a battle's files, and the rendering of its replay."""
+        self._put((_CLOSE, username, battle_tag, opponent_username))
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """Completes queued writes, closes every open file and stops the writer thread.
+
+        Called when the interpreter exits. Writing again starts a new thread.
+
+        :return: Whether the writes completed within the timeout.
+        :rtype: bool
+        """
+        with self._start_lock:
+            queue_, thread = self._queue, self._thread
+            if queue_ is None or thread is None:
+                return True
+            self._queue = self._thread = None
+            atexit.unregister(self.close)
+        queue_.put((_STOP,))
+        thread.join(timeout)
+        return not thread.is_alive()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Waits until every write queued so far is on disk.
+
+        :return: Whether the writes completed within the timeout.
+        :rtype: bool
+        """
+        queue_ = self._queue
+        if queue_ is None:
+            return True
+        done = threading.Event()
+        queue_.put((_FLUSH, done))
+        return done.wait(timeout)
+
+    @property
+    def pending(self) -> int:
+        """Number of queued writes."""
+        return self._pending
+
+    def _put(self, item: Tuple[Any, ...]):
+        queue_ = self._queue
+        if queue_ is None:
+            queue_ = self._start()
+        if item[0] == _WRITE:
+            with self._pending_lock:
+                if self._pending >= self.max_pending:
+                    self.dropped += 1
+                    if self.dropped == 1:
+                        self._logger.warning("Battle log queue full, dropping writes to %s", self.folder)
+                    return
+                self._pending += 1
+        # Unbounded, so that closing battles never blocks: the bound is on writes only
+        queue_.put(item)
+
+    def _start(self) -> "queue.Queue[Tuple[Any, ...]]":
+        with self._start_lock:
+            if self._queue is None:
+                self._queue = queue.Queue()
+                self._thread = threading.Thread(
+                    target=self._run, args=(self._queue,), name="battle-log-writer", daemon=True
+                )
+                self._thread.start()
+                # Daemon threads are killed at exit: finish the logs first
+                atexit.register(self.close)
+            return self._queue
+
+    def _run(self, queue_: "queue.Queue[Tuple[Any, ...]]"):
+        files: Dict[str, IO[str]] = {}
+        os.makedirs(self.folder, exist_ok=True)
+        while True:
+            item = queue_.get()
+            if item[0] == _STOP:
+                for f in files.values():
+                    f.close()
+                return
+            try:
+                if item[0] == _WRITE:
+                    _, path, text = item
+                    with self._pending_lock:
+                        self._pending -= 1
+                    f = files.get(path)
+                    if f is None:
+                        f = files[path] = gzip.open(path, "at", encoding="utf-8")
+                    f.write(text)
+                elif item[0] == _CLOSE:
+                    _, username, battle_tag, opponent_username = item
+                    for suffix in (PROTOCOL_SUFFIX, DECISIONS_SUFFIX):
+                        f = files.pop(self.path(username, battle_tag, suffix), None)
+                        if f is not None:
+                            f.close()
+                    if self.html:
+                        self._render_replay(username, battle_tag, opponent_username)
+                else:
+                    for f in files.values():
+                        f.flush()
+                    item[1].set()
+            except Exception:  # pylint: disable=broad-except
+                self._logger.exception("Failed to write battle log item %s", item[:2])
+
+    def _render_replay(self, username: str, battle_tag: str, opponent_username: Optional[str]):
+        path = self.path(username, battle_tag, PROTOCOL_SUFFIX)
+        if not os.path.exists(path):
+            return
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            log = f.read()
+        replay = (
+            REPLAY_TEMPLATE.replace("{BATTLE_TAG}", battle_tag)
+            .replace("{PLAYER_USERNAME}", username)
+            .replace("{OPPONENT_USERNAME}", f"{opponent_username}")
+            .replace("{REPLAY_LOG}", f">{battle_tag}\n{log}")
+        )
+        with open(self.path(username, battle_tag, ".html"), "w", encoding="utf-8") as f:
+            f.write(replay)
@@ -0,0 +1,49 @@
+"""This module defines the compact record kept of finished battles.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+from poke_env.environment.abstract_battle import AbstractBattle
+
+
+@dataclass(frozen=True)
+class BattleResult:
+    """Outcome of a finished battle, kept once the battle itself is evicted.
+
+    ``won`` is None for ties. ``remaining_hp`` sums the HP fractions left in the
+    player's team and ``opponent_hp_lost`` the HP fractions the opponent's team
+    lost, as used by battle summaries.
+    """
+
+    battle_tag: str
+    won: Optional[bool]
+    winner: Optional[str]
+    turns: int
+    rating: Optional[int]
+    opponent_rating: Optional[int]
+    opponent_username: Optional[str]
+    remaining_hp: float
+    opponent_hp_lost: float
+
+    @property
+    def lost(self) -> Optional[bool]:
+        return None if self.won is None else not self.won
+
+    @classmethod
+    def from_battle(cls, battle: AbstractBattle) -> "BattleResult":
+        if battle.won is None:
+            winner = None
+        else:
+            winner = battle.player_username if battle.won else battle.opponent_username
+        return cls(
+            battle_tag=battle.battle_tag,
+            won=battle.won,
+            winner=winner,
+            turns=battle.turn,
+            rating=battle.rating,
+            opponent_rating=battle.opponent_rating,
+            opponent_username=battle.opponent_username,
+            remaining_hp=sum(mon.current_hp_fraction for mon in battle.team.values()),
+            opponent_hp_lost=sum(1 - mon.current_hp_fraction for mon in battle.opponent_team.values()),
+        )
@@ -0,0 +1,83 @@
+"""This module defines where players run their decisions, off the shared event loop.
+"""
+
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any, Callable, Optional, Tuple, Union
+
+
+@dataclass
+class DecisionMetrics:
+    """Queueing and decision times of one battle, in seconds.
+
+    ``queue_wait`` is the time a decision waited for an executor worker (or for the
+    previous decision of the same battle); ``decision_time`` the time the decision
+    itself took. ``pending`` counts the decisions queued or running right now.
+    """
+
+    decisions: int = 0
+    off_loop: int = 0
+    pending: int = 0
+    queue_wait_total: float = 0.0
+    queue_wait_max: float = 0.0
+    decision_time_total: float = 0.0
+    decision_time_max: float = 0.0
+
+    def record(self, queue_wait: float, decision_time: float, off_loop: bool):
+        self.decisions += 1
+        self.off_loop += off_loop
+        self.queue_wait_total += queue_wait
+        self.queue_wait_max = max(self.queue_wait_max, queue_wait)
+        self.decision_time_total += decision_time
+        self.decision_time_max = max(self.decision_time_max, decision_time)
+
+    def merge(self, other: "DecisionMetrics"):
+        """Adds the decisions recorded in other to these metrics."""
+        self.decisions += other.decisions
+        self.off_loop += other.off_loop
+        self.queue_wait_total += other.queue_wait_total
+        self.queue_wait_max = max(self.queue_wait_max, other.queue_wait_max)
+        self.decision_time_total += other.decision_time_total
+        self.decision_time_max = max(self.decision_time_max, other.decision_time_max)
+
+    @property
+    def mean_queue_wait(self) -> float:
+        return self.queue_wait_total / self.decisions if self.decisions else 0.0
+
+    @property
+    def mean_decision_time(self) -> float:
+        return self.decision_time_total / self.decisions if self.decisions else 0.0
+
+
+def create_decision_executor(
+    kind: Union[str, Executor], max_workers: Optional[int] = None
+) -> Executor:
+    """Returns the executor decisions run on.
+
+    :param kind: "thread", "process", or an executor to use as is. Process pools
+        need a picklable player and battle; decisions then cannot update the player.
+    :type kind: str or Executor
+    :param max_workers: Maximum number of concurrent decisions. Defaults to the
+        executor's own default.
+    :type max_workers: int, optional
+    :return: The executor.
+    :rtype: Executor
+    """
+    if isinstance(kind, Executor):
+        return kind
+    if kind == "thread":
+        return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="decision")
+    if kind == "process":
+        return ProcessPoolExecutor(max_workers=max_workers)
+    raise ValueError(f"Unknown decision executor {kind!r}: expected 'thread', 'process' or an Executor")
+
+
+def timed_call(decide: Callable[..., Any], *args: Any) -> Tuple[Any, float]:
+    """Calls decide(*args) and returns its result with the seconds it took.
+
+    Module-level so that process pools can pickle it.
+    """
+    start = perf_counter()
+    result = decide(*args)
+    return result, perf_counter() - start
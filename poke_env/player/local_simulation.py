@@ -1,7 +1,7 @@
 import json
 import sys
 from time import sleep
-from typing import Callable, Dict, List
+from typing import TYPE_CHECKING, Callable, Dict, List
 import numpy as np
 from copy import deepcopy
 
@@ -15,13 +15,11 @@ from poke_env.environment.pokemon import Pokemon
 from poke_env.environment.side_condition import SideCondition
 from poke_env.environment.status import Status
 from poke_env.player.battle_order import BattleOrder
-from pokechamp.gpt_player import GPTPlayer
 
-# Optional import for LLaMA (requires torch)
-try:
+if TYPE_CHECKING:
+    # LLM clients pull in openai and torch: only imported for annotations
+    from pokechamp.gpt_player import GPTPlayer
     from pokechamp.llama_player import LLAMAPlayer
-except ImportError:
-    LLAMAPlayer = None
 
 # Avoid circular import by importing here
 try:
@@ -151,6 +149,9 @@ class LocalSim():
         self.strategy = _strategy
         self.format = format
         self.prompt_translate = prompt_translate
+        # set by budgeted prompt translators (see pokechamp.prompts.state_translate_compact)
+        self.last_prompt_tokens = 0
+        self.last_dropped_sections = []
 
         self.switch_set = set()
 
@@ -170,7 +171,7 @@ class LocalSim():
                 self.moves_set = {}
 
 
-    def get_llm_system_prompt(self, _format: str, llm: GPTPlayer | LLAMAPlayer = None, team_str: str=None, model: str='gpt-4o'):
+    def get_llm_system_prompt(self, _format: str, llm: "GPTPlayer | LLAMAPlayer" = None, team_str: str=None, model: str='gpt-4o'):
         # sleep to make sure server has sent pokemon team information first
         # llm = GPTPlayer(api_key=KEY)
         if 'random' in _format:
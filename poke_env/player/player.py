@@ -5,11 +5,13 @@ import asyncio
 from difflib import get_close_matches
 import random
 from abc import ABC, abstractmethod
-from asyncio import Condition, Event, Queue, Semaphore
+from asyncio import Condition, Event, Lock, Queue, Semaphore
+from collections import deque
+from concurrent.futures import Executor, Future
 from logging import Logger
 import os
 from time import perf_counter, sleep
-from typing import Any, Awaitable, Dict, List, Optional, Union
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, Union
 
 import orjson
 
@@ -26,7 +28,16 @@ from poke_env.player.battle_order import (
     DefaultBattleOrder,
     DoubleBattleOrder,
 )
+from poke_env.player.battle_log_writer import BattleLogWriter
+from poke_env.player.battle_result import BattleResult
+from poke_env.player.decision_executor import (
+    DecisionMetrics,
+    create_decision_executor,
+    timed_call,
+)
+from poke_env.player.warm_up import WarmUpService
 from poke_env.ps_client import PSClient
+from poke_env.ps_client.frames import REQUEST_PREFIX, BattleFrame, request_json
 from poke_env.ps_client.account_configuration import (
     CONFIGURATION_FROM_PLAYER_COUNTER,
     AccountConfiguration,
@@ -55,6 +66,16 @@ class Player(ABC):
     # chance of being showdown's default order to prevent infinite loops
     DEFAULT_CHOICE_CHANCE = 1 / 1000
 
+    # Whether choose_move blocks for long (LLM calls, search) and must run on the
+    # decision executor. None detects it: a synchronous decision slower than
+    # BLOCKING_DECISION_THRESHOLD seconds moves the following ones off the loop.
+    BLOCKING_CHOOSE_MOVE: Optional[bool] = None
+
+    # Assets of the battle format loaded in the background when the player is
+    # created, see WarmUpService. Players that need none start no warm-up.
+    WARM_UP_ASSETS: Tuple[str, ...] = ()
+    BLOCKING_DECISION_THRESHOLD = 0.1
+
     def __init__(
         self,
         account_configuration: Optional[AccountConfiguration] = None,
@@ -70,6 +91,12 @@ class Player(ABC):
         ping_interval: Optional[float] = None, #20.0
         ping_timeout: Optional[float] = None,   #20.0
         team: Optional[Union[str, Teambuilder]] = None,
+        learn_from_battles: bool = False,
+        background_warm_up: bool = True,
+        decision_executor: Optional[Union[str, Executor]] = "thread",
+        decision_workers: Optional[int] = None,
+        log_writer: Optional[BattleLogWriter] = None,
+        max_finished_battles: Optional[int] = None,
     ):
         """
         :param account_configuration: Player configuration. If empty, defaults to an
@@ -88,7 +115,8 @@ class Player(ABC):
         :type max_concurrent_battles: int
         :param save_replays: Whether to save battle replays. Can be a boolean, where
             True will lead to replays being saved in a potentially new /replay folder,
-            or a string representing a folder where replays will be saved.
+            or a string representing a folder where replays will be saved. Battle
+            logs are streamed to disk by a BattleLogWriter as they are received.
         :type save_replays: bool or str
         :param server_configuration: Server configuration. Defaults to Localhost Server
             Configuration.
@@ -111,6 +139,32 @@ class Player(ABC):
             team string, a showdown packed team string, of a ShowdownTeam object.
             Defaults to None.
         :type team: str or Teambuilder, optional
+        :param learn_from_battles: Whether to fold the opponent team of every finished
+            battle into the Bayesian team predictor of this format, on a background
+            thread. Defaults to False.
+        :type learn_from_battles: bool
+        :param background_warm_up: Whether to load the WARM_UP_ASSETS of the battle
+            format on a background thread as soon as the player is created, instead
+            of during its first decision. Defaults to True.
+        :type background_warm_up: bool
+        :param decision_executor: Where blocking decisions run so that they do not
+            stall the event loop shared by every battle: "thread", "process" (the
+            player must then be picklable), an executor, or None to always decide on
+            the event loop. Defaults to "thread".
+        :type decision_executor: str or Executor, optional
+        :param decision_workers: Maximum number of decisions running at once.
+            Defaults to max_concurrent_battles, or to the executor's default if
+            that is 0.
+        :type decision_workers: int, optional
+        :param log_writer: Writer streaming battle logs and decision records to disk,
+            which can be shared between players. Defaults to one writing to the
+            save_replays folder if replays are saved, and to None otherwise.
+        :type log_writer: BattleLogWriter, optional
+        :param max_finished_battles: Number of finished battles kept in full in
+            battles. Older ones are compacted into BattleResult records, available
+            in battle_results, and their battle state is released. None keeps every
+            battle. Defaults to None.
+        :type max_finished_battles: int, optional
         """
         if account_configuration is None:
             account_configuration = self._create_account_configuration()
@@ -139,9 +193,20 @@ class Player(ABC):
         self._format: str = battle_format
         self._max_concurrent_battles: int = max_concurrent_battles
         self._save_replays = save_replays
+        if log_writer is None and save_replays:
+            log_writer = BattleLogWriter("replays" if save_replays is True else str(save_replays))
+        self._log_writer: Optional[BattleLogWriter] = log_writer
         self._start_timer_on_battle_start: bool = start_timer_on_battle_start
+        self._learn_from_battles: bool = learn_from_battles
 
         self._battles: Dict[str, AbstractBattle] = {}
+        self._max_finished_battles: Optional[int] = max_finished_battles
+        # Finished battles still in _battles, oldest first, and records of evicted ones
+        self._finished_battle_tags: Deque[str] = deque()
+        self._compacted_battles: Dict[str, BattleResult] = {}
+        self._n_finished_battles: int = 0
+        self._n_won_battles: int = 0
+        self._n_lost_battles: int = 0
         self._battle_semaphore: Semaphore = create_in_poke_loop(Semaphore, 0)
 
         self._battle_start_condition: Condition = create_in_poke_loop(Condition)
@@ -173,6 +238,20 @@ class Player(ABC):
         self._max_team_rejections = 10
         self._last_challenge_info = None  # Track last challenge/accept for retry
         self._teamloader = None  # Store teamloader for rejection recovery
+        self._warm_up_service: Optional[WarmUpService] = (
+            WarmUpService.for_format(battle_format, self.WARM_UP_ASSETS)
+            if background_warm_up and self.WARM_UP_ASSETS
+            else None
+        )
+        self._decision_executor_kind = decision_executor
+        self._decision_workers = decision_workers or max_concurrent_battles or None
+        self._decision_executor: Optional[Executor] = None
+        self._blocking_choose_move: Optional[bool] = self.BLOCKING_CHOOSE_MOVE
+        self._decision_locks: Dict[str, Lock] = {}
+        self._decision_metrics: Dict[str, DecisionMetrics] = {}
+        self._finished_decision_metrics = DecisionMetrics()
+        # Held while a frame of the battle is handled, decisions included
+        self._frame_locks: Dict[str, Lock] = {}
         self.logger.debug("Player initialisation finished")
     
     async def _handle_team_rejection(self, message: str):
@@ -303,7 +382,47 @@ class Player(ABC):
         return AccountConfiguration(username, None)
 
     def _battle_finished_callback(self, battle: AbstractBattle):
-        pass
+        if self._learn_from_battles:
+            self._update_team_predictor(battle)
+
+    def _retain_finished_battle(self, battle: AbstractBattle):
+        """Counts a finished battle, and compacts the oldest finished battles beyond
+        max_finished_battles into BattleResult records.
+
+        Battles are compacted once later battles finish rather than when they do,
+        so that the ratings sent after the end of a battle are still recorded.
+        """
+        self._n_finished_battles += 1
+        self._release_decision_state(battle.battle_tag)
+        if battle.won:
+            self._n_won_battles += 1
+        elif battle.lost:
+            self._n_lost_battles += 1
+
+        if self._max_finished_battles is None:
+            return
+        self._finished_battle_tags.append(battle.battle_tag)
+        while len(self._finished_battle_tags) > self._max_finished_battles:
+            battle_tag = self._finished_battle_tags.popleft()
+            evicted = self._battles.pop(battle_tag, None)
+            if evicted is not None:
+                self._compacted_battles[battle_tag] = BattleResult.from_battle(evicted)
+
+    def _update_team_predictor(self, battle: AbstractBattle) -> Future:
+        from bayesian.predictor_singleton import update_from_battle_in_background
+
+        future = update_from_battle_in_background(self._format, battle)
+
+        def log_failure(future: Future):
+            if future.exception() is not None:
+                self.logger.warning(
+                    "Team predictor update failed for %s: %s",
+                    battle.battle_tag,
+                    future.exception(),
+                )
+
+        future.add_done_callback(log_failure)
+        return future
 
     def update_team(self, team: Union[Teambuilder, str]):
         """Updates the team used by the player.
@@ -357,7 +476,7 @@ class Player(ABC):
                         battle_tag=battle_tag,
                         username=self.username,
                         logger=self.logger,
-                        save_replays=self._save_replays,
+                        save_replays=False,
                         gen=gen,
                     )
                 else:
@@ -366,7 +485,7 @@ class Player(ABC):
                         username=self.username,
                         logger=self.logger,
                         gen=gen,
-                        save_replays=self._save_replays,
+                        save_replays=False,
                     )
                 
                 # Set the correct format from player instead of waiting for gen message
@@ -399,256 +518,293 @@ class Player(ABC):
             async with self._battle_start_condition:
                 await self._battle_start_condition.wait()
 
-    async def _handle_battle_message(self, split_messages: List[List[str]]):
-        """Handles a battle message.
+    def _describe_battle_event(self, battle: AbstractBattle, split_message: List[str]) -> str:
+        """Describes a protocol event for the battle message history.
 
-        :param split_message: The received battle message.
-        :type split_message: str
+        Also keeps track of the HP log and move order used by the descriptions.
+
+        :param battle: The battle the event happened in.
+        :type battle: AbstractBattle
+        :param split_message: The protocol event, split.
+        :type split_message: List[str]
+        :return: The event description, empty if the event is not described.
+        :rtype: str
         """
-        #print(f'[battle messages]', split_messages)
-        # Battle messages can be multiline
-        if (
-            len(split_messages) > 1
-            and len(split_messages[1]) > 1
-            and split_messages[1][1] == "init"
-        ):
-            battle_info = split_messages[0][0].split("-")
-            battle = await self._create_battle(battle_info)
-        else:
-            battle = await self._get_battle(split_messages[0][0])
+        description = ""
+        event = split_message[1]
+        if event == "start":
+            description = "Battle start:"
+            battle.speed_list = []
+
+        elif event == "turn":
+            if len(battle.speed_list) == 2:
+                description = f" {battle.speed_list[0]} outspeeded {battle.speed_list[1]} in this turn."
+            description += "[sep]Turn " + split_message[2] + ":"
+            battle.speed_list = []
+
+        elif event == "switch":
+            # update hp information
+            self.switch_set.add(split_message[2])
+            try:
+                battle.pokemon_hp_log_dict[split_message[2]].append(split_message[4])
+            except:
+                battle.pokemon_hp_log_dict[split_message[2]] = [split_message[4]]
+
+            description = " " + split_message[2].split(" ")[0] + " sent out " + split_message[2].split(": ")[-1] + "."
+            description = description.replace("p2a:", "Player2").replace("p1a:", "Player1")
+
+        elif event == "drag":
+            try:
+                battle.pokemon_hp_log_dict[split_message[2]].append(split_message[4])
+            except:
+                battle.pokemon_hp_log_dict[split_message[2]] = [split_message[4]]
+
+            description = " " + split_message[2] + "was dragged out."
+
+        elif event == "faint":
+            description = " " + split_message[2] + " faint."
+
+        elif event == "move":
+            description = " " + split_message[2] + " used "+ split_message[3] + "."
+            battle.speed_list.append(split_message[2])
+
+        elif event == "cant":
+            if split_message[3] == "frz":
+                reason = "frozen"
+            elif split_message[3] == "par":
+                reason = "paralyzed"
+            elif split_message[3] == "slp":
+                reason = "sleeping"
+            else:
+                reason = split_message[3]
 
-        if len(split_messages) > 3:
-            msg = split_messages[3:]
-            idx = 0
-            while idx < len(msg):
-                if len(msg[idx]) == 1:
-                    break
+            description = " " + split_message[2] + " cannot move because of " + reason + "."
 
-                description = ""
-                if msg[idx][1] == "start":
-                    description = "Battle start:"
-                    battle.speed_list = []
-
-                elif msg[idx][1] == "turn":
-                    if len(battle.speed_list) == 2:
-                        description = f" {battle.speed_list[0]} outspeeded {battle.speed_list[1]} in this turn."
-                    description += "[sep]Turn " + msg[idx][2] + ":"
-                    battle.speed_list = []
-
-                elif msg[idx][1] == "switch":
-                    # update hp information
-                    self.switch_set.add(msg[idx][2])
-                    try:
-                        battle.pokemon_hp_log_dict[msg[idx][2]].append(msg[idx][4])
-                    except:
-                        battle.pokemon_hp_log_dict[msg[idx][2]] = [msg[idx][4]]
-
-                    description = " " + msg[idx][2].split(" ")[0] + " sent out " + msg[idx][2].split(": ")[-1] + "."
-                    description = description.replace("p2a:", "Player2").replace("p1a:", "Player1")
-
-                elif msg[idx][1] == "drag":
-                    try:
-                        battle.pokemon_hp_log_dict[msg[idx][2]].append(msg[idx][4])
-                    except:
-                        battle.pokemon_hp_log_dict[msg[idx][2]] = [msg[idx][4]]
-
-                    description = " " + msg[idx][2] + "was dragged out."
-
-                elif msg[idx][1] == "faint":
-                    description = " " + msg[idx][2] + " faint."
-
-                elif msg[idx][1] == "move":
-                    description = " " + msg[idx][2] + " used "+ msg[idx][3] + "."
-                    battle.speed_list.append(msg[idx][2])
-
-                elif msg[idx][1] == "cant":
-                    if msg[idx][3] == "frz":
-                        reason = "frozen"
-                    elif msg[idx][3] == "par":
-                        reason = "paralyzed"
-                    elif msg[idx][3] == "slp":
-                        reason = "sleeping"
-                    else:
-                        reason = msg[idx][3]
-
-                    description = " " + msg[idx][2] + " cannot move because of " + reason + "."
-
-                elif msg[idx][1] == "-sidestart":
-                    if self.username in msg[idx][2]:
-                        target = "your team"
-                    else:
-                        target = "opponent's team"
-
-                    move_name = msg[idx][3]
-                    if move_name.startswith("move: "):
-                        move_name = move_name.replace("move: ", "")
-                    description = " " + move_name + " was set around " + target + "."
-
-                elif msg[idx][1] == "-sideend":
-                    if self.username in msg[idx][2]:
-                        target = "your"
-                    else:
-                        target = "opponent"
-                    description = " " + msg[idx][3] + "was removed from " + target + " team"
-
-                elif msg[idx][1] == "-start":
-                    description = " " + msg[idx][2] + " started " + msg[idx][3] + "."
-                    if len(msg[idx]) > 4:
-                        if msg[idx][4]:
-                            description = " " + msg[idx][2] + " started " + msg[idx][3] + " due to " + msg[idx][4] + "."
-
-                elif msg[idx][1] == "-end":
-                    description = " " + msg[idx][2] + " stop " + msg[idx][3] + "."
-
-                elif msg[idx][1] == "-fieldstart":
-                    description = " Field start: " + msg[idx][2] + " ran across the battlefield."
-
-                elif msg[idx][1] == "-fieldend":
-                    description = " Field end: " + msg[idx][2] + " disappeared from the battlefield."
-
-                elif msg[idx][1] == "-ability":
-                    description = " " + msg[idx][2] + "'s ability: " + msg[idx][3] + "."
-
-                elif msg[idx][1] == "-supereffective":
-                    description = " The move was super effective to " + msg[idx][2] + "."
-
-                elif msg[idx][1] == "-resisted":
-                    description = " The move was ineffective to " + msg[idx][2] + "."
-
-                elif msg[idx][1] == "-heal":
-                    try:
-                        previous_hp = battle.pokemon_hp_log_dict[msg[idx][2]][-1].split(" ")[0]
-                    except:
-                        previous_hp = "100/100"
-
-                    if previous_hp == "0":
-                        previous_hp_fraction = 0
-                    else:
-                        previous_hp_fraction = round(float(previous_hp.split("/")[0]) / float(previous_hp.split("/")[1]) * 100)
-
-                    current_hp = msg[idx][3].split(" ")[0]
-                    if current_hp == "0":
-                        current_hp_fraction = 0
-                    else:
-                        current_hp_fraction = round(float(current_hp.split("/")[0]) / float(current_hp.split("/")[1]) * 100)
-
-                    delta_hp_fraction = current_hp_fraction - previous_hp_fraction
-
-                    if len(msg[idx]) > 4:
-                        description = f" {msg[idx][2]} restored {delta_hp_fraction}% of HP ({current_hp_fraction}% left) {msg[idx][4]}."
-                    else:
-                        description = f" {msg[idx][2]} restored {delta_hp_fraction}% of HP ({current_hp_fraction}% left)."
-                    try:
-                        battle.pokemon_hp_log_dict[msg[idx][2]].append(msg[idx][3])
-                    except:
-                        battle.pokemon_hp_log_dict[msg[idx][2]] = [msg[idx][3]]
-
-                elif msg[idx][1] == "-damage":
-                    try:
-                        previous_hp = battle.pokemon_hp_log_dict[msg[idx][2]][-1].split(" ")[0]
-                    except:
-                        previous_hp = "100/100"
-
-                    if previous_hp == "0":
-                        previous_hp_fraction = 0
-                    else:
-                        previous_hp_fraction = round(float(previous_hp.split("/")[0]) / float(previous_hp.split("/")[1]) * 100)
-
-                    try:
-                        battle.pokemon_hp_log_dict[msg[idx][2]].append(msg[idx][3])
-                    except:
-                        battle.pokemon_hp_log_dict[msg[idx][2]] = [msg[idx][3]]
-
-                    current_hp = msg[idx][3].split(" ")[0]
-                    if current_hp == "0":
-                        current_hp_fraction = 0
-                    else:
-                        current_hp_fraction = round(float(current_hp.split("/")[0]) / float(current_hp.split("/")[1]) * 100)
-
-                    delta_hp_fraction = previous_hp_fraction - current_hp_fraction
-
-                    if current_hp_fraction == 100:
-                        idx += 1  # this is important !!
-                        continue  # no need to output
-
-                    if "oroark" in msg[idx][2]:  # Zoroark
-                        if len(msg[idx]) > 4:
-                            description = f" {msg[idx][2]}'s HP was damaged to {current_hp_fraction}% {msg[idx][4]}."
-                        else:
-                            description = f" It damaged {msg[idx][2]}'s HP to {current_hp_fraction}%."
-                    else:
-                        if len(msg[idx]) > 4:
-                            description = f" {msg[idx][2]}'s HP was damaged by {delta_hp_fraction}% {msg[idx][4]} ({current_hp_fraction}% left)."
-                        else:
-                            description = f" It damaged {msg[idx][2]}'s HP by {delta_hp_fraction}% ({current_hp_fraction}% left)."
-
-                elif msg[idx][1] == "-unboost":
-                    description = " It decreased " + msg[idx][2] + "'s " + msg[idx][3] + " " + msg[idx][4] + " level."
-
-                elif msg[idx][1] == "-boost":
-                    description = " It boosted " + msg[idx][2] + "'s " + msg[idx][3] + " " + msg[idx][4] + " level."
-
-                elif msg[idx][1] == "-fail":
-                    description = " But it failed."
-
-                elif msg[idx][1] == "-miss":
-                    description = " It missed."
-
-                elif msg[idx][1] == "-weather":
-                    # remove weather and put into the state
-                    pass
-                    # if len(msg[idx]) == 3:
-                    #     if msg[idx][2] == "None" or msg[idx][2] == "none":
-                    #         description = " Weather became normal."
-                    #     else:
-                    #         description = " Weather was " + msg[idx][2] + "."
-                    # else:
-                    #     if len(msg[idx]) == 4:
-                    #         description = " Weather was " + msg[idx][2] + " " + msg[idx][3] + "."
-                    #     else:
-                    #         description = " Weather was " + msg[idx][2] + " " + msg[idx][3] + " " + msg[idx][4] + "."
-
-                elif msg[idx][1] == "-activate":
-                    description = " " + msg[idx][2] + " activated " + msg[idx][3] + "."
-
-                elif msg[idx][1] == "-immune":
-                    description = f" but had zero effect to {msg[idx][2]}."
-
-                elif msg[idx][1] == "-crit":
-                    description = " A critical hit."
-
-                elif msg[idx][1] == "-status":
-                    status_dict = {"brn": "burnt", "frz": "frozen", "par": "paralyzed", "slp": "sleeping", "tox": "toxic", "psn": "poisoned"}
-                    description = " It caused " + msg[idx][2] + " " + status_dict[msg[idx][3]] + "."
+        elif event == "-sidestart":
+            if self.username in split_message[2]:
+                target = "your team"
+            else:
+                target = "opponent's team"
 
-                if description:
-                    #print(description)
-                    battle.battle_msg_history = battle.battle_msg_history + description
-                    
+            move_name = split_message[3]
+            if move_name.startswith("move: "):
+                move_name = move_name.replace("move: ", "")
+            description = " " + move_name + " was set around " + target + "."
 
-                idx += 1
+        elif event == "-sideend":
+            if self.username in split_message[2]:
+                target = "your"
+            else:
+                target = "opponent"
+            description = " " + split_message[3] + "was removed from " + target + " team"
 
-        for split_message in split_messages[1:]:
-            if len(split_message) <= 1:
-                continue
-            elif split_message[1] in self.MESSAGES_TO_IGNORE:
-                pass
-            
-            elif split_message[1] == "request":
-                if split_message[2]:
-                    request = orjson.loads(split_message[2])
+        elif event == "-start":
+            description = " " + split_message[2] + " started " + split_message[3] + "."
+            if len(split_message) > 4:
+                if split_message[4]:
+                    description = " " + split_message[2] + " started " + split_message[3] + " due to " + split_message[4] + "."
+
+        elif event == "-end":
+            description = " " + split_message[2] + " stop " + split_message[3] + "."
+
+        elif event == "-fieldstart":
+            description = " Field start: " + split_message[2] + " ran across the battlefield."
+
+        elif event == "-fieldend":
+            description = " Field end: " + split_message[2] + " disappeared from the battlefield."
+
+        elif event == "-ability":
+            description = " " + split_message[2] + "'s ability: " + split_message[3] + "."
+
+        elif event == "-supereffective":
+            description = " The move was super effective to " + split_message[2] + "."
+
+        elif event == "-resisted":
+            description = " The move was ineffective to " + split_message[2] + "."
+
+        elif event == "-heal":
+            try:
+                previous_hp = battle.pokemon_hp_log_dict[split_message[2]][-1].split(" ")[0]
+            except:
+                previous_hp = "100/100"
+
+            if previous_hp == "0":
+                previous_hp_fraction = 0
+            else:
+                previous_hp_fraction = round(float(previous_hp.split("/")[0]) / float(previous_hp.split("/")[1]) * 100)
+
+            current_hp = split_message[3].split(" ")[0]
+            if current_hp == "0":
+                current_hp_fraction = 0
+            else:
+                current_hp_fraction = round(float(current_hp.split("/")[0]) / float(current_hp.split("/")[1]) * 100)
+
+            delta_hp_fraction = current_hp_fraction - previous_hp_fraction
+
+            if len(split_message) > 4:
+                description = f" {split_message[2]} restored {delta_hp_fraction}% of HP ({current_hp_fraction}% left) {split_message[4]}."
+            else:
+                description = f" {split_message[2]} restored {delta_hp_fraction}% of HP ({current_hp_fraction}% left)."
+            try:
+                battle.pokemon_hp_log_dict[split_message[2]].append(split_message[3])
+            except:
+                battle.pokemon_hp_log_dict[split_message[2]] = [split_message[3]]
+
+        elif event == "-damage":
+            try:
+                previous_hp = battle.pokemon_hp_log_dict[split_message[2]][-1].split(" ")[0]
+            except:
+                previous_hp = "100/100"
+
+            if previous_hp == "0":
+                previous_hp_fraction = 0
+            else:
+                previous_hp_fraction = round(float(previous_hp.split("/")[0]) / float(previous_hp.split("/")[1]) * 100)
+
+            try:
+                battle.pokemon_hp_log_dict[split_message[2]].append(split_message[3])
+            except:
+                battle.pokemon_hp_log_dict[split_message[2]] = [split_message[3]]
+
+            current_hp = split_message[3].split(" ")[0]
+            if current_hp == "0":
+                current_hp_fraction = 0
+            else:
+                current_hp_fraction = round(float(current_hp.split("/")[0]) / float(current_hp.split("/")[1]) * 100)
+
+            delta_hp_fraction = previous_hp_fraction - current_hp_fraction
+
+            if current_hp_fraction == 100:
+                return ""  # no need to output
+
+            if "oroark" in split_message[2]:  # Zoroark
+                if len(split_message) > 4:
+                    description = f" {split_message[2]}'s HP was damaged to {current_hp_fraction}% {split_message[4]}."
+                else:
+                    description = f" It damaged {split_message[2]}'s HP to {current_hp_fraction}%."
+            else:
+                if len(split_message) > 4:
+                    description = f" {split_message[2]}'s HP was damaged by {delta_hp_fraction}% {split_message[4]} ({current_hp_fraction}% left)."
+                else:
+                    description = f" It damaged {split_message[2]}'s HP by {delta_hp_fraction}% ({current_hp_fraction}% left)."
+
+        elif event == "-unboost":
+            description = " It decreased " + split_message[2] + "'s " + split_message[3] + " " + split_message[4] + " level."
+
+        elif event == "-boost":
+            description = " It boosted " + split_message[2] + "'s " + split_message[3] + " " + split_message[4] + " level."
+
+        elif event == "-fail":
+            description = " But it failed."
+
+        elif event == "-miss":
+            description = " It missed."
+
+        elif event == "-weather":
+            # remove weather and put into the state
+            pass
+            # if len(split_message) == 3:
+            #     if split_message[2] == "None" or split_message[2] == "none":
+            #         description = " Weather became normal."
+            #     else:
+            #         description = " Weather was " + split_message[2] + "."
+            # else:
+            #     if len(split_message) == 4:
+            #         description = " Weather was " + split_message[2] + " " + split_message[3] + "."
+            #     else:
+            #         description = " Weather was " + split_message[2] + " " + split_message[3] + " " + split_message[4] + "."
+
+        elif event == "-activate":
+            description = " " + split_message[2] + " activated " + split_message[3] + "."
+
+        elif event == "-immune":
+            description = f" but had zero effect to {split_message[2]}."
+
+        elif event == "-crit":
+            description = " A critical hit."
+
+        elif event == "-status":
+            status_dict = {"brn": "burnt", "frz": "frozen", "par": "paralyzed", "slp": "sleeping", "tox": "toxic", "psn": "poisoned"}
+            description = " It caused " + split_message[2] + " " + status_dict[split_message[3]] + "."
+
+        return description
+
+    async def _handle_battle_message(self, frame: BattleFrame):
+        """Handles a battle message.
+
+        The frame is handled in a single pass: every line is split once, described
+        for the battle message history and then handled. Request payloads are
+        parsed straight from their line.
+
+        Frames of a battle are handled one after the other, each with the decision
+        it requests: a decision running on the decision executor reads the battle
+        the following frames update.
+
+        :param frame: The received battle frame.
+        :type frame: BattleFrame
+        """
+        # Battle messages can be multiline
+        if frame.room[1:] in self._compacted_battles:
+            # Late messages of a battle that was already compacted
+            return
+        if frame.is_init:
+            battle_info = frame.room.split("-")
+            battle = await self._create_battle(battle_info)
+        else:
+            battle = await self._get_battle(frame.room)
+
+        async with self._frame_locks.setdefault(battle.battle_tag, Lock()):
+            await self._handle_battle_lines(battle, frame.lines)
+        if battle.finished:
+            self._release_decision_state(battle.battle_tag)
+
+    async def _handle_battle_lines(self, battle: AbstractBattle, lines: List[str]):
+        """Handles the lines of a battle frame, the room line first."""
+        if self._log_writer is not None:
+            self._log_writer.write_lines(
+                self.username,
+                battle.battle_tag,
+                [line for line in lines[1:] if not line.startswith(REQUEST_PREFIX)],
+            )
+        # Events are described from the fourth line up to the first empty one
+        describe = True
+        for index in range(1, len(lines)):
+            line = lines[index]
+            if line.startswith(REQUEST_PREFIX):
+                payload = request_json(line)
+                if payload:
+                    request = orjson.loads(payload)
                     battle.parse_request(request)
                     if battle.move_on_next_request:
                         await self._handle_battle_request(battle)
                         battle.move_on_next_request = False
+                continue
+
+            split_message = line.split("|")
+            if len(split_message) <= 1:
+                if index >= 3:
+                    describe = False
+                continue
+            if describe and index >= 3:
+                description = self._describe_battle_event(battle, split_message)
+                if description:
+                    battle.battle_msg_history = battle.battle_msg_history + description
+
+            if split_message[1] in self.MESSAGES_TO_IGNORE:
+                pass
             elif split_message[1] == "win" or split_message[1] == "tie":
                 if split_message[1] == "win":
                     battle.won_by(split_message[2])
                 else:
                     battle.tied()
+                if self._log_writer is not None:
+                    self._log_writer.close_battle(
+                        self.username, battle.battle_tag, battle.opponent_username
+                    )
                 await self._battle_count_queue.get()
                 self._battle_count_queue.task_done()
                 self._battle_finished_callback(battle)
+                self._retain_finished_battle(battle)
                 async with self._battle_end_condition:
                     self._battle_end_condition.notify_all()
             elif split_message[1] == "uhtml" and "otsrequest" in split_message[2]:
@@ -754,12 +910,10 @@ class Player(ABC):
         elif battle.in_team_preview:        # changed from battle.teampreview which look like it is irrelevant in abstract_battle for some reason
             if not from_teampreview_request:
                 return
-            message = self.teampreview(battle)
+            message = await self._decide(self.teampreview, battle)
         else:
-            message = self.choose_move(battle)
-            if isinstance(message, Awaitable):
-                message = await message
-            
+            message = await self._decide(self.choose_move, battle)
+
             # Handle incorrect return types
             if isinstance(message, str):
                 print(f"Warning: choose_move returned string: {message}")
@@ -771,6 +925,67 @@ class Player(ABC):
 
         await self.ps_client.send_message(message, battle.battle_tag)
 
+    async def _decide(self, decide: Callable[[AbstractBattle], Any], battle: AbstractBattle) -> Any:
+        """Runs a decision of a battle, on the decision executor if decisions block.
+
+        Decisions of one battle are queued behind each other; their queueing and
+        decision times are recorded in decision_metrics.
+        """
+        metrics = self._decision_metrics.setdefault(battle.battle_tag, DecisionMetrics())
+        lock = self._decision_locks.setdefault(battle.battle_tag, Lock())
+        metrics.pending += 1
+        queued_at = perf_counter()
+        try:
+            async with lock:
+                off_loop = bool(self._blocking_choose_move) and self._decision_executor_kind is not None
+                if off_loop:
+                    future = self.decision_executor.submit(timed_call, decide, battle)
+                    result, decision_time = await asyncio.wrap_future(future)
+                else:
+                    result, decision_time = timed_call(decide, battle)
+                    if (
+                        self._blocking_choose_move is None
+                        and decision_time > self.BLOCKING_DECISION_THRESHOLD
+                    ):
+                        self._blocking_choose_move = True
+                        self.logger.info(
+                            "Decision took %.2fs on the event loop: deciding on the %s executor from now on",
+                            decision_time,
+                            self._decision_executor_kind,
+                        )
+                if isinstance(result, Awaitable):
+                    awaited_at = perf_counter()
+                    result = await result
+                    decision_time += perf_counter() - awaited_at
+        finally:
+            metrics.pending -= 1
+        metrics.record(perf_counter() - queued_at - decision_time, decision_time, off_loop)
+        if battle.finished:
+            # The battle ended while deciding: release what its end left behind
+            self._release_decision_state(battle.battle_tag)
+        return result
+
+    def _release_decision_state(self, battle_tag: str):
+        """Drops the decision and frame locks and the metrics of a finished battle,
+        folding its metrics into finished_decision_metrics. Kept while decisions are
+        pending or a frame is handled."""
+        metrics = self._decision_metrics.get(battle_tag)
+        if metrics is not None and metrics.pending:
+            return
+        frame_lock = self._frame_locks.get(battle_tag)
+        if frame_lock is not None and frame_lock.locked():
+            return
+        self._frame_locks.pop(battle_tag, None)
+        self._decision_locks.pop(battle_tag, None)
+        if metrics is not None:
+            del self._decision_metrics[battle_tag]
+            self._finished_decision_metrics.merge(metrics)
+        self._decisions_finished_callback(battle_tag)
+
+    def _decisions_finished_callback(self, battle_tag: str):
+        """Called once a finished battle has no decision running or queued anymore,
+        so that players can release the state their decisions use."""
+
     async def _handle_challenge_request(self, split_message: List[str]):
         """Handles an individual challenge."""
         challenging_player = split_message[2].strip()
@@ -1210,6 +1425,13 @@ class Player(ABC):
                     "Can not reset player's battles while they are still running"
                 )
         self._battles = {}
+        self._finished_battle_tags.clear()
+        self._compacted_battles = {}
+        self._n_finished_battles = self._n_won_battles = self._n_lost_battles = 0
+        self._decision_locks.clear()
+        self._decision_metrics.clear()
+        self._finished_decision_metrics = DecisionMetrics()
+        self._frame_locks.clear()
 
     def teampreview(self, battle: AbstractBattle) -> str:
         """Returns a teampreview order for the given battle.
@@ -1284,6 +1506,39 @@ class Player(ABC):
     def battles(self) -> Dict[str, AbstractBattle]:
         return self._battles
 
+    @property
+    def battle_results(self) -> Dict[str, BattleResult]:
+        """Results of every finished battle, compacted or not, by battle tag."""
+        results = dict(self._compacted_battles)
+        for battle_tag, battle in self._battles.items():
+            if battle.finished:
+                results[battle_tag] = BattleResult.from_battle(battle)
+        return results
+
+    @property
+    def decision_executor(self) -> Optional[Executor]:
+        """The executor blocking decisions run on, created on first use."""
+        if self._decision_executor is None and self._decision_executor_kind is not None:
+            self._decision_executor = create_decision_executor(
+                self._decision_executor_kind, self._decision_workers
+            )
+        return self._decision_executor
+
+    @property
+    def log_writer(self) -> Optional[BattleLogWriter]:
+        """Writer streaming this player's battle logs to disk, if any."""
+        return self._log_writer
+
+    @property
+    def decision_metrics(self) -> Dict[str, DecisionMetrics]:
+        """Queueing and decision times of every running battle, by battle tag."""
+        return self._decision_metrics
+
+    @property
+    def finished_decision_metrics(self) -> DecisionMetrics:
+        """Queueing and decision times of every finished battle, combined."""
+        return self._finished_decision_metrics
+
     @property
     def format(self) -> str:
         return self._format
@@ -1299,11 +1554,11 @@ class Player(ABC):
 
     @property
     def n_finished_battles(self) -> int:
-        return len([None for b in self._battles.values() if b.finished])
+        return self._n_finished_battles
 
     @property
     def n_lost_battles(self) -> int:
-        return len([None for b in self._battles.values() if b.lost])
+        return self._n_lost_battles
 
     @property
     def n_tied_battles(self) -> int:
@@ -1311,7 +1566,11 @@ class Player(ABC):
 
     @property
     def n_won_battles(self) -> int:
-        return len([None for b in self._battles.values() if b.won])
+        return self._n_won_battles
+
+    @property
+    def warm_up_service(self) -> Optional[WarmUpService]:
+        return self._warm_up_service
 
     @property
     def win_rate(self) -> float:
@@ -6,13 +6,11 @@ from poke_env.ps_client.account_configuration import AccountConfiguration
 from poke_env.ps_client.server_configuration import ShowdownServerConfiguration
 from poke_env.teambuilder import Teambuilder
 from numpy.random import randint
+from functools import partial
 import importlib
 import inspect
 import os
 import random
-from pokechamp.llm_vgc_player import LLMVGCPlayer
-from pokechamp.mcp_player import MCPPlayer
-from bots.gen1_agent import Gen1Agent
 
 class TeamSet(Teambuilder):
     """Sample from a directory of Showdown team files.
@@ -212,7 +210,17 @@ def get_llm_player(args,
                    use_timeout: bool=True,
                    timeout_seconds: int=90) -> Player:
     from pokechamp.llm_player import LLMPlayer
-    from pokechamp.prompts import prompt_translate, state_translate2, state_translate3
+    from pokechamp.llm_vgc_player import LLMVGCPlayer
+    from pokechamp.mcp_player import MCPPlayer
+    from bots.gen1_agent import Gen1Agent
+    from pokechamp.prompts import prompt_translate, state_translate2, state_translate3, state_translate_compact, COMPACT_TOKEN_BUDGET
+
+    # singles prompt rendering: 'full' sentences or 'compact' token-budgeted tables
+    if getattr(args, 'prompt_mode', 'full') == 'compact':
+        singles_translate = partial(state_translate_compact,
+                                    token_budget=getattr(args, 'token_budget', None) or COMPACT_TOKEN_BUDGET)
+    else:
+        singles_translate = state_translate2
     
     server_config = None
     if online:
@@ -231,7 +239,7 @@ def get_llm_player(args,
                            account_configuration=AccountConfiguration(f'{USERNAME}{PNUMBER1}', PASSWORD),
                            server_configuration=server_config,
                            save_replays=args.log_dir,
-                           prompt_translate=state_translate3 if "vgc" in battle_format.lower() else state_translate2,
+                           prompt_translate=state_translate3 if "vgc" in battle_format.lower() else singles_translate,
                            device=device,
                            llm_backend=llm_backend)
     if name == 'abyssal':
@@ -312,7 +320,7 @@ def get_llm_player(args,
                            account_configuration=AccountConfiguration(f'{USERNAME}{PNUMBER1}', PASSWORD),
                            server_configuration=server_config,
                            save_replays=args.log_dir,
-                           prompt_translate=state_translate2,
+                           prompt_translate=singles_translate,
                            device=device,
                            llm_backend=llm_backend,
                            timeout_seconds=timeout_seconds)
@@ -326,7 +334,7 @@ def get_llm_player(args,
                            account_configuration=AccountConfiguration(f'{USERNAME}{PNUMBER1}', PASSWORD),
                            server_configuration=server_config,
                            save_replays=args.log_dir,
-                           prompt_translate=state_translate2,
+                           prompt_translate=singles_translate,
                            device=device,
                            llm_backend=llm_backend)
     elif 'vgc' in name:
@@ -340,7 +348,7 @@ def get_llm_player(args,
                        server_configuration=server_config,
                        save_replays=args.log_dir,
                        # Use state_translate3 for VGC formats, state_translate2 for others
-                       prompt_translate=state_translate3 if "vgc" in battle_format.lower() else state_translate2,
+                       prompt_translate=state_translate3 if "vgc" in battle_format.lower() else singles_translate,
                        device=device,
                        llm_backend=llm_backend)
     elif 'pokechamp' in name:
@@ -356,7 +364,7 @@ def get_llm_player(args,
                        server_configuration=server_config,
                        save_replays=args.log_dir,
                     #    prompt_translate=prompt_translate,
-                       prompt_translate=state_translate3 if "vgc" in battle_format.lower() else state_translate2,
+                       prompt_translate=state_translate3 if "vgc" in battle_format.lower() else singles_translate,
                        device=device,
                        llm_backend=llm_backend)
     else:
@@ -13,7 +13,6 @@ from poke_env.player.player import Player
 from poke_env.player.random_player import RandomPlayer
 from tqdm import tqdm
 import numpy as np
-import pandas as pd
 
 from poke_env.ps_client.account_configuration import AccountConfiguration
 from poke_env.player.team_util import load_random_team
@@ -25,6 +24,8 @@ _EVALUATION_RATINGS = {
 }
 
 def write_stats(model_As: list[str], model_Bs: list[str], winners: list[str], turns: list[str], file='whole_history.csv') -> None:
+    import pandas as pd
+
     model_As = np.array(model_As)
     model_Bs = np.array(model_Bs)
     winners = np.array(winners)
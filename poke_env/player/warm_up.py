@@ -0,0 +1,98 @@
+"""This module defines the background warm-up of the data a battle format needs.
+"""
+
+import threading
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from poke_env.data import GenData
+
+
+class WarmUpService:
+    """Loads the static data and team predictor of a battle format on a daemon
+    thread, so that the first decision of a battle does not pay for them.
+
+    One service is shared by every player of a format needing the same assets.
+    ``ready`` is set once every asset has been attempted; ``load_times`` holds the
+    seconds each asset took and ``errors`` the assets that failed, which are loaded
+    again on first use.
+
+    :param battle_format: The battle format whose data is loaded.
+    :type battle_format: str
+    :param assets: Names of the assets to load, among ``ASSETS``. Defaults to all of
+        them. Random battles never load the team predictor.
+    :type assets: Iterable[str], optional
+    """
+
+    ASSETS = ("gen_data", "sets", "game_data", "moves_set", "team_predictor")
+
+    _services: Dict[Tuple[str, Tuple[str, ...]], "WarmUpService"] = {}
+    _services_lock = threading.Lock()
+
+    def __init__(self, battle_format: str, assets: Optional[Iterable[str]] = None):
+        self.battle_format = battle_format
+        self.asset_names = self.ASSETS if assets is None else tuple(assets)
+        self.ready = threading.Event()
+        self.load_times: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def for_format(
+        cls, battle_format: str, assets: Optional[Iterable[str]] = None
+    ) -> "WarmUpService":
+        """Returns the started service loading assets of a battle format, creating it
+        if needed."""
+        key = (battle_format, cls.ASSETS if assets is None else tuple(assets))
+        with cls._services_lock:
+            service = cls._services.get(key)
+            if service is None:
+                service = cls._services[key] = cls(*key)
+                service.start()
+        return service
+
+    def assets(self) -> List[Tuple[str, Callable[[], Any]]]:
+        """Name and loader of every asset, in load order."""
+        from pokechamp import data_cache
+
+        battle_format = self.battle_format
+        assets: List[Tuple[str, Callable[[], Any]]] = [
+            ("gen_data", lambda: GenData.from_format(battle_format)),
+            ("sets", lambda: GenData.sets_for_format(battle_format)),
+            # The global cache the decision path reads
+            ("game_data", data_cache._get_cache),
+            ("moves_set", lambda: data_cache.get_cached_moves_set(battle_format)),
+        ]
+        # Random battles never guess stats, so they do not need the predictor
+        if "random" not in battle_format:
+            from bayesian.predictor_singleton import get_pokemon_predictor
+
+            assets.append(
+                ("team_predictor", lambda: get_pokemon_predictor(battle_format))
+            )
+        return [(name, load) for name, load in assets if name in self.asset_names]
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name=f"warm-up-{self.battle_format}", daemon=True
+            )
+            self._thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until every asset has been attempted. Returns whether it was."""
+        return self.ready.wait(timeout)
+
+    def _run(self):
+        try:
+            for name, load in self.assets():
+                start = perf_counter()
+                try:
+                    load()
+                except Exception as e:
+                    self.errors[name] = f"{type(e).__name__}: {e}"
+                self.load_times[name] = perf_counter() - start
+        except Exception as e:
+            self.errors["assets"] = f"{type(e).__name__}: {e}"
+        finally:
+            self.ready.set()
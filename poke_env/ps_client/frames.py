@@ -0,0 +1,59 @@
+"""This module classifies showdown websocket frames without splitting them up front.
+"""
+from typing import List
+
+BATTLE_PREFIX = ">battle"
+REQUEST_PREFIX = "|request|"
+
+
+class BattleFrame:
+    """A battle room frame.
+
+    Keeps the raw protocol lines of the frame: they are split on "|" one at a time
+    as they are handled, and request lines are never split, their JSON payload
+    being read directly from the line.
+    """
+
+    __slots__ = ("lines",)
+
+    def __init__(self, message: str):
+        self.lines: List[str] = message.split("\n")
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    @property
+    def room(self) -> str:
+        """The battle tag line of the frame, e.g. '>battle-gen9ou-1'."""
+        return self.lines[0]
+
+    @property
+    def is_init(self) -> bool:
+        """Whether the frame opens a new battle room."""
+        return len(self.lines) > 1 and (
+            self.lines[1] == "|init" or self.lines[1].startswith("|init|")
+        )
+
+
+def is_battle_frame(message: str) -> bool:
+    return message.startswith(BATTLE_PREFIX)
+
+
+def frame_type(message: str) -> str:
+    """Message type of a global frame, e.g. 'challstr' for '|challstr|4|...'.
+
+    Returns an empty string for frames that do not start with a message type.
+    """
+    if not message.startswith("|"):
+        return ""
+    end = len(message)
+    for separator in ("|", "\n"):
+        index = message.find(separator, 1, end)
+        if index != -1:
+            end = index
+    return message[1:end]
+
+
+def request_json(line: str) -> str:
+    """JSON payload of a '|request|' protocol line."""
+    return line[len(REQUEST_PREFIX):]
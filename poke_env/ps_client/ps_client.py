@@ -19,6 +19,7 @@ from poke_env.concurrency import (
 )
 from poke_env.exceptions import ShowdownException
 from poke_env.ps_client.account_configuration import AccountConfiguration
+from poke_env.ps_client.frames import BattleFrame, frame_type, is_battle_frame
 from poke_env.ps_client.server_configuration import ServerConfiguration
 
 
@@ -31,6 +32,17 @@ class PSClient:
     handling.
     """
 
+    # Message type of global frames -> name of the method handling them
+    _FRAME_HANDLERS = {
+        "challstr": "_handle_challstr",
+        "updateuser": "_handle_updateuser",
+        "updatechallenges": "_handle_updatechallenges",
+        "updatesearch": "_handle_updatesearch",
+        "popup": "_handle_popup",
+        "nametaken": "_handle_nametaken",
+        "pm": "_handle_pm",
+    }
+
     def __init__(
         self,
         account_configuration: AccountConfiguration,
@@ -131,73 +143,24 @@ class PSClient:
     async def _handle_message(self, message: str):
         """Handle received messages.
 
+        Battle frames are passed on unsplit as a BattleFrame. Other frames are
+        dispatched on their message type, with only their first line split.
+
         :param message: The message to parse.
         :type message: str
         """
         try:
-            # Showdown websocket messages are pipe-separated sequences
-            split_messages = [m.split("|") for m in message.split("\n")]
-            # The type of message is determined by the first entry in the message
-            # For battles, this is the zero-th entry
-            # Otherwise it is the one-th entry
-            if split_messages[0][0].startswith(">battle"):
+            if is_battle_frame(message):
                 # Battle update
-                # if self.username == 'SimpleHeuristics 1':
-                    # print("pause")
-                await self._handle_battle_message(split_messages)  # type: ignore
-            elif split_messages[0][1] == "challstr":
-                # Confirms connection to the server: we can login
-                await self.log_in(split_messages[0])
-            elif split_messages[0][1] == "updateuser":
-                if split_messages[0][2] in [
-                    " " + self.username,
-                    " " + self.username + "@!",
-                ]:
-                    # Confirms successful login
-                    self.logged_in.set()
-                elif not split_messages[0][2].startswith(" Guest "):
-                    self.logger.warning(
-                        """Trying to login as %s, showdown returned %s """
-                        """- this might prevent future actions from this agent. """
-                        """Changing the agent's username might solve this problem.""",
-                        self.username,
-                        split_messages[0][2],
-                    )
-            elif "updatechallenges" in split_messages[0][1]:
-                # Contain information about current challenge
-                await self._update_challenges(split_messages[0])  # type: ignore
-            elif split_messages[0][1] == "updatesearch":
-                pass
-            elif split_messages[0][1] == "popup":
-                self.logger.warning("Popup message received: %s", message)
-                # Check if this is a team rejection message
-                if "team was rejected" in message.lower():
-                    # Notify the player about team rejection if handler exists
-                    if hasattr(self, '_handle_team_rejection'):
-                        await self._handle_team_rejection(message)  # type: ignore
-            elif split_messages[0][1] in ["nametaken"]:
-                self.logger.critical("SKIPPED Error message received: %s", message)
-                # raise ShowdownException("Error message received: %s", message)
-            elif split_messages[0][1] == "pm":
-                if len(split_messages) == 1:
-                    if split_messages[0][4].startswith("/challenge"):
-                        await self._handle_challenge_request(split_messages[0])  # type: ignore
-                    elif split_messages[0][4].startswith("/text"):
-                        self.logger.info("Received pm with text: %s", message)
-                    elif split_messages[0][4].startswith("/nonotify"):
-                        self.logger.info("Received pm: %s", message)
-                    elif split_messages[0][4].startswith("/log"):
-                        self.logger.info("Received pm: %s", message)
-                    else:
-                        self.logger.warning("Received pm: %s", message)
-                elif len(split_messages) == 2:
-                    self.logger.info("Received pm: %s", message)
-                else:
-                    raise ValueError(
-                        f"Expected len({split_messages}) to be 1 or 2, got {len(split_messages)}"
-                    )
-            else:
+                await self._handle_battle_message(BattleFrame(message))  # type: ignore
+                return
+            handler = self._FRAME_HANDLERS.get(frame_type(message))
+            if handler is None:
                 self.logger.warning("Unhandled message: %s", message)
+                return
+            # Showdown websocket messages are pipe-separated sequences
+            split_message = message.split("\n", 1)[0].split("|")
+            await getattr(self, handler)(split_message, message)
         except CancelledError as e:
             self.logger.critical("CancelledError intercepted: %s", e)
         except Exception as exception:
@@ -206,6 +169,66 @@ class PSClient:
             )
             raise exception
 
+    async def _handle_challstr(self, split_message: List[str], message: str):
+        # Confirms connection to the server: we can login
+        await self.log_in(split_message)
+
+    async def _handle_updateuser(self, split_message: List[str], message: str):
+        if split_message[2] in [
+            " " + self.username,
+            " " + self.username + "@!",
+        ]:
+            # Confirms successful login
+            self.logged_in.set()
+        elif not split_message[2].startswith(" Guest "):
+            self.logger.warning(
+                """Trying to login as %s, showdown returned %s """
+                """- this might prevent future actions from this agent. """
+                """Changing the agent's username might solve this problem.""",
+                self.username,
+                split_message[2],
+            )
+
+    async def _handle_updatechallenges(self, split_message: List[str], message: str):
+        # Contain information about current challenge
+        await self._update_challenges(split_message)  # type: ignore
+
+    async def _handle_updatesearch(self, split_message: List[str], message: str):
+        pass
+
+    async def _handle_popup(self, split_message: List[str], message: str):
+        self.logger.warning("Popup message received: %s", message)
+        # Check if this is a team rejection message
+        if "team was rejected" in message.lower():
+            # Notify the player about team rejection if handler exists
+            if hasattr(self, '_handle_team_rejection'):
+                await self._handle_team_rejection(message)  # type: ignore
+
+    async def _handle_nametaken(self, split_message: List[str], message: str):
+        self.logger.critical("SKIPPED Error message received: %s", message)
+        # raise ShowdownException("Error message received: %s", message)
+
+    async def _handle_pm(self, split_message: List[str], message: str):
+        n_lines = message.count("\n") + 1
+        if n_lines == 1:
+            if split_message[4].startswith("/challenge"):
+                await self._handle_challenge_request(split_message)  # type: ignore
+            elif split_message[4].startswith("/text"):
+                self.logger.info("Received pm with text: %s", message)
+            elif split_message[4].startswith("/nonotify"):
+                self.logger.info("Received pm: %s", message)
+            elif split_message[4].startswith("/log"):
+                self.logger.info("Received pm: %s", message)
+            else:
+                self.logger.warning("Received pm: %s", message)
+        elif n_lines == 2:
+            self.logger.info("Received pm: %s", message)
+        else:
+            raise ValueError(
+                f"Expected pm message to have 1 or 2 lines, got {n_lines}"
+            )
+
+
     async def _stop_listening(self):
         await self.websocket.close()
 
@@ -0,0 +1,196 @@
+"""
+Single-process host for many ladder agents.
+
+run_with_timeout*.py start one showdown_ladder.py subprocess per agent
+session, each re-importing torch and the LLM SDKs, reloading GenData, the sets
+and the Bayesian predictor and opening its own websocket. AgentHost runs all
+agents as players of one process instead: every player keeps its own account
+and PSClient connection, while the static data caches, the predictor singleton
+and one LLMClientPool are shared. An agent failing (login, connection, a
+crashed decision) is logged and restarted on its own, the other agents keep
+laddering.
+"""
+
+import asyncio
+import logging
+import random
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from poke_env.player.player import Player
+from poke_env.player.team_util import get_llm_player, get_metamon_teams, load_random_team
+from pokechamp.llm_backends import LLMClientPool
+
+# Bots of get_llm_player that do not use an LLM client
+NON_LLM_AGENTS = frozenset(('abyssal', 'max_power', 'random', 'one_step', 'gen1_agent'))
+
+
+@dataclass
+class AgentSpec:
+    """Configuration of one hosted agent, as in the AGENTS lists of run_with_timeout*.py."""
+    name: str
+    backend: str
+    prompt_algo: str
+    username: str
+    password: Optional[str] = None
+    device: int = 0
+    api_key: str = ''
+
+    @classmethod
+    def from_dict(cls, agent: Dict[str, Any], passwords: Optional[Dict[str, str]] = None) -> "AgentSpec":
+        """Builds a spec from an agent dict, looking its password up in passwords if not set."""
+        password = agent.get('password')
+        if password is None and passwords is not None:
+            password = passwords.get(agent['username'])
+        return cls(name=agent['name'],
+                   backend=agent['backend'],
+                   prompt_algo=agent['prompt_algo'],
+                   username=agent['username'],
+                   password=password,
+                   device=agent.get('device', 0),
+                   api_key=agent.get('api_key', ''))
+
+    @property
+    def uses_llm(self) -> bool:
+        return self.name not in NON_LLM_AGENTS
+
+
+class AgentHost:
+    """Runs ladder sessions of several agents concurrently in one process.
+
+    :param agents: Agents to host, one player each.
+    :param args: Namespace with the options get_llm_player reads (temperature, log_dir, prompt_mode...).
+    :param battle_format: Ladder format.
+    :param games: Number of ladder games per agent session.
+    :param max_restarts: Number of times a failing agent is recreated before giving up.
+    :param timeout_seconds: LLM timeout per move, 0 to disable.
+    :param game_delay: (min, max) seconds waited before each ladder search.
+    :param clients: LLM client pool, a new one by default.
+    """
+
+    def __init__(self,
+                 agents: List[AgentSpec],
+                 args,
+                 battle_format: str = 'gen9ou',
+                 games: int = 1,
+                 max_restarts: int = 1,
+                 timeout_seconds: int = 90,
+                 game_delay=(10, 60),
+                 clients: Optional[LLMClientPool] = None):
+        if len({agent.username for agent in agents}) != len(agents):
+            raise ValueError("Hosted agents need distinct usernames.")
+        self.agents = agents
+        self.args = args
+        self.battle_format = battle_format
+        self.games = games
+        self.max_restarts = max_restarts
+        self.timeout_seconds = timeout_seconds
+        self.game_delay = game_delay
+        self.clients = clients if clients is not None else LLMClientPool()
+        self.players: Dict[str, Player] = {}
+        self.logger = logging.getLogger("AgentHost")
+
+    def create_player(self, agent: AgentSpec) -> Player:
+        """Creates the player of an agent, with the shared LLM client if it uses one."""
+        llm_backend = None
+        if agent.uses_llm and agent.prompt_algo != 'mcp':
+            llm_backend = self.clients.get(agent.backend, agent.api_key, agent.device)
+        return get_llm_player(self.args,
+                              agent.backend,
+                              agent.prompt_algo,
+                              agent.name,
+                              KEY=agent.api_key,
+                              battle_format=self.battle_format,
+                              llm_backend=llm_backend,
+                              device=agent.device,
+                              online=True,
+                              USERNAME=agent.username,
+                              PASSWORD=agent.password,
+                              use_timeout=(self.timeout_seconds > 0),
+                              timeout_seconds=self.timeout_seconds)
+
+    def prepare_player(self, agent: AgentSpec, player: Player):
+        """Sets up the teams of a player and warms it up, like showdown_ladder.py.
+
+        Returns the teamloader the player's team is rotated from after each game, if any.
+        """
+        teamloader = None
+        if 'random' not in self.battle_format:
+            try:
+                team_list = "competitive" if agent.name == 'pokechamp' else "modern_replays"
+                teamloader = get_metamon_teams(self.battle_format, team_list)
+            except Exception as e:
+                self.logger.warning("Metamon teams not available for %s: %s", self.battle_format, e)
+            if teamloader is None:
+                player.update_team(load_random_team(id=None, vgc=False))
+            else:
+                player.set_teamloader(teamloader)
+                player.update_team(teamloader.yield_team())
+        if hasattr(player, 'warm_up'):
+            player.warm_up()
+        return teamloader
+
+    async def run(self) -> List[Dict[str, Any]]:
+        """Runs one ladder session of every agent and returns their results."""
+        results = await asyncio.gather(*[self.run_agent(agent) for agent in self.agents],
+                                       return_exceptions=True)
+        return [result if not isinstance(result, BaseException) else self._result(agent, 0, 0, error=result)
+                for agent, result in zip(self.agents, results)]
+
+    async def run_agent(self, agent: AgentSpec) -> Dict[str, Any]:
+        """Runs the ladder session of an agent, recreating its player when it fails."""
+        wins = played = 0
+        restarts = 0
+        while True:
+            player = None
+            try:
+                # Loading static data, clients, teams and warming up block: keep the
+                # other agents playing meanwhile
+                player = await asyncio.to_thread(self.create_player, agent)
+                self.players[agent.username] = player
+                teamloader = await asyncio.to_thread(self.prepare_player, agent, player)
+                while played < self.games:
+                    await asyncio.sleep(random.uniform(*self.game_delay))
+                    await player.ladder(1)
+                    played += 1
+                    if player.n_won_battles > 0:
+                        wins += 1
+                    player.reset_battles()
+                    if teamloader is not None:
+                        player.update_team(teamloader.yield_team())
+                return self._result(agent, wins, played, player=player)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.exception("Agent %s failed", agent.username)
+                if restarts >= self.max_restarts:
+                    return self._result(agent, wins, played, player=player, error=e)
+                restarts += 1
+            finally:
+                if player is not None:
+                    await self._disconnect(player)
+
+    async def _disconnect(self, player: Player):
+        try:
+            await player.ps_client.stop_listening()
+        except Exception:
+            # never connected or already closed
+            pass
+
+    def _result(self, agent: AgentSpec, wins: int, total: int, player: Optional[Player] = None,
+                error: Optional[BaseException] = None) -> Dict[str, Any]:
+        """Session result, in the format of parse_ladder_results."""
+        result = {
+            "agent_name": agent.name,
+            "username": agent.username,
+            "wins": wins,
+            "losses": total - wins,
+            "win_rate": wins / total * 100 if total else 0.0,
+            "total_games": total,
+            "parsed_successfully": error is None,
+        }
+        if player is not None and hasattr(player, 'get_timeout_stats'):
+            result["timeout_rate"] = player.get_timeout_stats()['timeout_rate']
+        if error is not None:
+            result["error"] = repr(error)
+        return result
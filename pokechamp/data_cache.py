@@ -6,18 +6,13 @@ repeated file loading during battles and simulations.
 """
 
 import json
+import os
+import threading
 import orjson
 from typing import Dict, Any
 from functools import lru_cache
 from poke_env.data.gen_data import GenData
 
-# Visual effects import (optional)
-try:
-    from pokechamp.visual_effects import visual, print_banner
-    VISUAL_EFFECTS = True
-except ImportError:
-    VISUAL_EFFECTS = False
-
 
 class GameDataCache:
     """Singleton cache for static game data."""
@@ -37,6 +32,12 @@ class GameDataCache:
     
     def _load_all_data(self):
         """Load all static game data into memory."""
+        try:
+            from pokechamp.visual_effects import visual, print_banner
+            VISUAL_EFFECTS = True
+        except ImportError:
+            VISUAL_EFFECTS = False
+
         if VISUAL_EFFECTS:
             print_banner("CACHE", "water")
             print("Loading static game data...")
@@ -137,15 +138,15 @@ class GameDataCache:
         if cache_key not in self._data:
             try:
                 if format == 'gen9ou':
-                    file_path = 'poke_env/data/static/gen9/ou/sets_1000.json'
+                    file_path = os.path.join('gen9', 'ou', 'sets_1000.json')
                 elif format == 'gen9vgc2025regi':
-                    file_path = 'poke_env/data/static/gen9/vgc/sets_1760.json'
+                    file_path = os.path.join('gen9', 'vgc', 'sets_1760.json')
                 else:
                     # Add more formats as needed
-                    file_path = f'poke_env/data/static/{format}/sets_1000.json'
+                    file_path = os.path.join(format, 'sets_1000.json')
                 
-                with open(file_path, 'r') as f:
-                    self._data[cache_key] = orjson.loads(f.read())
+                # Shared with the usage sets GenData loads for Pokemon
+                self._data[cache_key] = GenData._load_sets(file_path)
                 print(f"[OK] Loaded {format} moves set data")
             except FileNotFoundError:
                 print(f"[WARN] {format} moves set not found, using empty dict")
@@ -159,50 +160,61 @@ class GameDataCache:
         print("🧹 Cache cleared")
 
 
-# Global cache instance
-_cache = GameDataCache()
+# Global cache instance, loaded on first use rather than on import
+_cache = None
+# Held while loading: the warm-up thread and the first decision may both load it
+_cache_lock = threading.Lock()
+
+
+def _get_cache() -> GameDataCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = GameDataCache()
+    return _cache
 
 
 def get_cached_move_effect() -> Dict[str, Any]:
     """Get cached move effects data."""
-    return _cache.get_move_effect()
+    return _get_cache().get_move_effect()
 
 
 def get_cached_pokemon_move_dict() -> Dict[str, Any]:
     """Get cached Pokemon move mappings."""
-    return _cache.get_pokemon_move_dict()
+    return _get_cache().get_pokemon_move_dict()
 
 
 def get_cached_ability_effect() -> Dict[str, Any]:
     """Get cached ability effects data."""
-    return _cache.get_ability_effect()
+    return _get_cache().get_ability_effect()
 
 
 def get_cached_pokemon_ability_dict() -> Dict[str, Any]:
     """Get cached Pokemon ability mappings."""
-    return _cache.get_pokemon_ability_dict()
+    return _get_cache().get_pokemon_ability_dict()
 
 
 def get_cached_item_effect() -> Dict[str, Any]:
     """Get cached item effects data."""
-    return _cache.get_item_effect()
+    return _get_cache().get_item_effect()
 
 
 def get_cached_pokemon_item_dict() -> Dict[str, Any]:
     """Get cached Pokemon item mappings."""
-    return _cache.get_pokemon_item_dict()
+    return _get_cache().get_pokemon_item_dict()
 
 
 def get_cached_pokedex(gen: int) -> Dict[str, Any]:
     """Get cached Pokedex data for a specific generation."""
-    return _cache.get_pokedex(gen)
+    return _get_cache().get_pokedex(gen)
 
 
 def get_cached_moves_set(format: str) -> Dict[str, Any]:
     """Get cached moves set data for a specific format."""
-    return _cache.get_moves_set(format)
+    return _get_cache().get_moves_set(format)
 
 
 def clear_data_cache():
     """Clear all cached data."""
-    _cache.clear_cache()
\ No newline at end of file
+    _get_cache().clear_cache()
\ No newline at end of file
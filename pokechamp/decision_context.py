@@ -0,0 +1,52 @@
+"""
+Per-battle decision state of the LLM players.
+
+A player deciding in several battles at once (max_concurrent_battles > 1, with
+decisions on the decision executor) must not share prompt or search state
+between them: each battle gets its own strategy prompt, plan and minimax
+optimizer, whose LocalSim pool and evaluation cache only ever hold that battle.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict
+
+from poke_env.environment.abstract_battle import AbstractBattle
+from pokechamp.minimax_optimizer import MinimaxOptimizer
+
+
+@dataclass
+class BattleDecisionContext:
+    """Decision state of one battle."""
+    strategy_prompt: str = ""
+    last_plan: str = ""
+    optimizer: MinimaxOptimizer = field(default_factory=MinimaxOptimizer)
+    minimax_initialized: bool = False
+
+
+class DecisionContexts:
+    """Decision contexts of a player's battles, by battle tag."""
+
+    def __init__(self):
+        self._contexts: Dict[str, BattleDecisionContext] = {}
+
+    def __len__(self) -> int:
+        return len(self._contexts)
+
+    def __contains__(self, battle_tag: str) -> bool:
+        return battle_tag in self._contexts
+
+    def get(self, battle: AbstractBattle) -> BattleDecisionContext:
+        """Context of a battle, created on its first decision. Finished battles get a
+        context of their own that is not kept, e.g. for a decision that timed out."""
+        context = self._contexts.get(battle.battle_tag)
+        if context is None:
+            context = BattleDecisionContext()
+            if not battle.finished:
+                self._contexts[battle.battle_tag] = context
+        return context
+
+    def discard(self, battle_tag: str):
+        """Drops the context of a finished battle, releasing its simulations."""
+        context = self._contexts.pop(battle_tag, None)
+        if context is not None:
+            context.optimizer.sim_pool.release_all()
@@ -3,6 +3,8 @@ from time import sleep
 import os, sys
 import json
 
+from pokechamp.llm_backends import CallUsage
+
 class GeminiPlayer():
     def __init__(self, api_key=""):
         print("api_key", api_key)
@@ -16,6 +18,9 @@ class GeminiPlayer():
         
         self.completion_tokens = 0
         self.prompt_tokens = 0
+        # prompt tokens served from Gemini's implicit context cache
+        self.cached_prompt_tokens = 0
+        self.last_call_usage = CallUsage()
         
         # Map common model names to official API names
         self.model_mapping = {
@@ -64,7 +69,13 @@ class GeminiPlayer():
             
             # Simple token counting approximation (Gemini doesn't provide exact counts)
             self.completion_tokens += len(outputs.split()) * 1.3  # Approximate tokens
-            self.prompt_tokens += len(combined_prompt.split()) * 1.3
+            prompt_tokens = len(combined_prompt.split()) * 1.3
+            self.prompt_tokens += prompt_tokens
+            usage_metadata = getattr(response, 'usage_metadata', None)
+            cached_tokens = getattr(usage_metadata, 'cached_content_token_count', None) or 0
+            self.cached_prompt_tokens += cached_tokens
+            self.last_call_usage.prompt_tokens = prompt_tokens
+            self.last_call_usage.cached_prompt_tokens = cached_tokens
             
             if json_format:
                 # Handle cases where the model adds extra text before the JSON
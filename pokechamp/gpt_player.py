@@ -3,6 +3,8 @@ from time import sleep
 from openai import RateLimitError
 import os
 
+from pokechamp.llm_backends import CallUsage
+
 class GPTPlayer():
     def __init__(self, api_key=""):
         if api_key == "":
@@ -11,6 +13,9 @@ class GPTPlayer():
             self.api_key = api_key
         self.completion_tokens = 0
         self.prompt_tokens = 0
+        # prompt tokens served from the provider's prompt cache
+        self.cached_prompt_tokens = 0
+        self.last_call_usage = CallUsage()
 
     def get_LLM_action(self, system_prompt, user_prompt, model='gpt-4o', temperature=0.7, json_format=False, seed=None, stop=[], max_tokens=200, actions=None, battle=None, ps_client=None) -> str:
         client = OpenAI(api_key=self.api_key)
@@ -51,6 +56,11 @@ class GPTPlayer():
         # log completion tokens
         self.completion_tokens += response.usage.completion_tokens
         self.prompt_tokens += response.usage.prompt_tokens
+        prompt_tokens_details = getattr(response.usage, 'prompt_tokens_details', None)
+        cached_tokens = getattr(prompt_tokens_details, 'cached_tokens', None) or 0
+        self.cached_prompt_tokens += cached_tokens
+        self.last_call_usage.prompt_tokens = response.usage.prompt_tokens
+        self.last_call_usage.cached_prompt_tokens = cached_tokens
         if json_format:
             return outputs, True, outputs  # Return processed, json_flag, raw
         return outputs, False, outputs  # Return processed, json_flag, raw
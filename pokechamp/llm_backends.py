@@ -0,0 +1,78 @@
+"""
+LLM client construction for the LLM players.
+
+create_llm_backend picks the client class of a backend name. LLMClientPool
+hands out one client per (backend, api key, device), so that players of the
+same backend hosted in one process share its connection pool or loaded model
+instead of opening their own.
+
+Client modules are imported by the branch that creates them: their SDKs
+(openai, google-genai, ollama, torch) take seconds to import, which players
+that never call an LLM should not pay.
+"""
+
+import threading
+from typing import Any, Dict, Tuple
+
+OPENROUTER_PREFIXES = ('openai/', 'anthropic/', 'google/', 'meta/', 'mistral/', 'cohere/', 'perplexity/',
+                       'deepseek/', 'microsoft/', 'nvidia/', 'huggingface/', 'together/', 'replicate/',
+                       'fireworks/', 'localai/', 'vllm/', 'sagemaker/', 'vertex/', 'bedrock/', 'azure/', 'custom/')
+
+
+class CallUsage(threading.local):
+    """Token usage of the last call a client made from the current thread.
+
+    Clients shared through LLMClientPool are called concurrently by several
+    players and decision threads; their running totals mix every caller, while
+    this holds the caller's own last call.
+    """
+
+    prompt_tokens = 0
+    cached_prompt_tokens = 0
+
+
+def create_llm_backend(backend: str, api_key: str = "", device: int = 0) -> Any:
+    """Creates the LLM client of a backend name."""
+    print(f"Initializing backend: {backend}")  # Debug logging
+    if backend.startswith('ollama/'):
+        # Ollama models - extract model name after 'ollama/'
+        model_name = backend.replace('ollama/', '')
+        print(f"Using Ollama with model: {model_name}")
+        from pokechamp.ollama_player import OllamaPlayer
+        return OllamaPlayer(model=model_name, device=device)
+    elif 'gpt' in backend and not backend.startswith('openai/'):
+        from pokechamp.gpt_player import GPTPlayer
+        return GPTPlayer(api_key)
+    elif 'llama' == backend:
+        # Requires torch and transformers
+        from pokechamp.llama_player import LLAMAPlayer
+        return LLAMAPlayer(device=device)
+    elif 'gemini' in backend:
+        from pokechamp.gemini_player import GeminiPlayer
+        return GeminiPlayer(api_key)
+    elif backend.startswith(OPENROUTER_PREFIXES):
+        # OpenRouter supports hundreds of models from various providers
+        from pokechamp.openrouter_player import OpenRouterPlayer
+        return OpenRouterPlayer(api_key)
+    else:
+        raise NotImplementedError('LLM type not implemented:', backend)
+
+
+class LLMClientPool:
+    """Shared LLM clients, created on first request."""
+
+    def __init__(self):
+        self._clients: Dict[Tuple[str, str, int], Any] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def get(self, backend: str, api_key: str = "", device: int = 0) -> Any:
+        """Client of a backend, shared by every caller asking for the same backend, key and device."""
+        key = (backend, api_key, device)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._clients[key] = create_llm_backend(backend, api_key, device)
+        return client
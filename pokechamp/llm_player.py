@@ -15,21 +15,13 @@ from poke_env.environment.move_category import MoveCategory
 from poke_env.environment.pokemon import Pokemon
 from poke_env.environment.side_condition import SideCondition
 from poke_env.player.player import Player, BattleOrder
+from poke_env.player.battle_log_writer import BattleLogWriter
 from typing import Callable, Dict, List, Optional, Tuple, Union
-from poke_env.environment.move import Move
+from poke_env.environment.move import FrozenMove, Move
 import time
 import json
 from poke_env.data.gen_data import GenData
-from pokechamp.gpt_player import GPTPlayer
-from pokechamp.openrouter_player import OpenRouterPlayer
-from pokechamp.gemini_player import GeminiPlayer
-from pokechamp.ollama_player import OllamaPlayer
-
-# Optional import for LLaMA (requires torch)
-try:
-    from pokechamp.llama_player import LLAMAPlayer
-except ImportError:
-    LLAMAPlayer = None
+from pokechamp.llm_backends import create_llm_backend
 from pokechamp.data_cache import (
     get_cached_move_effect,
     get_cached_pokemon_move_dict,
@@ -40,16 +32,16 @@ from pokechamp.data_cache import (
     get_cached_pokedex
 )
 from poke_env.concurrency import POKE_LOOP
+from pokechamp.decision_context import BattleDecisionContext, DecisionContexts
 from pokechamp.minimax_optimizer import (
-    get_minimax_optimizer,
-    initialize_minimax_optimization,
     fast_battle_evaluation,
     create_battle_state_hash,
     OptimizedSimNode
 )
 from poke_env.player.local_simulation import LocalSim, SimNode
+from poke_env.player.warm_up import WarmUpService
 from difflib import get_close_matches
-from pokechamp.prompts import get_number_turns_faint, get_status_num_turns_fnt, state_translate, get_gimmick_motivation
+from pokechamp.prompts import PROMPT_CALL, PROMPT_STATIC, PROMPT_TURN, assemble_prompt, estimate_tokens, get_number_turns_faint, get_status_num_turns_fnt, state_translate, get_gimmick_motivation
 
 # Visual effects import (optional)
 try:
@@ -61,6 +53,11 @@ except ImportError:
 DEBUG=False
 
 class LLMPlayer(Player):
+    # LLM calls and search take seconds: always decide off the event loop
+    BLOCKING_CHOOSE_MOVE = True
+    # Decisions read the game data cache and guess stats with the team predictor
+    WARM_UP_ASSETS = WarmUpService.ASSETS
+
     def __init__(self,
                  battle_format,
                  api_key="",
@@ -76,29 +73,45 @@ class LLMPlayer(Player):
                  _use_strat_prompt=False,
                  prompt_translate: Callable=state_translate,
                  device=0,
-                 llm_backend=None
+                 llm_backend=None,
+                 max_concurrent_battles=1,
+                 max_finished_battles=None
                  ):
 
         super().__init__(battle_format=battle_format,
                          team=team,
                          save_replays=save_replays,
                          account_configuration=account_configuration,
-                         server_configuration=server_configuration)
+                         server_configuration=server_configuration,
+                         max_concurrent_battles=max_concurrent_battles,
+                         max_finished_battles=max_finished_battles)
 
         self._reward_buffer: Dict[AbstractBattle, float] = {}
         self._battle_last_action : Dict[AbstractBattle, Dict] = {}
         self.completion_tokens = 0
         self.prompt_tokens = 0
+        # prompt tokens of each LLM call: provider-reported when available, else estimated
+        self.prompt_tokens_per_call = []
+        # prompt tokens of each LLM call that the provider reported as served from its prompt cache
+        self.cached_tokens_per_call = []
         self.backend = backend
         self.temperature = temperature
         self.log_dir = log_dir
+        # Decision records are streamed per battle, with the replays when they share log_dir
+        self.decision_log_writer = None
+        if log_dir is not None:
+            if self.log_writer is not None and self.log_writer.folder == str(log_dir):
+                self.decision_log_writer = self.log_writer
+            else:
+                self.decision_log_writer = BattleLogWriter(str(log_dir), html=False)
         self.api_key = api_key
         self.prompt_algo = prompt_algo
         self.gen = GenData.from_format(battle_format)
         self.genNum = self.gen.gen
         self.prompt_translate = prompt_translate
+        # Strategy prompt, plan and minimax search state of every ongoing battle
+        self._decision_contexts = DecisionContexts()
 
-        self.strategy_prompt = ""
         self.team_str = team
         self.use_strat_prompt = _use_strat_prompt
         
@@ -116,32 +129,13 @@ class LLMPlayer(Player):
         self.pokemon_item_dict = get_cached_pokemon_item_dict()
         self._pokemon_dict = get_cached_pokedex(self.gen.gen)
 
-        self.last_plan = ""
-
         if llm_backend is None:
-            print(f"Initializing backend: {backend}")  # Debug logging
-            if backend.startswith('ollama/'):
-                # Ollama models - extract model name after 'ollama/'
-                model_name = backend.replace('ollama/', '')
-                print(f"Using Ollama with model: {model_name}")
-                self.llm = OllamaPlayer(model=model_name, device=device)
-            elif 'gpt' in backend and not backend.startswith('openai/'):
-                self.llm = GPTPlayer(self.api_key)
-            elif 'llama' == backend:
-                self.llm = LLAMAPlayer(device=device)
-            elif 'gemini' in backend:
-                self.llm = GeminiPlayer(self.api_key)
-            elif backend.startswith(('openai/', 'anthropic/', 'google/', 'meta/', 'mistral/', 'cohere/', 'perplexity/', 'deepseek/', 'microsoft/', 'nvidia/', 'huggingface/', 'together/', 'replicate/', 'fireworks/', 'localai/', 'vllm/', 'sagemaker/', 'vertex/', 'bedrock/', 'azure/', 'custom/')):
-                # OpenRouter supports hundreds of models from various providers
-                self.llm = OpenRouterPlayer(self.api_key)
-            else:
-                raise NotImplementedError('LLM type not implemented:', backend)
+            self.llm = create_llm_backend(backend, self.api_key, device)
         else:
             self.llm = llm_backend
         self.llm_value = self.llm
         self.K = K      # for minimax, SC, ToT
         self.use_optimized_minimax = True  # Enable optimized minimax by default
-        self._minimax_initialized = False
         # Configuration for time optimization
         self.use_damage_calc_early_exit = True  # Use damage calculator to exit early when advantageous
         self.use_llm_value_function = True  # Use LLM for leaf node evaluation (vs fast heuristic)
@@ -172,26 +166,14 @@ class LLMPlayer(Player):
             # The optimizer will initialize on first actual battle turn
             print("   [INFO] Minimax optimizer will initialize on first battle turn")
         
-        # 3. Pre-load team predictor (triggers Bayesian model loading)
-        try:
-            from bayesian.predictor_singleton import get_pokemon_predictor
-            predictor = get_pokemon_predictor()
-            # Trigger model loading if it has training methods
-            if hasattr(predictor, 'load_and_train'):
-                predictor.load_and_train()
-            elif hasattr(predictor, 'team_predictor') and hasattr(predictor.team_predictor, 'load_and_train'):
-                predictor.team_predictor.load_and_train()
-            print("   [OK] Pokemon predictor pre-loaded")
-        except Exception as e:
-            print(f"   [WARN] Pokemon predictor warm-up failed: {e}")
-        
-        # 4. Pre-load move set data
-        try:
-            from pokechamp.data_cache import get_cached_moves_set
-            get_cached_moves_set('gen9ou')
-            print("   [OK] Move set data pre-loaded")
-        except Exception as e:
-            print(f"   [WARN] Move set data warm-up failed: {e}")
+        # 3. Wait for the background warm-up of the predictor, sets and move set data
+        service = self.warm_up_service or WarmUpService.for_format(self._format, self.WARM_UP_ASSETS)
+        service.wait()
+        for name, seconds in service.load_times.items():
+            if name in service.errors:
+                print(f"   [WARN] {name} warm-up failed: {service.errors[name]}")
+            else:
+                print(f"   [OK] {name} pre-loaded ({seconds * 1000:.0f} ms)")
         
         self._warmed_up = True
         if VISUAL_EFFECTS:
@@ -252,9 +234,17 @@ class LLMPlayer(Player):
 
     def get_LLM_action(self, system_prompt, user_prompt, model, temperature=0.7, json_format=False, seed=None, stop=[], max_tokens=200, actions=None, llm=None, battle=None) -> str:
         if llm is None:
-            output, _, raw_message = self.llm.get_LLM_action(system_prompt, user_prompt, model, temperature, True, seed, stop, max_tokens=max_tokens, actions=actions, battle=battle, ps_client=self.ps_client)
-        else:
-            output, _, raw_message = llm.get_LLM_action(system_prompt, user_prompt, model, temperature, True, seed, stop, max_tokens=max_tokens, actions=actions, battle=battle, ps_client=self.ps_client)
+            llm = self.llm
+        # Clients may be shared with other players: read this call's own usage
+        usage = getattr(llm, 'last_call_usage', None)
+        if usage is not None:
+            usage.prompt_tokens = usage.cached_prompt_tokens = 0
+        output, _, raw_message = llm.get_LLM_action(system_prompt, user_prompt, model, temperature, True, seed, stop, max_tokens=max_tokens, actions=actions, battle=battle, ps_client=self.ps_client)
+        call_tokens = usage.prompt_tokens if usage is not None else 0
+        if call_tokens <= 0:
+            call_tokens = estimate_tokens(system_prompt) + estimate_tokens(user_prompt)
+        self.prompt_tokens_per_call.append(call_tokens)
+        self.cached_tokens_per_call.append(usage.cached_prompt_tokens if usage is not None else 0)
         
         # Send thinking message if battle is provided
         if battle is not None and raw_message:
@@ -268,6 +258,14 @@ class LLMPlayer(Player):
         
         return output
     
+    @property
+    def prompt_cache_hit_rate(self) -> float:
+        '''Fraction of prompt tokens the provider served from its prompt cache.'''
+        total = sum(self.prompt_tokens_per_call)
+        if total == 0:
+            return 0.0
+        return sum(self.cached_tokens_per_call) / total
+
     def check_all_pokemon(self, pokemon_str: str) -> Pokemon:
         valid_pokemon = None
         if pokemon_str in self._pokemon_dict:
@@ -281,7 +279,19 @@ class LLMPlayer(Player):
         pokemon = Pokemon(species=pokemon_str, gen=self.genNum)
         return pokemon
 
+    def decision_context(self, battle: AbstractBattle) -> BattleDecisionContext:
+        """Decision state of a battle, isolated from the player's other battles."""
+        return self._decision_contexts.get(battle)
+
+    def _decisions_finished_callback(self, battle_tag: str):
+        # Not on the battle's end: a decision still running searches with its
+        # simulations and logs its records
+        self._decision_contexts.discard(battle_tag)
+        if self.decision_log_writer is not None and self.decision_log_writer is not self.log_writer:
+            self.decision_log_writer.close_battle(self.username, battle_tag)
+
     def choose_move(self, battle: AbstractBattle):
+        context = self.decision_context(battle)
         sim = LocalSim(battle, 
                     self.move_effect,
                     self.pokemon_move_dict,
@@ -291,12 +301,12 @@ class LLMPlayer(Player):
                     self.pokemon_item_dict,
                     self.gen,
                     self._dynamax_disable,
-                    self.strategy_prompt,
+                    context.strategy_prompt,
                     format=self.format,
                     prompt_translate=self.prompt_translate
         )
         if battle.turn <=1 and self.use_strat_prompt:
-            self.strategy_prompt = sim.get_llm_system_prompt(self.format, self.llm, team_str=self.team_str, model='gpt-4o-2024-05-13')
+            context.strategy_prompt = sim.get_llm_system_prompt(self.format, self.llm, team_str=self.team_str, model='gpt-4o-2024-05-13')
         
         if battle.active_pokemon:
             if battle.active_pokemon.fainted and len(battle.available_switches) == 1:
@@ -336,10 +346,10 @@ class LLMPlayer(Player):
             constraint_prompt_tot_1 = '''Generate top-k (k<=3) best action options. Your output MUST be a JSON like: {"option_1":{"action":"<move_or_switch>", "target":"<move_name_or_switch_pokemon_name>"}, ..., "option_k":{"action":"<move_or_switch>", "target":"<move_name_or_switch_pokemon_name>"}}\n'''
             constraint_prompt_tot_2 = '''Select the best action from the following choices by considering their consequences: [OPTIONS]. Your output MUST be a JSON like:"decision":{"action":"<move_or_switch>", "target":"<move_name_or_switch_pokemon_name>"}\n'''
 
-        state_prompt_io = state_prompt + state_action_prompt + constraint_prompt_io
-        state_prompt_cot = state_prompt + state_action_prompt + constraint_prompt_cot
-        state_prompt_tot_1 = state_prompt + state_action_prompt + constraint_prompt_tot_1
-        state_prompt_tot_2 = state_prompt + state_action_prompt + constraint_prompt_tot_2
+        state_prompt_io = assemble_prompt((PROMPT_TURN, state_prompt), (PROMPT_CALL, state_action_prompt + constraint_prompt_io))
+        state_prompt_cot = assemble_prompt((PROMPT_TURN, state_prompt), (PROMPT_CALL, state_action_prompt + constraint_prompt_cot))
+        state_prompt_tot_1 = assemble_prompt((PROMPT_TURN, state_prompt), (PROMPT_CALL, state_action_prompt + constraint_prompt_tot_1))
+        state_prompt_tot_2 = assemble_prompt((PROMPT_TURN, state_prompt), (PROMPT_CALL, state_action_prompt + constraint_prompt_tot_2))
 
         retries = 10
         # Chain-of-thought
@@ -382,15 +392,16 @@ class LLMPlayer(Player):
                                                battle=battle)
 
                     next_action = self.parse_new(llm_output2, battle, sim)
-                    with open(f"{self.log_dir}/output.jsonl", "a") as f:
-                        f.write(json.dumps({"turn": battle.turn,
-                                            "system_prompt": system_prompt,
-                                            "user_prompt1": state_prompt_tot_1,
-                                            "user_prompt2": state_prompt_tot_2,
-                                            "llm_output1": llm_output1,
-                                            "llm_output2": llm_output2,
-                                            "battle_tag": battle.battle_tag
-                                            }) + "\n")
+                    if self.decision_log_writer is not None:
+                        self.decision_log_writer.write_decision(self.username, battle.battle_tag, {
+                            "turn": battle.turn,
+                            "system_prompt": system_prompt,
+                            "user_prompt1": state_prompt_tot_1,
+                            "user_prompt2": state_prompt_tot_2,
+                            "llm_output1": llm_output1,
+                            "llm_output2": llm_output2,
+                            "battle_tag": battle.battle_tag,
+                        })
                     if next_action is not None:     break
                 except:
                     raise ValueError('No valid move', battle.active_pokemon.fainted, len(battle.available_switches))
@@ -403,7 +414,7 @@ class LLMPlayer(Player):
         elif self.prompt_algo == "minimax":
             try:
                 # Initialize minimax optimizer if not already done
-                if self.use_optimized_minimax and not self._minimax_initialized:
+                if self.use_optimized_minimax and not context.minimax_initialized:
                     self._initialize_minimax_optimizer(battle)
                     
                 if self.use_optimized_minimax:
@@ -419,7 +430,7 @@ class LLMPlayer(Player):
     def io(self, retries, system_prompt, state_prompt, constraint_prompt_cot, constraint_prompt_io, state_action_prompt, battle: Battle, sim, dont_verify=False, actions=None):
         next_action = None
         cot_prompt = 'In fewer than 3 sentences, let\'s think step by step:'
-        state_prompt_io = state_prompt + state_action_prompt + constraint_prompt_io + cot_prompt
+        state_prompt_io = assemble_prompt((PROMPT_TURN, state_prompt), (PROMPT_CALL, state_action_prompt + constraint_prompt_io + cot_prompt))
 
         for i in range(retries):
             try:
@@ -542,7 +553,7 @@ class LLMPlayer(Player):
         if battle.active_pokemon.species == mon.species and not is_opp:
             moves = [move.id for move in battle.available_moves]
         for move_id in moves:
-            move = Move(move_id, gen=sim.gen.gen)
+            move = FrozenMove.from_id(move_id, sim.gen.gen)
             t = np.inf
             if move.category == MoveCategory.STATUS:
                 # apply stat boosting effects to see if it will KO in fewer turns
@@ -561,21 +572,21 @@ class LLMPlayer(Player):
         # dyna for gen 8
         if sim.battle._data.gen == 8 and sim.battle.can_dynamax:
             for move_id in moves:
-                move = Move(move_id, gen=sim.gen.gen).dynamaxed
+                move = FrozenMove.from_id(move_id, sim.gen.gen).dynamaxed
                 if move.category != MoveCategory.STATUS:
                     t = get_number_turns_faint(mon, move, mon_opp, sim, boosts1=mon._boosts.copy(), boosts2=mon_opp.boosts.copy())
                     if t < best_move_turns:
-                        best_move = self.create_order(move, dynamax=True)
+                        best_move = self.create_order(Move(move_id, gen=sim.gen.gen).dynamaxed, dynamax=True)
                         best_move_turns = t
         # tera for gen 9
         elif sim.battle._data.gen == 9 and sim.battle.can_tera:
             mon.terastallize()
             for move_id in moves:
-                move = Move(move_id, gen=sim.gen.gen)
+                move = FrozenMove.from_id(move_id, sim.gen.gen)
                 if move.category != MoveCategory.STATUS:
                     t = get_number_turns_faint(mon, move, mon_opp, sim, boosts1=mon._boosts.copy(), boosts2=mon_opp.boosts.copy())
                     if t < best_move_turns:
-                        best_move = self.create_order(move, terastallize=True)
+                        best_move = self.create_order(Move(move_id, gen=sim.gen.gen), terastallize=True)
                         best_move_turns = t
             mon.unterastallize()
             
@@ -665,7 +676,8 @@ class LLMPlayer(Player):
     def _initialize_minimax_optimizer(self, battle):
         """Initialize the minimax optimizer with current battle state."""
         try:
-            initialize_minimax_optimization(
+            context = self.decision_context(battle)
+            context.optimizer.initialize(
                 battle=battle,
                 move_effect=self.move_effect,
                 pokemon_move_dict=self.pokemon_move_dict,
@@ -678,7 +690,7 @@ class LLMPlayer(Player):
                 format=self.format,
                 prompt_translate=self.prompt_translate
             )
-            self._minimax_initialized = True
+            context.minimax_initialized = True
             if VISUAL_EFFECTS:
                 print_status("Minimax optimizer initialized", "success")
             else:
@@ -738,7 +750,8 @@ class LLMPlayer(Player):
                                     'Subtract points based on the effectiveness of the opponent\'s current moves, especially if they have a faster speed.' +\
                                     'Remove points for each pokemon remaining on the opponent\'s team, weighted by their strength.\n'
                     cot_prompt = 'Briefly justify your total score, up to 100 words. Then, conclude with the score in the JSON format: {"score": <total_points>}. '
-                    state_prompt_io = state_prompt + value_prompt + cot_prompt
+                    # the scoring rubric is the same for every leaf, so it goes ahead of the state
+                    state_prompt_io = assemble_prompt((PROMPT_STATIC, value_prompt), (PROMPT_TURN, state_prompt), (PROMPT_CALL, cot_prompt))
                     llm_output = self.get_LLM_action(system_prompt=system_prompt,
                                                     user_prompt=state_prompt_io,
                                                     model=self.backend,
@@ -938,7 +951,10 @@ class LLMPlayer(Player):
         - LLM choice between damage calculator and minimax upfront
         - Battle state caching to avoid repeated computations
         """
-        optimizer = get_minimax_optimizer()
+        context = self.decision_context(battle)
+        if not context.minimax_initialized:
+            self._initialize_minimax_optimizer(battle)
+        optimizer = context.optimizer
         start_time = time.time()
         
         try:
@@ -1033,7 +1049,8 @@ class LLMPlayer(Player):
                                         'Subtract points based on the effectiveness of the opponent\'s current moves, especially if they have a faster speed.' +\
                                         'Remove points for each pokemon remaining on the opponent\'s team, weighted by their strength.\n'
                         cot_prompt = 'Briefly justify your total score, up to 100 words. Then, conclude with the score in the JSON format: {"score": <total_points>}. '
-                        state_prompt_io = state_prompt + value_prompt + cot_prompt
+                        # the scoring rubric is the same for every leaf, so it goes ahead of the state
+                        state_prompt_io = assemble_prompt((PROMPT_STATIC, value_prompt), (PROMPT_TURN, state_prompt), (PROMPT_CALL, cot_prompt))
                         llm_output = self.get_LLM_action(system_prompt=system_prompt,
                                                         user_prompt=state_prompt_io,
                                                         model=self.backend,
@@ -1205,19 +1222,10 @@ class LLMPlayer(Player):
         remain_list = []
         win_list = []
         tag_list = []
-        for tag, battle in self.battles.items():
-            beat_score = 0
-            for mon in battle.opponent_team.values():
-                beat_score += (1-mon.current_hp_fraction)
-
-            beat_list.append(beat_score)
-
-            remain_score = 0
-            for mon in battle.team.values():
-                remain_score += mon.current_hp_fraction
-
-            remain_list.append(remain_score)
-            if battle.won:
+        for tag, result in self.battle_results.items():
+            beat_list.append(result.opponent_hp_lost)
+            remain_list.append(result.remaining_hp)
+            if result.won:
                 win_list.append(1)
 
             tag_list.append(tag)
@@ -18,20 +18,11 @@ from poke_env.player.player import Player, BattleOrder, DoubleBattleOrder
 from poke_env.player.battle_order import DefaultBattleOrder
 from poke_env.concurrency import POKE_LOOP
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union
-from poke_env.environment.move import Move
+from poke_env.environment.move import FrozenMove, Move
 import time
 import json
 from poke_env.data.gen_data import GenData
-from pokechamp.gpt_player import GPTPlayer
-from pokechamp.openrouter_player import OpenRouterPlayer
-from pokechamp.gemini_player import GeminiPlayer
-from pokechamp.ollama_player import OllamaPlayer
-
-# Optional import for LLaMA (requires torch)
-try:
-    from pokechamp.llama_player import LLAMAPlayer
-except ImportError:
-    LLAMAPlayer = None
+from pokechamp.llm_backends import create_llm_backend
 from pokechamp.data_cache import (
     get_cached_move_effect,
     get_cached_pokemon_move_dict,
@@ -41,20 +32,25 @@ from pokechamp.data_cache import (
     get_cached_pokemon_item_dict,
     get_cached_pokedex
 )
+from pokechamp.decision_context import BattleDecisionContext, DecisionContexts
 from pokechamp.minimax_optimizer import (
-    get_minimax_optimizer,
-    initialize_minimax_optimization,
     fast_battle_evaluation,
     create_battle_state_hash,
     OptimizedSimNode
 )
 from poke_env.player.local_simulation import LocalSim, SimNode
+from poke_env.player.warm_up import WarmUpService
 from difflib import get_close_matches
 from pokechamp.prompts import get_number_turns_faint, get_status_num_turns_fnt, state_translate, get_gimmick_motivation
 
 DEBUG=False
 
 class LLMVGCPlayer(Player):
+    # LLM calls and search take seconds: always decide off the event loop
+    BLOCKING_CHOOSE_MOVE = True
+    # Decisions read the game data cache and guess stats with the team predictor
+    WARM_UP_ASSETS = WarmUpService.ASSETS
+
     def __init__(self,
                  battle_format="gen9vgc2025regi",
                  api_key="",
@@ -70,14 +66,18 @@ class LLMVGCPlayer(Player):
                  _use_strat_prompt=False,
                  prompt_translate: Callable=state_translate,
                  device=0,
-                 llm_backend=None
+                 llm_backend=None,
+                 max_concurrent_battles=1,
+                 max_finished_battles=None
                  ):
 
         super().__init__(battle_format=battle_format,
                          team=team,
                          save_replays=save_replays,
                          account_configuration=account_configuration,
-                         server_configuration=server_configuration)
+                         server_configuration=server_configuration,
+                         max_concurrent_battles=max_concurrent_battles,
+                         max_finished_battles=max_finished_battles)
 
         self._reward_buffer: Dict[AbstractBattle, float] = {}
         self._battle_last_action : Dict[AbstractBattle, Dict] = {}
@@ -91,8 +91,9 @@ class LLMVGCPlayer(Player):
         self.gen = GenData.from_format(battle_format)
         self.genNum = self.gen.gen
         self.prompt_translate = prompt_translate
+        # Strategy prompt, plan and minimax search state of every ongoing battle
+        self._decision_contexts = DecisionContexts()
 
-        self.strategy_prompt = ""
         self.team_str = team
         self.use_strat_prompt = _use_strat_prompt
         
@@ -110,32 +111,13 @@ class LLMVGCPlayer(Player):
         self.pokemon_item_dict = get_cached_pokemon_item_dict()
         self._pokemon_dict = get_cached_pokedex(self.gen.gen)
 
-        self.last_plan = ""
-
         if llm_backend is None:
-            print(f"Initializing backend: {backend}")  # Debug logging
-            if backend.startswith('ollama/'):
-                # Ollama models - extract model name after 'ollama/'
-                model_name = backend.replace('ollama/', '')
-                print(f"Using Ollama with model: {model_name}")
-                self.llm = OllamaPlayer(model=model_name, device=device)
-            elif 'gpt' in backend and not backend.startswith('openai/'):
-                self.llm = GPTPlayer(self.api_key)
-            elif 'llama' == backend:
-                self.llm = LLAMAPlayer(device=device)
-            elif 'gemini' in backend:
-                self.llm = GeminiPlayer(self.api_key)
-            elif backend.startswith(('openai/', 'anthropic/', 'google/', 'meta/', 'mistral/', 'cohere/', 'perplexity/', 'deepseek/', 'microsoft/', 'nvidia/', 'huggingface/', 'together/', 'replicate/', 'fireworks/', 'localai/', 'vllm/', 'sagemaker/', 'vertex/', 'bedrock/', 'azure/', 'custom/')):
-                # OpenRouter supports hundreds of models from various providers
-                self.llm = OpenRouterPlayer(self.api_key)
-            else:
-                raise NotImplementedError('LLM type not implemented:', backend)
+            self.llm = create_llm_backend(backend, self.api_key, device)
         else:
             self.llm = llm_backend
         self.llm_value = self.llm
         self.K = K      # for minimax, SC, ToT
         self.use_optimized_minimax = True  # Enable optimized minimax by default
-        self._minimax_initialized = False
         # Configuration for time optimization
         self.use_damage_calc_early_exit = True  # Use damage calculator to exit early when advantageous
         self.use_llm_value_function = True  # Use LLM for leaf node evaluation (vs fast heuristic)
@@ -281,7 +263,16 @@ class LLMVGCPlayer(Player):
             self._teampreview_team_data = request["side"]["pokemon"]
             print(f"Stored teampreview team data: {len(self._teampreview_team_data)} Pokemon")
     
+    def decision_context(self, battle: AbstractBattle) -> BattleDecisionContext:
+        """Decision state of a battle, isolated from the player's other battles."""
+        return self._decision_contexts.get(battle)
+
+    def _decisions_finished_callback(self, battle_tag: str):
+        # Not on the battle's end: a decision still running searches with its simulations
+        self._decision_contexts.discard(battle_tag)
+
     def choose_move(self, battle: AbstractBattle):
+        context = self.decision_context(battle)
         sim = LocalSim(battle, 
                     self.move_effect,
                     self.pokemon_move_dict,
@@ -291,13 +282,13 @@ class LLMVGCPlayer(Player):
                     self.pokemon_item_dict,
                     self.gen,
                     self._dynamax_disable,
-                    self.strategy_prompt,
+                    context.strategy_prompt,
                     format=self.format,
                     prompt_translate=self.prompt_translate
         )
         next_action: List[Optional[BattleOrder]] = [None, None]
         if battle.turn <=1 and self.use_strat_prompt:
-            self.strategy_prompt = sim.get_llm_system_prompt(self.format, self.llm, team_str=self.team_str, model='gpt-4o-2024-05-13')
+            context.strategy_prompt = sim.get_llm_system_prompt(self.format, self.llm, team_str=self.team_str, model='gpt-4o-2024-05-13')
         
         # handle one choice paths for each active pokemon
         for i, mon in enumerate(battle.active_pokemon):
@@ -671,7 +662,7 @@ Target numbers: 1=left opponent, 2=right opponent, 0=field effect, 0=self\n'''
         if battle.active_pokemon.species == mon.species and not is_opp:
             moves = [move.id for move in battle.available_moves]
         for move_id in moves:
-            move = Move(move_id, gen=sim.gen.gen)
+            move = FrozenMove.from_id(move_id, sim.gen.gen)
             t = np.inf
             if move.category == MoveCategory.STATUS:
                 # apply stat boosting effects to see if it will KO in fewer turns
@@ -690,21 +681,21 @@ Target numbers: 1=left opponent, 2=right opponent, 0=field effect, 0=self\n'''
         # dyna for gen 8
         if sim.battle._data.gen == 8 and sim.battle.can_dynamax:
             for move_id in moves:
-                move = Move(move_id, gen=sim.gen.gen).dynamaxed
+                move = FrozenMove.from_id(move_id, sim.gen.gen).dynamaxed
                 if move.category != MoveCategory.STATUS:
                     t = get_number_turns_faint(mon, move, mon_opp, sim, boosts1=mon._boosts.copy(), boosts2=mon_opp.boosts.copy())
                     if t < best_move_turns:
-                        best_move = self.create_order(move, dynamax=True)
+                        best_move = self.create_order(Move(move_id, gen=sim.gen.gen).dynamaxed, dynamax=True)
                         best_move_turns = t
         # tera for gen 9
         elif sim.battle._data.gen == 9 and sim.battle.can_tera:
             mon.terastallize()
             for move_id in moves:
-                move = Move(move_id, gen=sim.gen.gen)
+                move = FrozenMove.from_id(move_id, sim.gen.gen)
                 if move.category != MoveCategory.STATUS:
                     t = get_number_turns_faint(mon, move, mon_opp, sim, boosts1=mon._boosts.copy(), boosts2=mon_opp.boosts.copy())
                     if t < best_move_turns:
-                        best_move = self.create_order(move, terastallize=True)
+                        best_move = self.create_order(Move(move_id, gen=sim.gen.gen), terastallize=True)
                         best_move_turns = t
             mon.unterastallize()
             
@@ -794,7 +785,8 @@ Target numbers: 1=left opponent, 2=right opponent, 0=field effect, 0=self\n'''
     def _initialize_minimax_optimizer(self, battle):
         """Initialize the minimax optimizer with current battle state."""
         try:
-            initialize_minimax_optimization(
+            context = self.decision_context(battle)
+            context.optimizer.initialize(
                 battle=battle,
                 move_effect=self.move_effect,
                 pokemon_move_dict=self.pokemon_move_dict,
@@ -807,7 +799,7 @@ Target numbers: 1=left opponent, 2=right opponent, 0=field effect, 0=self\n'''
                 format=self.format,
                 prompt_translate=self.prompt_translate
             )
-            self._minimax_initialized = True
+            context.minimax_initialized = True
             print("[INIT] Minimax optimizer initialized")
         except Exception as e:
             print(f"[WARN] Failed to initialize minimax optimizer: {e}")
@@ -1062,7 +1054,10 @@ Target numbers: 1=left opponent, 2=right opponent, 0=field effect, 0=self\n'''
         - LLM choice between damage calculator and minimax upfront
         - Battle state caching to avoid repeated computations
         """
-        optimizer = get_minimax_optimizer()
+        context = self.decision_context(battle)
+        if not context.minimax_initialized:
+            self._initialize_minimax_optimizer(battle)
+        optimizer = context.optimizer
         start_time = time.time()
         
         try:
@@ -1324,19 +1319,10 @@ Target numbers: 1=left opponent, 2=right opponent, 0=field effect, 0=self\n'''
         remain_list = []
         win_list = []
         tag_list = []
-        for tag, battle in self.battles.items():
-            beat_score = 0
-            for mon in battle.opponent_team.values():
-                beat_score += (1-mon.current_hp_fraction)
-
-            beat_list.append(beat_score)
-
-            remain_score = 0
-            for mon in battle.team.values():
-                remain_score += mon.current_hp_fraction
-
-            remain_list.append(remain_score)
-            if battle.won:
+        for tag, result in self.battle_results.items():
+            beat_list.append(result.opponent_hp_lost)
+            remain_list.append(result.remaining_hp)
+            if result.won:
                 win_list.append(1)
 
             tag_list.append(tag)
@@ -2,6 +2,8 @@ from openai import OpenAI
 from time import sleep
 from openai import RateLimitError
 import os
+
+from pokechamp.llm_backends import CallUsage
 import json
 
 class OpenRouterPlayer():
@@ -12,6 +14,9 @@ class OpenRouterPlayer():
             self.api_key = api_key
         self.completion_tokens = 0
         self.prompt_tokens = 0
+        # prompt tokens served from the provider's prompt cache
+        self.cached_prompt_tokens = 0
+        self.last_call_usage = CallUsage()
         
         # Optional headers for OpenRouter leaderboards
         self.site_url = os.getenv('OPENROUTER_SITE_URL', 'https://github.com/pokechamp')
@@ -73,6 +78,11 @@ class OpenRouterPlayer():
         # log completion tokens
         self.completion_tokens += response.usage.completion_tokens
         self.prompt_tokens += response.usage.prompt_tokens
+        prompt_tokens_details = getattr(response.usage, 'prompt_tokens_details', None)
+        cached_tokens = getattr(prompt_tokens_details, 'cached_tokens', None) or 0
+        self.cached_prompt_tokens += cached_tokens
+        self.last_call_usage.prompt_tokens = response.usage.prompt_tokens
+        self.last_call_usage.cached_prompt_tokens = cached_tokens
         
         if json_format:
             # Handle cases where the model adds extra text before the JSON
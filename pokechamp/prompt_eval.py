@@ -9,6 +9,8 @@ from poke_env.player.baselines import MaxBasePowerPlayer, Human, OneStepPlayer,
 from pokechamp.depth_translate import data_battle
 from pokechamp.llm_player import LLMPlayer
 from poke_env.player.player import Player
+from poke_env.data.gen_data import GenData
+from poke_env.data.usage_sets import UsageSets
 from pokechamp.prompts import prompt_translate, state_translate
 # from pokechamp.translate import add_battle
 from poke_env.ps_client.account_configuration import AccountConfiguration
@@ -90,17 +92,12 @@ def eval_action_player(llm: LLMPlayer, gen: int=9, format: str='randombattle'):
     return
 
 
-def get_loadout_str(data, mon):
+def get_loadout_str(data: UsageSets, mon):
     '''
     Creates a random loadout based on statistical sets.
     '''    
     def get_weighted_choice(category, id, size=1):
-        category_dict = data[mon][category]
-        p = np.array([float(category_dict[i]['percentage'])/100. for i in range(len(category_dict))])
-        p = p / p.sum()
-        if size > len(category_dict):
-            size = len(category_dict)
-        item = np.random.choice(category_dict, p=p, size=size, replace=False)
+        item = data.choice(mon, category, size=size)
         if category == 'moves':
             out = [item[i][id] if item[i][id] != 'Nothing' else '' for i in range(len(item))]
         else:
@@ -134,10 +131,8 @@ def get_loadout_str(data, mon):
 
 async def hand_benchmark(args, PNUMBER1, total=1):
     # find 1v1 mons
-    file = f'poke_env/data/static/gen9/ou/sets_1500.json'
-    with open(file, 'r') as f:
-        data = orjson.loads(f.read())
-    available_mons = list(data.keys())
+    data = GenData.usage_sets_for_format('gen9ou')
+    available_mons = list(data.sets.keys())
     total_mons = len(available_mons)
     
     t = 0
@@ -240,10 +235,8 @@ async def one_vs_one(args, PNUMBER1, total=1, compare_bots=False):
     1v1 Eval
     '''
     # find 1v1 mons
-    file = f'poke_env/data/static/gen9/ou/sets_1500.json'
-    with open(file, 'r') as f:
-        data = orjson.loads(f.read())
-    available_mons = list(data.keys())
+    data = GenData.usage_sets_for_format('gen9ou')
+    available_mons = list(data.sets.keys())
     total_mons = len(available_mons)
     for i in range(total_mons):
         assert len(get_loadout_str(data, available_mons[i])) != 0
@@ -1,13 +1,27 @@
 from typing import Dict
 import numpy as np
 from poke_env.environment.battle import Battle
-from poke_env.environment.move import Move
+from poke_env.environment.move import FrozenMove, Move
 from poke_env.environment.move_category import MoveCategory
 from poke_env.environment.pokemon import Pokemon
 from poke_env.environment.side_condition import SideCondition
-from poke_env.player.local_simulation import LocalSim, move_type_damage_wrapper
+from poke_env.player.local_simulation import LocalSim, calculate_move_type_damage_multipier, move_type_damage_wrapper
 from poke_env.player.battle_order import DefaultBattleOrder
 
+# Prompt section levels, from most static to most dynamic. Hosted providers cache repeated
+# prompt prefixes, so sections are emitted in this order and everything at PROMPT_STATIC
+# must be byte-identical across the calls of a battle.
+PROMPT_STATIC = 0  # rules, strategy, team; the system prompt and fixed instructions
+PROMPT_TURN = 1    # battle history and state, changes every turn
+PROMPT_CALL = 2    # action choices and output format, changes every call
+
+def assemble_prompt(*sections) -> str:
+    '''
+    Join (level, text) sections ordered from most static to most dynamic.
+    Sections at the same level keep their given order.
+    '''
+    return ''.join(text for _, text in sorted(sections, key=lambda section: section[0]))
+
 def get_turn_summary(sim: LocalSim,
                      battle: Battle,
                      n_turn: int=5
@@ -295,7 +309,7 @@ def get_move_prompt(mon: Pokemon,
         if 'nothing' == move_id:
             continue
         # move = mon.moves[move_id]
-        move = Move(move_id, gen=sim.gen.gen)
+        move = FrozenMove.from_id(move_id, sim.gen.gen)
         if mon.is_dynamaxed:
             move = move.dynamaxed
             # check if the move is status move -> change to max guard
@@ -321,7 +335,7 @@ def get_move_prompt(mon: Pokemon,
         for move_id in moves:
             if 'nothing' == move_id:
                 continue
-            move = Move(move_id, gen=sim.gen.gen).dynamaxed
+            move = FrozenMove.from_id(move_id, sim.gen.gen).dynamaxed
             prompt_new, _ = call_dmg_calc(mon, mon_opp, move)
             move_prompt += prompt_new
                 
@@ -335,7 +349,7 @@ def get_move_prompt(mon: Pokemon,
             for move_id in moves:
                 if 'nothing' == move_id:
                     continue
-                move = Move(move_id, gen=sim.gen.gen)
+                move = FrozenMove.from_id(move_id, sim.gen.gen)
                 prompt_new, _ = call_dmg_calc(mon, mon_opp, move)
                 move_prompt += prompt_new
 
@@ -345,7 +359,7 @@ def get_move_prompt(mon: Pokemon,
             for move_id in moves:
                 if 'nothing' == move_id:
                     continue
-                move = Move(move_id, gen=sim.gen.gen)
+                move = FrozenMove.from_id(move_id, sim.gen.gen)
                 prompt_new, _ = call_dmg_calc(mon, mon_opp, move)
                 move_prompt += prompt_new
 
@@ -355,7 +369,7 @@ def get_move_prompt(mon: Pokemon,
             for move_id in moves:
                 if 'nothing' == move_id:
                     continue
-                move = Move(move_id, gen=sim.gen.gen)
+                move = FrozenMove.from_id(move_id, sim.gen.gen)
                 prompt_new, _ = call_dmg_calc(mon, mon_opp, move)
                 move_prompt += prompt_new
 
@@ -368,7 +382,7 @@ def get_move_prompt(mon: Pokemon,
             for move_id in moves:
                 if 'nothing' == move_id:
                     continue
-                move = Move(move_id, gen=sim.gen.gen)
+                move = FrozenMove.from_id(move_id, sim.gen.gen)
                 prompt_new, _ = call_dmg_calc(mon, mon_opp, move)
                 move_prompt += prompt_new
             mon.unterastallize()
@@ -401,7 +415,7 @@ def get_move_opp_prompt(mon: Pokemon,
         # @TODO: fix nothing coming up
         if 'nothing' == move_id:
             continue
-        move = Move(move_id, gen=sim.gen.gen)
+        move = FrozenMove.from_id(move_id, sim.gen.gen)
         if mon.is_dynamaxed:
             move = move.dynamaxed
             # check if the move is status move -> change to max guard
@@ -426,7 +440,7 @@ def get_move_opp_prompt(mon: Pokemon,
         for move_id in moves:
             if 'nothing' == move_id:
                 continue
-            move = Move(move_id, gen=sim.gen.gen).dynamaxed
+            move = FrozenMove.from_id(move_id, sim.gen.gen).dynamaxed
 
             move_prompt += call_dmg_calc(mon_opp, mon, move)
 
@@ -447,7 +461,7 @@ def get_move_opp_prompt(mon: Pokemon,
             for move_id in moves:
                 if 'nothing' == move_id:
                     continue
-                move = Move(move_id, gen=sim.gen.gen)
+                move = FrozenMove.from_id(move_id, sim.gen.gen)
                 move_prompt += call_dmg_calc(mon_opp, mon, move)
 
             # tera'd opp vs tera'd mon
@@ -456,7 +470,7 @@ def get_move_opp_prompt(mon: Pokemon,
             for move_id in moves:
                 if 'nothing' == move_id:
                     continue
-                move = Move(move_id, gen=sim.gen.gen)
+                move = FrozenMove.from_id(move_id, sim.gen.gen)
                 move_prompt += call_dmg_calc(mon_opp, mon, move)
 
             # tera'd opp vs untera'd mon
@@ -465,7 +479,7 @@ def get_move_opp_prompt(mon: Pokemon,
             for move_id in moves:
                 if 'nothing' == move_id:
                     continue
-                move = Move(move_id, gen=sim.gen.gen)
+                move = FrozenMove.from_id(move_id, sim.gen.gen)
                 move_prompt += call_dmg_calc(mon_opp, mon, move)
             mon_opp.unterastallize() 
 
@@ -476,7 +490,7 @@ def get_move_opp_prompt(mon: Pokemon,
             for move_id in moves:
                 if 'nothing' == move_id:
                     continue
-                move = Move(move_id, gen=sim.gen.gen)
+                move = FrozenMove.from_id(move_id, sim.gen.gen)
                 move_prompt += call_dmg_calc(mon_opp, mon, move)
             mon_opp.unterastallize()
 
@@ -503,7 +517,7 @@ def estimate_matchup(sim: LocalSim, battle: Battle, mon: Pokemon, mon_opp: Pokem
         if battle.active_pokemon.species == mon.species and not is_opp:
             moves = [move.id for move in battle.available_moves]
         for move_id in moves:
-            move = Move(move_id, gen=sim.gen.gen)
+            move = FrozenMove.from_id(move_id, sim.gen.gen)
             t = np.inf
             if move.category == MoveCategory.STATUS:
                 # apply stat boosting effects to see if it will KO in fewer turns
@@ -1419,11 +1433,11 @@ def state_translate2(sim: LocalSim,
     
     opponent_prompt = 'Opponent active pokemon:'
     moves_opp_str, moves_opp_possible_str = sim.get_opponent_current_moves(mon=battle.opponent_active_pokemon, return_separate=True)
-    moves_opp = [Move(move_opp, sim.gen.gen) for move_opp in moves_opp_str]
+    moves_opp = [FrozenMove.from_id(move_opp, sim.gen.gen) for move_opp in moves_opp_str]
     moves_opp_possible = []
     for move_opp in moves_opp_possible_str:
         if move_opp not in moves_opp_str:
-            moves_opp_possible.append(Move(move_opp, sim.gen.gen))
+            moves_opp_possible.append(FrozenMove.from_id(move_opp, sim.gen.gen))
     opponent_prompt += get_opp_move_summary(battle.opponent_active_pokemon, moves_opp, moves_opp_possible, battle, sim)
 
     opponent_move_type_damage_prompt = move_type_damage_wrapper(battle.opponent_active_pokemon, sim.gen.type_chart, team_move_type)
@@ -1483,11 +1497,11 @@ def state_translate2(sim: LocalSim,
             continue
         # moves
         moves_opp_str, moves_opp_possible_str = sim.get_opponent_current_moves(mon=mon_opp, return_separate=True)
-        moves_opp = [Move(move_opp, sim.gen.gen) for move_opp in moves_opp_str]
+        moves_opp = [FrozenMove.from_id(move_opp, sim.gen.gen) for move_opp in moves_opp_str]
         moves_opp_possible = []
         for move_opp in moves_opp_possible_str:
             if move_opp not in moves_opp_str:
-                moves_opp_possible.append(Move(move_opp, sim.gen.gen))
+                moves_opp_possible.append(FrozenMove.from_id(move_opp, sim.gen.gen))
         opponent_prompt += get_opp_move_summary(mon_opp, moves_opp, moves_opp_possible, battle, sim)
 
 
@@ -1689,33 +1703,32 @@ def state_translate2(sim: LocalSim,
     if len(switch_choices) > 0:
         action_prompt_switch = f"[<switch_pokemon_name>] = {switch_choices}\n"
 
+    # The system prompt is the static prefix shared by every call in a battle (see assemble_prompt),
+    # so anything that depends on the turn goes in the state or action prompts instead.
+    system_prompt = (
+        f"You are a pokemon battler in generation {sim.gen.gen} OU format Pokemon Showdown that targets to win the pokemon battle. You can choose to take a move or switch in another pokemon. Here are some battle tips:"
+        " Use status-boosting moves like swordsdance, calmmind, dragondance, nastyplot strategically. The boosting will be reset when pokemon switch out."
+        " Set traps like stickyweb, spikes, toxicspikes, stealthrock strategically."
+        " When face to a opponent is boosting or has already boosted its attack/special attack/speed, knock it out as soon as possible, even sacrificing your pokemon."
+        " if choose to switch, you forfeit to take a move this turn and the opposing pokemon will definitely move first. Therefore, you should pay attention to speed, type-resistance and defense of your switch-in pokemon to bear the damage from the opposing pokemon."
+        " And If the switch-in pokemon has a slower speed then the opposing pokemon, the opposing pokemon will move twice continuously."
+        f" Player elo is {player_elo}. Player is P2. Opponent elo is {opponent_elo}. Opponent is P1.\n"
+        ) + sim.strategy
+
     if battle.active_pokemon.fainted: # passive switching
 
-        system_prompt = (
-            f"You are a pokemon battler in generation {sim.gen.gen} OU format Pokemon Showdown that targets to win the pokemon battle. Your {battle.active_pokemon.species} just fainted. Choose a suitable pokemon to continue the battle. Here are some tips:"
+        action_prompt = (
+            f" Your {battle.active_pokemon.species} just fainted. Choose a suitable pokemon to continue the battle. Here are some tips:"
             " Compare the speeds of your pokemon to the opposing pokemon, which determines who take the move first."
             " Consider the defense state and type-resistance of your pokemon when its speed is lower than the opposing pokemon."
-            " Consider the move-type advantage of your pokemon pokemon when its speed is higher than the opposing pokemon."
-            f" Player elo is {player_elo}. Player is P2. Opponent elo is {opponent_elo}. Opponent is P1.\n"
-            )
+            " Consider the move-type advantage of your pokemon pokemon when its speed is higher than the opposing pokemon.\n"
+            ) + action_prompt
 
         state_prompt = battle_prompt + opponent_prompt + switch_prompt
         state_action_prompt = action_prompt + action_prompt_switch
 
     else: # take a move or active switch
 
-        system_prompt = (
-            f"You are a pokemon battler in generation {sim.gen.gen} OU format Pokemon Showdown that targets to win the pokemon battle. You can choose to take a move or switch in another pokemon. Here are some battle tips:"
-            " Use status-boosting moves like swordsdance, calmmind, dragondance, nastyplot strategically. The boosting will be reset when pokemon switch out."
-            " Set traps like stickyweb, spikes, toxicspikes, stealthrock strategically."
-            " When face to a opponent is boosting or has already boosted its attack/special attack/speed, knock it out as soon as possible, even sacrificing your pokemon."
-            " if choose to switch, you forfeit to take a move this turn and the opposing pokemon will definitely move first. Therefore, you should pay attention to speed, type-resistance and defense of your switch-in pokemon to bear the damage from the opposing pokemon."
-            " And If the switch-in pokemon has a slower speed then the opposing pokemon, the opposing pokemon will move twice continuously."
-            f" Player elo is {player_elo}. Player is P2. Opponent elo is {opponent_elo}. Opponent is P1.\n"
-            )
-
-        system_prompt = system_prompt + sim.strategy
-
         state_prompt = battle_prompt + opponent_prompt + active_pokemon_prompt + move_prompt + switch_prompt
         state_action_prompt = action_prompt + action_prompt_move + action_prompt_switch
 
@@ -1817,11 +1830,11 @@ def state_translate3(sim: LocalSim,
         if(pokemon is None):
             continue
         moves_opp_str, moves_opp_possible_str = sim.get_opponent_current_moves(mon=pokemon, return_separate=True)
-        moves_opp = [Move(move_opp, sim.gen.gen) for move_opp in moves_opp_str]
+        moves_opp = [FrozenMove.from_id(move_opp, sim.gen.gen) for move_opp in moves_opp_str]
         moves_opp_possible = []
         for move_opp in moves_opp_possible_str: 
             if move_opp not in moves_opp_str:
-                moves_opp_possible.append(Move(move_opp, sim.gen.gen))
+                moves_opp_possible.append(FrozenMove.from_id(move_opp, sim.gen.gen))
         opponent_prompt += get_opp_move_summary2(pokemon, moves_opp, moves_opp_possible, battle, sim, idx = idx)
 
         opponent_move_type_damage_prompt = move_type_damage_wrapper(pokemon, sim.gen.type_chart, team_move_type)
@@ -1836,11 +1849,11 @@ def state_translate3(sim: LocalSim,
         if mon_opp.fainted or mon_opp is None or any((pokemon is not None) and (mon_opp.species == pokemon.species) for pokemon in battle.opponent_active_pokemon):
             continue
         moves_opp_str, moves_opp_possible_str = sim.get_opponent_current_moves(mon=mon_opp, return_separate=True)
-        moves_opp = [Move(move_opp, sim.gen.gen) for move_opp in moves_opp_str]
+        moves_opp = [FrozenMove.from_id(move_opp, sim.gen.gen) for move_opp in moves_opp_str]
         moves_opp_possible = []
         for move_opp in moves_opp_possible_str:
             if move_opp not in moves_opp_str:
-                moves_opp_possible.append(Move(move_opp, sim.gen.gen))
+                moves_opp_possible.append(FrozenMove.from_id(move_opp, sim.gen.gen))
         opponent_prompt += get_opp_move_summary2(mon_opp, moves_opp, moves_opp_possible, idx=idx, battle=battle, sim=sim)
 
 
@@ -2123,3 +2136,256 @@ def state_translate3(sim: LocalSim,
     return system_prompt, state_prompt, state_action_prompt
 
 
+
+
+# Compact prompt rendering. Same inputs and return values as state_translate2,
+# but tabular rows and matchup codes instead of sentences, trimmed to a token budget.
+COMPACT_TOKEN_BUDGET = 1500
+
+# Sections in drop order: lowest priority first. Sections not listed are never dropped.
+COMPACT_DROP_ORDER = ['history', 'opp_bench', 'bench_matchups', 'side_conditions', 'opp_ko', 'bench']
+
+COMPACT_LEGEND = (
+    "Rows are '|'-separated. Stats are atk/def/spa/spd/spe after boosts. "
+    "Weak/resist codes list incoming move types by multiplier, e.g. 2x:FIR/WAT takes double damage "
+    "from Fire and Water moves. Types use their first three letters. ko is the estimated turns to KO.\n"
+)
+
+
+def estimate_tokens(text: str) -> int:
+    '''
+    Rough token count for provider-agnostic budgeting (~4 characters per token).
+    '''
+    return (len(text) + 3) // 4
+
+
+def get_matchup_code(pokemon: Pokemon, type_chart: Dict, constraint_type_list=None) -> str:
+    '''
+    Abbreviated counterpart of move_type_damage_wrapper, e.g. "4x:GRO 2x:FIR .5x:WAT 0x:ELE".
+    '''
+    if pokemon is None or pokemon.type_1 is None:
+        return ''
+    type_1 = pokemon.type_1.name
+    type_2 = pokemon.type_2.name if pokemon.type_2 else None
+    multiplier_lists = calculate_move_type_damage_multipier(type_1, type_2, type_chart, constraint_type_list)
+    codes = []
+    for label, types in zip(['4x', '2x', '.5x', '.25x', '0x'], multiplier_lists):
+        if types:
+            codes.append(label + ':' + '/'.join(sorted(t[:3].upper() for t in types)))
+    return ' '.join(codes)
+
+
+def _compact_types(pokemon: Pokemon) -> str:
+    return '/'.join(t.name[:3] for t in pokemon.types if t is not None)
+
+
+def _compact_stats(sim: LocalSim, stats: Dict, boosts: Dict) -> str:
+    values = []
+    for stat in ['atk', 'def', 'spa', 'spd', 'spe']:
+        value = stats.get(stat)
+        if value is None:
+            values.append('?')
+        elif boosts.get(stat, 0):
+            values.append(f"{round(value * sim.boost_multiplier(stat, boosts[stat]))}({boosts[stat]:+d})")
+        else:
+            values.append(str(value))
+    return '/'.join(values)
+
+
+def _compact_ability(sim: LocalSim, ability: str) -> str:
+    if not ability:
+        return '-'
+    try:
+        return sim.ability_effect[ability]['name']
+    except:
+        return ability
+
+
+def _compact_item(sim: LocalSim, item: str) -> str:
+    if not item or item == 'unknown_item':
+        return '-'
+    try:
+        return sim.item_effect[item]['name']
+    except:
+        return item
+
+
+def _compact_mon_row(sim: LocalSim, mon: Pokemon, stats: Dict, boosts: Dict, matchup: str, ability: str=None) -> str:
+    return '|'.join([
+        mon.species,
+        _compact_types(mon),
+        f"{round(mon.current_hp_fraction * 100)}%",
+        sim.check_status(mon.status) or '-',
+        _compact_stats(sim, stats, boosts),
+        _compact_ability(sim, ability if ability is not None else mon.ability),
+        _compact_item(sim, mon.item),
+        matchup or '-',
+    ]) + '\n'
+
+
+def _compact_ko_turns(attacker: Pokemon, move: Move, defender: Pokemon, sim: LocalSim) -> str:
+    try:
+        if move.category == MoveCategory.STATUS:
+            return '-'
+        turns = get_number_turns_faint(attacker, move, defender, sim,
+                                       boosts1=attacker._boosts.copy(), boosts2=defender.boosts.copy())
+        return str(turns) if turns < 100 else 'inf'
+    except Exception:
+        return '?'
+
+
+def fit_prompt_sections(sections: Dict[str, str], token_budget: int, drop_order=COMPACT_DROP_ORDER):
+    '''
+    Drop sections following drop_order until the estimated total fits token_budget.
+    Returns the kept sections (original order) and the names of the dropped ones.
+    '''
+    kept = dict(sections)
+    dropped = []
+    for name in drop_order:
+        if sum(estimate_tokens(text) for text in kept.values()) <= token_budget:
+            break
+        if kept.get(name):
+            kept.pop(name)
+            dropped.append(name)
+    return kept, dropped
+
+
+def state_translate_compact(sim: LocalSim,
+                            battle: Battle,
+                            return_actions=False,
+                            return_choices=False,
+                            idx=0,
+                            token_budget: int=COMPACT_TOKEN_BUDGET,
+                            n_turn: int=4,
+                            ):
+    '''
+    Compact, token-budgeted drop-in for state_translate2 (singles only).
+    The estimated prompt size and any dropped sections are stored on the sim as
+    sim.last_prompt_tokens and sim.last_dropped_sections.
+    '''
+    active = battle.active_pokemon
+    opp_active = battle.opponent_active_pokemon
+    type_chart = sim.gen.type_chart
+
+    opponent_fainted_num = len([mon for mon in battle.opponent_team.values() if mon.fainted])
+    opponent_unfainted_num = 6 - opponent_fainted_num
+
+    opponent_stats = opp_active.calculate_stats(battle_format=sim.format)
+    opponent_boosts = opp_active._boosts
+    active_stats = active.stats
+    if active_stats['atk'] is None:
+        active_stats = active.base_stats
+    active_boosts = active._boosts
+
+    team_move_type = [move.type.name for move in battle.available_moves if move.base_power > 0]
+    for pokemon in battle.available_switches:
+        team_move_type += [move.type.name for move in pokemon.moves.values() if move.base_power > 0]
+
+    # Opponent active pokemon, its known and likely moves
+    moves_opp_str = sim.get_opponent_current_moves(mon=opp_active)
+    opp_moves = [FrozenMove.from_id(move_id, sim.gen.gen) for move_id in moves_opp_str if move_id != 'nothing']
+    opponent_type_list = [t.name for t in opp_active.types if t is not None]
+    opponent_type_list += [move.type.name for move in opp_moves if move.base_power > 0]
+
+    opp_ability = opp_active.ability
+    if not opp_ability and opp_active.species in sim.pokemon_ability_dict:
+        opp_ability = sim.pokemon_ability_dict[opp_active.species][0]
+
+    mon_header = 'name|type|hp|status|atk/def/spa/spd/spe|ability|item|weak/resist\n'
+    sections = {}
+    if battle.battle_msg_history:
+        sections['history'] = get_turn_summary(sim, battle, n_turn=n_turn).replace(' Current battle state:\n', '\n')
+    sections['opp_active'] = (
+        f"Opponent ({opponent_unfainted_num} left) active:\n" + mon_header +
+        _compact_mon_row(sim, opp_active, opponent_stats, opponent_boosts,
+                         get_matchup_code(opp_active, type_chart, team_move_type), ability=opp_ability)
+    )
+    if opp_moves:
+        sections['opp_ko'] = 'Opponent moves (ko vs you): ' + ', '.join(
+            f"{move.id}:{move.type.name[:3]}:{_compact_ko_turns(opp_active, move, active, sim)}" for move in opp_moves
+        ) + '\n'
+
+    opp_bench_rows = ''
+    for mon_opp in battle.opponent_team.values():
+        if mon_opp.fainted or mon_opp.species == opp_active.species:
+            continue
+        row_stats = mon_opp.calculate_stats(battle_format=sim.format)
+        opp_bench_rows += _compact_mon_row(sim, mon_opp, row_stats, {}, get_matchup_code(mon_opp, type_chart, team_move_type))
+    if opp_bench_rows:
+        sections['opp_bench'] = 'Opponent seen bench:\n' + opp_bench_rows
+
+    side_conditions = []
+    if battle.side_conditions:
+        side_conditions.append('you:' + ','.join(sc.name.lower() for sc in battle.side_conditions))
+    if battle.opponent_side_conditions:
+        side_conditions.append('opp:' + ','.join(sc.name.lower() for sc in battle.opponent_side_conditions))
+    if side_conditions:
+        sections['side_conditions'] = 'Side conditions: ' + ' '.join(side_conditions) + '\n'
+
+    if not active.fainted:
+        sections['active'] = (
+            'You active:\n' + mon_header +
+            _compact_mon_row(sim, active, active_stats, active_boosts,
+                             get_matchup_code(active, type_chart, opponent_type_list))
+        )
+        move_rows = 'move|type|cat|pow|acc|eff|ko\n'
+        for move in battle.available_moves:
+            move_rows += '|'.join([
+                move.id,
+                move.type.name[:3],
+                move.category.name[:3],
+                str(move.base_power),
+                f"{round(move.accuracy * 100)}",
+                f"{opp_active.damage_multiplier(move):g}x" if move.base_power else '-',
+                _compact_ko_turns(active, move, opp_active, sim),
+            ]) + '\n'
+        sections['moves'] = move_rows
+
+    bench_rows = ''
+    bench_matchups = ''
+    for pokemon in battle.available_switches:
+        if pokemon.species == active.species:
+            continue
+        stats = pokemon.stats
+        if stats['atk'] is None:
+            stats = pokemon.base_stats
+        bench_rows += _compact_mon_row(sim, pokemon, stats, {}, get_matchup_code(pokemon, type_chart, opponent_type_list))
+        attacks = [f"{move.id}:{opp_active.damage_multiplier(move):g}x" for move in pokemon.moves.values() if move.base_power > 0]
+        if attacks:
+            bench_matchups += f"{pokemon.species}: " + ', '.join(attacks) + '\n'
+    if bench_rows:
+        sections['bench'] = 'You bench:\n' + mon_header + bench_rows
+    if bench_matchups:
+        sections['bench_matchups'] = 'Bench attacks vs opponent active:\n' + bench_matchups
+
+    move_choices = [move.id for move in battle.available_moves]
+    switch_choices = [pokemon.species for pokemon in battle.available_switches if pokemon.species != active.species]
+    action_prompt = f' Your current Pokemon: {active.species}.\nChoose only from the following action choices:\n'
+    action_prompt_move = f"[<move_name>] = {move_choices}\n" if move_choices else ''
+    action_prompt_switch = f"[<switch_pokemon_name>] = {switch_choices}\n" if switch_choices else ''
+
+    system_prompt = (
+        f"You are a pokemon battler in generation {sim.gen.gen} OU format Pokemon Showdown that targets to win the pokemon battle. "
+        "You can choose to take a move or switch in another pokemon. Switching forfeits your move and the opponent moves first. "
+        "Boosts reset on switch out; knock out boosting opponents quickly.\n"
+    ) + COMPACT_LEGEND + sim.strategy
+    if active.fainted:
+        action_prompt = (
+            f" Your {active.species} just fainted. Choose a suitable pokemon to continue the battle, considering speed, typing and remaining HP.\n"
+        ) + action_prompt
+        state_action_prompt = action_prompt + action_prompt_switch
+    else:
+        state_action_prompt = action_prompt + action_prompt_move + action_prompt_switch
+
+    fixed_tokens = estimate_tokens(system_prompt) + estimate_tokens(state_action_prompt)
+    sections, dropped = fit_prompt_sections(sections, token_budget - fixed_tokens)
+    state_prompt = ''.join(sections.values())
+
+    sim.last_prompt_tokens = fixed_tokens + estimate_tokens(state_prompt)
+    sim.last_dropped_sections = dropped
+
+    if return_actions:
+        return system_prompt, state_prompt, action_prompt, action_prompt_switch, action_prompt_move
+    if return_choices:
+        return system_prompt, state_prompt, action_prompt, switch_choices, move_choices
+    return system_prompt, state_prompt, state_action_prompt
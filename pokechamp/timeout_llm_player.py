@@ -85,8 +85,10 @@ class TimeoutLLMPlayer(LLMPlayer):
         self.battle_startup_messages = set()  # Track which battles have had startup messages
         self.battle_timeout_messages = set()  # Track which battles have had timeout messages to prevent duplicates
         
-        # Thread pool for executing LLM calls and parallel fallback with cleaner timeout handling
-        self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="llm_timeout")
+        # Thread pool for executing LLM calls and parallel fallback with cleaner timeout handling;
+        # each concurrent battle runs an LLM call and a fallback at once
+        self.executor = ThreadPoolExecutor(max_workers=2 * max(1, self._max_concurrent_battles),
+                                           thread_name_prefix="llm_timeout")
         
         # Use cached data for fast fallback
         self.cached_data = _CACHED_DATA
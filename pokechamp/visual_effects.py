@@ -5,35 +5,39 @@ Visual Effects Module - ASCII Art and Gradient Text for Pokemon Champion
 Based on printing_guide.md techniques for creating engaging terminal output.
 """
 
+import importlib
+import importlib.util
 import sys
 from typing import Optional
 
-try:
-    import pyfiglet
-    PYFIGLET_AVAILABLE = True
-except ImportError:
-    PYFIGLET_AVAILABLE = False
+# pyfiglet, rich and fade take most of a second to import: only their presence
+# is checked here, and they are imported the first time an effect needs them.
+PYFIGLET_AVAILABLE = importlib.util.find_spec("pyfiglet") is not None
+RICH_AVAILABLE = importlib.util.find_spec("rich") is not None
+FADE_AVAILABLE = importlib.util.find_spec("fade") is not None
 
-try:
-    from rich.console import Console
-    from rich.text import Text
-    from rich.panel import Panel
-    RICH_AVAILABLE = True
-except ImportError:
-    RICH_AVAILABLE = False
 
-try:
-    import fade
-    FADE_AVAILABLE = True
-except ImportError:
-    FADE_AVAILABLE = False
+def _figlet_format(text: str, font: str) -> str:
+    return importlib.import_module("pyfiglet").figlet_format(text, font=font)
+
+
+def _fade():
+    return importlib.import_module("fade")
 
 
 class VisualEffects:
     """Visual effects manager for Pokemon Champion."""
     
     def __init__(self):
-        self.console = Console() if RICH_AVAILABLE else None
+        self._console = None
+
+    @property
+    def console(self):
+        """Rich console, created on first use. None without rich."""
+        if self._console is None and RICH_AVAILABLE:
+            from rich.console import Console
+            self._console = Console()
+        return self._console
         
     def create_banner(self, text: str, font: str = "slant", style: str = "fire") -> str:
         """
@@ -52,10 +56,11 @@ class VisualEffects:
             return f"\n{'='*50}\n  {text.upper()}\n{'='*50}\n"
             
         # Generate ASCII art
-        ascii_art = pyfiglet.figlet_format(text, font=font)
+        ascii_art = _figlet_format(text, font=font)
         
         # Apply gradient if available
         if FADE_AVAILABLE and style != "none":
+            fade = _fade()
             gradient_map = {
                 "fire": fade.fire,
                 "water": fade.water,
@@ -75,7 +80,7 @@ class VisualEffects:
             # Use rich for colored output
             vs_text = f"{player1} VS {player2}"
             if PYFIGLET_AVAILABLE:
-                ascii_vs = pyfiglet.figlet_format("BATTLE", font="standard")
+                ascii_vs = _figlet_format("BATTLE", font="standard")
                 return f"{ascii_vs}\n{vs_text}\n" + "="*50
             else:
                 return f"\n{'='*50}\n    BATTLE: {vs_text}\n{'='*50}\n"
@@ -119,10 +124,10 @@ class VisualEffects:
             return "\n".join(lines) + "\n"
         
         # ASCII art header for Pokemon name
-        header = pyfiglet.figlet_format(pokemon[:8], font="small")  # Limit length
+        header = _figlet_format(pokemon[:8], font="small")  # Limit length
         
         if FADE_AVAILABLE:
-            header = fade.greenblue(header)
+            header = _fade().greenblue(header)
         
         lines = [header, "BATTLE PREDICTIONS:"]
         for item, prob in predictions[:5]:
@@ -142,9 +147,9 @@ class VisualEffects:
     def battle_turn(self, turn_number: int, action: str) -> str:
         """Format battle turn announcements."""
         if PYFIGLET_AVAILABLE and turn_number % 5 == 1:  # Every 5th turn gets ASCII
-            turn_art = pyfiglet.figlet_format(f"T{turn_number}", font="small")
+            turn_art = _figlet_format(f"T{turn_number}", font="small")
             if FADE_AVAILABLE:
-                turn_art = fade.water(turn_art)
+                turn_art = _fade().water(turn_art)
             return f"{turn_art}\nAction: {action}\n"
         else:
             return f"\n>>> TURN {turn_number}: {action}\n"
@@ -152,9 +157,9 @@ class VisualEffects:
     def victory_banner(self, winner: str, turns: int) -> str:
         """Create victory celebration banner."""
         if PYFIGLET_AVAILABLE:
-            victory_art = pyfiglet.figlet_format("VICTORY", font="banner")
+            victory_art = _figlet_format("VICTORY", font="banner")
             if FADE_AVAILABLE:
-                victory_art = fade.brazil(victory_art)  # Gold gradient
+                victory_art = _fade().brazil(victory_art)  # Gold gradient
             return f"{victory_art}\nWinner: {winner}\nTurns: {turns}\n"
         else:
             return f"\n{'='*50}\n    VICTORY: {winner}\n    Turns: {turns}\n{'='*50}\n"
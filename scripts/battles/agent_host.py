@@ -0,0 +1,59 @@
+"""
+Ladders several agents from one process.
+
+Agents are read from a JSON file holding a list of agent dicts, in the format
+of the AGENTS lists of run_with_timeout*.py:
+
+    [{"name": "pokechamp", "backend": "gemini-2.5-flash", "prompt_algo": "minimax",
+      "device": 0, "username": "my-account"}]
+
+Passwords left out (or null) are looked up in passwords.json by username.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from pokechamp.agent_host import AgentHost, AgentSpec
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--agents", type=str, required=True, help="JSON file with the list of agents to host")
+parser.add_argument("--passwords", type=str, default="passwords.json", help="JSON file mapping usernames to passwords")
+parser.add_argument("--battle_format", default="gen9ou", choices=["gen8randombattle", "gen8ou", "gen9ou", "gen9randombattle", "gen9vgc2025regi"])
+parser.add_argument("--temperature", type=float, default=0.5)
+parser.add_argument("--log_dir", type=str, default="./battle_log/ladder")
+parser.add_argument("--N", type=int, default=1, help="Ladder games per agent")
+parser.add_argument("--timeout", type=int, default=90, help="LLM timeout in seconds (0 to disable)")
+parser.add_argument("--max_restarts", type=int, default=1, help="Times a failing agent is restarted")
+parser.add_argument("--prompt_mode", type=str, default="full", choices=["full", "compact"], help="Singles prompt rendering (compact = token-budgeted tables)")
+parser.add_argument("--token_budget", type=int, default=None, help="Prompt token budget for --prompt_mode compact")
+args = parser.parse_args()
+
+
+async def main():
+    with open(args.agents, 'r') as f:
+        agents = json.load(f)
+    passwords = None
+    if os.path.exists(args.passwords):
+        with open(args.passwords, 'r') as f:
+            passwords = json.load(f)
+
+    host = AgentHost([AgentSpec.from_dict(agent, passwords) for agent in agents],
+                     args,
+                     battle_format=args.battle_format,
+                     games=args.N,
+                     max_restarts=args.max_restarts,
+                     timeout_seconds=args.timeout)
+    results = await host.run()
+    for result in results:
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,69 @@
+"""
+Plays heuristic bots against each other locally, without a showdown server.
+
+Games are simulated in-process by poke_env.player.arena and spread over worker
+processes; reports win rates and games per hour.
+
+Usage:
+    python scripts/battles/arena.py --player_1 abyssal --player_2 max_power --N 1000 --processes 4
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from poke_env.player import MaxBasePowerPlayer, RandomPlayer
+from poke_env.player.arena import Arena
+from poke_env.player.baselines import AbyssalPlayer, OneStepPlayer
+# After poke_env, whose player modules must be imported before the bots package
+from bots.gen1_agent import Gen1Agent
+
+PLAYERS = {
+    "abyssal": AbyssalPlayer,
+    "max_power": MaxBasePowerPlayer,
+    "one_step": OneStepPlayer,
+    "random": RandomPlayer,
+    "gen1_agent": Gen1Agent,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--player_1", default="abyssal", choices=sorted(PLAYERS))
+    parser.add_argument("--player_2", default="max_power", choices=sorted(PLAYERS))
+    parser.add_argument("--battle_format", default="gen9ou")
+    parser.add_argument("--team_dir", type=str, default=None, help="Directory of Showdown-format teams (defaults to the format's)")
+    parser.add_argument("--N", type=int, default=100, help="Games to play")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--max_turns", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    teams = None
+    if args.team_dir is not None:
+        teams = []
+        for name in sorted(os.listdir(args.team_dir)):
+            with open(os.path.join(args.team_dir, name)) as f:
+                teams.append(f.read())
+
+    arena = Arena(PLAYERS[args.player_1], PLAYERS[args.player_2], battle_format=args.battle_format,
+                  teams=teams, max_turns=args.max_turns, seed=args.seed)
+    start = time.perf_counter()
+    results = arena.play(args.N, processes=args.processes)
+    elapsed = time.perf_counter() - start
+
+    username_1, username_2 = results.games[0].players
+    print(f"{args.player_1}: {results.wins(username_1)} wins ({results.win_rate(username_1):.1%})")
+    print(f"{args.player_2}: {results.wins(username_2)} wins ({results.win_rate(username_2):.1%})")
+    print(f"ties: {results.ties}")
+    print(f"{results.n_games} games in {elapsed:.1f}s: {results.n_games / elapsed * 3600:,.0f} games/hour "
+          f"on {args.processes} processes")
+
+
+if __name__ == "__main__":
+    main()
@@ -84,6 +84,8 @@ parser.add_argument("--battle_format", default="gen9ou", choices=["gen1ou", "gen
 parser.add_argument("--log_dir", type=str, default="./battle_log/one_vs_one")
 parser.add_argument("--N", type=int, default=25)
 parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducibility")
+parser.add_argument("--prompt_mode", type=str, default="full", choices=["full", "compact"], help="Singles prompt rendering (compact = token-budgeted tables)")
+parser.add_argument("--token_budget", type=int, default=None, help="Prompt token budget for --prompt_mode compact")
 
 args = parser.parse_args()
 
@@ -51,6 +51,8 @@ parser.add_argument("--PASSWORD", type=str, default='')
 parser.add_argument("--N", type=int, default=1)
 parser.add_argument("--timeout", type=int, default=90, help="LLM timeout in seconds (0 to disable)")
 parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducibility")
+parser.add_argument("--prompt_mode", type=str, default="full", choices=["full", "compact"], help="Singles prompt rendering (compact = token-budgeted tables)")
+parser.add_argument("--token_budget", type=int, default=None, help="Prompt token budget for --prompt_mode compact")
 args = parser.parse_args()
 
 # Set random seed if provided
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Copy-time benchmark for battle states.
+
+Replays generated gen9 singles battles and deep-copies the battle after every
+few turns, as LocalSim and the minimax search do for each node. Reports the
+time per copy with the battle's own __deepcopy__ and, for comparison, with the
+generic copy.deepcopy protocol (which also copies the static pokedex, sets and
+moves tables held by every Pokemon and Move).
+
+Usage:
+    python scripts/benchmarks/copy_benchmark.py [--battles N] [--every T] [--repeat R]
+"""
+
+import argparse
+import copy
+import gc
+import logging
+import os
+import sys
+import time
+from typing import List
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, project_root)
+
+from parse_message_benchmark import PLAYER_EVENTS, synthetic_log
+from poke_env.environment.abstract_battle import AbstractBattle
+from poke_env.environment.battle import Battle
+from poke_env.environment.move import Move
+from poke_env.environment.pokemon import Pokemon
+
+
+def battle_states(n_battles: int, every: int) -> List[Battle]:
+    """Snapshots of generated battles, taken every `every` turns."""
+    states = []
+    for seed in range(n_battles):
+        battle = Battle(f"battle-gen9ou-{seed}", "Alice", logging.getLogger("benchmark"), gen=9)
+        for line in synthetic_log(seed):
+            split_message = line.split("|")
+            if len(split_message) < 2 or split_message[1] in PLAYER_EVENTS:
+                continue
+            battle.parse_message(split_message)
+            if split_message[1] == "turn" and battle.turn % every == 0:
+                states.append(copy.deepcopy(battle))
+    return states
+
+
+def generic_deepcopy(obj, memodict):
+    """copy.deepcopy as it behaves without the custom __deepcopy__ methods."""
+    memodict[id(obj)] = copied = object.__new__(type(obj))
+    for klass in type(obj).__mro__:
+        for slot in vars(klass).get("__slots__", ()):
+            if hasattr(obj, slot):
+                object.__setattr__(copied, slot, copy.deepcopy(getattr(obj, slot), memodict))
+    if hasattr(obj, "__dict__"):
+        copied.__dict__.update(copy.deepcopy(obj.__dict__, memodict))
+    return copied
+
+
+def time_copies(states: List[Battle], repeat: int) -> float:
+    """Best time over `repeat` runs to copy every state, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        for battle in states:
+            copy.deepcopy(battle)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--battles", type=int, default=20, help="Generated battles to take states from")
+    parser.add_argument("--every", type=int, default=5, help="Take a state every this many turns")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    logging.getLogger("benchmark").setLevel(logging.ERROR)
+    states = battle_states(args.battles, args.every)
+    n_pokemon = sum(len(battle.team) + len(battle.opponent_team) for battle in states)
+    print(f"{len(states):,} battle states, {n_pokemon / len(states):.1f} Pokemon per state")
+
+    shared = time_copies(states, args.repeat)
+
+    classes = [AbstractBattle, Pokemon, Move]
+    overrides = {cls: cls.__dict__["__deepcopy__"] for cls in classes}
+    for cls in classes:
+        cls.__deepcopy__ = generic_deepcopy
+    try:
+        # The generic copy is slow enough that a sample of the states suffices
+        sample = states[:: max(1, len(states) // 10)]
+        generic = time_copies(sample, args.repeat) * len(states) / len(sample)
+    finally:
+        for cls, method in overrides.items():
+            cls.__deepcopy__ = method
+
+    print(f"generic deepcopy: {generic * 1e3 / len(states):8.3f} ms per state")
+    print(f"battle deepcopy:  {shared * 1e3 / len(states):8.3f} ms per state ({generic / shared:,.0f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for websocket frame handling.
+
+Replays battle room frames through PSClient._handle_message of an offline
+player, as they would arrive from the server: battle updates, |request| frames
+carrying the side JSON, and the decisions they trigger (answered instantly, and
+never sent). Reports frames and megabytes handled per second.
+
+Frames can be captured ones, from .jsonl files holding one JSON-encoded frame
+string per line; without paths, --synthetic generated gen9 singles battles are
+cut into frames, with a request before every turn.
+
+Usage:
+    python scripts/benchmarks/frame_benchmark.py [PATH ...] [--synthetic N] [--repeat R]
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import os
+import re
+import sys
+import time
+from typing import Dict, List
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from parse_message_benchmark import SETS, synthetic_log
+
+from poke_env.concurrency import POKE_LOOP
+from poke_env.data import GenData, to_id_str
+from poke_env.player import Player
+from poke_env.player.battle_order import DefaultBattleOrder
+from poke_env.ps_client import AccountConfiguration
+
+FORMAT = "gen9ou"
+
+
+class ReplayPlayer(Player):
+    """Answers every request instantly, without sending anything."""
+
+    def choose_move(self, battle):
+        return DefaultBattleOrder()
+
+
+def request_frame(room: str, team: List[str], active: str, hp: Dict[str, int], rqid: int) -> str:
+    """A |request| frame of p1's side, as the server sends before every turn."""
+    pokedex = GenData.from_gen(9).pokedex
+    pokemon = []
+    for species in team:
+        ability = to_id_str(pokedex[to_id_str(species)]["abilities"]["0"])
+        pokemon.append({
+            "ident": f"p1: {species}",
+            "details": f"{species}, L100",
+            "condition": f"{hp[species]}/100" if hp[species] else "0 fnt",
+            "active": species == active,
+            "stats": {"atk": 250, "def": 250, "spa": 250, "spd": 250, "spe": 250},
+            "moves": [to_id_str(move) for move in SETS[species]],
+            "baseAbility": ability,
+            "item": "leftovers",
+            "pokeball": "pokeball",
+            "ability": ability,
+            "commanding": False,
+            "reviving": False,
+            "teraType": "Normal",
+            "terastallized": "",
+        })
+    moves = [{"move": move, "id": to_id_str(move), "pp": 16, "maxpp": 16, "target": "normal", "disabled": False}
+             for move in SETS[active]]
+    request = {"active": [{"moves": moves}], "side": {"name": "Alice", "id": "p1", "pokemon": pokemon}, "rqid": rqid}
+    return f"{room}\n|request|{json.dumps(request)}"
+
+
+def synthetic_frames(seed: int) -> List[str]:
+    """Frames of a generated battle: the init frame, then a request and an update per turn."""
+    lines = synthetic_log(seed)
+    if not lines[-1].startswith("|win|"):
+        lines.append("|win|Alice")
+    room = f">battle-{FORMAT}-{seed}"
+    team = [line.split("|")[3].split(",")[0] for line in lines if line.startswith("|poke|p1|")]
+    hp = {species: 100 for species in team}
+    active = team[0]
+
+    frames, chunk = [], []
+    for line in lines:
+        if line == "|" and chunk:
+            frames.append("\n".join([room] + chunk))
+            frames.append(request_frame(room, team, active, hp, len(frames)))
+            chunk = []
+        chunk.append(line)
+        match = re.match(r"\|(switch|-damage|-heal)\|p1a: ([^|]+)\|[^|]*?(\d+)", line)
+        if match is not None:
+            if match.group(1) == "switch":
+                active = match.group(2)
+            else:
+                hp[match.group(2)] = int(match.group(3))
+    frames.append("\n".join([room] + chunk))
+    return frames
+
+
+def read_frames(paths: List[str]) -> List[str]:
+    """Frames of every .jsonl capture found under `paths`."""
+    frames = []
+    for path in paths:
+        if os.path.isdir(path):
+            frames += read_frames([os.path.join(root, name) for root, _, files in os.walk(path)
+                                   for name in sorted(files) if name.endswith(".jsonl")])
+            continue
+        with open(path, encoding="utf-8") as f:
+            frames += [json.loads(line) for line in f if line.strip()]
+    return frames
+
+
+def make_player(n_battles: int) -> Player:
+    player = ReplayPlayer(account_configuration=AccountConfiguration("Alice", None),
+                          battle_format=FORMAT,
+                          max_concurrent_battles=max(1, n_battles),
+                          start_listening=False,
+                          background_warm_up=False,
+                          decision_executor=None)
+    player.logger.setLevel(logging.ERROR)
+
+    async def send_message(message, room="", message_2=None):
+        pass
+
+    player.ps_client.send_message = send_message
+    return player
+
+
+async def replay(player: Player, frames: List[str]):
+    for frame in frames:
+        await player.ps_client._handle_message(frame)
+
+
+def main():
+    global FORMAT
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="*", help="Captured frame .jsonl files or directories")
+    parser.add_argument("--synthetic", type=int, default=200, help="Generated battles to use without paths")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.paths:
+        frames = read_frames(args.paths)
+        room = next((frame.split("\n", 1)[0] for frame in frames if frame.startswith(">battle-")), None)
+        if room is None:
+            print("No battle frames found")
+            return
+        FORMAT = room.split("-")[1]
+    else:
+        frames = [frame for seed in range(args.synthetic) for frame in synthetic_frames(seed)]
+    n_battles = len({frame.split("\n", 1)[0] for frame in frames})
+    n_requests = sum("\n|request|" in frame for frame in frames)
+    size = sum(len(frame) for frame in frames)
+
+    def run() -> float:
+        player = make_player(n_battles)
+        gc.collect()
+        start = time.perf_counter()
+        asyncio.run_coroutine_threadsafe(replay(player, frames), POKE_LOOP).result()
+        return time.perf_counter() - start
+
+    run()  # Warm-up: GenData, sets and Move caches
+    best = min(run() for _ in range(args.repeat))
+    print(f"Corpus: {n_battles:,} battles, {len(frames):,} frames ({n_requests:,} requests, {size / 1e6:.1f} MB)")
+    print(f"_handle_message: {len(frames) / best:,.0f} frames/s, {size / 1e6 / best:.1f} MB/s "
+          f"({best * 1e6 / len(frames):.1f} us/frame, best of {args.repeat})")
+
+
+if __name__ == "__main__":
+    main()
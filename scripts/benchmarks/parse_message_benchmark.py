@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for AbstractBattle.parse_message.
+
+Replays recorded battle logs through a fresh Battle each and reports protocol
+events parsed per second. Logs can be replay HTML files (as written with
+save_replays, or downloaded from the replay server), replay JSON files with a
+"log" field, or plain protocol logs; directories are searched recursively.
+Without paths, --synthetic generated gen9 singles battles are used.
+
+Usage:
+    python scripts/benchmarks/parse_message_benchmark.py [PATH ...] [--synthetic N] [--repeat R]
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import random
+import re
+import sys
+import time
+from collections import Counter
+from typing import Iterator, List, Optional
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, project_root)
+
+from poke_env.environment.battle import Battle
+from poke_env.player.player import Player
+
+# Lines the Player handles itself instead of passing them to parse_message
+PLAYER_EVENTS = Player.MESSAGES_TO_IGNORE | {"request", "win", "tie", "error", "uhtml"}
+
+SETS = {
+    "Kingambit": ["Knock Off", "Sucker Punch", "Swords Dance", "Iron Head"],
+    "Great Tusk": ["Headlong Rush", "Rapid Spin", "Knock Off", "Ice Spinner"],
+    "Gholdengo": ["Make It Rain", "Shadow Ball", "Nasty Plot", "Recover"],
+    "Dragapult": ["Draco Meteor", "Shadow Ball", "U-turn", "Will-O-Wisp"],
+    "Corviknight": ["Brave Bird", "Roost", "Body Press", "Defog"],
+    "Zamazenta": ["Body Press", "Close Combat", "Crunch", "Iron Defense"],
+    "Iron Valiant": ["Moonblast", "Close Combat", "Knock Off", "Encore"],
+    "Gliscor": ["Earthquake", "Spikes", "Toxic", "Protect"],
+    "Raging Bolt": ["Thunderclap", "Draco Meteor", "Calm Mind", "Thunderbolt"],
+    "Slowking-Galar": ["Future Sight", "Chilly Reception", "Sludge Bomb", "Toxic Spikes"],
+    "Ting-Lu": ["Ruination", "Stealth Rock", "Whirlwind", "Earthquake"],
+    "Cinderace": ["Pyro Ball", "U-turn", "Court Change", "Sucker Punch"],
+}
+
+
+def synthetic_log(seed: int, turns: int = 30) -> List[str]:
+    """Protocol lines of a random gen9 singles battle between two teams of six."""
+    rng = random.Random(seed)
+    teams = {side: rng.sample(sorted(SETS), 6) for side in ["p1", "p2"]}
+    lines = ["|init|battle", "|title|Alice vs. Bob", "|gametype|singles",
+             "|player|p1|Alice|1|1500", "|player|p2|Bob|2|1500",
+             "|teamsize|p1|6", "|teamsize|p2|6", "|gen|9", "|tier|[Gen 9] OU",
+             "|rule|Sleep Clause Mod: Limit one foe put to sleep", "|clearpoke"]
+    for side, team in teams.items():
+        lines += [f"|poke|{side}|{species}, L100|" for species in team]
+    lines += ["|teampreview", "|", "|start"]
+
+    hp = {side: {species: 100 for species in team} for side, team in teams.items()}
+    active = {}
+    for side, team in teams.items():
+        active[side] = team[0]
+        lines.append(f"|switch|{side}a: {team[0]}|{team[0]}, L100|100/100")
+    lines.append("|turn|1")
+
+    for turn in range(2, turns + 2):
+        lines += ["|", f"|t:|{1700000000 + turn}"]
+        for side, foe in [("p1", "p2"), ("p2", "p1")]:
+            alive = [species for species in teams[side] if hp[side][species] > 0 and species != active[side]]
+            if alive and rng.random() < 0.15:
+                active[side] = rng.choice(alive)
+                lines.append(f"|switch|{side}a: {active[side]}|{active[side]}, L100|{hp[side][active[side]]}/100")
+                continue
+            user, target = active[side], active[foe]
+            lines.append(f"|move|{side}a: {user}|{rng.choice(SETS[user])}|{foe}a: {target}")
+            hp[foe][target] = max(0, hp[foe][target] - rng.randint(10, 60))
+            if hp[foe][target]:
+                lines.append(f"|-damage|{foe}a: {target}|{hp[foe][target]}/100")
+            else:
+                lines += [f"|-damage|{foe}a: {target}|0 fnt", f"|faint|{foe}a: {target}"]
+        for side in ["p1", "p2"]:
+            species = active[side]
+            if 0 < hp[side][species] < 100:
+                hp[side][species] = min(100, hp[side][species] + 6)
+                lines.append(f"|-heal|{side}a: {species}|{hp[side][species]}/100|[from] item: Leftovers")
+            elif hp[side][species] == 0:
+                alive = [s for s in teams[side] if hp[side][s] > 0]
+                if not alive:
+                    return lines + [f"|win|{'Bob' if side == 'p1' else 'Alice'}"]
+                active[side] = rng.choice(alive)
+                lines.append(f"|switch|{side}a: {active[side]}|{active[side]}, L100|{hp[side][active[side]]}/100")
+        lines += ["|upkeep", f"|turn|{turn}"]
+    return lines
+
+
+def read_logs(paths: List[str]) -> Iterator[List[str]]:
+    """Protocol lines of every log found under `paths`."""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                yield from read_logs([os.path.join(root, name) for name in sorted(files)])
+            continue
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        if path.endswith(".json"):
+            text = json.loads(text)["log"]
+        elif path.endswith(".html"):
+            match = re.search(r'class="battle-log-data">(.*?)</script>', text, re.S)
+            if match is None:
+                continue
+            text = match.group(1)
+        yield [line.strip() for line in text.splitlines() if line.strip().startswith("|")]
+
+
+def parse_logs(logs: List[List[List[str]]], events: Optional[Counter] = None) -> int:
+    """Parse every log into a fresh Battle, counting events if given; returns the number of parse errors."""
+    errors = 0
+    for index, log in enumerate(logs):
+        username = next((message[3] for message in log if message[1] == "player" and message[2] == "p1"), "")
+        battle = Battle(f"battle-gen9ou-{index}", username, logging.getLogger("benchmark"), gen=9)
+        if events is not None:
+            events.update(split_message[1] for split_message in log)
+        for split_message in log:
+            try:
+                battle.parse_message(split_message)
+            except Exception:
+                errors += 1
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="*", help="Replay / log files or directories")
+    parser.add_argument("--synthetic", type=int, default=200, help="Generated battles to use without paths")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    logging.getLogger("benchmark").setLevel(logging.ERROR)
+    raw_logs = list(read_logs(args.paths)) if args.paths else [synthetic_log(seed) for seed in range(args.synthetic)]
+    # Split once up front, as the client does before handing lines to the battle
+    logs = [[split_message for split_message in (line.split("|") for line in log)
+             if len(split_message) > 1 and split_message[1] not in PLAYER_EVENTS]
+            for log in raw_logs]
+    n_events = sum(len(log) for log in logs)
+    if not n_events:
+        print("No battle log lines found")
+        return
+
+    events = Counter()
+    errors = parse_logs(logs, events)  # Warm-up: GenData, sets and Move caches
+    timings = []
+    for _ in range(args.repeat):
+        gc.collect()
+        start = time.perf_counter()
+        parse_logs(logs)
+        timings.append(time.perf_counter() - start)
+
+    best = min(timings)
+    print(f"Corpus: {len(logs):,} battles, {n_events:,} events ({errors:,} raised)")
+    print(f"Most frequent: {', '.join(f'{event} {count / n_events:.0%}' for event, count in events.most_common(6))}")
+    print(f"parse_message: {n_events / best:,.0f} events/s ({best * 1e6 / n_events:.2f} us/event, best of {args.repeat})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Builds the static data bundles GenData loads, e.g. ahead of time in a docker image.
+
+Bundles are otherwise built on first use, and rebuilt when their JSON sources change.
+
+Usage:
+    python scripts/data/build_bundles.py --gens 1 9 --force
+"""
+
+import argparse
+import os
+import sys
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from poke_env.data.gen_data import GenData
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--gens", type=int, nargs="+", default=list(range(1, 10)))
+    parser.add_argument("--force", action="store_true", help="Rebuild up-to-date bundles too")
+    args = parser.parse_args()
+
+    for gen in args.gens:
+        path = GenData.bundle_path(gen)
+        if args.force and os.path.exists(path):
+            os.remove(path)
+        GenData.from_gen(gen)
+        print(f"gen {gen}: {path} ({os.path.getsize(path) / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Tests for hosting several ladder agents in one process.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from argparse import Namespace
+from types import SimpleNamespace
+
+import pytest
+
+import pokechamp.llm_backends as llm_backends
+from poke_env.environment.battle import Battle
+from poke_env.player import RandomPlayer
+from pokechamp.agent_host import AgentHost, AgentSpec
+from pokechamp.llm_backends import CallUsage, LLMClientPool
+from pokechamp.llm_player import LLMPlayer
+
+
+class LadderPlayer(RandomPlayer):
+    """Plays ladder games offline, winning them all unless told to crash."""
+
+    crash = False
+
+    async def ladder(self, n_games):
+        if self.crash:
+            raise ConnectionError("websocket closed")
+        for _ in range(n_games):
+            battle = Battle(f"battle-gen9randombattle-{len(self._battles)}", self.username,
+                            logging.getLogger("test"), gen=9)
+            battle.won_by(self.username)
+            self._battles[battle.battle_tag] = battle
+            self._retain_finished_battle(battle)
+
+
+class WarmingLadderPlayer(LadderPlayer):
+    """Ladder player whose creation and warm-up block, like loading static data and
+    waiting for the team predictor."""
+
+    warm_up_delay = 0.3
+
+    def __init__(self, *args, **kwargs):
+        time.sleep(self.warm_up_delay)
+        super().__init__(*args, **kwargs)
+
+    def warm_up(self):
+        time.sleep(self.warm_up_delay)
+
+
+class OfflineHost(AgentHost):
+    """Host creating offline players, crashing the ones of usernames in `crashing`."""
+
+    player_class = LadderPlayer
+
+    def __init__(self, agents, crashing=(), **kwargs):
+        super().__init__(agents, Namespace(), battle_format="gen9randombattle", game_delay=(0, 0), **kwargs)
+        self.crashing = set(crashing)
+        self.created = []
+
+    def create_player(self, agent):
+        player = self.player_class(battle_format=self.battle_format, start_listening=False, background_warm_up=False)
+        player.crash = agent.username in self.crashing
+        self.created.append(agent.username)
+        return player
+
+
+class SharedClient:
+    """LLM client whose calls from two threads overlap, reporting their prompt sizes."""
+
+    def __init__(self):
+        self.prompt_tokens = self.cached_prompt_tokens = 0
+        self.last_call_usage = CallUsage()
+        self.both_calling = threading.Barrier(2)
+
+    def get_LLM_action(self, system_prompt, user_prompt, *args, **kwargs):
+        tokens = len(user_prompt)
+        self.prompt_tokens += tokens
+        self.cached_prompt_tokens += tokens // 2
+        self.both_calling.wait(timeout=10)
+        self.last_call_usage.prompt_tokens = tokens
+        self.last_call_usage.cached_prompt_tokens = tokens // 2
+        return "{}", True, ""
+
+
+def make_agent(username, name="random"):
+    return AgentSpec(name=name, backend="gpt-4o", prompt_algo="io", username=username)
+
+
+class TestAgentHost:
+    """Test class for AgentHost."""
+
+    @pytest.mark.unit
+    def test_failing_agent_is_isolated(self):
+        """A crashing agent should be restarted and reported without stopping the others."""
+        host = OfflineHost([make_agent("alice"), make_agent("bob")], crashing=["bob"], games=2, max_restarts=1)
+
+        alice, bob = asyncio.run(host.run())
+
+        assert (alice["wins"], alice["total_games"], alice["parsed_successfully"]) == (2, 2, True)
+        assert alice["win_rate"] == 100.0
+        assert not bob["parsed_successfully"] and "websocket closed" in bob["error"]
+        assert host.created.count("bob") == 2 and host.created.count("alice") == 1
+
+    @pytest.mark.unit
+    def test_agents_share_llm_clients(self, monkeypatch):
+        """Agents of the same backend and device should share one client."""
+        monkeypatch.setattr(llm_backends, "create_llm_backend", lambda backend, api_key="", device=0: object())
+        clients = LLMClientPool()
+
+        first = clients.get("gpt-4o", device=0)
+
+        assert clients.get("gpt-4o", device=0) is first
+        assert clients.get("gpt-4o", device=1) is not first
+        assert len(clients) == 2
+        with pytest.raises(ValueError):
+            OfflineHost([make_agent("alice"), make_agent("alice")])
+        assert AgentSpec.from_dict({"name": "pokechamp", "backend": "gpt-4o", "prompt_algo": "io",
+                                    "username": "alice", "password": None},
+                                   {"alice": "secret"}).password == "secret"
+
+    @pytest.mark.unit
+    def test_shared_client_usage_is_per_call(self):
+        """Players sharing a client should only count their own calls' tokens."""
+        client = SharedClient()
+        players = [SimpleNamespace(llm=client, ps_client=None, prompt_tokens_per_call=[], cached_tokens_per_call=[])
+                   for _ in range(2)]
+
+        threads = [threading.Thread(target=LLMPlayer.get_LLM_action, args=(player, "", "x" * size, "gpt-4o"))
+                   for player, size in zip(players, [100, 300])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+
+        assert client.prompt_tokens == 400
+        assert [player.prompt_tokens_per_call for player in players] == [[100], [300]]
+        assert [player.cached_tokens_per_call for player in players] == [[50], [150]]
+
+    @pytest.mark.unit
+    def test_player_setups_do_not_block_other_agents(self):
+        """Agents should create and warm up their players concurrently instead of stalling the host loop."""
+        host = OfflineHost([make_agent(name) for name in ["alice", "bob", "carol"]], games=1)
+        host.player_class = WarmingLadderPlayer
+
+        start = time.perf_counter()
+        results = asyncio.run(host.run())
+
+        assert [result["total_games"] for result in results] == [1, 1, 1]
+        assert time.perf_counter() - start < 4 * WarmingLadderPlayer.warm_up_delay
@@ -0,0 +1,62 @@
+"""
+Tests for playing games locally in the arena.
+"""
+
+import random
+
+import pytest
+
+from poke_env.player import MaxBasePowerPlayer, RandomPlayer
+from poke_env.player.arena import Arena, load_format_teams
+
+
+def seat(game):
+    return None if game.tie else game.players.index(game.winner)
+
+
+class TestArena:
+    """Test class for Arena."""
+
+    @pytest.mark.unit
+    def test_games_are_played_to_the_end(self):
+        """Both players should see every game end, with the winner the arena reports."""
+        arena = Arena(MaxBasePowerPlayer, RandomPlayer, battle_format="gen9ou")
+        players = arena.create_players()
+
+        results = [arena.play_game(players, seed) for seed in range(3)]
+
+        for player in players:
+            battles = list(player.battles.values())
+            assert len(battles) == 3 and all(battle.finished for battle in battles)
+            for battle, result in zip(battles, results):
+                assert battle.won == (result.winner == player.username)
+                assert battle.turn == result.turns
+        assert all(0 < result.turns <= 200 for result in results)
+
+    @pytest.mark.unit
+    def test_games_are_reproducible(self):
+        """Games of the same seed should play out the same way."""
+        arena = Arena(MaxBasePowerPlayer, RandomPlayer, battle_format="gen9ou", seed=7)
+
+        first, second = arena.play(4), arena.play(4)
+
+        assert [game.seed for game in first.games] == [7, 8, 9, 10]
+        assert [(seat(game), game.turns) for game in first.games] == \
+            [(seat(game), game.turns) for game in second.games]
+        assert first.wins(first.games[0].players[0]) + first.wins(first.games[0].players[1]) + first.ties == 4
+        with pytest.raises(ValueError):
+            Arena(RandomPlayer, RandomPlayer, battle_format="gen9vgc2025regi")
+        with pytest.raises(ValueError):
+            load_format_teams("gen3ou")
+
+    @pytest.mark.unit
+    def test_global_random_state_is_restored(self):
+        """Seeding games should not change the random state of the code hosting the arena."""
+        arena = Arena(RandomPlayer, RandomPlayer, battle_format="gen9ou")
+        players = arena.create_players()
+        random.seed(123)
+        expected = random.Random(123).random()
+
+        arena.play_game(players, 0)
+
+        assert random.random() == expected
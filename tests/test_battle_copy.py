@@ -0,0 +1,79 @@
+"""
+Tests for copying battle states.
+"""
+
+import copy
+import logging
+
+import pytest
+
+from poke_env.environment.battle import Battle
+from poke_env.environment.effect import Effect
+from poke_env.environment.move import Move
+
+
+def make_battle():
+    battle = Battle("battle-gen9ou-1", "Alice", logging.getLogger("test"), save_replays=True, gen=9)
+    for line in ["|player|p1|Alice|1|1500", "|player|p2|Bob|2|1500",
+                 "|switch|p1a: Kingambit|Kingambit, L100, M|100/100",
+                 "|switch|p2a: Great Tusk|Great Tusk, L100|100/100",
+                 "|move|p1a: Kingambit|Iron Head|p2a: Great Tusk",
+                 "|-damage|p2a: Great Tusk|55/100",
+                 "|-boost|p1a: Kingambit|atk|2",
+                 "|turn|2"]:
+        battle.parse_message(line.split("|"))
+    return battle
+
+
+class TestBattleCopy:
+    """Test class for Battle, Pokemon and Move deep copies."""
+
+    @pytest.mark.unit
+    def test_copy_is_independent(self):
+        """Mutating the copy should leave the original battle untouched."""
+        battle = make_battle()
+        copied = battle.clone()
+
+        kingambit = copied.get_pokemon("p1a: Kingambit")
+        great_tusk = copied.get_pokemon("p2a: Great Tusk")
+        kingambit.boost("atk", 2)
+        kingambit.moves["ironhead"].use()
+        kingambit._effects[Effect.TAUNT] = 1
+        great_tusk.damage("20/100")
+        copied.parse_message(["", "turn", "3"])
+
+        original = battle.get_pokemon("p1a: Kingambit")
+        assert original.boosts["atk"] == 2 and kingambit.boosts["atk"] == 4
+        assert original.moves["ironhead"].current_pp == kingambit.moves["ironhead"].current_pp + 1
+        assert Effect.TAUNT not in original.effects
+        assert battle.get_pokemon("p2a: Great Tusk").current_hp == 55
+        assert battle.turn == 2 and copied.turn == 3
+        assert len(battle._replay_data) == len(copied._replay_data) - 1
+
+    @pytest.mark.unit
+    def test_copy_shares_static_data(self):
+        """Copies should share the pokedex, sets and moves tables."""
+        battle = make_battle()
+        copied = copy.deepcopy(battle)
+
+        original, kingambit = battle.get_pokemon("p1a: Kingambit"), copied.get_pokemon("p1a: Kingambit")
+        assert copied._data is battle._data
+        assert copied.logger is battle.logger
+        assert kingambit is not original
+        assert kingambit._sets is original._sets
+        assert kingambit._base_stats is original._base_stats
+        assert kingambit.moves["ironhead"]._moves_dict is original.moves["ironhead"]._moves_dict
+        assert copied.active_pokemon is kingambit
+
+    @pytest.mark.unit
+    def test_move_copy(self):
+        """Move copies keep their state and rebuild the dynamaxed view."""
+        move = Move("hiddenpowerfire", gen=9, raw_id="hiddenpowerfire60")
+        move.use()
+        move.dynamaxed
+
+        copied = move.clone()
+        assert copied.id == move.id and copied.base_power == move.base_power
+        assert copied.current_pp == move.current_pp
+        assert copied._dynamaxed_move is None
+        assert copied.dynamaxed._parent is copied
@@ -0,0 +1,145 @@
+"""
+Tests for streaming battle logs to disk.
+"""
+
+import asyncio
+import gzip
+import json
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from poke_env.concurrency import POKE_LOOP
+from poke_env.player import Player
+from poke_env.player.battle_log_writer import BattleLogWriter
+from poke_env.player.battle_order import DefaultBattleOrder
+from poke_env.ps_client import AccountConfiguration
+
+INIT_FRAME = "\n".join([
+    ">battle-gen9ou-1", "|init|battle", "|title|Alice vs. Bob", "|j|Alice",
+    "|player|p1|Alice|1|", "|player|p2|Bob|2|", "|gen|9", "|tier|[Gen 9] OU",
+    "|", "|start", "|switch|p1a: Kingambit|Kingambit, L100|100/100",
+    "|switch|p2a: Gholdengo|Gholdengo, L100|100/100", "|turn|1",
+])
+
+
+class FirstMovePlayer(Player):
+    def choose_move(self, battle):
+        return DefaultBattleOrder()
+
+
+def read_gzip(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return f.read()
+
+
+class TestBattleLogWriter:
+    """Test class for BattleLogWriter."""
+
+    @pytest.mark.unit
+    def test_logs_are_streamed_to_battle_files(self, tmp_path):
+        """Protocol lines and decisions should land in per-battle files, rendered on close."""
+        writer = BattleLogWriter(str(tmp_path))
+
+        writer.write_lines("Alice", "battle-gen9ou-1", ["|init|battle", "|turn|1"])
+        writer.write_decision("Alice", "battle-gen9ou-1", {"turn": 1, "llm_output1": "move"})
+        writer.write_lines("Alice", "battle-gen9ou-1", ["|win|Alice"])
+        writer.close_battle("Alice", "battle-gen9ou-1", "Bob")
+        assert writer.flush(timeout=10)
+
+        log = read_gzip(writer.path("Alice", "battle-gen9ou-1", ".log.gz"))
+        assert log == "|init|battle\n|turn|1\n|win|Alice\n"
+        decisions = read_gzip(writer.path("Alice", "battle-gen9ou-1", ".decisions.jsonl.gz"))
+        assert [json.loads(line) for line in decisions.splitlines()] == [{"turn": 1, "llm_output1": "move"}]
+        with open(writer.path("Alice", "battle-gen9ou-1", ".html"), encoding="utf-8") as f:
+            replay = f.read()
+        assert ">battle-gen9ou-1\n|init|battle\n|turn|1" in replay and "Bob" in replay
+        assert writer.dropped == 0 and writer.pending == 0
+
+    @pytest.mark.unit
+    def test_closes_never_block(self, tmp_path):
+        """Closing a battle should not wait for the disk, even when writes are dropped."""
+        writer = BattleLogWriter(str(tmp_path), max_pending=1)
+        rendering, release, rendered = threading.Event(), threading.Event(), []
+
+        def render_replay(username, battle_tag, opponent_username):
+            rendering.set()
+            release.wait(timeout=10)
+            rendered.append(battle_tag)
+
+        writer._render_replay = render_replay
+        writer.close_battle("Alice", "battle-gen9ou-1", "Bob")
+        assert rendering.wait(timeout=10)
+        writer.write_lines("Alice", "battle-gen9ou-2", ["|init|battle"])
+        writer.write_lines("Alice", "battle-gen9ou-2", ["|win|Alice"])
+
+        closing = threading.Thread(target=writer.close_battle, args=("Alice", "battle-gen9ou-2", "Bob"))
+        closing.start()
+        closing.join(timeout=5)
+        assert not closing.is_alive()
+        release.set()
+        assert writer.flush(timeout=10)
+
+        assert rendered == ["battle-gen9ou-1", "battle-gen9ou-2"]
+        assert read_gzip(writer.path("Alice", "battle-gen9ou-2", ".log.gz")) == "|init|battle\n"
+        assert writer.dropped == 1 and writer.pending == 0
+
+    @pytest.mark.unit
+    def test_player_streams_replays(self, tmp_path):
+        """Players saving replays should stream battle frames instead of keeping them in memory."""
+        player = FirstMovePlayer(account_configuration=AccountConfiguration("Alice", None), battle_format="gen9ou",
+                                 save_replays=str(tmp_path), start_listening=False, background_warm_up=False)
+
+        async def send_message(message, room="", message_2=None):
+            pass
+
+        async def play():
+            await player.ps_client._handle_message(INIT_FRAME)
+            await player.ps_client._handle_message('>battle-gen9ou-1\n|request|{"wait": true, "side": {"pokemon": []}, "rqid": 1}')
+            await player.ps_client._handle_message(">battle-gen9ou-1\n|\n|win|Alice")
+
+        player.ps_client.send_message = send_message
+        asyncio.run_coroutine_threadsafe(play(), POKE_LOOP).result(timeout=60)
+        assert player.log_writer.flush(timeout=10)
+
+        battle = player.battles["battle-gen9ou-1"]
+        assert battle.won and battle._replay_data == []
+        log = read_gzip(player.log_writer.path("Alice", "battle-gen9ou-1", ".log.gz")).splitlines()
+        assert log == INIT_FRAME.split("\n")[1:] + ["|", "|win|Alice"]
+        assert (tmp_path / "Alice - battle-gen9ou-1.html").exists()
+
+    @pytest.mark.unit
+    def test_logs_are_completed_at_exit(self, tmp_path):
+        """Scripts exiting right after their last battle should keep its logs and replay."""
+        code = "\n".join([
+            "from poke_env.player.battle_log_writer import BattleLogWriter",
+            f"writer = BattleLogWriter({str(tmp_path)!r})",
+            "writer.write_lines('Alice', 'battle-gen9ou-1', ['|init|battle', '|win|Alice'])",
+            "writer.close_battle('Alice', 'battle-gen9ou-1', 'Bob')",
+            "writer.write_lines('Alice', 'battle-gen9ou-2', ['|init|battle'])",
+        ])
+        env = dict(os.environ, PYTHONPATH=os.path.join(os.path.dirname(__file__), ".."))
+        subprocess.run([sys.executable, "-c", code], env=env, check=True, timeout=120)
+
+        writer = BattleLogWriter(str(tmp_path))
+        assert read_gzip(writer.path("Alice", "battle-gen9ou-1", ".log.gz")) == "|init|battle\n|win|Alice\n"
+        assert (tmp_path / "Alice - battle-gen9ou-1.html").exists()
+        # Unfinished battles are closed as valid gzip files
+        assert read_gzip(writer.path("Alice", "battle-gen9ou-2", ".log.gz")) == "|init|battle\n"
+
+    @pytest.mark.unit
+    def test_close_completes_writes(self, tmp_path):
+        """Closing the writer should write every queued item and allow writing again."""
+        writer = BattleLogWriter(str(tmp_path))
+
+        writer.write_lines("Alice", "battle-gen9ou-1", ["|init|battle"])
+        assert writer.close(timeout=10) and writer.pending == 0
+        assert read_gzip(writer.path("Alice", "battle-gen9ou-1", ".log.gz")) == "|init|battle\n"
+
+        writer.write_lines("Alice", "battle-gen9ou-1", ["|win|Alice"])
+        writer.close_battle("Alice", "battle-gen9ou-1", "Bob")
+        assert writer.close(timeout=10)
+        assert read_gzip(writer.path("Alice", "battle-gen9ou-1", ".log.gz")) == "|init|battle\n|win|Alice\n"
@@ -0,0 +1,91 @@
+"""
+Tests for the retention of finished battles in Player.
+"""
+
+import asyncio
+
+import pytest
+
+from poke_env.concurrency import POKE_LOOP
+from poke_env.player import Player
+from poke_env.player.battle_order import DefaultBattleOrder
+from poke_env.ps_client import AccountConfiguration
+
+
+class FirstMovePlayer(Player):
+    def choose_move(self, battle):
+        return DefaultBattleOrder()
+
+
+def battle_frames(number, winner):
+    room = f">battle-gen9ou-{number}"
+    return [
+        "\n".join([
+            room, "|init|battle", "|title|Alice vs. Bob", "|j|Alice", "|player|p1|Alice|1|",
+            "|player|p2|Bob|2|", "|gen|9", "|tier|[Gen 9] OU", "|", "|start",
+            "|switch|p1a: Kingambit|Kingambit, L100|100/100",
+            "|switch|p2a: Gholdengo|Gholdengo, L100|100/100", "|turn|1",
+        ]),
+        "\n".join([room, "|", "|-damage|p2a: Gholdengo|40/100", "|turn|2"]),
+        "\n".join([room, "|", f"|win|{winner}"]),
+        "\n".join([room, "|raw|Alice's rating: 1020 &rarr; <strong>1040</strong>"]),
+    ]
+
+
+def play(player, frames):
+    async def replay():
+        for frame in frames:
+            await player.ps_client._handle_message(frame)
+
+    asyncio.run_coroutine_threadsafe(replay(), POKE_LOOP).result(timeout=60)
+
+
+def make_player(**kwargs):
+    player = FirstMovePlayer(account_configuration=AccountConfiguration("Alice", None), battle_format="gen9ou",
+                             max_concurrent_battles=0, start_listening=False, background_warm_up=False, **kwargs)
+
+    async def send_message(message, room="", message_2=None):
+        pass
+
+    player.ps_client.send_message = send_message
+    return player
+
+
+class TestBattleRetention:
+    """Test class for finished battle retention."""
+
+    @pytest.mark.unit
+    def test_finished_battles_are_compacted(self):
+        """Only the latest finished battles should be kept, older ones as result records."""
+        player = make_player(max_finished_battles=1)
+
+        for number, winner in enumerate(["Alice", "Bob", "Alice"]):
+            play(player, battle_frames(number, winner))
+
+        assert list(player.battles) == ["battle-gen9ou-2"]
+        assert (player.n_finished_battles, player.n_won_battles, player.n_lost_battles) == (3, 2, 1)
+        assert player.n_tied_battles == 0 and player.win_rate == 2 / 3
+        results = player.battle_results
+        assert [results[f"battle-gen9ou-{n}"].winner for n in range(3)] == ["Alice", "Bob", "Alice"]
+        first = results["battle-gen9ou-0"]
+        assert first.won and first.turns == 2 and first.rating == 1020 and first.opponent_username == "Bob"
+        assert first.opponent_hp_lost == pytest.approx(0.6) and first.remaining_hp == pytest.approx(1.0)
+
+        # Late messages of compacted battles are dropped
+        play(player, battle_frames(0, "Alice")[1:])
+        assert player.n_finished_battles == 3 and "battle-gen9ou-0" not in player.battles
+
+        player.reset_battles()
+        assert player.battle_results == {} and player.n_finished_battles == 0
+
+    @pytest.mark.unit
+    def test_battles_are_kept_by_default(self):
+        """Without a retention limit, every battle should stay available."""
+        player = make_player()
+
+        for number, winner in enumerate(["Alice", "Bob"]):
+            play(player, battle_frames(number, winner))
+
+        assert list(player.battles) == ["battle-gen9ou-0", "battle-gen9ou-1"]
+        assert (player.n_finished_battles, player.n_won_battles) == (2, 1)
+        assert [result.won for result in player.battle_results.values()] == [True, False]
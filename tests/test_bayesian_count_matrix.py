@@ -0,0 +1,194 @@
+"""
+Tests for the NumPy count-matrix backend of the Bayesian team predictor.
+
+The compiled backend must reproduce the Counter-loop predictions, so every
+test compares both backends on the same synthetic model; a model file written
+from it must predict the same again once memory-mapped.
+"""
+
+import numpy as np
+import pytest
+
+from bayesian.benchmark_predictor import make_synthetic_predictor
+from bayesian.count_matrix import CountMatrixModel, popcount
+from bayesian.team_predictor import BayesianTeamPredictor
+
+
+@pytest.fixture(scope="module")
+def synthetic_predictor():
+    """Small synthetic model that trains without downloading the team dataset."""
+    return make_synthetic_predictor(n_teams=1500, n_species=60, seed=1)
+
+
+@pytest.fixture(scope="module")
+def loaded_predictor(synthetic_predictor, tmp_path_factory):
+    """The synthetic model written to a model file and loaded back."""
+    synthetic_predictor.use_count_matrix = True
+    synthetic_predictor.model_path = str(tmp_path_factory.mktemp("model") / "synthetic.model")
+    synthetic_predictor._save_model_file()
+
+    loaded = BayesianTeamPredictor(cache_file="synthetic_missing.pkl", battle_format="synthetic")
+    loaded.model_path = synthetic_predictor.model_path
+    loaded.load_and_train()
+    return loaded
+
+
+def predict_both(predictor, method, *args):
+    predictor.use_count_matrix = False
+    expected = getattr(predictor, method)(*args)
+    predictor.use_count_matrix = True
+    actual = getattr(predictor, method)(*args)
+    return expected, actual
+
+
+class TestCountMatrixBackend:
+    """Test class for the count-matrix backend."""
+
+    @pytest.mark.bayesian
+    @pytest.mark.parametrize("revealed", [
+        [],
+        ["Species0"],
+        ["Species0", "Species3", "Species7"],
+        ["Species1", "Unknown"],
+    ])
+    def test_unrevealed_pokemon_matches(self, synthetic_predictor, revealed):
+        """Teammate predictions should match the Counter loop within tolerance."""
+        expected, actual = predict_both(synthetic_predictor, "predict_unrevealed_pokemon", revealed, 8)
+
+        assert [species for species, _ in actual] == [species for species, _ in expected]
+        for (_, expected_prob), (_, actual_prob) in zip(expected, actual):
+            assert actual_prob == pytest.approx(expected_prob, rel=1e-9)
+
+    @pytest.mark.bayesian
+    @pytest.mark.parametrize("revealed_moves", [[], ["Move 2"], ["Move 2", "Move 5", "Move 59"]])
+    def test_component_probabilities_match(self, synthetic_predictor, revealed_moves):
+        """Component distributions should be identical to the Counter loop."""
+        expected, actual = predict_both(
+            synthetic_predictor, "predict_component_probabilities", "Species2", ["Species0"], revealed_moves
+        )
+
+        assert actual.keys() == expected.keys()
+        for component in ["moves", "items", "natures", "abilities", "ev_spreads"]:
+            assert [name for name, _ in actual[component]] == [name for name, _ in expected[component]]
+            for (_, expected_prob), (_, actual_prob) in zip(expected[component], actual[component]):
+                assert actual_prob == pytest.approx(expected_prob, rel=1e-12)
+
+    @pytest.mark.bayesian
+    def test_pokemon_config_matches(self, synthetic_predictor):
+        """The most likely config should be the same for both backends."""
+        expected, actual = predict_both(
+            synthetic_predictor, "predict_pokemon_config", "Species4", None, ["Move 5", "Move 7"]
+        )
+
+        assert actual == expected
+
+    @pytest.mark.bayesian
+    def test_unknown_species(self, synthetic_predictor):
+        """Unknown species should report an error rather than compile an empty table."""
+        synthetic_predictor.use_count_matrix = True
+        assert "error" in synthetic_predictor.predict_component_probabilities("Missingno")
+
+    @pytest.mark.bayesian
+    def test_config_rows_match_parsed_keys(self, synthetic_predictor):
+        """Every pre-parsed row should rebuild the same config as parsing its key."""
+        table = synthetic_predictor.count_matrix.config_table("Species5")
+
+        assert len(table.config_keys) > 1
+        for row, config_key in enumerate(table.config_keys):
+            assert table.config(row) == synthetic_predictor._parse_config_key(config_key)
+
+    @pytest.mark.bayesian
+    def test_move_bitsets(self, synthetic_predictor):
+        """Move bitsets should hold exactly the moves of each config."""
+        table = synthetic_predictor.count_matrix.config_table("Species5")
+
+        assert (popcount(table.move_bits).sum(axis=1) == (table.move_slots >= 0).sum(axis=1)).all()
+        config_moves = table.config(0)["moves"]
+        mask = table.revealed_mask(config_moves + ["Not A Move"])
+        assert popcount(table.move_bits[0] & mask).sum() == len(config_moves)
+
+    @pytest.mark.bayesian
+    def test_popcount(self):
+        """popcount should count set bits across the full 64-bit range."""
+        words = np.array([0, 1, 0b1011, np.iinfo(np.uint64).max], dtype=np.uint64)
+        assert popcount(words).tolist() == [0, 1, 3, 64]
+
+
+class TestModelFile:
+    """Test class for the memory-mapped model file."""
+
+    @pytest.mark.bayesian
+    @pytest.mark.parametrize("method,args", [
+        ("predict_unrevealed_pokemon", (["Species0", "Species3"], 8)),
+        ("predict_pokemon_config", ("Species4", None, ["Move 5", "Move 7"])),
+        ("predict_component_probabilities", ("Species2", ["Species0"], ["Move 2", "Move 5"])),
+        ("predict_component_probabilities", ("Missingno", None, None)),
+    ])
+    def test_round_trip_predictions(self, synthetic_predictor, loaded_predictor, method, args):
+        """A loaded model file should predict exactly like the model that wrote it."""
+        synthetic_predictor.use_count_matrix = True
+        assert getattr(loaded_predictor, method)(*args) == getattr(synthetic_predictor, method)(*args)
+
+    @pytest.mark.bayesian
+    def test_round_trip_metadata(self, synthetic_predictor, loaded_predictor):
+        """Team totals and species counts should survive the round trip."""
+        assert loaded_predictor.total_teams == synthetic_predictor.total_teams
+        assert loaded_predictor.species_counts == synthetic_predictor.species_counts
+
+    @pytest.mark.bayesian
+    def test_arrays_are_read_only_maps(self, loaded_predictor):
+        """Loaded tables should be read-only views of the mapped file, not private copies."""
+        model = loaded_predictor.count_matrix
+        table = model.config_table("Species5")
+
+        for array in [model.teammates, model.log_teammate_given, table.evs, table.parse_errors]:
+            assert not array.flags.writeable
+            assert isinstance(array.base, np.memmap) or isinstance(array, np.memmap)
+
+    @pytest.mark.bayesian
+    def test_counter_backend_needs_counts(self, loaded_predictor):
+        """The Counter loops cannot run on a model loaded from the model file."""
+        loaded_predictor.use_count_matrix = False
+        try:
+            with pytest.raises(RuntimeError):
+                loaded_predictor.predict_unrevealed_pokemon(["Species0"])
+        finally:
+            loaded_predictor.use_count_matrix = True
+
+    @pytest.mark.bayesian
+    def test_rejects_other_files(self, tmp_path):
+        """Loading something that is not a model file should fail loudly."""
+        path = tmp_path / "not_a_model.model"
+        path.write_bytes(b"\x80\x04not a model")
+        with pytest.raises(ValueError):
+            CountMatrixModel.load(str(path))
+
+
+class TestPredictTeam:
+    """Test class for batched whole-team predictions."""
+
+    @pytest.mark.bayesian
+    @pytest.mark.parametrize("revealed", [{}, {"Species2": ["Move 2", "Move 5"], "Species7": ["Move 9"]}])
+    def test_matches_separate_calls(self, synthetic_predictor, revealed):
+        """predict_team should return exactly what six separate calls return."""
+        synthetic_predictor.use_count_matrix = True
+        team = ["Species0", "Species2", "Species3", "Species7", "Species11", "Missingno"]
+
+        results = synthetic_predictor.predict_team(team, revealed)
+
+        assert list(results) == team
+        for species in team:
+            teammates = [other for other in team if other != species]
+            expected = synthetic_predictor.predict_component_probabilities(species, teammates, revealed.get(species))
+            assert results[species] == expected
+
+    @pytest.mark.bayesian
+    def test_counter_backend(self, synthetic_predictor):
+        """Without the count matrix predict_team falls back to per-species queries."""
+        synthetic_predictor.use_count_matrix = False
+        try:
+            results = synthetic_predictor.predict_team(["Species0", "Species1"], {"Species1": ["Move 1"]})
+        finally:
+            synthetic_predictor.use_count_matrix = True
+
+        assert results["Species1"] == synthetic_predictor.predict_component_probabilities("Species1", None, ["Move 1"])
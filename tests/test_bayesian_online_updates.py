@@ -0,0 +1,154 @@
+"""
+Tests for online (incremental) updates of the Bayesian team predictor.
+"""
+
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from bayesian import predictor_singleton
+from bayesian.benchmark_predictor import make_synthetic_teams
+from bayesian.pokemon_predictor import PokemonPredictor
+from bayesian.team_predictor import BayesianTeamPredictor
+from poke_env.data import GenData
+from poke_env.player import RandomPlayer
+
+QUERIES = [
+    ("predict_unrevealed_pokemon", (["Species0", "Species3"], 8)),
+    ("predict_pokemon_config", ("Species4", None, ["Move 5", "Move 7"])),
+    ("predict_component_probabilities", ("Species2", ["Species0"], ["Move 2", "Move 5"])),
+]
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("METAMON_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def trained_on(teams, name: str) -> BayesianTeamPredictor:
+    predictor = BayesianTeamPredictor(cache_file=f"{name}_team_predictor_full.pkl", battle_format=name)
+    predictor.update_from_teams(teams)
+    return predictor
+
+
+def predictions(predictor):
+    return [getattr(predictor, method)(*args) for method, args in QUERIES]
+
+
+class TestOnlineUpdates:
+    """Test class for incremental predictor updates."""
+
+    @pytest.mark.bayesian
+    def test_update_matches_full_training(self, cache_dir):
+        """Folding teams in later should give the same model as training on all of them."""
+        teams = make_synthetic_teams(n_teams=600, n_species=30, seed=3)
+        full = trained_on(teams, "full")
+
+        incremental = trained_on(teams[:400], "incremental")
+        predictions(incremental)  # compile the model before updating it
+        assert incremental.update_from_teams(teams[400:]) == 200
+
+        assert incremental.total_teams == full.total_teams
+        assert predictions(incremental) == predictions(full)
+
+    @pytest.mark.bayesian
+    def test_update_model_file_and_snapshot(self, cache_dir):
+        """A model loaded from its file can be updated, snapshotted and loaded back."""
+        teams = make_synthetic_teams(n_teams=600, n_species=30, seed=4)
+        full = trained_on(teams, "full")
+
+        base = trained_on(teams[:400], "online")
+        base.save_snapshot()
+        loaded = BayesianTeamPredictor(cache_file="online_team_predictor_full.pkl", battle_format="online")
+        loaded.load_and_train()
+        loaded.update_from_teams(teams[400:])
+        assert predictions(loaded) == predictions(full)
+
+        loaded.save_snapshot()
+        reloaded = BayesianTeamPredictor(cache_file="online_team_predictor_full.pkl", battle_format="online")
+        reloaded.load_and_train()
+        assert reloaded.total_teams == 600
+        assert predictions(reloaded) == predictions(full)
+
+    @pytest.mark.bayesian
+    def test_species_update_keeps_configs_in_model_file(self, cache_dir):
+        """Species-only updates of a loaded model should not rebuild its config counts."""
+        teams = make_synthetic_teams(n_teams=400, n_species=30, seed=7)
+        trained_on(teams, "species").save_snapshot()
+        compositions = [[pokemon.species for pokemon in team.pokemon] for team in teams[:50]]
+
+        def loaded():
+            predictor = BayesianTeamPredictor(cache_file="species_team_predictor_full.pkl", battle_format="species")
+            predictor.load_and_train()
+            return predictor
+
+        reference = loaded()
+        reference._restore_counts()
+        reference.update_from_species(compositions)
+        online = loaded()
+        online.update_from_species(compositions)
+
+        assert not online.config_given_species and online._config_source is not None
+        assert predictions(online) == predictions(reference)
+        online.save_snapshot()
+        assert predictions(loaded()) == predictions(reference)
+
+        # Full sets need the config counts
+        online.update_from_teams(teams[:1])
+        reference.update_from_teams(teams[:1])
+        assert online.config_given_species == reference.config_given_species
+        assert predictions(online) == predictions(reference)
+
+    @pytest.mark.bayesian
+    def test_player_updates_off_event_loop(self, monkeypatch):
+        """Players should queue finished battles to the update thread instead of updating inline."""
+        threads = []
+        predictor = SimpleNamespace(update_from_battle=lambda battle: threads.append(threading.current_thread().name))
+        monkeypatch.setitem(predictor_singleton._predictor_instances, "gen9ou", predictor)
+        player = RandomPlayer(battle_format="gen9ou", learn_from_battles=True, start_listening=False,
+                              background_warm_up=False)
+
+        player._update_team_predictor(SimpleNamespace(battle_tag="battle-gen9ou-1")).result(timeout=10)
+
+        assert threads and threads[0].startswith("team-predictor-update")
+
+    @pytest.mark.bayesian
+    def test_periodic_snapshot(self, cache_dir):
+        """A snapshot should be written in the background once enough teams were folded."""
+        teams = make_synthetic_teams(n_teams=30, n_species=20, seed=5)
+        predictor = BayesianTeamPredictor(cache_file="periodic_team_predictor_full.pkl",
+                                          battle_format="periodic", snapshot_every=25)
+        predictor.update_from_teams(teams[:20])
+        assert predictor._snapshot_thread is None
+
+        predictor.update_from_teams(teams[20:])
+        predictor._snapshot_thread.join(timeout=30)
+        loaded = BayesianTeamPredictor(cache_file="periodic_team_predictor_full.pkl", battle_format="periodic")
+        loaded.load_and_train()
+        assert loaded.total_teams == 30
+
+    @pytest.mark.bayesian
+    def test_update_from_battle(self, cache_dir):
+        """Finished battles should update teammate counts and drop cached predictions."""
+        trained_on(make_synthetic_teams(n_teams=200, n_species=20, seed=6), "battles").save_snapshot()
+        pokemon_predictor = PokemonPredictor(battle_format="battles")
+
+        data = GenData.from_gen(9)
+        opponent = ["greattusk", "kingambit", "gholdengo", "dragapult", "zamazenta", "corviknight"]
+        battle = SimpleNamespace(opponent_team={
+            f"p2: {species}": SimpleNamespace(species=species, _data=data) for species in opponent
+        })
+
+        before = pokemon_predictor.predict_teammates(["Great Tusk"], 5)
+        assert all(species.startswith("Species") for species, _ in before)
+        assert pokemon_predictor.update_from_battle(battle)
+
+        after = pokemon_predictor.predict_teammates(["Great Tusk"], 5)
+        assert {species for species, _ in after} == {"Kingambit", "Gholdengo", "Dragapult", "Zamazenta", "Corviknight"}
+        assert pokemon_predictor.predictor.species_counts["Great Tusk"] == 1
+
+        # Partially revealed teams are skipped
+        battle.opponent_team.pop("p2: corviknight")
+        assert not pokemon_predictor.update_from_battle(battle)
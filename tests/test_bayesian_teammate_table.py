@@ -0,0 +1,91 @@
+"""
+Tests for the compacted teammate-conditional config table.
+"""
+
+import pytest
+
+from bayesian.benchmark_predictor import make_synthetic_predictor, make_synthetic_teams
+from bayesian.team_predictor import BayesianTeamPredictor
+from bayesian.teammate_table import TeammateConfigTable, raw_entries
+
+
+@pytest.fixture
+def synthetic_predictor(tmp_path, monkeypatch):
+    monkeypatch.setenv("METAMON_CACHE_DIR", str(tmp_path))
+    return make_synthetic_predictor(n_teams=400, n_species=20, seed=3)
+
+
+def raw_counts(predictor):
+    return {(species, teammates, config_key): count
+            for species, teammates, config_key, count in raw_entries(predictor.config_given_teammates)}
+
+
+class TestTeammateConfigTable:
+    """Test class for TeammateConfigTable."""
+
+    @pytest.mark.bayesian
+    def test_team_keys_are_lossless(self, synthetic_predictor):
+        """A 5-way table without pruning should hold exactly the raw counts."""
+        expected = raw_counts(synthetic_predictor)
+        table = TeammateConfigTable.from_counts(raw_entries(synthetic_predictor.config_given_teammates),
+                                                list(synthetic_predictor.species_counts), pairwise=False)
+
+        assert {(species, teammates, config_key): count
+                for species, teammates, config_key, count in table.entries()} == expected
+        for (species, teammates, config_key), count in list(expected.items())[:50]:
+            (key,) = table.encode(species, reversed(teammates))
+            assert table.config_counts(key)[config_key] == count
+
+    @pytest.mark.bayesian
+    def test_pairwise_counts_and_pruning(self, synthetic_predictor):
+        """Pairwise counts should sum the teams containing both species, minus pruned entries."""
+        species, teammate = "Species0", "Species1"
+        expected = {}
+        for (s, teammates, config_key), count in raw_counts(synthetic_predictor).items():
+            if s == species and teammate in teammates:
+                expected[config_key] = expected.get(config_key, 0) + count
+        entries = list(raw_entries(synthetic_predictor.config_given_teammates))
+        species_names = list(synthetic_predictor.species_counts)
+
+        table = TeammateConfigTable.from_counts(entries, species_names, pairwise=True)
+        pruned = TeammateConfigTable.from_counts(entries, species_names, min_support=2, pairwise=True)
+
+        (key,) = table.encode(species, [teammate])
+        assert table.config_counts(key) == expected
+        assert pruned.config_counts(key) == {k: v for k, v in expected.items() if v >= 2}
+        assert len(pruned.keys) < len(table.keys)
+        assert pruned.nbytes < table.nbytes
+
+    @pytest.mark.bayesian
+    def test_predict_config_falls_back_to_species(self, synthetic_predictor):
+        """Unseen teams should predict the most common config of the species."""
+        table = synthetic_predictor.compact_teammate_table()
+        configs = synthetic_predictor.config_given_species["Species0"]
+
+        assert table.predict_config("Species0", ["Missingno"], configs) == max(configs, key=configs.get)
+        assert table.predict_config("Species0", ["Species1", "Species2"], configs) in configs
+
+    @pytest.mark.bayesian
+    def test_compaction_keeps_raw_counts(self, synthetic_predictor):
+        """Compacting should leave the raw counts in place, so later compactions include new teams."""
+        expected = raw_counts(synthetic_predictor)
+
+        table = synthetic_predictor.compact_teammate_table()
+        assert table.pairwise and raw_counts(synthetic_predictor) == expected
+        synthetic_predictor.update_from_teams(make_synthetic_teams(50, n_species=20, seed=4))
+        table = synthetic_predictor.compact_teammate_table()
+
+        reference = TeammateConfigTable.from_counts(raw_entries(synthetic_predictor.config_given_teammates),
+                                                    table.species_names)
+        assert sorted(table.entries()) == sorted(reference.entries())
+        assert len(raw_counts(synthetic_predictor)) > len(expected)
+
+    @pytest.mark.bayesian
+    def test_compaction_needs_training_counts(self, synthetic_predictor):
+        """Predictors loaded from a model file have no teammate config counts to compact."""
+        synthetic_predictor._save_model_file()
+        loaded = BayesianTeamPredictor(cache_file=synthetic_predictor.cache_file, battle_format="synthetic")
+        loaded.load_and_train()
+
+        with pytest.raises(RuntimeError):
+            loaded.compact_teammate_table()
@@ -0,0 +1,64 @@
+"""
+Tests for sharded (map-reduce) training of the Bayesian team predictor.
+"""
+
+import random
+
+import pytest
+
+from bayesian.team_predictor import BayesianTeamPredictor
+
+SPECIES = ["Gliscor", "Kingambit", "Gholdengo", "Great Tusk", "Zamazenta", "Dragapult",
+           "Iron Valiant", "Slowking-Galar", "Raging Bolt", "Corviknight", "Ting-Lu", "Cinderace"]
+MOVES = ["Knock Off", "U-turn", "Earthquake", "Stealth Rock", "Swords Dance", "Shadow Ball",
+         "Close Combat", "Calm Mind", "Protect", "Body Press", "Volt Switch", "Roost"]
+
+
+def write_team_files(directory, n_teams: int, seed: int = 0):
+    """Write random Showdown-format team files and return their paths."""
+    rng = random.Random(seed)
+    paths = []
+    for i in range(n_teams):
+        sections = []
+        for species in rng.sample(SPECIES, 6):
+            moves = "\n".join(f"- {move}" for move in rng.sample(MOVES, 4))
+            sections.append(
+                f"{species} @ {rng.choice(['Leftovers', 'Choice Scarf', 'Life Orb'])}\n"
+                f"Ability: {rng.choice(['Pressure', 'Intimidate'])}\n"
+                f"Tera Type: {rng.choice(['Fairy', 'Steel'])}\n"
+                f"EVs: {rng.choice(['252 HP / 4 Def / 252 SpD', '252 Atk / 4 SpD / 252 Spe'])}\n"
+                f"{rng.choice(['Jolly', 'Careful', 'Timid'])} Nature\n"
+                f"{moves}"
+            )
+        path = directory / f"team_{i:04d}.txt"
+        path.write_text("\n\n".join(sections))
+        paths.append(str(path))
+    # An unreadable entry must be skipped the same way by both trainers
+    paths.insert(n_teams // 2, str(directory / "missing.txt"))
+    return paths
+
+
+def train_cache_bytes(tmp_path, monkeypatch, team_files, name: str, **kwargs) -> bytes:
+    monkeypatch.setenv("METAMON_CACHE_DIR", str(tmp_path / "cache"))
+    predictor = BayesianTeamPredictor(cache_file=f"{name}.pkl", battle_format="gen9ou")
+    predictor._train_on_files(team_files, **kwargs)
+    predictor._save_model_file()
+    with open(predictor.model_path, "rb") as f:
+        return f.read()
+
+
+class TestShardedTraining:
+    """Test class for parallel predictor training."""
+
+    @pytest.mark.bayesian
+    @pytest.mark.slow
+    def test_parallel_matches_serial(self, tmp_path, monkeypatch):
+        """Sharded training should write a model file byte-identical to serial training."""
+        team_dir = tmp_path / "teams"
+        team_dir.mkdir()
+        team_files = write_team_files(team_dir, 120)
+
+        serial = train_cache_bytes(tmp_path, monkeypatch, team_files, "serial", workers=1)
+        parallel = train_cache_bytes(tmp_path, monkeypatch, team_files, "parallel", workers=3, shard_size=25)
+
+        assert serial == parallel
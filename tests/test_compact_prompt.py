@@ -0,0 +1,79 @@
+"""
+Tests for the prompt rendering helpers: compact token-budgeted rendering and
+prefix-stable section ordering.
+"""
+
+import pytest
+
+from poke_env.data.gen_data import GenData
+from poke_env.environment.pokemon import Pokemon
+from pokechamp.prompts import (
+    PROMPT_CALL,
+    PROMPT_STATIC,
+    PROMPT_TURN,
+    assemble_prompt,
+    estimate_tokens,
+    fit_prompt_sections,
+    get_matchup_code,
+)
+
+
+class TestCompactPrompt:
+    """Test class for compact prompt rendering."""
+
+    @pytest.mark.unit
+    def test_estimate_tokens(self):
+        """Token estimate should be roughly four characters per token."""
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("abcd") == 1
+        assert estimate_tokens("a" * 401) == 101
+
+    @pytest.mark.unit
+    def test_matchup_code(self):
+        """Matchup codes should list abbreviated types by damage multiplier."""
+        type_chart = GenData.from_gen(9).type_chart
+        garchomp = Pokemon(gen=9, species="garchomp")
+
+        code = get_matchup_code(garchomp, type_chart)
+        assert "4x:ICE" in code
+        assert "2x:DRA/FAI" in code
+        assert "0x:ELE" in code
+
+        # Restricting to a move pool drops unrelated types
+        assert get_matchup_code(garchomp, type_chart, ["WATER", "ELECTRIC"]) == "0x:ELE"
+
+    @pytest.mark.unit
+    def test_fit_prompt_sections(self):
+        """Lowest-priority sections should be dropped first until the budget fits."""
+        sections = {
+            "history": "h" * 400,
+            "active": "a" * 40,
+            "bench": "b" * 400,
+        }
+        kept, dropped = fit_prompt_sections(sections, 120, drop_order=["history", "bench"])
+        assert list(kept) == ["active", "bench"]
+        assert dropped == ["history"]
+
+        kept, dropped = fit_prompt_sections(sections, 5, drop_order=["history", "bench"])
+        assert list(kept) == ["active"]
+        assert dropped == ["history", "bench"]
+
+
+class TestPromptLayout:
+    """Test class for prefix-stable prompt assembly."""
+
+    @pytest.mark.unit
+    def test_static_sections_come_first(self):
+        """Sections should be ordered from most static to most dynamic."""
+        prompt = assemble_prompt(
+            (PROMPT_TURN, "state;"),
+            (PROMPT_CALL, "choices;"),
+            (PROMPT_STATIC, "rubric;"),
+        )
+        assert prompt == "rubric;state;choices;"
+
+    @pytest.mark.unit
+    def test_same_level_keeps_order(self):
+        """Sections at the same level should keep their given order."""
+        prompt = assemble_prompt((PROMPT_CALL, "b"), (PROMPT_TURN, "x"), (PROMPT_CALL, "a"))
+        assert prompt == "xba"
@@ -0,0 +1,99 @@
+"""
+Tests for the per-battle decision contexts of the LLM players.
+"""
+
+import asyncio
+import logging
+import time
+
+import pytest
+
+from poke_env.concurrency import POKE_LOOP
+from poke_env.environment.battle import Battle
+from poke_env.player import Player
+from poke_env.player.battle_order import DefaultBattleOrder
+from pokechamp.decision_context import DecisionContexts
+from pokechamp.minimax_optimizer import create_battle_state_hash, get_minimax_optimizer
+
+
+def make_battle(index):
+    return Battle(f"battle-gen9ou-{index}", "Alice", logging.getLogger("test"), gen=9)
+
+
+class ContextPlayer(Player):
+    """Searches with a decision context off the event loop, like the LLM players."""
+
+    BLOCKING_CHOOSE_MOVE = True
+    delay = 0.2
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._decision_contexts = DecisionContexts()
+
+    def choose_move(self, battle):
+        self._decision_contexts.get(battle)
+        time.sleep(self.delay)
+        self.kept_while_deciding = battle.battle_tag in self._decision_contexts
+        return DefaultBattleOrder()
+
+    def _decisions_finished_callback(self, battle_tag):
+        self._decision_contexts.discard(battle_tag)
+
+
+class TestDecisionContexts:
+    """Test class for DecisionContexts."""
+
+    @pytest.mark.unit
+    def test_battles_get_isolated_contexts(self):
+        """Every battle should get its own prompt state, optimizer, pool and cache."""
+        contexts = DecisionContexts()
+        first, second = make_battle(0), make_battle(1)
+
+        context = contexts.get(first)
+        context.strategy_prompt = "Set up Stealth Rock early."
+        context.optimizer.cache_evaluation(create_battle_state_hash(first), "move", "move", 0.5)
+
+        other = contexts.get(second)
+        assert contexts.get(first) is context
+        assert other.strategy_prompt == "" and not other.minimax_initialized
+        assert other.optimizer is not context.optimizer
+        assert other.optimizer.sim_pool is not context.optimizer.sim_pool
+        assert other.optimizer.get_cached_evaluation(create_battle_state_hash(first), "move", "move") is None
+        assert context.optimizer is not get_minimax_optimizer()
+
+    @pytest.mark.unit
+    def test_discard_finished_battle(self):
+        """Finished battles should drop their context and start fresh if seen again."""
+        contexts = DecisionContexts()
+        battle = make_battle(0)
+        context = contexts.get(battle)
+
+        contexts.discard(battle.battle_tag)
+        contexts.discard(battle.battle_tag)
+
+        assert battle.battle_tag not in contexts and len(contexts) == 0
+        assert contexts.get(battle) is not context
+
+        # Decisions outliving their battle do not leave a context behind
+        battle.won_by("Alice")
+        contexts.discard(battle.battle_tag)
+        assert contexts.get(battle) is not contexts.get(battle) and len(contexts) == 0
+
+    @pytest.mark.unit
+    def test_context_outlives_running_decision(self):
+        """A battle ending during its decision should keep its context until the decision returns."""
+        player = ContextPlayer(battle_format="gen9ou", start_listening=False, background_warm_up=False)
+        battle = make_battle(0)
+
+        async def finish_while_deciding():
+            deciding = asyncio.ensure_future(player._decide(player.choose_move, battle))
+            await asyncio.sleep(ContextPlayer.delay / 2)
+            battle.won_by("Alice")
+            player._retain_finished_battle(battle)
+            player.kept_after_end = battle.battle_tag in player._decision_contexts
+            await deciding
+
+        asyncio.run_coroutine_threadsafe(finish_while_deciding(), POKE_LOOP).result(timeout=60)
+
+        assert player.kept_after_end and player.kept_while_deciding
+        assert len(player._decision_contexts) == 0
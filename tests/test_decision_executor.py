@@ -0,0 +1,186 @@
+"""
+Tests for running player decisions off the shared event loop.
+"""
+
+import asyncio
+import json
+import logging
+import time
+
+import pytest
+
+from poke_env.concurrency import POKE_LOOP
+from poke_env.environment.battle import Battle
+from poke_env.player import Player
+from poke_env.player.battle_order import DefaultBattleOrder
+from poke_env.ps_client import AccountConfiguration
+
+INIT_FRAME = "\n".join([
+    ">battle-gen9ou-1", "|init|battle", "|title|Alice vs. Bob", "|j|Alice",
+    "|player|p1|Alice|1|", "|player|p2|Bob|2|", "|gen|9", "|tier|[Gen 9] OU",
+    "|", "|start", "|switch|p1a: Kingambit|Kingambit, L100|100/100",
+    "|switch|p2a: Gholdengo|Gholdengo, L100|100/100", "|turn|1",
+])
+
+REQUEST_FRAME = ">battle-gen9ou-1\n|request|" + json.dumps({
+    "active": [{"moves": [{"move": "Knock Off", "id": "knockoff", "pp": 32, "maxpp": 32,
+                           "target": "normal", "disabled": False}]}],
+    "side": {"name": "Alice", "id": "p1", "pokemon": [{
+        "ident": "p1: Kingambit", "details": "Kingambit, L100", "condition": "100/100", "active": True,
+        "stats": {"atk": 300, "def": 250, "spa": 150, "spd": 200, "spe": 150}, "moves": ["knockoff"],
+        "baseAbility": "supremeoverlord", "item": "leftovers", "pokeball": "pokeball",
+        "ability": "supremeoverlord", "teraType": "Dark", "terastallized": "",
+    }]},
+    "rqid": 2,
+})
+
+
+class SlowPlayer(Player):
+    """Decides after blocking for `delay` seconds, like an LLM call."""
+
+    delay = 0.2
+
+    def choose_move(self, battle):
+        time.sleep(self.delay)
+        return DefaultBattleOrder()
+
+
+class BlockingSlowPlayer(SlowPlayer):
+    BLOCKING_CHOOSE_MOVE = True
+
+
+class WatchingPlayer(BlockingSlowPlayer):
+    """Records whether the battle finished while it was deciding."""
+
+    def choose_move(self, battle):
+        order = super().choose_move(battle)
+        self.finished_while_deciding = battle.finished
+        return order
+
+
+def make_player(cls, **kwargs):
+    player = cls(battle_format="gen9ou", start_listening=False, background_warm_up=False, **kwargs)
+    player.sent = []
+
+    async def send_message(message, room="", message_2=None):
+        player.sent.append((room, message))
+
+    player.ps_client.send_message = send_message
+    return player
+
+
+def make_battle(index):
+    return Battle(f"battle-gen9ou-{index}", "Alice", logging.getLogger("test"), gen=9)
+
+
+def run(coroutine):
+    return asyncio.run_coroutine_threadsafe(coroutine, POKE_LOOP).result(timeout=60)
+
+
+async def play(player, battles):
+    """Requests a decision in every battle while measuring the longest event loop stall."""
+    stalls = []
+
+    async def heartbeat():
+        while True:
+            before = time.perf_counter()
+            await asyncio.sleep(0.01)
+            stalls.append(time.perf_counter() - before - 0.01)
+
+    beat = asyncio.ensure_future(heartbeat())
+    start = time.perf_counter()
+    await asyncio.gather(*[player._handle_battle_request(battle) for battle in battles])
+    elapsed = time.perf_counter() - start
+    beat.cancel()
+    return elapsed, max(stalls, default=0.0)
+
+
+class TestDecisionExecutor:
+    """Test class for Player decisions on the decision executor."""
+
+    @pytest.mark.unit
+    def test_concurrent_battles_against_slow_bot(self):
+        """Slow decisions of many battles should overlap without stalling the loop."""
+        n_battles = 12
+        player = make_player(BlockingSlowPlayer, max_concurrent_battles=n_battles)
+        battles = [make_battle(i) for i in range(n_battles)]
+
+        elapsed, stall = run(play(player, battles))
+
+        assert sorted(room for room, _ in player.sent) == sorted(battle.battle_tag for battle in battles)
+        assert elapsed < n_battles * SlowPlayer.delay / 3
+        assert stall < SlowPlayer.delay / 2
+        for battle in battles:
+            metrics = player.decision_metrics[battle.battle_tag]
+            assert (metrics.decisions, metrics.off_loop, metrics.pending) == (1, 1, 0)
+            assert metrics.decision_time_max >= SlowPlayer.delay
+
+    @pytest.mark.unit
+    def test_decisions_of_a_battle_are_queued(self):
+        """Requests of the same battle should be decided one after the other."""
+        player = make_player(BlockingSlowPlayer, max_concurrent_battles=4)
+        battle = make_battle(0)
+
+        run(play(player, [battle, battle]))
+
+        metrics = player.decision_metrics[battle.battle_tag]
+        assert metrics.decisions == 2
+        assert metrics.queue_wait_max >= SlowPlayer.delay * 0.9
+        assert len(player.sent) == 2
+
+    @pytest.mark.unit
+    def test_blocking_decisions_are_detected(self):
+        """A slow synchronous choose_move should move off the loop after its first decision, if allowed to."""
+        player = make_player(SlowPlayer)
+        on_loop = make_player(SlowPlayer, decision_executor=None)
+        battle = make_battle(0)
+
+        run(play(player, [battle]))
+        run(play(player, [battle]))
+        run(play(on_loop, [battle]))
+
+        assert player.decision_metrics[battle.battle_tag].off_loop == 1
+        assert player.decision_executor is not None
+        assert on_loop.decision_metrics[battle.battle_tag].off_loop == 0
+        assert on_loop.decision_executor is None
+
+    @pytest.mark.unit
+    def test_decision_state_is_released_when_battles_end(self):
+        """Finished battles should fold their metrics into the aggregate and drop their lock."""
+        player = make_player(BlockingSlowPlayer, max_concurrent_battles=2)
+        battles = [make_battle(i) for i in range(2)]
+
+        run(play(player, battles))
+        battles[0].won_by("Alice")
+        player._retain_finished_battle(battles[0])
+
+        assert list(player.decision_metrics) == [battles[1].battle_tag]
+        assert list(player._decision_locks) == [battles[1].battle_tag]
+        assert player.finished_decision_metrics.decisions == 1
+        assert player.finished_decision_metrics.decision_time_max >= SlowPlayer.delay
+
+        battles[1].won_by("Alice")
+        player._retain_finished_battle(battles[1])
+        assert player.decision_metrics == {} and player._decision_locks == {}
+        assert player.finished_decision_metrics.decisions == 2
+
+        player.reset_battles()
+        assert player.finished_decision_metrics.decisions == 0
+
+    @pytest.mark.unit
+    def test_frames_wait_for_running_decisions(self):
+        """Frames of a battle received during its decision should be handled once it returns."""
+        player = make_player(WatchingPlayer, account_configuration=AccountConfiguration("Alice", None))
+        handle = player.ps_client._handle_message
+
+        async def listen():
+            await handle(INIT_FRAME)
+            # Like listen, which handles every frame in its own task
+            await asyncio.gather(handle(REQUEST_FRAME), handle(">battle-gen9ou-1\n|\n|win|Bob"))
+
+        run(listen())
+
+        assert player.finished_while_deciding is False
+        assert player.battles["battle-gen9ou-1"].lost
+        assert player.sent == [("battle-gen9ou-1", "/choose default")]
+        assert player._frame_locks == {} and player._decision_locks == {} and player.decision_metrics == {}
@@ -0,0 +1,91 @@
+"""
+Tests for websocket frame classification and handling.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from poke_env.concurrency import POKE_LOOP
+from poke_env.player import Player
+from poke_env.player.battle_order import DefaultBattleOrder
+from poke_env.ps_client import AccountConfiguration
+from poke_env.ps_client.frames import BattleFrame, frame_type, is_battle_frame
+
+INIT_FRAME = "\n".join([
+    ">battle-gen9ou-1", "|init|battle", "|title|Alice vs. Bob", "|j|Alice",
+    "|player|p1|Alice|1|", "|player|p2|Bob|2|", "|gen|9", "|tier|[Gen 9] OU",
+    "|", "|start", "|switch|p1a: Kingambit|Kingambit, L100|100/100",
+    "|switch|p2a: Gholdengo|Gholdengo, L100|100/100", "|turn|1",
+])
+
+REQUEST = {
+    "active": [{"moves": [{"move": "Knock Off", "id": "knockoff", "pp": 32, "maxpp": 32,
+                           "target": "normal", "disabled": False}]}],
+    "side": {"name": "Alice", "id": "p1", "pokemon": [{
+        "ident": "p1: Kingambit", "details": "Kingambit, L100", "condition": "100/100", "active": True,
+        "stats": {"atk": 300, "def": 250, "spa": 150, "spd": 200, "spe": 150}, "moves": ["knockoff"],
+        "baseAbility": "supremeoverlord", "item": "leftovers", "pokeball": "pokeball",
+        "ability": "supremeoverlord", "teraType": "Dark", "terastallized": "",
+    }]},
+    "rqid": 2,
+}
+
+
+class FirstMovePlayer(Player):
+    def choose_move(self, battle):
+        return DefaultBattleOrder()
+
+
+def make_player():
+    player = FirstMovePlayer(account_configuration=AccountConfiguration("Alice", None), battle_format="gen9ou",
+                             start_listening=False, background_warm_up=False)
+    player.sent = []
+
+    async def send_message(message, room="", message_2=None):
+        player.sent.append((room, message))
+
+    player.ps_client.send_message = send_message
+    return player
+
+
+def handle(player, *frames):
+    async def replay():
+        for frame in frames:
+            await player.ps_client._handle_message(frame)
+
+    asyncio.run_coroutine_threadsafe(replay(), POKE_LOOP).result(timeout=60)
+
+
+class TestFrames:
+    """Test class for websocket frames."""
+
+    @pytest.mark.unit
+    def test_frame_classification(self):
+        """Frames should be classified from their prefix only."""
+        assert is_battle_frame(INIT_FRAME) and not is_battle_frame("|challstr|4|abc")
+        assert frame_type("|challstr|4|abc") == "challstr"
+        assert frame_type("|updatesearch|{}\n|pm|a|b") == "updatesearch"
+        assert frame_type("|nametaken") == "nametaken"
+        assert frame_type(">lobby\n|raw|hi") == ""
+
+        frame = BattleFrame(INIT_FRAME)
+        assert frame.room == ">battle-gen9ou-1" and frame.is_init and len(frame) == 13
+        assert not BattleFrame(">battle-gen9ou-1\n|request|{}").is_init
+
+    @pytest.mark.unit
+    def test_battle_frames_are_handled(self):
+        """Battle updates and requests should update the battle and trigger a decision."""
+        player = make_player()
+        request = dict(REQUEST, side=dict(REQUEST["side"], name="Alice | the first"))
+
+        handle(player, INIT_FRAME, f">battle-gen9ou-1\n|request|{json.dumps(request)}")
+
+        battle = player.battles["battle-gen9ou-1"]
+        assert battle.turn == 1
+        assert battle.active_pokemon.species == "kingambit"
+        assert [move.id for move in battle.available_moves] == ["knockoff"]
+        assert "Battle start:" in battle.battle_msg_history
+        assert "[sep]Turn 1:" in battle.battle_msg_history
+        assert player.sent == [("battle-gen9ou-1", "/choose default")]
@@ -0,0 +1,73 @@
+"""
+Tests for the interned read-only FrozenMove view.
+
+FrozenMove is used on the prompt-building and damage-estimation hot paths, so it
+must behave exactly like a freshly built Move for every property read there.
+"""
+
+import copy
+import pickle
+
+import pytest
+
+from poke_env.environment.move import FrozenMove, Move
+
+
+class TestFrozenMove:
+    """Test class for FrozenMove."""
+
+    @pytest.mark.moves
+    @pytest.mark.parametrize("gen", [1, 4, 8, 9])
+    def test_matches_regular_move(self, gen):
+        """Precomputed properties should match the lazily computed ones."""
+        for move_id in ["tackle", "thunderbolt", "thunderwave", "quickattack"]:
+            move = Move(move_id, gen=gen)
+            frozen = FrozenMove.from_id(move_id, gen)
+
+            assert frozen.id == move.id
+            assert frozen.base_power == move.base_power
+            assert frozen.category == move.category
+            assert frozen.type == move.type
+            assert frozen.priority == move.priority
+            assert frozen.heal == move.heal
+            assert frozen.status == move.status
+            assert frozen.accuracy == move.accuracy
+
+    @pytest.mark.moves
+    def test_heal_is_precomputed(self):
+        """Healing moves should expose the same heal fraction as Move."""
+        assert FrozenMove.from_id("recover", 9).heal == Move("recover", gen=9).heal == 0.5
+
+    @pytest.mark.moves
+    def test_interned_per_move_and_gen(self):
+        """The same instance should be returned for the same (move_id, gen)."""
+        assert FrozenMove.from_id("earthquake", 9) is FrozenMove.from_id("earthquake", 9)
+        assert FrozenMove.from_id("earthquake", 9) is not FrozenMove.from_id("earthquake", 8)
+
+    @pytest.mark.moves
+    def test_read_only(self):
+        """State mutations should be rejected instead of leaking across battles."""
+        frozen = FrozenMove.from_id("earthquake", 9)
+
+        with pytest.raises(AttributeError):
+            frozen.use()
+        with pytest.raises(AttributeError):
+            frozen._current_pp = 0
+        assert frozen.current_pp == Move("earthquake", gen=9).current_pp
+
+    @pytest.mark.moves
+    def test_copies_are_shared(self):
+        """Copying or pickling a battle should not duplicate interned moves."""
+        frozen = FrozenMove.from_id("earthquake", 9)
+
+        assert copy.copy(frozen) is frozen
+        assert copy.deepcopy(frozen) is frozen
+        assert pickle.loads(pickle.dumps(frozen)) is frozen
+
+    @pytest.mark.moves
+    def test_dynamaxed_is_cached(self):
+        """The dynamaxed view should be built once and reuse the parent data."""
+        frozen = FrozenMove.from_id("earthquake", 8)
+
+        assert frozen.dynamaxed is frozen.dynamaxed
+        assert frozen.dynamaxed.base_power == Move("earthquake", gen=8).dynamaxed.base_power
@@ -0,0 +1,58 @@
+"""
+Tests for the static data bundles loaded by GenData.
+"""
+
+import json
+import pickle
+
+import pytest
+
+from poke_env.data.bundle import BundleMapping, load_bundle
+from poke_env.data.gen_data import GenData
+
+
+def write_json(path, data):
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+
+class TestGenDataBundle:
+    """Test class for static data bundles."""
+
+    @pytest.mark.unit
+    def test_bundle_is_rebuilt_when_sources_change(self, tmp_path):
+        """Bundles should be reused until a source changes, with lazy sections decoded on access."""
+        source = tmp_path / "learnset.json"
+        path = str(tmp_path / "bundles" / "test.bundle")
+        builds = []
+
+        def build():
+            with open(source) as f:
+                learnset = json.load(f)
+            builds.append(learnset)
+            return {"learnset": learnset, "version": len(builds)}
+
+        write_json(source, {"pikachu": {"thunderbolt": ["9M"]}, "raichu": {"surf": ["9M"]}})
+        assert load_bundle(path, [str(source)], build, lazy=("learnset",))["version"] == 1
+
+        data = load_bundle(path, [str(source)], build, lazy=("learnset",))
+        assert len(builds) == 1 and data["version"] == 1
+        learnset = data["learnset"]
+        assert isinstance(learnset, BundleMapping)
+        assert list(learnset) == ["pikachu", "raichu"] and "raichu" in learnset and "mew" not in learnset
+        assert learnset["raichu"] == {"surf": ["9M"]}
+        assert pickle.loads(pickle.dumps(learnset)) == builds[0]
+
+        write_json(source, {"pikachu": {"thunderbolt": ["9M", "8M"]}})
+        assert load_bundle(path, [str(source)], build, lazy=("learnset",))["version"] == 2
+        assert dict(load_bundle(path, [str(source)], build, lazy=("learnset",))["learnset"]) == builds[1]
+
+    @pytest.mark.unit
+    def test_gen_data_matches_sources(self):
+        """GenData loaded from its bundle should hold the data parsed from the JSON sources."""
+        gen_data = GenData.from_gen(9)
+        sources = gen_data.load_sources(9)
+
+        for name, data in sources.items():
+            assert dict(getattr(gen_data, name)) == data, name
+        assert gen_data.pokedex["pikachualolagmax"] is gen_data.pokedex["pikachugmax"]
@@ -0,0 +1,49 @@
+"""
+Tests for the startup cost of importing poke_env and the LLM players.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+PROJECT_ROOT = os.path.join(os.path.dirname(__file__), '..')
+
+# Cumulative import time of the module, in seconds. Importing it takes around
+# 0.4s; the LLM client SDKs alone used to add more than a second.
+IMPORT_BUDGET = 1.5
+
+# Only needed by the code paths that use them
+LAZY_MODULES = ["openai", "google.genai", "ollama", "torch", "transformers", "pyfiglet", "rich", "pandas"]
+
+
+def import_profile(module):
+    """Imports a module in a fresh interpreter, returning the modules it loaded and
+    the cumulative import time of each, in seconds, as reported by ``-X importtime``."""
+    code = f"import sys, {module}; print('\\n'.join(sys.modules))"
+    env = dict(os.environ, PYTHONPATH=PROJECT_ROOT)
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=PROJECT_ROOT,
+                             env=env, capture_output=True, text=True, timeout=300)
+    assert process.returncode == 0, process.stderr
+
+    times = {}
+    for line in process.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative) / 1e6
+    return set(process.stdout.split()), times
+
+
+class TestImportTime:
+    """Test class for import time regressions."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("module", ["poke_env.player", "pokechamp.llm_player"])
+    def test_import_stays_under_budget(self, module):
+        """Importing players should not load LLM clients, torch or display libraries."""
+        modules, times = import_profile(module)
+
+        assert [name for name in LAZY_MODULES if name in modules] == []
+        assert times[module] < IMPORT_BUDGET, f"importing {module} took {times[module]:.2f}s"
@@ -0,0 +1,103 @@
+"""
+Tests for the table-driven protocol message dispatch of battles.
+"""
+
+import logging
+
+import pytest
+
+from poke_env.environment.battle import Battle
+from poke_env.environment.double_battle import DoubleBattle
+
+
+def make_battle():
+    battle = Battle("battle-gen9ou-1", "Alice", logging.getLogger("test"), gen=9)
+    for line in ["|player|p1|Alice|1|1500", "|player|p2|Bob|2|1500",
+                 "|switch|p1a: Kingambit|Kingambit, L100, M|100/100",
+                 "|switch|p2a: Great Tusk|Great Tusk, L100|100/100"]:
+        battle.parse_message(line.split("|"))
+    return battle
+
+
+class TestParseMessage:
+    """Test class for AbstractBattle.parse_message."""
+
+    @pytest.mark.unit
+    def test_handlers_registered_per_subclass(self):
+        """Every concrete battle class should dispatch the same protocol events."""
+        for cls in [Battle, DoubleBattle]:
+            handlers = cls._message_handlers
+            assert {"move", "-damage", "switch", "drag", "-heal", "turn", "-start", "start"} <= set(handlers)
+            assert handlers["drag"] is handlers["switch"]
+
+    @pytest.mark.unit
+    def test_subclass_override_is_dispatched(self):
+        """Overriding a handler in a subclass should replace it in the table."""
+        class CountingBattle(Battle):
+            turns = []
+
+            def _parse_turn(self, split_message):
+                self.turns.append(int(split_message[2]))
+                super()._parse_turn(split_message)
+
+        battle = CountingBattle("battle-gen9ou-2", "Alice", logging.getLogger("test"), gen=9)
+        battle.parse_message(["", "turn", "3"])
+
+        assert CountingBattle.turns == [3]
+        assert battle.turn == 3
+
+    @pytest.mark.unit
+    def test_hot_events(self):
+        """Fast paths should update the battle exactly like the full handlers."""
+        battle = make_battle()
+        for line in ["|move|p1a: Kingambit|Iron Head|p2a: Great Tusk",
+                     "|-damage|p2a: Great Tusk|55/100",
+                     "|move|p2a: Great Tusk|Earthquake|p1a: Kingambit|[miss]",
+                     "|-damage|p1a: Kingambit|80/100|[from] item: Life Orb",
+                     "|-heal|p2a: Great Tusk|61/100|[from] item: Leftovers",
+                     "|turn|2"]:
+            battle.parse_message(line.split("|"))
+
+        kingambit = battle.get_pokemon("p1a: Kingambit")
+        great_tusk = battle.get_pokemon("p2a: Great Tusk")
+        assert "ironhead" in kingambit.moves
+        assert "earthquake" in great_tusk.moves
+        assert great_tusk.current_hp == 61
+        assert kingambit.item == "lifeorb"
+        assert great_tusk.item == "leftovers"
+        assert battle.turn == 2
+
+    @pytest.mark.unit
+    def test_ignored_and_unknown_events(self):
+        """Ignored events should be no-ops and unknown ones should still raise."""
+        battle = make_battle()
+        battle.parse_message(["", "-crit", "p2a: Great Tusk"])
+        battle.parse_message(["", "gen", "9"])
+
+        with pytest.raises(NotImplementedError):
+            battle.parse_message(["", "not-an-event", "x"])
+
+    @pytest.mark.unit
+    def test_get_pokemon_index(self):
+        """Repeated identifiers should resolve through the index to the same Pokemon."""
+        battle = make_battle()
+        great_tusk = battle.get_pokemon("p2a: Great Tusk")
+
+        assert battle._pokemon_index["p2a: Great Tusk"] is great_tusk
+        assert battle.get_pokemon("p2a: Great Tusk") is great_tusk
+        assert battle.get_pokemon("p2b: Great Tusk") is great_tusk
+        assert battle.get_pokemon("p1a: Kingambit", force_self_team=True) is battle.team["p1: Kingambit"]
+
+    @pytest.mark.unit
+    def test_get_pokemon_index_invalidation(self):
+        """New team members and team replacement should drop indexed lookups."""
+        battle = make_battle()
+        battle.get_pokemon("p2a: Great Tusk")
+        battle.parse_message("|switch|p2a: Zoroark|Zoroark-Hisui, L100|100/100".split("|"))
+
+        assert set(battle._pokemon_index) == {"p2a: Zoroark"}
+        assert battle.get_pokemon("p2a: Zoroark") is battle.opponent_team["p2: Zoroark"]
+
+        battle.get_pokemon("p1a: Kingambit")
+        battle.team = {}
+        assert not battle._pokemon_index
@@ -0,0 +1,115 @@
+"""
+Tests for the LRU prediction cache in PokemonPredictor.
+"""
+
+import threading
+
+import pytest
+
+from bayesian.benchmark_predictor import make_synthetic_predictor
+from bayesian.pokemon_predictor import PokemonPredictor, PredictionCache
+
+
+@pytest.fixture(scope="module")
+def model_dir(tmp_path_factory):
+    """Directory holding a synthetic model file for the "synthetic" format."""
+    directory = tmp_path_factory.mktemp("metamon_cache")
+    predictor = make_synthetic_predictor(n_teams=500, n_species=30, seed=2)
+    predictor.model_path = str(directory / "synthetic_team_predictor_full.model")
+    predictor._save_model_file()
+    return directory
+
+
+@pytest.fixture
+def pokemon_predictor(model_dir, monkeypatch):
+    monkeypatch.setenv("METAMON_CACHE_DIR", str(model_dir))
+    return PokemonPredictor(battle_format="synthetic", cache_size=8)
+
+
+class TestPredictionCache:
+    """Test class for the prediction cache."""
+
+    @pytest.mark.bayesian
+    def test_repeated_queries_hit(self, pokemon_predictor):
+        """The same species, teammates and revealed moves should only be computed once."""
+        first = pokemon_predictor.predict_component_probabilities("Species1", ["Species0", "Species2"], ["Move 1", "Move 2"])
+        # Order of teammates and revealed moves does not matter
+        second = pokemon_predictor.predict_component_probabilities("Species1", ["Species2", "Species0"], ["Move 2", "Move 1"])
+
+        assert second is first
+        stats = pokemon_predictor.cache_stats()
+        assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+    @pytest.mark.bayesian
+    def test_new_information_misses(self, pokemon_predictor):
+        """A newly revealed move should trigger a fresh prediction."""
+        before = pokemon_predictor.predict_component_probabilities("Species1", ["Species0"], ["Move 1"])
+        after = pokemon_predictor.predict_component_probabilities("Species1", ["Species0"], ["Move 1", "Move 3"])
+
+        assert after is not before
+        assert after == pokemon_predictor.predictor.predict_component_probabilities("Species1", ["Species0"], ["Move 1", "Move 3"])
+        assert pokemon_predictor.cache_stats()["misses"] == 2
+
+    @pytest.mark.bayesian
+    def test_methods_do_not_collide(self, pokemon_predictor):
+        """Moveset and component queries with the same arguments are cached separately."""
+        moveset = pokemon_predictor.predict_moveset("Species3", None, ["Move 3"])
+        components = pokemon_predictor.predict_component_probabilities("Species3", None, ["Move 3"])
+
+        assert "probability" in moveset
+        assert "moves" in components
+
+    @pytest.mark.unit
+    def test_lru_eviction(self):
+        """The least recently used entry should be evicted first."""
+        cache = PredictionCache(max_size=2)
+        cache.get_or_compute("a", lambda: 1)
+        cache.get_or_compute("b", lambda: 2)
+        cache.get_or_compute("a", lambda: 1)  # "a" becomes most recent
+        cache.get_or_compute("c", lambda: 3)  # evicts "b"
+
+        assert cache.get_or_compute("a", lambda: -1) == 1
+        assert cache.get_or_compute("b", lambda: -2) == -2
+        assert cache.get_stats()["size"] == 2
+
+    @pytest.mark.unit
+    def test_disabled_cache(self):
+        """A zero-size cache should always recompute."""
+        cache = PredictionCache(max_size=0)
+        calls = []
+        cache.get_or_compute("a", lambda: calls.append(1))
+        cache.get_or_compute("a", lambda: calls.append(1))
+
+        assert len(calls) == 2
+        assert cache.get_stats()["size"] == 0
+
+    @pytest.mark.unit
+    def test_clear_during_compute(self):
+        """A result computed before a clear should not be stored after it."""
+        cache = PredictionCache(max_size=4)
+
+        def compute():
+            cache.clear()
+            return 1
+
+        assert cache.get_or_compute("a", compute) == 1
+        assert cache.get_stats()["size"] == 0
+        assert cache.get_or_compute("a", lambda: 2) == 2
+
+    @pytest.mark.unit
+    def test_concurrent_lookups(self):
+        """Threads sharing the cache should see consistent results and statistics."""
+        cache = PredictionCache(max_size=16)
+
+        def lookups():
+            for i in range(2000):
+                assert cache.get_or_compute(i % 32, lambda: (i % 32) * 2) == (i % 32) * 2
+
+        threads = [threading.Thread(target=lookups) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = cache.get_stats()
+        assert stats["hits"] + stats["misses"] == 8000 and stats["size"] == 16
@@ -0,0 +1,83 @@
+"""
+Tests for sampling usage sets from the compiled store.
+"""
+
+import json
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from poke_env.data.gen_data import GenData
+from poke_env.data.usage_sets import UsageSets
+from poke_env.environment.pokemon import Pokemon
+
+SETS = {
+    "kingambit": {
+        "moves": [
+            {"name": "Kowtow Cleave", "percentage": 90.0},
+            {"name": "Sucker Punch", "percentage": 80.0},
+            {"name": "Swords Dance", "percentage": 20.0},
+            {"name": "Iron Head", "percentage": 10.0},
+        ],
+        "spreads": [
+            {"nature": "Adamant", "stats": [252, 252, 0, 0, 4, 0], "percentage": "75"},
+            {"nature": "Jolly", "stats": [0, 252, 4, 0, 0, 252], "percentage": "25"},
+        ],
+        "tera": [{"name": "Dark", "percentage": 0.0}, {"name": "Flying", "percentage": 0.0}],
+    },
+}
+
+
+class TestUsageSets:
+    """Test class for UsageSets."""
+
+    @pytest.mark.unit
+    def test_draws_follow_percentages(self):
+        """Entries should be drawn distinct and in proportion to their percentages."""
+        usage_sets = UsageSets(SETS, UsageSets.compile(SETS))
+        np.random.seed(0)
+
+        spreads = Counter(usage_sets.sample("kingambit", "spreads")[0] for _ in range(4000))
+        assert spreads[0] / 4000 == pytest.approx(0.75, abs=0.03)
+        # Tables without usage are sampled uniformly
+        teras = Counter(usage_sets.choice("kingambit", "tera")[0]["name"] for _ in range(4000))
+        assert teras["Dark"] / 4000 == pytest.approx(0.5, abs=0.03)
+
+        moves = [usage_sets.sample("kingambit", "moves", size=3) for _ in range(4000)]
+        assert all(len(set(drawn)) == 3 for drawn in moves)
+        # Without replacement, like np.random.choice: the rarest move is left out most often
+        expected = Counter(i for _ in range(4000) for i in np.random.choice(4, 3, replace=False, p=[0.45, 0.4, 0.1, 0.05]))
+        drawn = Counter(i for draw in moves for i in draw)
+        for entry in range(4):
+            assert drawn[entry] / 4000 == pytest.approx(expected[entry] / 4000, abs=0.04)
+
+        assert sorted(usage_sets.sample("kingambit", "moves", size=6)) == [0, 1, 2, 3]
+        assert "kingambit" in usage_sets and "gholdengo" not in usage_sets
+
+    @pytest.mark.unit
+    def test_tables_are_loaded_from_bundle(self, tmp_path):
+        """Compiled tables should be reloaded read-only from their bundle."""
+        source = tmp_path / "sets.json"
+        source.write_text(json.dumps(SETS))
+        bundle_path = str(tmp_path / "sets.bundle")
+
+        UsageSets.load(SETS, str(source), bundle_path)
+        usage_sets = UsageSets.load(SETS, str(source), bundle_path)
+
+        assert not usage_sets._probabilities.flags.writeable
+        np.testing.assert_array_equal(usage_sets._aliases, UsageSets.compile(SETS)["aliases"])
+        assert usage_sets.choice("kingambit", "moves", size=4)[0]["name"] in {move["name"] for move in SETS["kingambit"]["moves"]}
+
+    @pytest.mark.unit
+    def test_pokemon_guesses_from_usage_sets(self):
+        """Weighted guesses of Pokemon should come from the format's usage sets."""
+        kingambit = Pokemon(gen=9, species="kingambit", battle_format="gen9ou")
+        sets = GenData.usage_sets_for_format("gen9ou")
+
+        assert sets.sets is kingambit.sets
+        spread, nature = kingambit.guess_stats(guess_type="weighted")
+        assert {"stats": spread, "nature": nature} in [
+            {"stats": entry["stats"], "nature": entry["nature"]} for entry in sets.sets["kingambit"]["spreads"]
+        ]
+        assert kingambit.guess_tera(guess_type="weighted") in {entry["name"] for entry in sets.sets["kingambit"]["tera"]}
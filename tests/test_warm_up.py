@@ -0,0 +1,117 @@
+"""
+Tests for the background warm-up of battle format data.
+
+Players start the warm-up of the assets they declare when they are created; every
+asset it loads must be the instance the decision path reads later, so nothing is
+loaded twice.
+"""
+
+import threading
+import time
+
+import pytest
+
+from bayesian import predictor_singleton
+from poke_env.data import GenData, gen_data
+from poke_env.environment.pokemon import Pokemon
+from poke_env.player import RandomPlayer
+from poke_env.player.warm_up import WarmUpService
+from pokechamp import data_cache
+
+
+class WarmingPlayer(RandomPlayer):
+    WARM_UP_ASSETS = ("gen_data", "game_data")
+
+
+class TestWarmUpService:
+    """Test class for WarmUpService."""
+
+    @pytest.mark.unit
+    def test_loads_random_battle_assets(self):
+        """Random battles should warm up static data but not the team predictor."""
+        service = WarmUpService("gen9randombattle")
+        service.start()
+
+        assert service.wait(timeout=60)
+        assert service.errors == {}
+        assert list(service.load_times) == ["gen_data", "sets", "game_data", "moves_set"]
+        assert all(seconds >= 0 for seconds in service.load_times.values())
+
+    @pytest.mark.unit
+    def test_loads_team_predictor(self, monkeypatch):
+        """Other formats should load the predictor through the shared singleton."""
+        predictor = object()
+        monkeypatch.setitem(predictor_singleton._predictor_instances, "gen9warmup", predictor)
+        service = WarmUpService("gen9warmup")
+        service.start()
+
+        assert service.wait(timeout=60)
+        assert "team_predictor" in service.load_times
+        assert predictor_singleton.get_pokemon_predictor("gen9warmup") is predictor
+
+    @pytest.mark.unit
+    def test_player_starts_shared_service(self):
+        """Players declaring assets should share one service, unless they opt out."""
+        first = WarmingPlayer(battle_format="gen9randombattle", start_listening=False)
+        second = WarmingPlayer(battle_format="gen9randombattle", start_listening=False)
+        opted_out = WarmingPlayer(battle_format="gen9randombattle", start_listening=False,
+                                  background_warm_up=False)
+
+        assert first.warm_up_service is second.warm_up_service
+        assert first.warm_up_service is WarmUpService.for_format("gen9randombattle", ("gen_data", "game_data"))
+        assert first.warm_up_service.wait(timeout=60)
+        assert list(first.warm_up_service.load_times) == ["gen_data", "game_data"]
+        assert opted_out.warm_up_service is None
+
+    @pytest.mark.unit
+    def test_players_without_assets_stay_cheap(self):
+        """Players declaring no assets, like the heuristic baselines, should not warm anything up."""
+        player = RandomPlayer(battle_format="gen9ou", start_listening=False)
+
+        assert player.warm_up_service is None
+
+    @pytest.mark.unit
+    def test_warms_global_game_data_cache(self, monkeypatch):
+        """The game data asset should load the cache the decision path reads, once."""
+        monkeypatch.setattr(data_cache, "_cache", None)
+        service = WarmUpService("gen9randombattle", ("game_data",))
+        service.start()
+
+        assert service.wait(timeout=60) and service.errors == {}
+        assert data_cache._cache is not None and data_cache._get_cache() is data_cache._cache
+
+    @pytest.mark.unit
+    def test_pokemon_share_warmed_sets(self):
+        """Pokemon should read the warmed-up sets instead of loading the file again."""
+        sets = GenData.sets_for_format("gen9ou")
+
+        assert Pokemon(gen=9, species="kingambit", battle_format="gen9ou").sets is sets
+        assert Pokemon(gen=9, species="gholdengo", battle_format="gen9ou").sets is sets
+        assert "kingambit" in sets
+
+    @pytest.mark.unit
+    def test_concurrent_loads_share_gen_data(self, monkeypatch):
+        """A constructor loading a generation the warm-up is loading should wait for it."""
+        load_bundle = gen_data.load_bundle
+
+        def slow_load_bundle(*args, **kwargs):
+            time.sleep(0.2)
+            return load_bundle(*args, **kwargs)
+
+        monkeypatch.setattr(gen_data, "load_bundle", slow_load_bundle)
+        loaded, errors = [], []
+
+        def load():
+            try:
+                loaded.append(GenData.from_format("gen1ou"))
+            except Exception as e:  # pylint: disable=broad-except
+                errors.append(e)
+
+        threads = [threading.Thread(target=load) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=60)
+
+        assert errors == []
+        assert all(data is GenData._gen_data_per_gen[1] for data in loaded) and len(loaded) == 4